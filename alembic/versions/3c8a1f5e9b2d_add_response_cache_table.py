@@ -0,0 +1,35 @@
+"""add response cache table
+
+Revision ID: 3c8a1f5e9b2d
+Revises: f1169c4032e9
+Create Date: 2026-10-16 10:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8a1f5e9b2d"
+down_revision: Union[str, None] = "f1169c4032e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "response_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("body", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(op.f("ix_response_cache_expires_at"), "response_cache", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_response_cache_expires_at"), table_name="response_cache")
+    op.drop_table("response_cache")
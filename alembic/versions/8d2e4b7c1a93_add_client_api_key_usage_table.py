@@ -0,0 +1,40 @@
+"""add client api key usage table
+
+Revision ID: 8d2e4b7c1a93
+Revises: 3c8a1f5e9b2d
+Create Date: 2026-10-16 14:03:27.529441
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2e4b7c1a93"
+down_revision: Union[str, None] = "3c8a1f5e9b2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "client_api_key_usage",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("api_key_id", sa.Integer(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(), nullable=False),
+        sa.Column("requests", sa.Integer(), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["api_key_id"], ["client_api_keys.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_client_api_key_usage_api_key_id"), "client_api_key_usage", ["api_key_id"], unique=False)
+    op.create_index(op.f("ix_client_api_key_usage_recorded_at"), "client_api_key_usage", ["recorded_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_client_api_key_usage_recorded_at"), table_name="client_api_key_usage")
+    op.drop_index(op.f("ix_client_api_key_usage_api_key_id"), table_name="client_api_key_usage")
+    op.drop_table("client_api_key_usage")
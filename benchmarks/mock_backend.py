@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""A local OpenAI-compatible chat completions server for benchmarking the proxy.
+
+Responses are synthetic and never depend on the prompt, so the measured time is
+dominated by the proxy rather than by a real model. Latency, response size and the
+number of streamed chunks are configurable.
+
+Usage:
+    python -m benchmarks.mock_backend --port 9100 --latency-ms 50 --response-chars 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response, StreamingResponse
+
+
+@dataclass
+class MockBackendConfig:
+    """Behaviour of the mock backend.
+
+    Attributes:
+        latency_ms: Delay before a non-streamed response is returned, or spread evenly
+            across the chunks of a streamed response.
+        response_chars: Length of the generated assistant message.
+        stream_chunks: Number of content chunks a streamed response is split into.
+    """
+
+    latency_ms: float = 50.0
+    response_chars: int = 1000
+    stream_chunks: int = 20
+
+
+def _completion(model: str, content: str) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"},
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": len(content) // 4, "total_tokens": 10 + len(content) // 4},
+    }
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason: str | None = None) -> bytes:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+def create_mock_backend_app(config: MockBackendConfig) -> FastAPI:
+    """Builds the mock backend application."""
+    app = FastAPI(title="Luthien Control benchmark backend")
+    content = ("lorem ipsum " * (config.response_chars // 12 + 1))[: config.response_chars]
+    app.state.content = content
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "mock-model")
+
+        if not body.get("stream"):
+            await asyncio.sleep(config.latency_ms / 1000)
+            return Response(content=json.dumps(_completion(model, content)), media_type="application/json")
+
+        n_chunks = max(1, config.stream_chunks)
+        piece_size = -(-len(content) // n_chunks)
+        delay = config.latency_ms / 1000 / n_chunks
+
+        async def events() -> AsyncIterator[bytes]:
+            completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+            yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+            for start in range(0, len(content), piece_size):
+                await asyncio.sleep(delay)
+                yield _chunk(completion_id, model, {"content": content[start : start + piece_size]})
+            yield _chunk(completion_id, model, {}, finish_reason="stop")
+            yield b"data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a mock OpenAI-compatible backend for benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=MockBackendConfig.latency_ms)
+    parser.add_argument("--response-chars", type=int, default=MockBackendConfig.response_chars)
+    parser.add_argument("--stream-chunks", type=int, default=MockBackendConfig.stream_chunks)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = MockBackendConfig(
+        latency_ms=args.latency_ms, response_chars=args.response_chars, stream_chunks=args.stream_chunks
+    )
+    uvicorn.run(create_mock_backend_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Representative policy trees for benchmarking, in the format read from `POLICY_FILEPATH`."""
+
+import json
+from typing import Any, Callable, Dict, List
+
+BACKEND_API_KEY_ENV_VAR = "BENCHMARK_BACKEND_API_KEY"
+
+SerializedPolicy = Dict[str, Any]
+
+
+def _forward(backend_url: str) -> List[SerializedPolicy]:
+    return [
+        {
+            "type": "AddApiKeyHeaderFromEnv",
+            "config": {"name": "AddBackendKey", "api_key_env_var_name": BACKEND_API_KEY_ENV_VAR},
+        },
+        {"type": "SetBackendPolicy", "config": {"name": "SetBackend", "backend_url": backend_url}},
+        {"type": "SendBackendRequest", "config": {"name": "SendBackendRequest"}},
+    ]
+
+
+def noop_policy(backend_url: str) -> SerializedPolicy:
+    """A `NoopPolicy` in front of a plain forward to the backend: the proxy's baseline overhead."""
+    return {
+        "type": "SerialPolicy",
+        "config": {
+            "name": "NoopForward",
+            "policies": [{"type": "NoopPolicy", "config": {"name": "Noop"}}, *_forward(backend_url)],
+        },
+    }
+
+
+def serial_policy(backend_url: str) -> SerializedPolicy:
+    """Client key authentication and leaked key detection before forwarding, as in a typical deployment."""
+    return {
+        "type": "SerialPolicy",
+        "config": {
+            "name": "AuthLeakSend",
+            "policies": [
+                {"type": "ClientApiKeyAuth", "config": {"name": "ClientApiKeyAuth"}},
+                {"type": "LeakedApiKeyDetection", "config": {"name": "LeakedApiKeyDetection"}},
+                *_forward(backend_url),
+            ],
+        },
+    }
+
+
+def branching_policy(backend_url: str, depth: int = 10, branches: int = 10) -> SerializedPolicy:
+    """`depth` successive `BranchingPolicy` stages with `branches` conditions each, none of which match.
+
+    Every request therefore evaluates all `depth * branches` conditions before falling through to
+    each stage's default and, finally, the backend.
+    """
+    stages = []
+    for level in range(depth):
+        cond_to_policy_map = {
+            json.dumps(
+                {
+                    "type": "equals",
+                    "left": {"type": "transaction_path", "path": "request.payload.model"},
+                    "right": {"type": "static", "value": f"model-{level}-{branch}"},
+                    "comparator": "equals",
+                }
+            ): {"type": "NoopPolicy", "name": f"Branch{level}.{branch}"}
+            for branch in range(branches)
+        }
+        stages.append(
+            {
+                "type": "BranchingPolicy",
+                "config": {
+                    "name": f"Branching{level}",
+                    "cond_to_policy_map": cond_to_policy_map,
+                    "default_policy": {"type": "NoopPolicy", "name": f"Default{level}"},
+                },
+            }
+        )
+    return {
+        "type": "SerialPolicy",
+        "config": {"name": "DeepBranching", "policies": [*stages, *_forward(backend_url)]},
+    }
+
+
+SCENARIOS: Dict[str, Callable[[str], SerializedPolicy]] = {
+    "noop": noop_policy,
+    "serial": serial_policy,
+    "branching": branching_policy,
+}
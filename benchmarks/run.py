@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+"""Load-test the proxy against a local mock backend and report latency percentiles.
+
+For each scenario (see `benchmarks.policies.SCENARIOS`), this script:
+
+1. starts `luthien_control.main:app` under uvicorn, with the scenario's policy file and
+   a SQLite (default) or Postgres database;
+2. sends warm-up requests, then drives `--requests` chat completions at `--concurrency`;
+3. reports throughput, p50/p95/p99 latency, and the mean `apply` time of each policy, which
+   it reads from the proxy's `/metrics` endpoint.
+
+A "direct" row measures the mock backend without the proxy, so the difference is the proxy's
+overhead.
+
+Usage:
+    python -m benchmarks.run --scenarios noop serial branching --concurrency 32 --requests 2000
+    python -m benchmarks.run --stream --latency-ms 200 --database-url postgresql://user:pw@localhost/bench
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import httpx
+
+from benchmarks.policies import BACKEND_API_KEY_ENV_VAR, SCENARIOS
+
+CLIENT_API_KEY = "luthien-benchmark-client-key"
+
+_METRIC_LINE = re.compile(r'^luthien_policy_apply_duration_seconds_(sum|count)\{policy_name="([^"]*)",[^}]*\} (\S+)$')
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements for one scenario."""
+
+    scenario: str
+    requests: int
+    errors: int
+    duration_seconds: float
+    latencies_ms: List[float] = field(repr=False)
+    policy_mean_ms: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration_seconds if self.duration_seconds else 0.0
+
+    def summary(self) -> Dict[str, object]:
+        data = asdict(self)
+        del data["latencies_ms"]
+        data["throughput_rps"] = round(self.throughput, 1)
+        for p in (50, 95, 99):
+            data[f"p{p}_ms"] = round(percentile(self.latencies_ms, p), 2)
+        return data
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of `values` (0 for an empty sequence)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def parse_policy_apply_totals(metrics_text: str) -> Dict[str, Tuple[float, float]]:
+    """Extracts (sum of seconds, count) per policy name from the proxy's `/metrics` output."""
+    totals: Dict[str, List[float]] = {}
+    for line in metrics_text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if match:
+            kind, name, value = match.groups()
+            entry = totals.setdefault(name, [0.0, 0.0])
+            entry[0 if kind == "sum" else 1] += float(value)
+    return {name: (total, count) for name, (total, count) in totals.items()}
+
+
+def policy_mean_ms(before: Dict[str, Tuple[float, float]], after: Dict[str, Tuple[float, float]]) -> Dict[str, float]:
+    """Mean apply time (ms) per policy over the requests made between two `/metrics` scrapes."""
+    means = {}
+    for name, (total, count) in after.items():
+        prev_total, prev_count = before.get(name, (0.0, 0.0))
+        if count > prev_count:
+            means[name] = round((total - prev_total) / (count - prev_count) * 1000, 3)
+    return means
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(args: List[str], env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, *args], env={**os.environ, **env})
+
+
+async def _wait_until_healthy(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode} before becoming healthy ({url})")
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def _stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def prepare_database(database_url: str) -> None:
+    """Creates the schema (if needed) and the benchmark client API key."""
+    os.environ["DATABASE_URL"] = database_url
+    from luthien_control.db.client_api_key_crud import create_api_key, get_api_key_by_value
+    from luthien_control.db.database_async import close_db_engine, create_db_engine, get_db_session
+    from luthien_control.db.exceptions import LuthienDBNotFoundError
+    from luthien_control.db.sqlmodel_models import ClientApiKey
+    from sqlmodel import SQLModel
+
+    engine = await create_db_engine()
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        async with get_db_session() as session:
+            try:
+                await get_api_key_by_value(session, CLIENT_API_KEY)
+            except LuthienDBNotFoundError:
+                await create_api_key(session, ClientApiKey(key_value=CLIENT_API_KEY, name="Benchmark client"))
+    finally:
+        await close_db_engine()
+
+
+def _request_body(args: argparse.Namespace) -> Dict[str, object]:
+    return {
+        "model": "benchmark-model",
+        "messages": [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": ("benchmark prompt " * (args.prompt_chars // 17 + 1))[: args.prompt_chars]},
+        ],
+        "stream": args.stream,
+    }
+
+
+async def drive_load(
+    url: str, body: Dict[str, object], concurrency: int, total: int, stream: bool
+) -> Tuple[List[float], int, float]:
+    """Sends `total` requests from `concurrency` workers.
+
+    Returns:
+        Per-request latencies in ms (until the full body has been read), the number of
+        failed requests and the wall-clock duration in seconds.
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+    headers = {"Authorization": f"Bearer {CLIENT_API_KEY}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as client:
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    async with client.stream("POST", url, json=body, headers=headers) as response:
+                        async for _ in response.aiter_raw():
+                            pass
+                    ok = response.status_code == 200
+                    if ok and stream and not response.headers.get("content-type", "").startswith("text/event-stream"):
+                        ok = False
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append((time.perf_counter() - start) * 1000)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - started
+
+
+async def run_scenario(name: str, args: argparse.Namespace, backend_url: str, workdir: Path) -> ScenarioResult:
+    """Boots the proxy with `name`'s policy tree and measures it."""
+    policy_file = workdir / f"{name}_policy.json"
+    policy_file.write_text(json.dumps(SCENARIOS[name](backend_url)))
+    port = _free_port()
+    proxy = _start_server(
+        ["-m", "uvicorn", "luthien_control.main:app", "--host", "127.0.0.1", "--port", str(port)]
+        + ["--log-level", "warning", "--no-access-log"],
+        env={
+            "DATABASE_URL": args.database_url,
+            "POLICY_FILEPATH": str(policy_file),
+            BACKEND_API_KEY_ENV_VAR: "benchmark-backend-key",
+            "LOG_LEVEL": args.log_level,
+            "RUN_MODE": "prod",
+        },
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        await _wait_until_healthy(f"{base_url}/health", proxy)
+        url = f"{base_url}/api/chat/completions"
+        body = _request_body(args)
+        _, warmup_errors, _ = await drive_load(url, body, args.concurrency, args.warmup, args.stream)
+        if args.warmup and warmup_errors == args.warmup:
+            raise RuntimeError(f"Every warm-up request failed for scenario '{name}'")
+        async with httpx.AsyncClient() as client:
+            before = parse_policy_apply_totals((await client.get(f"{base_url}/metrics")).text)
+            latencies, errors, duration = await drive_load(url, body, args.concurrency, args.requests, args.stream)
+            after = parse_policy_apply_totals((await client.get(f"{base_url}/metrics")).text)
+    finally:
+        _stop_server(proxy)
+    return ScenarioResult(name, args.requests, errors, duration, latencies, policy_mean_ms(before, after))
+
+
+async def run_direct(args: argparse.Namespace, backend_url: str) -> ScenarioResult:
+    """Measures the mock backend on its own, as the baseline for proxy overhead."""
+    url = f"{backend_url}/chat/completions"
+    body = _request_body(args)
+    await drive_load(url, body, args.concurrency, args.warmup, args.stream)
+    latencies, errors, duration = await drive_load(url, body, args.concurrency, args.requests, args.stream)
+    return ScenarioResult("direct", args.requests, errors, duration, latencies)
+
+
+def _print_report(results: List[ScenarioResult]) -> None:
+    print(f"\n{'scenario':<12}{'reqs':>7}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for result in results:
+        s = result.summary()
+        print(
+            f"{result.scenario:<12}{result.requests:>7}{result.errors:>8}{s['throughput_rps']:>10}"
+            f"{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}"
+        )
+    for result in results:
+        if result.policy_mean_ms:
+            print(f"\nMean policy apply time, {result.scenario} (ms; composite policies include their members):")
+            for name, mean in sorted(result.policy_mean_ms.items(), key=lambda item: -item[1]):
+                print(f"  {name:<40}{mean:>10}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the proxy against a local mock LLM backend.")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="Measured requests per scenario.")
+    parser.add_argument("--warmup", type=int, default=100, help="Unmeasured requests sent first.")
+    parser.add_argument("--stream", action="store_true", help="Request streamed (SSE) completions.")
+    parser.add_argument("--prompt-chars", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mock backend latency.")
+    parser.add_argument("--response-chars", type=int, default=1000)
+    parser.add_argument("--stream-chunks", type=int, default=20)
+    parser.add_argument(
+        "--database-url",
+        help="Database for the proxy. Defaults to a throwaway SQLite file; Postgres URLs are also accepted.",
+    )
+    parser.add_argument("--log-level", default="WARNING", help="LOG_LEVEL for the proxy under test.")
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="luthien-bench-") as tmp:
+        workdir = Path(tmp)
+        if not args.database_url:
+            args.database_url = f"sqlite+aiosqlite:///{workdir / 'bench.db'}"
+        await prepare_database(args.database_url)
+
+        backend_port = _free_port()
+        backend = _start_server(
+            ["-m", "benchmarks.mock_backend", "--port", str(backend_port)]
+            + ["--latency-ms", str(args.latency_ms), "--response-chars", str(args.response_chars)]
+            + ["--stream-chunks", str(args.stream_chunks)],
+            env={},
+        )
+        backend_url = f"http://127.0.0.1:{backend_port}/v1"
+        try:
+            await _wait_until_healthy(f"http://127.0.0.1:{backend_port}/health", backend)
+            results = [await run_direct(args, backend_url)]
+            for name in args.scenarios:
+                print(f"Running scenario '{name}'...", file=sys.stderr)
+                results.append(await run_scenario(name, args, backend_url, workdir))
+        finally:
+            _stop_server(backend)
+
+    _print_report(results)
+    if args.output:
+        args.output.write_text(json.dumps([result.summary() for result in results], indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,6 +2,7 @@
 
 import json
 import os
+from datetime import datetime, timezone
 from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response
@@ -11,7 +12,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from luthien_control.admin.auth import admin_auth_service
 from luthien_control.admin.dependencies import csrf_protection, get_current_admin
-from luthien_control.core.dependencies import get_db_session
+from luthien_control.core.dependencies import get_db_session, get_dependencies
+from luthien_control.core.dependency_container import DependencyContainer
 from luthien_control.db.control_policy_crud import (
     get_policy_by_name,
     list_policies,
@@ -207,6 +209,7 @@ async def update_policy_handler(
     config: Annotated[str, Form()],
     current_admin: Annotated[AdminUser, Depends(get_current_admin)],
     db: AsyncSession = Depends(get_db_session),
+    dependencies: DependencyContainer = Depends(get_dependencies),
     description: Annotated[Optional[str], Form()] = None,
     is_active: Annotated[bool, Form()] = False,
     csrf_token: Annotated[str, Form(alias="csrf_token")] = "",
@@ -254,10 +257,13 @@ async def update_policy_handler(
         if description is not None:
             policy.description = description
         policy.is_active = is_active
+        policy.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
 
         db.add(policy)
         await db.commit()
         await db.refresh(policy)
+        # Make the proxy pick up the new configuration on its next request
+        dependencies.invalidate_policy_cache(policy_name)
     except Exception as e:
         new_csrf = await csrf_protection.generate_token()
         response = templates.TemplateResponse(
@@ -320,6 +326,7 @@ async def create_policy_handler(
     config: Annotated[str, Form()],
     current_admin: Annotated[AdminUser, Depends(get_current_admin)],
     db: AsyncSession = Depends(get_db_session),
+    dependencies: DependencyContainer = Depends(get_dependencies),
     description: Annotated[Optional[str], Form()] = None,
     is_active: Annotated[bool, Form()] = False,
     csrf_token: Annotated[str, Form(alias="csrf_token")] = "",
@@ -371,6 +378,7 @@ async def create_policy_handler(
             is_active=is_active,
         )
         await save_policy_to_db(db, policy)
+        dependencies.invalidate_policy_cache(name)
     except Exception as e:
         new_csrf = await csrf_protection.generate_token()
         response = templates.TemplateResponse(
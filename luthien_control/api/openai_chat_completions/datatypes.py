@@ -46,10 +46,34 @@ class ToolCall(DeepEventedModel):
     type: str = Field(default="function")
 
 
+class ImageUrl(DeepEventedModel):
+    """The image URL details."""
+
+    url: str
+    detail: Literal["auto", "low", "high"] = "auto"
+
+
+class ContentPartText(DeepEventedModel):
+    """A text content part."""
+
+    type: str = Field(default="text", frozen=True)
+    text: str = Field()
+
+
+class ContentPartImage(DeepEventedModel):
+    """An image content part."""
+
+    type: str = Field(default="image_url", frozen=True)
+    image_url: ImageUrl = Field()
+
+
+Content = Union[str, EList[Union[ContentPartText, ContentPartImage]]]
+
+
 class Message(DeepEventedModel):
     """A message in a chat completion."""
 
-    content: Optional[str] = Field(default=None)
+    content: Optional[Content] = Field(default=None)
     refusal: Optional[str] = Field(default=None)
     role: str = Field(default_factory=str)
     annotations: EList[Annotation] = Field(default_factory=lambda: EList[Annotation]())
@@ -103,27 +127,6 @@ class Usage(DeepEventedModel):
 # ------------------ Request Objects ------------------
 
 
-class ImageUrl(DeepEventedModel):
-    """The image URL details."""
-
-    url: str
-    detail: Literal["auto", "low", "high"] = "auto"
-
-
-class ContentPartText(DeepEventedModel):
-    """A text content part."""
-
-    type: str = Field(default="text", frozen=True)
-    text: str = Field()
-
-
-class ContentPartImage(DeepEventedModel):
-    """An image content part."""
-
-    type: str = Field(default="image_url", frozen=True)
-    image_url: ImageUrl = Field()
-
-
 class ResponseFormat(DeepEventedModel):
     """An object specifying the format that the model must output.
 
@@ -170,8 +173,6 @@ class RequestFunctionCall(DeepEventedModel):
 
 RequestFunctionCallSpec = Union[str, RequestFunctionCall]
 
-Content = Union[str, EList[Union[ContentPartText, ContentPartImage]]]
-
 
 class Prediction(DeepEventedModel):
     content: Content = Field()
@@ -1,10 +1,10 @@
-import json
 from typing import Optional
 
 from psygnal.containers import EventedDict as EDict
 from psygnal.containers import EventedList as EList
 from pydantic import Field
 
+from luthien_control.utils import json_codec
 from luthien_control.utils.deep_evented_model import DeepEventedModel
 
 from .datatypes import (
@@ -65,5 +65,9 @@ class OpenAIChatCompletionsRequest(DeepEventedModel):
 
 
 def fastapi_request_to_openai_chat_completions_request(body: bytes) -> OpenAIChatCompletionsRequest:
-    data = json.loads(body)
-    return OpenAIChatCompletionsRequest.model_validate(data)
+    """Parses a request body straight into an `OpenAIChatCompletionsRequest`.
+
+    Raises:
+        pydantic.ValidationError: If the body is not valid JSON or not a valid request.
+    """
+    return json_codec.decode_model(OpenAIChatCompletionsRequest, body)
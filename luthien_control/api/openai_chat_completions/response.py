@@ -1,6 +1,9 @@
-from typing import Optional
+import logging
+from typing import AsyncIterator, Optional
 
 import fastapi
+from fastapi.responses import StreamingResponse
+from openai.types.chat import ChatCompletionChunk
 from psygnal.containers import EventedList as EList
 from pydantic import Field
 
@@ -8,8 +11,11 @@ from luthien_control.api.openai_chat_completions.datatypes import (
     Choice,
     Usage,
 )
+from luthien_control.utils import json_codec
 from luthien_control.utils.deep_evented_model import DeepEventedModel
 
+logger = logging.getLogger(__name__)
+
 
 class OpenAIChatCompletionsResponse(DeepEventedModel):
     """The request for a chat completion."""
@@ -24,7 +30,45 @@ class OpenAIChatCompletionsResponse(DeepEventedModel):
     usage: Usage = Field(default_factory=Usage)
 
 
-def openai_chat_completions_response_to_fastapi_response(response: OpenAIChatCompletionsResponse) -> fastapi.Response:
-    return fastapi.Response(
-        content=response.model_dump_json(), status_code=200, headers={"Content-Type": "application/json"}
+def openai_chat_completions_response_to_fastapi_response(
+    response: OpenAIChatCompletionsResponse, raw_body: Optional[bytes] = None
+) -> fastapi.Response:
+    """Builds the client response, reusing the backend's original bytes when they are still current.
+
+    Args:
+        response: The response payload.
+        raw_body: The backend bytes `response` was parsed from, if it hasn't been modified since.
+            When given, they are returned as-is instead of re-serializing `response`.
+    """
+    content = raw_body if raw_body is not None else json_codec.encode_model(response)
+    return fastapi.Response(content=content, status_code=200, headers={"Content-Type": "application/json"})
+
+
+async def _chat_completion_chunks_to_sse(chunks: AsyncIterator[ChatCompletionChunk]) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in chunks:
+            yield b"data: " + json_codec.encode_model(chunk, exclude_unset=True) + b"\n\n"
+    except Exception as e:
+        # Headers are already sent, so the best we can do is report the error in-band like OpenAI does
+        logger.exception(f"Error while streaming chat completion: {e}")
+        detail = getattr(e, "detail", None) or str(e)
+        error = {"error": {"message": detail, "type": e.__class__.__name__}}
+        yield b"data: " + json_codec.dumps(error) + b"\n\n"
+        return
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    yield b"data: [DONE]\n\n"
+
+
+def openai_chat_completions_stream_to_fastapi_response(
+    chunks: AsyncIterator[ChatCompletionChunk],
+) -> StreamingResponse:
+    """Builds a server-sent events response that forwards chunks to the client as they arrive."""
+    return StreamingResponse(
+        _chat_completion_chunks_to_sse(chunks),
+        status_code=200,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
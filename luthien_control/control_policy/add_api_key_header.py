@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from luthien_control.control_policy.control_policy import ControlPolicy
 from luthien_control.control_policy.exceptions import ApiKeyNotFoundError, NoRequestError
 from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.tracked_context import TrackedContext
 from luthien_control.core.transaction import Transaction
 
 
@@ -55,3 +56,22 @@ class AddApiKeyHeaderPolicy(ControlPolicy):
         transaction.request.api_key = api_key
 
         return transaction
+
+    async def apply_headers(
+        self,
+        context: TrackedContext,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> TrackedContext:
+        """
+        Sets the configured API key as the bearer token of a raw passthrough request.
+
+        Raises:
+            ApiKeyNotFoundError if the OpenAI API key is not configured.
+        """
+        api_key = container.settings.get_openai_api_key()
+        if not api_key:
+            raise ApiKeyNotFoundError(f"OpenAI API key not configured ({self.name}).")
+        self.logger.info(f"Setting API key header from settings ({self.name}).")
+        context.update_request(headers={"authorization": f"Bearer {api_key}"})
+        return context
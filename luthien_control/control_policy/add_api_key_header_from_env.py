@@ -17,6 +17,7 @@ from luthien_control.control_policy.exceptions import (
     NoRequestError,
 )
 from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.tracked_context import TrackedContext
 from luthien_control.core.transaction import Transaction
 
 
@@ -58,6 +59,27 @@ class AddApiKeyHeaderFromEnvPolicy(ControlPolicy):
         if transaction.request is None:
             raise NoRequestError("No request in transaction.")
 
+        transaction.request.api_key = self._get_api_key()
+
+        return transaction
+
+    async def apply_headers(
+        self,
+        context: TrackedContext,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> TrackedContext:
+        """
+        Sets the API key from the configured environment variable as the bearer token of a raw passthrough request.
+
+        Raises:
+            ApiKeyNotFoundError if the configured environment variable is not set or is empty.
+        """
+        context.update_request(headers={"authorization": f"Bearer {self._get_api_key()}"})
+        return context
+
+    def _get_api_key(self) -> str:
+        """Reads the API key from the configured environment variable."""
         api_key = os.environ.get(self.api_key_env_var_name)
 
         if not api_key:
@@ -68,6 +90,4 @@ class AddApiKeyHeaderFromEnvPolicy(ControlPolicy):
             raise ApiKeyNotFoundError(f"{error_message} ({self.name})")
 
         self.logger.info(f"Setting API key from env var '{self.api_key_env_var_name}' ({self.name}).")
-        transaction.request.api_key = api_key
-
-        return transaction
+        return api_key
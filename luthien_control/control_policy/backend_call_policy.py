@@ -1,5 +1,5 @@
 import os
-from typing import Optional
+from typing import ClassVar, Optional
 
 import openai
 from pydantic import Field
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from luthien_control.control_policy.control_policy import ControlPolicy
 from luthien_control.core.dependency_container import DependencyContainer
 from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import BACKEND_REQUEST_DURATION
 from luthien_control.utils.backend_call_spec import BackendCallSpec
 
 
@@ -16,6 +17,8 @@ class BackendCallPolicy(ControlPolicy):
     This policy makes a backend LLM call.
     """
 
+    modifies_payloads: ClassVar[bool] = True
+
     name: Optional[str] = Field(default="BackendCallPolicy")
     backend_call_spec: BackendCallSpec = Field(...)
 
@@ -45,8 +48,12 @@ class BackendCallPolicy(ControlPolicy):
             transaction.request.api_endpoint, api_key or transaction.request.api_key
         )
         try:
-            response_payload = await openai_client.chat.completions.create(**transaction.request.payload.model_dump())
-            transaction.response.payload = response_payload
+            request_dict = transaction.request.payload.model_dump()
+            with BACKEND_REQUEST_DURATION.time(backend=transaction.request.api_endpoint):
+                if request_dict.get("stream"):
+                    transaction.response.stream = await openai_client.chat.completions.create(**request_dict)
+                else:
+                    transaction.response.payload = await openai_client.chat.completions.create(**request_dict)
             transaction.response.api_endpoint = transaction.request.api_endpoint
         except openai.APITimeoutError as e:
             self.logger.error(f"Timeout error during backend request: {e} ({self.name})")
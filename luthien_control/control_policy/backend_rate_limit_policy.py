@@ -0,0 +1,188 @@
+"""
+Control Policy for flow control between the proxy and a backend.
+"""
+
+import json
+import time
+from typing import Any, AsyncIterator, Optional
+
+import openai
+from openai.types.chat import ChatCompletionChunk
+from pydantic import Field, field_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.api.openai_chat_completions.request import OpenAIChatCompletionsRequest
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.exceptions import BackendRateLimitError
+from luthien_control.control_policy.serialization import SerializableDict
+from luthien_control.core.backend_limiter import BackendLimiter, BackendLimitExceeded
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.response import ObservedStream
+from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import (
+    BACKEND_LIMITER_REJECTIONS,
+    BACKEND_LIMITER_WAIT_DURATION,
+    time_policy_apply,
+)
+
+# Rough number of characters per token, for estimating the size of a request before it is sent
+CHARS_PER_TOKEN = 4
+
+
+def estimate_prompt_tokens(payload: OpenAIChatCompletionsRequest) -> int:
+    """Estimates the prompt tokens of a request from the length of its messages."""
+    prompt_chars = len(json.dumps(payload.model_dump(mode="json", exclude_none=True).get("messages", [])))
+    return prompt_chars // CHARS_PER_TOKEN
+
+
+def estimate_request_tokens(payload: OpenAIChatCompletionsRequest) -> int:
+    """Estimates the tokens a request will use: its messages plus the completion tokens it allows."""
+    completion_tokens = payload.max_completion_tokens or payload.max_tokens or 0
+    return estimate_prompt_tokens(payload) + completion_tokens
+
+
+class BackendRateLimitPolicy(ControlPolicy):
+    """Keeps the requests sent to a backend within its rate and concurrency limits.
+
+    This policy wraps the policy that sends the backend request (`SendBackendRequestPolicy`
+    or `BackendCallPolicy`) and only applies it once the request is admitted by the limiter of
+    its backend URL. Limiters are shared by every request to the same backend URL (as set by
+    `SetBackendPolicy`, or by the wrapped `BackendCallPolicy`'s `backend_call_spec`), so
+    requests queue up smoothly instead of failing independently when the backend's quota runs out.
+
+    A request is admitted, in arrival order, once:
+    - fewer than `max_in_flight` requests to the backend are in flight;
+    - the `requests_per_minute` and `tokens_per_minute` budgets allow it. Its tokens are
+      estimated from the length of its messages and its completion token limit, and corrected
+      from the reported usage once the response arrives.
+    At most `max_queue` requests wait for admission, each for at most `max_wait_seconds`;
+    others fail with a 429 error. Streamed responses hold their slot until the stream ends.
+
+    With `adaptive` set, the limits are tightened to the `x-ratelimit-*` headers returned by
+    the backend, and a rate limit error from the backend pauses admission for its `retry-after`.
+
+    Policies with the same limits for a backend URL share its limiter; a policy with different
+    limits for the same URL has a limiter of its own.
+
+    Attributes:
+        policy: The policy sending the backend request.
+        requests_per_minute: Maximum request rate, or None for no limit.
+        tokens_per_minute: Maximum rate of estimated tokens, or None for no limit.
+        max_in_flight: Maximum number of concurrent requests, or None for no limit.
+        max_queue: Maximum number of requests waiting for admission, or None for no limit.
+        max_wait_seconds: Longest a request waits for admission, or None for no limit.
+        adaptive: Whether to adjust the limits to the rate limit headers of the backend.
+    """
+
+    name: Optional[str] = Field(default="BackendRateLimitPolicy")
+    policy: ControlPolicy = Field(...)
+    requests_per_minute: Optional[float] = Field(default=None, gt=0)
+    tokens_per_minute: Optional[float] = Field(default=None, gt=0)
+    max_in_flight: Optional[int] = Field(default=None, gt=0)
+    max_queue: Optional[int] = Field(default=None, ge=0)
+    max_wait_seconds: Optional[float] = Field(default=30.0, gt=0)
+    adaptive: bool = Field(default=True)
+
+    @field_validator("policy", mode="before")
+    @classmethod
+    def validate_policy(cls, value: Any) -> Any:
+        """Load the wrapped policy from its serialized form."""
+        if isinstance(value, dict):
+            return ControlPolicy.from_serialized(value)
+        return value
+
+    async def apply(
+        self,
+        transaction: Transaction,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> Transaction:
+        """
+        Waits for the backend's limiter to admit the request, then applies the wrapped policy.
+
+        Args:
+            transaction: The current transaction.
+            container: The application dependency container, holding the backend limiters.
+            session: An active SQLAlchemy AsyncSession, passed to the wrapped policy.
+
+        Returns:
+            The transaction, as returned by the wrapped policy.
+
+        Raises:
+            BackendRateLimitError: If the request is not admitted in time, or too many requests
+                are already waiting.
+            Exception: Propagates any exception raised by the wrapped policy.
+        """
+        backend_url = self._backend_url(transaction)
+        limiter = self.get_limiter(container, backend_url)
+        estimated_tokens = estimate_request_tokens(transaction.request.payload)
+
+        wait_start = time.perf_counter()
+        try:
+            await limiter.acquire(estimated_tokens, timeout=self.max_wait_seconds)
+        except BackendLimitExceeded as e:
+            BACKEND_LIMITER_REJECTIONS.inc(backend=backend_url, reason=e.reason)
+            self.logger.warning(f"Request to {backend_url} not admitted: {e} ({self.name})")
+            raise BackendRateLimitError(
+                f"Backend {backend_url} is at capacity, please retry later: {e}", policy_name=self.name
+            ) from e
+        BACKEND_LIMITER_WAIT_DURATION.observe(time.perf_counter() - wait_start, backend=backend_url)
+
+        try:
+            with time_policy_apply(self.policy):
+                transaction = await self.policy.apply(transaction, container, session)
+        except openai.APIStatusError as e:
+            if self.adaptive:
+                limiter.update_from_headers(e.response.headers)
+            limiter.release(estimated_tokens)
+            raise
+        except BaseException:
+            limiter.release(estimated_tokens)
+            raise
+
+        response = transaction.response
+        if self.adaptive and response.backend_headers:
+            limiter.update_from_headers(response.backend_headers)
+        if response.stream is not None:
+            response.stream = self._release_after(response.stream, limiter, estimated_tokens)
+        else:
+            usage = response.payload.usage if response.payload is not None else None
+            limiter.release(estimated_tokens, usage.total_tokens if usage is not None else None)
+        return transaction
+
+    def get_limiter(self, container: DependencyContainer, backend_url: str) -> BackendLimiter:
+        """Returns the limiter this policy uses for `backend_url`."""
+        return container.backend_limiters.get(
+            backend_url,
+            requests_per_minute=self.requests_per_minute,
+            tokens_per_minute=self.tokens_per_minute,
+            max_in_flight=self.max_in_flight,
+            max_queue=self.max_queue,
+        )
+
+    def _backend_url(self, transaction: Transaction) -> str:
+        backend_call_spec = getattr(self.policy, "backend_call_spec", None)
+        if backend_call_spec is not None:
+            return backend_call_spec.api_endpoint
+        return transaction.request.api_endpoint
+
+    def _release_after(
+        self, stream: AsyncIterator[ChatCompletionChunk], limiter: BackendLimiter, estimated_tokens: int
+    ) -> ObservedStream:
+        """Passes the stream through, releasing the request's slot once it ends or is closed."""
+        used_tokens: Optional[int] = None
+
+        def record_usage(chunk: ChatCompletionChunk) -> None:
+            nonlocal used_tokens
+            if chunk.usage is not None:
+                used_tokens = chunk.usage.total_tokens
+
+        return ObservedStream(
+            stream, on_close=lambda _: limiter.release(estimated_tokens, used_tokens), on_chunk=record_usage
+        )
+
+    def serialize(self) -> SerializableDict:
+        """Serialize the wrapped policy with its own `serialize`, keeping its type-specific fields."""
+        data = super().serialize()
+        data["policy"] = self.policy.serialize()
+        return data
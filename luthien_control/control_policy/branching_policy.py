@@ -1,19 +1,84 @@
 import json
 import logging
 from collections import OrderedDict
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from pydantic import Field, field_validator
+from pydantic import Field, PrivateAttr, field_validator, model_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from luthien_control.control_policy.conditions.condition import Condition
+from luthien_control.control_policy.conditions.any_cond import AnyCondition
+from luthien_control.control_policy.conditions.comparison_conditions import EqualsCondition
+from luthien_control.control_policy.conditions.condition import Condition, ConstantResult
+from luthien_control.control_policy.conditions.value_resolvers import StaticValue, TransactionPath
 from luthien_control.control_policy.control_policy import ControlPolicy
 from luthien_control.control_policy.serialization import SerializableDict
 from luthien_control.core.dependency_container import DependencyContainer
 from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import time_policy_apply
 
 logger = logging.getLogger(__name__)
 
+# A step of a compiled branching policy: returns the policy to apply, or None to continue with the next step.
+BranchStep = Callable[[Transaction], Optional[ControlPolicy]]
+
+# Runs of at least this many consecutive equality branches on the same path are looked up in a dict.
+MIN_INDEXED_BRANCHES = 2
+
+
+def _equality_keys(cond: Condition) -> Optional[Tuple[str, List[Any]]]:
+    """Returns (path, values) if `cond` holds exactly when the value at path equals one of the values.
+
+    Recognizes `EqualsCondition` between a transaction path and a hashable static value (either
+    way round), and `AnyCondition` over such conditions sharing one path. Returns None for
+    anything else.
+    """
+    if isinstance(cond, AnyCondition):
+        keys = [_equality_keys(sub_condition) for sub_condition in cond.conditions]
+        paths = {key[0] for key in keys if key is not None}
+        if not keys or None in keys or len(paths) != 1:
+            return None
+        return paths.pop(), [value for key in keys if key is not None for value in key[1]]
+    if type(cond) is not EqualsCondition:
+        return None
+    for resolver, static in ((cond.left, cond.right), (cond.right, cond.left)):
+        if isinstance(resolver, TransactionPath) and isinstance(static, StaticValue):
+            value = static.value
+            try:
+                hash(value)
+            except TypeError:
+                return None
+            # NaN is never equal to anything, but a dict lookup would find it by identity
+            if value != value:
+                return None
+            return resolver.path, [value]
+    return None
+
+
+def _branch_step(check: Callable[[Transaction], bool], policy: ControlPolicy) -> BranchStep:
+    return lambda transaction: policy if check(transaction) else None
+
+
+def _index_step(value_path: str, branches: List[Tuple[List[Any], ControlPolicy]]) -> BranchStep:
+    """Builds a step that looks the value at `value_path` up among the values of equality branches.
+
+    The first branch listing a value wins, preserving first-match semantics. Values that cannot be
+    hashed are compared against each branch in order instead.
+    """
+    index: Dict[Any, ControlPolicy] = {}
+    for values, policy in branches:
+        for value in values:
+            index.setdefault(value, policy)
+    resolve = TransactionPath(path=value_path).compile()
+
+    def lookup(transaction: Transaction) -> Optional[ControlPolicy]:
+        value = resolve(transaction)
+        try:
+            return index.get(value)
+        except TypeError:
+            return next((policy for values, policy in branches if value in values), None)
+
+    return lookup
+
 
 class BranchingPolicy(ControlPolicy):
     """
@@ -21,11 +86,23 @@ class BranchingPolicy(ControlPolicy):
 
     This policy evaluates conditions in order and applies the policy associated with the first
     matching condition. If no conditions match, it applies the default policy (if configured).
+
+    Conditions are compiled (see `Condition.compile`) when the policy is built or
+    `cond_to_policy_map` is assigned, so that per-request evaluation avoids re-parsing paths
+    and patterns. Branches whose condition can never match are dropped, and evaluation stops
+    at a condition that always matches. Consecutive branches that compare the same transaction
+    path for equality with static values (e.g. routing on `request.payload.model`) are replaced
+    by a single dict lookup, so routing over them takes constant time however many there are.
+    Call `compile_branches` after modifying conditions or the map in place.
+
+    The conditions are evaluated within `Transaction.memoizing_paths`, so a path read by
+    several of them is only resolved once per `apply`.
     """
 
     name: Optional[str] = Field(default="BranchingPolicy")
     cond_to_policy_map: OrderedDict[Condition, ControlPolicy] = Field(default_factory=OrderedDict, exclude=True)
     default_policy: Optional[ControlPolicy] = Field(default=None)
+    _branches: List[BranchStep] = PrivateAttr(default_factory=list)
 
     @field_validator("cond_to_policy_map", mode="before")
     @classmethod
@@ -43,6 +120,50 @@ class BranchingPolicy(ControlPolicy):
         """Validate default policy field."""
         return value
 
+    @model_validator(mode="after")
+    def _compile_after_validation(self) -> "BranchingPolicy":
+        self.compile_branches()
+        return self
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "cond_to_policy_map":
+            self.compile_branches()
+
+    def compile_branches(self) -> None:
+        """Compile the conditions of `cond_to_policy_map` into the steps used by `apply`."""
+        steps: List[BranchStep] = []
+        # Consecutive equality branches on the same path, not yet turned into steps
+        run: List[Tuple[Condition, List[Any], ControlPolicy]] = []
+        run_path: Optional[str] = None
+
+        def end_run() -> None:
+            if run_path is not None and len(run) >= MIN_INDEXED_BRANCHES:
+                steps.append(_index_step(run_path, [(values, policy) for _, values, policy in run]))
+            else:
+                steps.extend(_branch_step(cond.compile(), policy) for cond, _, policy in run)
+            run.clear()
+
+        for cond, policy in self.cond_to_policy_map.items():
+            keys = _equality_keys(cond)
+            if keys is not None:
+                if keys[0] != run_path:
+                    end_run()
+                    run_path = keys[0]
+                run.append((cond, keys[1], policy))
+                continue
+            end_run()
+            run_path = None
+            check = cond.compile()
+            if isinstance(check, ConstantResult):
+                if not check.value:
+                    continue
+                steps.append(_branch_step(check, policy))
+                break
+            steps.append(_branch_step(check, policy))
+        end_run()
+        self._branches = steps
+
     async def apply(
         self, transaction: Transaction, container: DependencyContainer, session: AsyncSession
     ) -> Transaction:
@@ -57,13 +178,21 @@ class BranchingPolicy(ControlPolicy):
         Returns:
             The potentially modified transaction.
         """
-        for cond, policy in self.cond_to_policy_map.items():
-            if cond.evaluate(transaction):
+        policy = self._select_policy(transaction)
+        if policy is not None:
+            with time_policy_apply(policy):
                 return await policy.apply(transaction, container, session)
-        if self.default_policy:
-            return await self.default_policy.apply(transaction, container, session)
         return transaction
 
+    def _select_policy(self, transaction: Transaction) -> Optional[ControlPolicy]:
+        """Returns the policy of the first matching branch, else the default policy (if set)."""
+        with transaction.memoizing_paths():
+            for step in self._branches:
+                policy = step(transaction)
+                if policy is not None:
+                    return policy
+        return self.default_policy
+
     def serialize(self) -> SerializableDict:
         """Override serialize to handle complex condition-to-policy mapping."""
         data = super().serialize()
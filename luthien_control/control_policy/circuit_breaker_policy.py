@@ -0,0 +1,203 @@
+"""
+Control Policy that fails requests fast while their backend is degraded.
+"""
+
+import time
+from typing import Any, AsyncIterator, Optional
+
+import openai
+from openai.types.chat import ChatCompletionChunk
+from pydantic import Field, field_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.exceptions import CircuitOpenError
+from luthien_control.control_policy.serialization import SerializableDict
+from luthien_control.core.backend_health import is_backend_failure
+from luthien_control.core.circuit_breaker import CircuitBreaker, CircuitState
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.response import ObservedStream
+from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import (
+    CIRCUIT_BREAKER_REJECTIONS,
+    CIRCUIT_BREAKER_TRANSITIONS,
+    time_policy_apply,
+)
+
+
+class CircuitBreakerPolicy(ControlPolicy):
+    """Stops sending requests to a backend while it is failing or too slow, instead of waiting out its timeouts.
+
+    This policy wraps the policy that sends the backend request (`SendBackendRequestPolicy`
+    or `BackendCallPolicy`) behind the circuit breaker of its backend URL (as set by
+    `SetBackendPolicy`, or by the wrapped `BackendCallPolicy`'s `backend_call_spec`). Breakers
+    are shared by every policy with the same thresholds sending requests to the same backend
+    URL; policies with different thresholds each track the backend separately.
+
+    The breaker opens once, over the last `window_seconds`, at least `minimum_calls` requests
+    were sent and the share of failures (timeouts, connection errors, 429 and 5xx responses)
+    reaches `failure_rate_threshold`, or the share of responses slower than `slow_call_seconds`
+    reaches `slow_call_rate_threshold`. For streamed responses, latency is the time until the
+    response started, and the outcome is known once the stream ends.
+
+    While the breaker is open, requests are not sent: they are handed to `fallback_policy` if
+    set (e.g. a `SendBackendRequestPolicy` behind a `SetBackendPolicy` for another backend), or
+    fail with a 503 error. After `open_seconds`, `half_open_max_calls` requests are sent as probes;
+    the breaker closes once they all succeed, and reopens as soon as one fails.
+
+    Attributes:
+        policy: The policy sending the backend request.
+        fallback_policy: The policy applied instead while the breaker is open, or None to fail fast.
+        failure_rate_threshold: Share of failed requests that opens the breaker.
+        slow_call_seconds: Latency above which a response counts as slow, or None to ignore latency.
+        slow_call_rate_threshold: Share of slow responses that opens the breaker.
+        minimum_calls: Requests in the window needed before the breaker can open.
+        window_seconds: How long request outcomes are taken into account.
+        open_seconds: How long the breaker stays open before sending probe requests.
+        half_open_max_calls: Probe requests that must succeed for the breaker to close again.
+    """
+
+    name: Optional[str] = Field(default="CircuitBreakerPolicy")
+    policy: ControlPolicy = Field(...)
+    fallback_policy: Optional[ControlPolicy] = Field(default=None)
+    failure_rate_threshold: float = Field(default=0.5, gt=0, le=1)
+    slow_call_seconds: Optional[float] = Field(default=None, gt=0)
+    slow_call_rate_threshold: float = Field(default=0.5, gt=0, le=1)
+    minimum_calls: int = Field(default=10, gt=0)
+    window_seconds: float = Field(default=60.0, gt=0)
+    open_seconds: float = Field(default=30.0, gt=0)
+    half_open_max_calls: int = Field(default=1, gt=0)
+
+    @field_validator("policy", "fallback_policy", mode="before")
+    @classmethod
+    def validate_policy(cls, value: Any) -> Any:
+        """Load the wrapped policies from their serialized form."""
+        if isinstance(value, dict):
+            return ControlPolicy.from_serialized(value)
+        return value
+
+    async def apply(
+        self,
+        transaction: Transaction,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> Transaction:
+        """
+        Applies the wrapped policy if the backend's circuit breaker allows it, or the fallback policy.
+
+        Args:
+            transaction: The current transaction.
+            container: The application dependency container, holding the circuit breakers.
+            session: An active SQLAlchemy AsyncSession, passed to the wrapped policies.
+
+        Returns:
+            The transaction, as returned by the wrapped or fallback policy.
+
+        Raises:
+            CircuitOpenError: If the breaker is open and there is no fallback policy.
+            Exception: Propagates any exception raised by the wrapped or fallback policy.
+        """
+        breaker = self.get_breaker(container, self._backend_url(transaction))
+
+        transitions = breaker.transitions
+        admitted_in = breaker.admit()
+        self._observe_transitions(breaker, transitions)
+        if admitted_in is None:
+            return await self._reject(transaction, container, session, breaker)
+
+        start_time = time.perf_counter()
+        transitions = breaker.transitions
+        try:
+            with time_policy_apply(self.policy):
+                transaction = await self.policy.apply(transaction, container, session)
+        except Exception as e:
+            if is_backend_failure(e):
+                breaker.record_failure(admitted_in)
+            elif isinstance(e, openai.APIStatusError):
+                # The backend answered, rejecting the request itself
+                breaker.record_success(time.perf_counter() - start_time, admitted_in)
+            else:
+                breaker.release(admitted_in)
+            self._observe_transitions(breaker, transitions)
+            raise
+        except BaseException:
+            breaker.release(admitted_in)
+            raise
+
+        latency = time.perf_counter() - start_time
+        if transaction.response.stream is not None:
+            transaction.response.stream = self._record_after(transaction.response.stream, breaker, admitted_in, latency)
+        else:
+            breaker.record_success(latency, admitted_in)
+            self._observe_transitions(breaker, transitions)
+        return transaction
+
+    def get_breaker(self, container: DependencyContainer, backend_url: str) -> CircuitBreaker:
+        """Returns the circuit breaker this policy uses for requests to `backend_url`."""
+        return container.circuit_breakers.get(
+            backend_url,
+            failure_rate_threshold=self.failure_rate_threshold,
+            slow_call_seconds=self.slow_call_seconds,
+            slow_call_rate_threshold=self.slow_call_rate_threshold,
+            minimum_calls=self.minimum_calls,
+            window_seconds=self.window_seconds,
+            open_seconds=self.open_seconds,
+            half_open_max_calls=self.half_open_max_calls,
+        )
+
+    async def _reject(
+        self,
+        transaction: Transaction,
+        container: DependencyContainer,
+        session: AsyncSession,
+        breaker: CircuitBreaker,
+    ) -> Transaction:
+        retry_after = breaker.retry_after()
+        if self.fallback_policy is not None:
+            CIRCUIT_BREAKER_REJECTIONS.inc(backend=breaker.backend_url, outcome="fallback")
+            self.logger.info(f"Circuit breaker of {breaker.backend_url} is open, applying the fallback ({self.name})")
+            with time_policy_apply(self.fallback_policy):
+                return await self.fallback_policy.apply(transaction, container, session)
+        CIRCUIT_BREAKER_REJECTIONS.inc(backend=breaker.backend_url, outcome="error")
+        raise CircuitOpenError(
+            f"Backend {breaker.backend_url} is unavailable, please retry in {retry_after:.0f}s",
+            policy_name=self.name,
+        )
+
+    def _backend_url(self, transaction: Transaction) -> str:
+        backend_call_spec = getattr(self.policy, "backend_call_spec", None)
+        if backend_call_spec is not None:
+            return backend_call_spec.api_endpoint
+        return transaction.request.api_endpoint
+
+    def _observe_transitions(self, breaker: CircuitBreaker, transitions_before: int) -> None:
+        """Counts the state the breaker moved to, if it changed since it had made `transitions_before` changes."""
+        if breaker.transitions != transitions_before:
+            CIRCUIT_BREAKER_TRANSITIONS.inc(backend=breaker.backend_url, state=breaker.state)
+
+    def _record_after(
+        self,
+        stream: AsyncIterator[ChatCompletionChunk],
+        breaker: CircuitBreaker,
+        admitted_in: CircuitState,
+        latency: float,
+    ) -> ObservedStream:
+        """Passes the stream through, recording the request's outcome once it ends or is closed."""
+        transitions = breaker.transitions
+
+        def on_close(error: Optional[BaseException]) -> None:
+            if isinstance(error, Exception) and is_backend_failure(error):
+                breaker.record_failure(admitted_in)
+            else:
+                breaker.record_success(latency, admitted_in)
+            self._observe_transitions(breaker, transitions)
+
+        return ObservedStream(stream, on_close)
+
+    def serialize(self) -> SerializableDict:
+        """Serialize the wrapped policies with their own `serialize`, keeping their type-specific fields."""
+        data = super().serialize()
+        data["policy"] = self.policy.serialize()
+        if self.fallback_policy is not None:
+            data["fallback_policy"] = self.fallback_policy.serialize()
+        return data
@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import ClassVar, Optional
 
 from pydantic import Field
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,24 +10,56 @@ from luthien_control.control_policy.exceptions import (
     ClientAuthenticationNotFoundError,
     NoRequestError,
 )
+from luthien_control.core.api_key_cache import CachedApiKey
 from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.tracked_context import TrackedContext
 from luthien_control.core.transaction import Transaction
 from luthien_control.db.client_api_key_crud import get_api_key_by_value
-from luthien_control.db.exceptions import LuthienDBQueryError
+from luthien_control.db.exceptions import LuthienDBNotFoundError, LuthienDBQueryError
 
 logger = logging.getLogger(__name__)
 
 
+async def lookup_client_api_key(
+    api_key_value: str, container: DependencyContainer, session: AsyncSession
+) -> Optional[CachedApiKey]:
+    """Looks up a client API key through the container's `api_key_cache`.
+
+    Args:
+        api_key_value: The API key sent by the client.
+        container: The application dependency container.
+        session: An active SQLAlchemy AsyncSession, used on a cache miss.
+
+    Returns:
+        The (possibly inactive) key, or None if no key has this value or the lookup failed.
+    """
+    api_key_cache = container.api_key_cache
+    cache_entry = api_key_cache.get(api_key_value)
+    if cache_entry is not None:
+        return cache_entry.api_key
+    try:
+        return api_key_cache.put(api_key_value, await get_api_key_by_value(session, api_key_value))
+    except LuthienDBNotFoundError:
+        api_key_cache.put_missing(api_key_value)
+        return None
+    except LuthienDBQueryError:
+        # Don't cache failed lookups; the key may well be valid once the DB recovers
+        return None
+
+
 class ClientApiKeyAuthPolicy(ControlPolicy):
     """Verifies the client API key from the transaction's request.
 
     This policy authenticates clients by checking their API key against
-    the database. It ensures the key exists and is active.
+    the database. It ensures the key exists and is active. Lookups (including
+    unknown keys) are cached in the container's `api_key_cache`.
 
     Attributes:
         name (str): The name of this policy instance.
     """
 
+    uses_db_session: ClassVar[bool] = True
+
     name: Optional[str] = Field(default="ClientApiKeyAuthPolicy")
 
     async def apply(
@@ -55,15 +87,37 @@ class ClientApiKeyAuthPolicy(ControlPolicy):
         if transaction.request is None:
             raise NoRequestError("No request in transaction for API key auth.")
 
-        api_key_value = transaction.request.api_key
+        await self._authenticate(transaction.request.api_key, container, session)
+        return transaction
 
+    async def apply_headers(
+        self,
+        context: TrackedContext,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> TrackedContext:
+        """
+        Verifies the bearer token of a raw passthrough request.
+
+        Raises:
+            NoRequestError: If the context has no request.
+            ClientAuthenticationError: If the key is missing, invalid, or inactive.
+        """
+        request = context.request
+        if request is None:
+            raise NoRequestError("No request in context for API key auth.")
+
+        await self._authenticate(request.headers.get("authorization", "").replace("Bearer ", ""), container, session)
+        return context
+
+    async def _authenticate(self, api_key_value: str, container: DependencyContainer, session: AsyncSession) -> None:
+        """Raises a ClientAuthenticationError unless `api_key_value` is a known, active client API key."""
         if not api_key_value:
             self.logger.warning("Missing API key in transaction request.")
             raise ClientAuthenticationNotFoundError(detail="Not authenticated: Missing API key.")
 
-        try:
-            db_key = await get_api_key_by_value(session, api_key_value)
-        except LuthienDBQueryError:
+        db_key = await lookup_client_api_key(api_key_value, container, session)
+        if db_key is None:
             self.logger.warning(
                 f"Invalid API key provided (key starts with: {api_key_value[:4]}...) ({self.__class__.__name__})."
             )
@@ -79,5 +133,3 @@ class ClientApiKeyAuthPolicy(ControlPolicy):
             f"Client API key authenticated successfully "
             f"(Name: {db_key.name}, ID: {db_key.id}). ({self.__class__.__name__})."
         )
-
-        return transaction
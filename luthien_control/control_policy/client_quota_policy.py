@@ -0,0 +1,205 @@
+"""
+Control Policy enforcing per-client-key request and token quotas.
+"""
+
+from typing import Any, AsyncIterator, ClassVar, Dict, Optional
+
+from openai.types.chat import ChatCompletionChunk
+from pydantic import Field, field_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.api.openai_chat_completions.datatypes import StreamOptions
+from luthien_control.api.openai_chat_completions.request import OpenAIChatCompletionsRequest
+from luthien_control.control_policy.backend_rate_limit_policy import CHARS_PER_TOKEN, estimate_prompt_tokens
+from luthien_control.control_policy.client_api_key_auth import lookup_client_api_key
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.exceptions import (
+    ClientAuthenticationError,
+    ClientAuthenticationNotFoundError,
+    ClientQuotaExceededError,
+    NoRequestError,
+)
+from luthien_control.control_policy.serialization import SerializableDict
+from luthien_control.core.api_key_cache import CachedApiKey
+from luthien_control.core.client_quota import QUOTA_METADATA_KEY, ClientQuotaTracker, QuotaLimits
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.response import ObservedStream
+from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import CLIENT_QUOTA_REJECTIONS, time_policy_apply
+
+
+class ClientQuotaPolicy(ControlPolicy):
+    """Rejects requests from client API keys that have used up their quota.
+
+    Quotas are set per key in the `quota` object of the `ClientApiKey`'s `metadata_`, e.g.
+    `{"quota": {"requests_per_minute": 60, "tokens_per_day": 1000000}}`. Limit names combine
+    `requests`, `tokens` (prompt plus completion), `prompt_tokens` or `completion_tokens` with
+    `minute`, `hour` or `day`. Keys without a `quota` object get `default_quota`, if set.
+
+    This policy wraps the rest of the policy chain (typically everything after
+    `ClientApiKeyAuthPolicy`): a request from a key that has reached any of its limits fails
+    with a 429 error before the wrapped policy, and thus any backend call, runs. Otherwise the
+    request is counted, the wrapped policy is applied, and the tokens reported in the response's
+    `usage` (or, for streams, in the final chunk's `usage`) are counted against the key.
+
+    Streamed requests are sent with `stream_options.include_usage` set, so that the backend
+    reports their usage; the extra usage chunk is removed from the stream if the client did not
+    ask for it. A stream that still ends without usage (e.g. the client disconnected, or the
+    backend ignores `stream_options`) is charged an estimate from the length of its messages
+    and of the streamed content.
+
+    Usage is counted in memory by the container's `client_quotas` tracker, which persists it
+    to the database in batches.
+
+    Attributes:
+        policy: The policy applied to requests within their quota.
+        default_quota: Limits of keys whose metadata has no `quota` object.
+    """
+
+    modifies_payloads: ClassVar[bool] = True
+    uses_db_session: ClassVar[bool] = True
+
+    name: Optional[str] = Field(default="ClientQuotaPolicy")
+    policy: ControlPolicy = Field(...)
+    default_quota: Optional[Dict[str, float]] = Field(default=None)
+
+    @field_validator("policy", mode="before")
+    @classmethod
+    def validate_policy(cls, value: Any) -> Any:
+        """Load the wrapped policy from its serialized form."""
+        if isinstance(value, dict):
+            return ControlPolicy.from_serialized(value)
+        return value
+
+    @field_validator("default_quota")
+    @classmethod
+    def validate_default_quota(cls, value: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+        """Reject unknown limit names."""
+        if value is not None:
+            QuotaLimits.from_metadata({QUOTA_METADATA_KEY: value})
+        return value
+
+    async def apply(
+        self,
+        transaction: Transaction,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> Transaction:
+        """
+        Checks the client API key's quotas, then applies the wrapped policy and counts its usage.
+
+        Args:
+            transaction: The current transaction.
+            container: The application dependency container, holding the quota tracker.
+            session: An active SQLAlchemy AsyncSession, used to look up the key and passed
+                to the wrapped policy.
+
+        Returns:
+            The transaction, as returned by the wrapped policy.
+
+        Raises:
+            NoRequestError: If transaction.request is None.
+            ClientAuthenticationError: If the key is missing, invalid, or inactive.
+            ClientQuotaExceededError: If the key has reached one of its limits.
+            Exception: Propagates any exception raised by the wrapped policy.
+        """
+        if transaction.request is None:
+            raise NoRequestError("No request in transaction for client quota check.")
+        api_key_value = transaction.request.api_key
+        if not api_key_value:
+            raise ClientAuthenticationNotFoundError(detail="Not authenticated: Missing API key.")
+        api_key = await lookup_client_api_key(api_key_value, container, session)
+        if api_key is None or not api_key.is_active:
+            raise ClientAuthenticationError(detail="Invalid API Key")
+
+        tracker = container.client_quotas
+        key_id = api_key.id
+        if key_id is not None:
+            limits = self._limits(api_key)
+            exceeded = await tracker.check(key_id, limits, session)
+            if exceeded is not None:
+                CLIENT_QUOTA_REJECTIONS.inc(limit=exceeded)
+                self.logger.warning(f"API key {api_key.name} (ID: {key_id}) reached its {exceeded} quota ({self.name})")
+                raise ClientQuotaExceededError(
+                    f"Quota exceeded: {exceeded} ({limits.limits[exceeded]:g}), please retry later",
+                    policy_name=self.name,
+                )
+            tracker.record(key_id, requests=1)
+
+        payload = transaction.request.payload
+        client_wants_usage = True
+        if key_id is not None and payload.stream:
+            client_wants_usage = bool(payload.stream_options and payload.stream_options.include_usage)
+            if not client_wants_usage:
+                payload.stream_options = StreamOptions(include_usage=True)
+
+        with time_policy_apply(self.policy):
+            transaction = await self.policy.apply(transaction, container, session)
+
+        if key_id is not None:
+            response = transaction.response
+            if response.stream is not None:
+                response.stream = self._record_stream_usage(response.stream, tracker, key_id, payload)
+                if not client_wants_usage:
+                    response.add_chunk_hook(_strip_usage)
+            elif response.payload is not None and response.payload.usage is not None:
+                usage = response.payload.usage
+                tracker.record(key_id, prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+        return transaction
+
+    def _limits(self, api_key: CachedApiKey) -> QuotaLimits:
+        metadata = api_key.metadata or {}
+        if metadata.get(QUOTA_METADATA_KEY) is None:
+            return QuotaLimits.from_metadata({QUOTA_METADATA_KEY: self.default_quota})
+        try:
+            return QuotaLimits.from_metadata(metadata)
+        except ValueError as e:
+            self.logger.error(f"Invalid quota for API key {api_key.name} (ID: {api_key.id}), using the default: {e}")
+            return QuotaLimits.from_metadata({QUOTA_METADATA_KEY: self.default_quota})
+
+    def _record_stream_usage(
+        self,
+        stream: AsyncIterator[ChatCompletionChunk],
+        tracker: ClientQuotaTracker,
+        key_id: int,
+        payload: OpenAIChatCompletionsRequest,
+    ) -> ObservedStream:
+        """Passes the stream through, counting the usage reported in its chunks, or an estimate if there is none."""
+        reported = False
+        content_chars = 0
+
+        def on_chunk(chunk: ChatCompletionChunk) -> None:
+            nonlocal reported, content_chars
+            if chunk.usage is not None:
+                reported = True
+                tracker.record(
+                    key_id, prompt_tokens=chunk.usage.prompt_tokens, completion_tokens=chunk.usage.completion_tokens
+                )
+            for choice in chunk.choices:
+                content_chars += len(choice.delta.content or "")
+
+        def on_close(error: Optional[BaseException]) -> None:
+            if not reported:
+                self.logger.debug(f"Stream ended without usage for API key ID {key_id}, counting an estimate")
+                tracker.record(
+                    key_id,
+                    prompt_tokens=estimate_prompt_tokens(payload),
+                    completion_tokens=content_chars // CHARS_PER_TOKEN,
+                )
+
+        return ObservedStream(stream, on_close, on_chunk)
+
+    def serialize(self) -> SerializableDict:
+        """Serialize the wrapped policy with its own `serialize`, keeping its type-specific fields."""
+        data = super().serialize()
+        data["policy"] = self.policy.serialize()
+        return data
+
+
+async def _strip_usage(chunk: ChatCompletionChunk) -> Optional[ChatCompletionChunk]:
+    """Removes the usage that was only requested for counting: drops usage-only chunks, clears it from others."""
+    if chunk.usage is None:
+        return chunk
+    if not chunk.choices:
+        return None
+    return chunk.model_copy(update={"usage": None})
@@ -2,7 +2,7 @@ from typing import List, Literal
 
 from pydantic import Field, field_serializer, field_validator
 
-from luthien_control.control_policy.conditions.condition import Condition
+from luthien_control.control_policy.conditions.condition import CompiledCondition, Condition, ConstantResult
 from luthien_control.core.transaction import Transaction
 
 
@@ -31,3 +31,20 @@ class AllCondition(Condition):
 
     def evaluate(self, transaction: Transaction) -> bool:
         return all(condition.evaluate(transaction) for condition in self.conditions)
+
+    def compile(self) -> CompiledCondition:
+        """Compile the sub-conditions, dropping those that are always true."""
+        compiled = []
+        for condition in self.conditions:
+            check = condition.compile()
+            if isinstance(check, ConstantResult):
+                if not check.value:
+                    return ConstantResult(False)
+                continue
+            compiled.append(check)
+        if not compiled:
+            return ConstantResult(True)
+        if len(compiled) == 1:
+            return compiled[0]
+        checks = tuple(compiled)
+        return lambda transaction: all(check(transaction) for check in checks)
@@ -2,7 +2,7 @@ from typing import List, Literal
 
 from pydantic import Field, field_serializer, field_validator
 
-from luthien_control.control_policy.conditions.condition import Condition
+from luthien_control.control_policy.conditions.condition import CompiledCondition, Condition, ConstantResult
 from luthien_control.core.transaction import Transaction
 
 
@@ -33,3 +33,20 @@ class AnyCondition(Condition):
         if not self.conditions:
             return False
         return any(condition.evaluate(transaction) for condition in self.conditions)
+
+    def compile(self) -> CompiledCondition:
+        """Compile the sub-conditions, dropping those that are always false."""
+        compiled = []
+        for condition in self.conditions:
+            check = condition.compile()
+            if isinstance(check, ConstantResult):
+                if check.value:
+                    return ConstantResult(True)
+                continue
+            compiled.append(check)
+        if not compiled:
+            return ConstantResult(False)
+        if len(compiled) == 1:
+            return compiled[0]
+        checks = tuple(compiled)
+        return lambda transaction: any(check(transaction) for check in checks)
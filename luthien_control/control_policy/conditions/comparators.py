@@ -1,14 +1,32 @@
 import re
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
 
 class Comparator:
-    def __init__(self, fn: Callable[[Any, Any], bool]):
+    """A binary comparison between a left and a right value.
+
+    Args:
+        fn: The comparison, called as `fn(left, prepared_right)`.
+        prepare_right: Converts the right value into the form `fn` expects (e.g. compiles a
+            regex pattern). When the right value is static it is prepared only once, by `bind_right`.
+    """
+
+    def __init__(self, fn: Callable[[Any, Any], bool], prepare_right: Optional[Callable[[Any], Any]] = None):
         self.fn = fn
+        self.prepare_right = prepare_right
 
     def evaluate(self, left: Any, right: Any) -> bool:
+        if self.prepare_right is not None:
+            right = self.prepare_right(right)
         return self.fn(left, right)
 
+    def bind_right(self, right: Any) -> Callable[[Any], bool]:
+        """Returns a function comparing its argument against a fixed right value."""
+        fn = self.fn
+        if self.prepare_right is not None:
+            right = self.prepare_right(right)
+        return lambda left: fn(left, right)
+
 
 equals = Comparator(lambda a, b: a == b)
 not_equals = Comparator(lambda a, b: a != b)
@@ -17,7 +35,7 @@ less_than = Comparator(lambda a, b: a < b)
 less_than_or_equal = Comparator(lambda a, b: a <= b)
 greater_than = Comparator(lambda a, b: a > b)
 greater_than_or_equal = Comparator(lambda a, b: a >= b)
-regex_match = Comparator(lambda target, pattern: re.search(pattern, target) is not None)
+regex_match = Comparator(lambda target, pattern: pattern.search(target) is not None, prepare_right=re.compile)
 
 NAME_TO_COMPARATOR = {
     "equals": equals,
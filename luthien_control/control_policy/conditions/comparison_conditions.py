@@ -60,7 +60,7 @@ from luthien_control.control_policy.conditions.comparators import (
     not_equals,
     regex_match,
 )
-from luthien_control.control_policy.conditions.condition import Condition
+from luthien_control.control_policy.conditions.condition import CompiledCondition, Condition, ConstantResult
 from luthien_control.control_policy.conditions.value_resolvers import (
     StaticValue,
     ValueResolver,
@@ -177,6 +177,30 @@ class ComparisonCondition(Condition, ABC):
         right_value = self.right.resolve(transaction)
         return type(self).comparator.evaluate(left_value, right_value)
 
+    def compile(self) -> CompiledCondition:
+        """Compile the condition, preparing static right values (e.g. regex patterns) once.
+
+        A comparison of two static values is evaluated immediately. If preparing or comparing
+        static values fails, the failure is left to happen at evaluation time, as with `evaluate`.
+        """
+        comparator = type(self).comparator
+        if isinstance(self.right, StaticValue):
+            try:
+                compare = comparator.bind_right(self.right.value)
+            except Exception:
+                return self.evaluate
+            if isinstance(self.left, StaticValue):
+                try:
+                    return ConstantResult(compare(self.left.value))
+                except Exception:
+                    return self.evaluate
+            resolve = self.left.compile()
+            return lambda transaction: compare(resolve(transaction))
+
+        resolve_left = self.left.compile()
+        resolve_right = self.right.compile()
+        return lambda transaction: comparator.evaluate(resolve_left(transaction), resolve_right(transaction))
+
     def __repr__(self) -> str:
         return f"{type(self).__name__}({self.left!r}, {self.right!r})"
 
@@ -1,11 +1,28 @@
 import abc
-from typing import Any
+from typing import Any, Callable
 
 from pydantic import BaseModel, ConfigDict
 
 from luthien_control.control_policy.serialization import SerializableDict, safe_model_dump, safe_model_validate
 from luthien_control.core.transaction import Transaction
 
+CompiledCondition = Callable[[Transaction], bool]
+
+
+class ConstantResult:
+    """A compiled condition whose result does not depend on the transaction.
+
+    Compiled compound conditions check for this type to fold constant sub-conditions away.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: bool):
+        self.value = value
+
+    def __call__(self, transaction: Transaction) -> bool:
+        return self.value
+
 
 class Condition(BaseModel, abc.ABC):
     """
@@ -21,6 +38,16 @@ class Condition(BaseModel, abc.ABC):
     def evaluate(self, transaction: Transaction) -> bool:
         pass
 
+    def compile(self) -> CompiledCondition:
+        """Compile the condition into a function of the transaction, equivalent to `evaluate`.
+
+        Subclasses override this to do as much of the work as possible once, ahead of time
+        (parsing paths, compiling regexes, folding constants), so that evaluating the compiled
+        form per request is cheap. The compiled form reflects the condition as it is now; compile
+        again after modifying it.
+        """
+        return self.evaluate
+
     def serialize(self) -> SerializableDict:
         """Serialize using Pydantic model_dump through SerializableDict validation."""
         data = safe_model_dump(self)
@@ -2,7 +2,7 @@ from typing import Literal
 
 from pydantic import Field, field_serializer, field_validator
 
-from luthien_control.control_policy.conditions.condition import Condition
+from luthien_control.control_policy.conditions.condition import CompiledCondition, Condition, ConstantResult
 from luthien_control.core.transaction import Transaction
 
 
@@ -26,5 +26,12 @@ class NotCondition(Condition):
     def evaluate(self, transaction: Transaction) -> bool:
         return not self.cond.evaluate(transaction)
 
+    def compile(self) -> CompiledCondition:
+        """Compile the negated condition."""
+        check = self.cond.compile()
+        if isinstance(check, ConstantResult):
+            return ConstantResult(not check.value)
+        return lambda transaction: not check(transaction)
+
     def __repr__(self) -> str:
         return f"{type(self).__name__}(value={self.cond!r})"
@@ -1,9 +1,12 @@
-from typing import Any, List, Type, cast
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Type, cast
 
 from luthien_control.control_policy.conditions.condition import Condition
 from luthien_control.control_policy.serialization import SerializableDict
 from luthien_control.core.transaction import Transaction
 
+_MISSING = object()
+
 
 def get_condition_class(name: str) -> Type[Condition]:
     from luthien_control.control_policy.conditions.registry import NAME_TO_CONDITION_CLASS
@@ -46,29 +49,72 @@ def get_transaction_value(transaction: Transaction, path: str) -> Any:
     Raises:
         ValueError: If the path is invalid or the value cannot be accessed.
     """
+    return compile_transaction_path(path)(transaction)
+
+
+@lru_cache(maxsize=1024)
+def compile_transaction_path(path: str) -> Callable[[Transaction], Any]:
+    """Compile a path into a function that gets its value from a transaction.
+
+    The path is split, and each component's integer form worked out, once rather than on
+    every lookup. The returned function behaves exactly like `get_transaction_value`, and
+    memoizes what it resolves in `Transaction.resolved_paths` when the transaction has one.
+
+    Args:
+        path: The path to the value e.g. "request.payload.model", "response.payload.choices.0".
+
+    Returns:
+        A function taking a transaction and returning the value at the path.
+
+    Raises:
+        ValueError: If the path has fewer than two components.
+    """
     vals = path.split(".")
     if len(vals) < 2:
         raise ValueError("Path must contain at least two components")
 
-    x: Any = getattr(transaction, vals.pop(0))
-    while vals:
-        key = vals.pop(0)
+    root = vals[0]
+    steps = tuple(_compile_path_step(key) for key in vals[1:])
+
+    def resolve(transaction: Transaction) -> Any:
+        cache = transaction.resolved_paths
+        if cache is not None and path in cache:
+            return cache[path]
+        x: Any = getattr(transaction, root)
+        for step in steps:
+            x = step(x)
+        if cache is not None:
+            cache[path] = x
+        return x
+
+    return resolve
 
+
+def _compile_path_step(key: str) -> Callable[[Any], Any]:
+    try:
+        index: Optional[int] = int(key)
+    except ValueError:
+        index = None
+
+    def step(x: Any) -> Any:
         # Try dict-like access first (includes EventedDict)
-        if hasattr(x, "__getitem__") and (isinstance(x, dict) or hasattr(x, "keys")):
+        if isinstance(x, dict) or (hasattr(x, "__getitem__") and hasattr(x, "keys")):
             try:
-                x = x[key]
-                continue
+                return x[key]
             except (KeyError, TypeError):
                 pass
 
         # Try attribute access
-        if hasattr(x, key):
-            x = getattr(x, key)
-        else:
-            # Try accessing as index for list-like objects
+        value = getattr(x, key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Try accessing as index for list-like objects
+        if index is not None:
             try:
-                x = x[int(key)]
+                return x[index]
             except (ValueError, TypeError, IndexError):
-                raise AttributeError(f"Cannot access '{key}' on {type(x).__name__}")
-    return x
+                pass
+        raise AttributeError(f"Cannot access '{key}' on {type(x).__name__}")
+
+    return step
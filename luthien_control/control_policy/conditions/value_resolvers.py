@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Any, Literal
+from typing import Any, Callable, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from luthien_control.control_policy.conditions.util import get_transaction_value
+from luthien_control.control_policy.conditions.util import compile_transaction_path, get_transaction_value
 from luthien_control.control_policy.serialization import SerializableDict, safe_model_dump, safe_model_validate
 from luthien_control.core.transaction import Transaction
 
@@ -28,6 +28,10 @@ class ValueResolver(BaseModel, ABC):
         """
         pass
 
+    def compile(self) -> Callable[[Transaction], Any]:
+        """Compile the resolver into a function of the transaction, equivalent to `resolve`."""
+        return self.resolve
+
     def serialize(self) -> SerializableDict:
         """Serialize using Pydantic model_dump through SerializableDict validation."""
         return safe_model_dump(self)
@@ -60,6 +64,11 @@ class StaticValue(ValueResolver):
         """Return the static value."""
         return self.value
 
+    def compile(self) -> Callable[[Transaction], Any]:
+        """Return a function producing the static value."""
+        value = self.value
+        return lambda transaction: value
+
     def __repr__(self) -> str:
         return f"StaticValue(value={self.value!r})"
 
@@ -83,6 +92,21 @@ class TransactionPath(ValueResolver):
         except (AttributeError, ValueError):
             return None
 
+    def compile(self) -> Callable[[Transaction], Any]:
+        """Return a function resolving the path, which is parsed only once."""
+        try:
+            accessor = compile_transaction_path(self.path)
+        except ValueError:
+            return lambda transaction: None
+
+        def resolve(transaction: Transaction) -> Any:
+            try:
+                return accessor(transaction)
+            except (AttributeError, ValueError):
+                return None
+
+        return resolve
+
     def __repr__(self) -> str:
         return f"TransactionPath(path={self.path!r})"
 
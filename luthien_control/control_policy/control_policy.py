@@ -2,13 +2,14 @@
 
 import abc
 import logging
-from typing import Any, Optional, Type, TypeVar, cast
+from typing import Any, ClassVar, Iterator, Optional, Type, TypeVar, cast
 
 from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from luthien_control.control_policy.serialization import SerializableDict, safe_model_validate
 from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.tracked_context import TrackedContext
 from luthien_control.core.transaction import Transaction
 
 # Type variable for the policy classes
@@ -22,8 +23,20 @@ class ControlPolicy(BaseModel, abc.ABC):
         name (Optional[str]): An optional name for the policy instance.
             Subclasses are expected to set this, often in their `__init__` method.
             It's used for logging and identification purposes.
+        requires_change_events (ClassVar[bool]): Whether this policy subscribes to the
+            `changed` signals of the transaction's request/response models. Payloads are
+            only built with deep change tracking when some policy in the tree sets this.
+        modifies_payloads (ClassVar[bool]): Whether this policy changes the request or response
+            payload in place (rather than replacing it). `ParallelPolicy` only gives members
+            their own copy of the payloads when some policy within them sets this.
+        uses_db_session (ClassVar[bool]): Whether this policy queries the `session` passed to
+            `apply`. `ParallelPolicy` only opens extra sessions for members that need one.
     """
 
+    requires_change_events: ClassVar[bool] = False
+    modifies_payloads: ClassVar[bool] = False
+    uses_db_session: ClassVar[bool] = False
+
     name: Optional[str] = Field(default=None)
     type: str = Field(default="")
     logger: logging.Logger = Field(default_factory=lambda: logging.getLogger(__name__), exclude=True)
@@ -83,6 +96,58 @@ class ControlPolicy(BaseModel, abc.ABC):
         """
         raise NotImplementedError
 
+    async def apply_headers(
+        self,
+        context: "TrackedContext",
+        container: "DependencyContainer",
+        session: "AsyncSession",
+    ) -> "TrackedContext":
+        """
+        Apply the policy to a raw passthrough request, whose body is streamed and never parsed.
+
+        Only header-level policies (authentication, backend selection, API keys) take part in
+        raw passthrough; they override this to act on the request's method, URL and headers.
+        A policy may also answer the request itself by setting the context's response, in which
+        case it is not forwarded. The default does nothing, so payload-level policies are skipped.
+
+        Args:
+            context: The tracked context holding the raw request.
+            container: The dependency injection container.
+            session: The database session for the current request.
+
+        Returns:
+            The potentially modified context.
+
+        Raises:
+            Exception: Processors may raise exceptions to halt the processing flow.
+        """
+        return context
+
+    def iter_header_policies(self) -> Iterator["ControlPolicy"]:
+        """Yields the policies whose `apply_headers` runs when this policy's does.
+
+        That is this policy and, for composite policies that pass raw passthrough requests on to
+        their members, those members' header policies.
+        """
+        yield self
+
+    def iter_policies(self) -> Iterator["ControlPolicy"]:
+        """Yields this policy and, recursively, every policy nested within it.
+
+        Nested policies are discovered from the model's fields, including policies held in
+        lists, tuples and dict values (e.g. `SerialPolicy.policies`, `BranchingPolicy.cond_to_policy_map`).
+        """
+        yield self
+        for field_name in self.__class__.model_fields:
+            value = getattr(self, field_name, None)
+            if isinstance(value, ControlPolicy):
+                yield from value.iter_policies()
+            elif isinstance(value, (list, tuple, dict)):
+                members = value.values() if isinstance(value, dict) else value
+                for member in members:
+                    if isinstance(member, ControlPolicy):
+                        yield from member.iter_policies()
+
     def serialize(self) -> SerializableDict:
         """Serialize using Pydantic model_dump through SerializableDict validation."""
         data = self.model_dump(mode="python", by_alias=True, exclude_none=True)
@@ -0,0 +1,226 @@
+"""
+Control Policy that batches concurrent embeddings requests into one backend call.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from pydantic import Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.control_policy.backend_rate_limit_policy import CHARS_PER_TOKEN
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.tracked_context import BACKEND_URL_KEY, TrackedContext
+from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import BACKEND_REQUEST_DURATION, EMBEDDINGS_BATCH_INPUTS
+from luthien_control.utils import json_codec
+
+# The status code and JSON body returned to one caller of a batch
+EmbeddingsResult = Tuple[int, bytes]
+
+# Client errors that do not depend on the inputs, so resending each caller's inputs separately would not help
+_BATCH_WIDE_ERRORS = {401, 403, 404, 429}
+
+
+def _split_inputs(value: Any) -> Optional[Tuple[str, List[Any]]]:
+    """Returns the kind of an embeddings `input` ("text" or "tokens") and its individual inputs.
+
+    Returns None for inputs that cannot be batched (empty, mixed or of an unknown type).
+    """
+    if isinstance(value, str):
+        return "text", [value]
+    if not isinstance(value, list) or not value:
+        return None
+    if all(isinstance(item, str) for item in value):
+        return "text", value
+    if all(isinstance(item, int) for item in value):
+        return "tokens", [value]
+    if all(isinstance(item, list) and item and all(isinstance(token, int) for token in item) for item in value):
+        return "tokens", value
+    return None
+
+
+def estimate_input_tokens(kind: str, inputs: Sequence[Any]) -> int:
+    """Estimates the tokens of embeddings inputs: token inputs are counted, text is estimated from its length."""
+    if kind == "tokens":
+        return sum(len(tokens) for tokens in inputs)
+    return sum(len(text) // CHARS_PER_TOKEN + 1 for text in inputs)
+
+
+def _split_usage(usage: Dict[str, Any], start: int, end: int, total: int) -> Dict[str, Any]:
+    """Apportions a batch's token usage to the caller of inputs `start` to `end` by its share of the inputs.
+
+    The shares of all callers add up to the batch's usage.
+    """
+    return {
+        key: value * end // total - value * start // total if isinstance(value, int) else value
+        for key, value in usage.items()
+    }
+
+
+def split_embeddings_response(body: bytes, input_counts: Sequence[int]) -> List[bytes]:
+    """Splits the response to a batched embeddings call into one response per caller.
+
+    Each caller gets the embeddings of its own inputs, indexed from 0, and a share of the
+    usage proportional to its number of inputs.
+
+    Raises:
+        ValueError: If the response does not hold exactly one embedding per input.
+    """
+    response = json_codec.loads(body)
+    data = sorted(response.get("data") or [], key=lambda item: item.get("index", 0))
+    total = sum(input_counts)
+    if len(data) != total:
+        raise ValueError(f"Backend returned {len(data)} embeddings for {total} inputs")
+    usage = response.get("usage")
+    bodies = []
+    offset = 0
+    for count in input_counts:
+        caller_data = [{**item, "index": index} for index, item in enumerate(data[offset : offset + count])]
+        caller_response = {**response, "data": caller_data}
+        if isinstance(usage, dict):
+            caller_response["usage"] = _split_usage(usage, offset, offset + count, total)
+        bodies.append(json_codec.dumps(caller_response))
+        offset += count
+    return bodies
+
+
+class EmbeddingsBatchingPolicy(ControlPolicy):
+    """Batches concurrent embeddings requests for the same model and backend into one backend call.
+
+    Applies to `POST embeddings` requests forwarded by the raw passthrough engine (so
+    `embeddings` must be listed in `RAW_PASSTHROUGH_PATHS`). Requests with the same backend,
+    backend API key, model and parameters that arrive within `max_wait_ms` of each other are
+    sent as one request with all their inputs, up to `max_batch_size` inputs and about
+    `max_batch_tokens` tokens (estimated from the length of text inputs); each caller then
+    gets the embeddings of its own inputs. The reported token usage is split among callers in
+    proportion to their number of inputs.
+
+    If the backend rejects a batch with a client error that may be caused by one caller's
+    inputs (e.g. `400` for an input that is too long), each caller's inputs are resent on their
+    own, so only the callers at fault get the error. Other errors are returned to every caller.
+
+    Place this policy after the policies that set the backend and its API key (e.g.
+    `SetBackendPolicy`, `AddApiKeyHeaderFromEnvPolicy`), in the position of
+    `SendBackendRequestPolicy`. Requests it cannot batch (other endpoints, or inputs mixing
+    text and tokens) are forwarded unchanged; chat completions are not affected.
+
+    Attributes:
+        name (str): The name of this policy instance.
+        max_batch_size (int): The largest number of inputs sent in one backend call.
+        max_batch_tokens (int): The largest estimated number of tokens sent in one backend call.
+        max_wait_ms (float): The longest a request waits for others to batch with, in milliseconds.
+    """
+
+    name: Optional[str] = Field(default="EmbeddingsBatchingPolicy")
+    max_batch_size: int = Field(default=256, gt=0)
+    max_batch_tokens: int = Field(default=100_000, gt=0)
+    max_wait_ms: float = Field(default=5.0, ge=0)
+
+    async def apply(
+        self,
+        transaction: Transaction,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> Transaction:
+        """Leaves chat completions transactions unchanged; only embeddings requests are batched."""
+        return transaction
+
+    async def apply_headers(
+        self,
+        context: TrackedContext,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> TrackedContext:
+        """
+        Answers an embeddings request from a batched backend call.
+
+        Args:
+            context: The tracked context holding the raw request.
+            container: The application dependency container, providing the HTTP client and the batcher.
+            session: An active SQLAlchemy AsyncSession (unused).
+
+        Returns:
+            The context, with its response set if the request was batched.
+        """
+        request = context.request
+        if request is None or request.method != "POST" or request.url.path.strip("/") != "embeddings":
+            return context
+        backend_url = context.get_data(BACKEND_URL_KEY) or container.settings.get_backend_url()
+        if not backend_url:
+            return context
+
+        try:
+            payload = json_codec.loads(await context.read_request_body())
+        except json_codec.JSONDecodeError:
+            return context
+        split = _split_inputs(payload.get("input")) if isinstance(payload, dict) else None
+        if split is None:
+            return context
+        kind, inputs = split
+
+        params = {key: value for key, value in payload.items() if key != "input"}
+        url = f"{backend_url.rstrip('/')}/{request.url.raw_path.decode('ascii').lstrip('/')}"
+        authorization = request.headers.get("authorization", "")
+        key = (url, authorization, kind, json_codec.dumps(dict(sorted(params.items()))))
+
+        async def send(batch: List[List[Any]]) -> List[EmbeddingsResult]:
+            return await self._send_batch(container.http_client, url, authorization, params, batch)
+
+        status_code, body = await container.embeddings_batcher.submit(
+            key,
+            inputs,
+            send,
+            size=len(inputs),
+            max_batch_size=self.max_batch_size,
+            max_wait=self.max_wait_ms / 1000,
+            weight=estimate_input_tokens(kind, inputs),
+            max_batch_weight=self.max_batch_tokens,
+        )
+        context.update_response(status_code=status_code, content=body, headers={"content-type": "application/json"})
+        return context
+
+    async def _send_batch(
+        self,
+        http_client: httpx.AsyncClient,
+        url: str,
+        authorization: str,
+        params: Dict[str, Any],
+        batch: List[List[Any]],
+    ) -> List[EmbeddingsResult]:
+        """Sends the inputs of every request in `batch` in one call and splits the response among them.
+
+        If the call fails with a client error that may be caused by some of the inputs, each
+        request's inputs are resent on their own.
+        """
+        input_counts = [len(inputs) for inputs in batch]
+        if len(batch) > 1:
+            self.logger.info(
+                f"Sending {len(batch)} embeddings requests ({sum(input_counts)} inputs) as one ({self.name})"
+            )
+        EMBEDDINGS_BATCH_INPUTS.observe(sum(input_counts), backend=url)
+        headers = {"content-type": "application/json"}
+        if authorization:
+            headers["authorization"] = authorization
+        content = json_codec.dumps({**params, "input": [item for inputs in batch for item in inputs]})
+        try:
+            with BACKEND_REQUEST_DURATION.time(backend=url):
+                response = await http_client.post(url, content=content, headers=headers)
+        except httpx.TimeoutException as e:
+            self.logger.error(f"Timeout during batched embeddings request: {e} ({self.name})")
+            return [(504, json_codec.dumps({"detail": "Backend request timed out"}))] * len(batch)
+        except httpx.RequestError as e:
+            self.logger.error(f"Error during batched embeddings request: {e} ({self.name})")
+            return [(502, json_codec.dumps({"detail": "Backend request failed"}))] * len(batch)
+        if response.status_code == 200:
+            return [(200, body) for body in split_embeddings_response(response.content, input_counts)]
+        self.logger.warning(f"Batched embeddings request failed with status {response.status_code} ({self.name})")
+        if len(batch) > 1 and 400 <= response.status_code < 500 and response.status_code not in _BATCH_WIDE_ERRORS:
+            self.logger.info(f"Resending the {len(batch)} embeddings requests of the batch separately ({self.name})")
+            results = await asyncio.gather(
+                *(self._send_batch(http_client, url, authorization, params, [inputs]) for inputs in batch)
+            )
+            return [result for (result,) in results]
+        return [(response.status_code, response.content)] * len(batch)
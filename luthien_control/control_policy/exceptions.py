@@ -122,3 +122,63 @@ class LeakedApiKeyError(ControlPolicyError):
         """
         # Pass detail positionally for Exception.__str__ and keywords for ControlPolicyError attributes
         super().__init__(detail, status_code=status_code, detail=detail)
+
+
+class PolicyTimeoutError(ControlPolicyError):
+    """Exception raised when a policy takes longer than it is allowed to."""
+
+    def __init__(self, detail: str, policy_name: str | None = None, status_code: int = 504):
+        """Initializes the PolicyTimeoutError.
+
+        Args:
+            detail (str): A detailed error message naming the policy that timed out.
+            policy_name (Optional[str]): The name of the policy that timed out.
+            status_code (int): The HTTP status code to associate with this error.
+                               Defaults to 504 (Gateway Timeout).
+        """
+        super().__init__(detail, policy_name=policy_name, status_code=status_code, detail=detail)
+
+
+class BackendRateLimitError(ControlPolicyError):
+    """Exception raised when a request is not admitted to the backend within its rate and concurrency limits."""
+
+    def __init__(self, detail: str, policy_name: str | None = None, status_code: int = 429):
+        """Initializes the BackendRateLimitError.
+
+        Args:
+            detail (str): A detailed error message explaining why the request was not admitted.
+            policy_name (Optional[str]): The name of the policy that rejected the request.
+            status_code (int): The HTTP status code to associate with this error.
+                               Defaults to 429 (Too Many Requests).
+        """
+        super().__init__(detail, policy_name=policy_name, status_code=status_code, detail=detail)
+
+
+class ClientQuotaExceededError(ControlPolicyError):
+    """Exception raised when a client API key has used up one of its quotas."""
+
+    def __init__(self, detail: str, policy_name: str | None = None, status_code: int = 429):
+        """Initializes the ClientQuotaExceededError.
+
+        Args:
+            detail (str): A detailed error message naming the quota that was reached.
+            policy_name (Optional[str]): The name of the policy that rejected the request.
+            status_code (int): The HTTP status code to associate with this error.
+                               Defaults to 429 (Too Many Requests).
+        """
+        super().__init__(detail, policy_name=policy_name, status_code=status_code, detail=detail)
+
+
+class CircuitOpenError(ControlPolicyError):
+    """Exception raised when a request is rejected without being sent because its backend's circuit breaker is open."""
+
+    def __init__(self, detail: str, policy_name: str | None = None, status_code: int = 503):
+        """Initializes the CircuitOpenError.
+
+        Args:
+            detail (str): A detailed error message naming the unavailable backend.
+            policy_name (Optional[str]): The name of the policy that rejected the request.
+            status_code (int): The HTTP status code to associate with this error.
+                               Defaults to 503 (Service Unavailable).
+        """
+        super().__init__(detail, policy_name=policy_name, status_code=status_code, detail=detail)
@@ -6,22 +6,26 @@ sensitive API keys from being sent to language models.
 """
 
 import re
-from typing import ClassVar, List, Optional
+from collections.abc import Sequence
+from typing import Any, ClassVar, Iterator, List, Optional, Tuple
 
-from pydantic import Field, field_validator, model_validator
+from pydantic import Field, PrivateAttr, field_validator, model_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from luthien_control.control_policy.control_policy import ControlPolicy
 from luthien_control.control_policy.exceptions import LeakedApiKeyError, NoRequestError
 from luthien_control.core.dependency_container import DependencyContainer
 from luthien_control.core.transaction import Transaction
+from luthien_control.utils.secret_scanner import SecretScanner
 
 
 class LeakedApiKeyDetectionPolicy(ControlPolicy):
     """Detects API keys that might be leaked in message content sent to LLMs.
 
-    This policy scans message content for patterns matching common API key formats
-    to prevent accidental exposure of sensitive credentials to language models.
+    This policy scans message content (plain strings and text content parts) and
+    tool call arguments for patterns matching common API key formats to prevent
+    accidental exposure of sensitive credentials to language models. All patterns
+    are checked in a single pass by a `SecretScanner`, so large pattern sets stay cheap.
     """
 
     # Common API key patterns
@@ -34,6 +38,7 @@ class LeakedApiKeyDetectionPolicy(ControlPolicy):
     name: Optional[str] = Field(default_factory=lambda: "LeakedApiKeyDetectionPolicy")
     patterns: List[str] = Field(default_factory=lambda: LeakedApiKeyDetectionPolicy.DEFAULT_PATTERNS)
     compiled_patterns: List[re.Pattern] = Field(default_factory=list, exclude=True)
+    _scanner: SecretScanner = PrivateAttr()
 
     @field_validator("patterns", mode="before")
     @classmethod
@@ -47,6 +52,7 @@ class LeakedApiKeyDetectionPolicy(ControlPolicy):
     def compile_patterns(self):
         """Compile regex patterns after validation."""
         self.compiled_patterns = [re.compile(pattern) for pattern in self.patterns]
+        self._scanner = SecretScanner(self.compiled_patterns)
         return self
 
     async def apply(
@@ -75,19 +81,17 @@ class LeakedApiKeyDetectionPolicy(ControlPolicy):
 
         self.logger.info(f"Checking for leaked API keys in message content ({self.name}).")
 
-        if hasattr(transaction.request.payload, "messages"):
-            messages = transaction.request.payload.messages
-
-            # Inspect each message's content
-            for message in messages:
-                if hasattr(message, "content") and isinstance(message.content, str):
-                    content = message.content
-                    if self._check_text(content):
-                        error_message = (
-                            "Potential API key detected in message content. For security, the request has been blocked."
-                        )
-                        self.logger.warning(f"{error_message} ({self.name})")
-                        raise LeakedApiKeyError(detail=error_message)
+        for index, message in enumerate(getattr(transaction.request.payload, "messages", None) or ()):
+            for owner, field in message_text_fields(message):
+                match = self._scanner.search(getattr(owner, field))
+                if match is not None:
+                    error_message = (
+                        "Potential API key detected in message content. For security, the request has been blocked."
+                    )
+                    self.logger.warning(
+                        f"{error_message} Message {index} matched pattern {match.pattern!r} ({self.name})"
+                    )
+                    raise LeakedApiKeyError(detail=error_message)
 
         return transaction
 
@@ -101,7 +105,23 @@ class LeakedApiKeyDetectionPolicy(ControlPolicy):
         Returns:
             True if a potential API key is found, False otherwise.
         """
-        for pattern in self.compiled_patterns:
-            if pattern.search(text):
-                return True
-        return False
+        return self._scanner.search(text) is not None
+
+
+def message_text_fields(message: Any) -> Iterator[Tuple[Any, str]]:
+    """Yields (object, attribute name) for each string field of a message that may carry a secret.
+
+    These are the message content (or its text content parts) and any tool or function call arguments.
+    """
+    content = getattr(message, "content", None)
+    if isinstance(content, str):
+        yield message, "content"
+    elif isinstance(content, Sequence):
+        for part in content:
+            if isinstance(getattr(part, "text", None), str):
+                yield part, "text"
+    function_calls = [tool_call.function for tool_call in getattr(message, "tool_calls", None) or ()]
+    function_calls.append(getattr(message, "function_call", None))
+    for function_call in function_calls:
+        if isinstance(getattr(function_call, "arguments", None), str):
+            yield function_call, "arguments"
@@ -0,0 +1,233 @@
+"""
+Control Policy for detecting leaked API keys in LLM responses.
+
+The response-side counterpart of `LeakedApiKeyDetectionPolicy`: it inspects what the
+backend returns, including streamed responses, where a key may be split across chunks.
+"""
+
+from typing import Any, AsyncIterator, ClassVar, Dict, List, Literal, Optional, Sequence, Set
+
+from openai.types.chat import ChatCompletionChunk
+from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice
+from openai.types.chat.chat_completion_chunk import ChoiceDelta
+from pydantic import Field, PrivateAttr, field_validator, model_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.exceptions import LeakedApiKeyError
+from luthien_control.control_policy.leaked_api_key_detection import LeakedApiKeyDetectionPolicy, message_text_fields
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.transaction import Transaction
+from luthien_control.utils.secret_scanner import IncrementalSecretScanner, SecretMatch, SecretScanner
+
+LeakAction = Literal["block", "redact", "flag"]
+
+
+class LeakedApiKeyResponseDetectionPolicy(ControlPolicy):
+    """Detects API keys in the content returned by the backend.
+
+    Place this policy after the one that sends the backend request. Non-streamed responses
+    are scanned in full. For streamed responses the backend stream is wrapped so that each
+    choice's content deltas are scanned as they pass through, keeping only a window of recent
+    text (bounded by the longest secret) so that keys split across chunks are still found.
+    The scan runs before any chunk hook sees the chunks.
+
+    Depending on `action`, a detected key:
+    - `block`: stops the response. A non-streamed response is replaced by a 403 error; in a
+      streamed one the choice is cut off just before the key and finishes with
+      `content_filter`. Other choices (`n > 1`) keep streaming; once every choice has finished
+      or been blocked the stream ends and the backend connection is closed.
+    - `redact`: is replaced by `redaction_text`.
+    - `flag`: is passed through unchanged.
+    In every case the matching patterns are logged and recorded in
+    `transaction.data[FLAGGED_PATTERNS_KEY]`.
+
+    To block or redact a streamed key before any of it reaches the client, text that may be
+    the start of a key (e.g. a trailing `sk-`) is held back until enough of what follows has
+    arrived. Text that cannot begin a key is released immediately, so streaming latency is
+    unaffected unless a candidate prefix appears. Text still held back when a choice finishes,
+    or when the stream ends without a `finish_reason`, is scanned and released then.
+    Streamed tool call arguments are not scanned.
+
+    Attributes:
+        patterns: Regular expressions describing API keys. Defaults to
+            `LeakedApiKeyDetectionPolicy.DEFAULT_PATTERNS`.
+        action: What to do when a key is found.
+        redaction_text: Replacement for redacted keys.
+        max_secret_length: How much streamed text to keep for keys split across chunks, when
+            the patterns themselves do not bound the length of a key (e.g. `{50,}`).
+    """
+
+    FLAGGED_PATTERNS_KEY: ClassVar[str] = "leaked_api_key_patterns"
+    modifies_payloads: ClassVar[bool] = True
+
+    name: Optional[str] = Field(default_factory=lambda: "LeakedApiKeyResponseDetectionPolicy")
+    patterns: List[str] = Field(default_factory=lambda: LeakedApiKeyDetectionPolicy.DEFAULT_PATTERNS)
+    action: LeakAction = Field(default="block")
+    redaction_text: str = Field(default="[REDACTED]")
+    max_secret_length: int = Field(default=256, gt=1)
+    _scanner: SecretScanner = PrivateAttr()
+
+    @field_validator("patterns", mode="before")
+    @classmethod
+    def validate_patterns(cls, value):
+        """Handle patterns validation and fallback to defaults for empty lists."""
+        if value is None or (isinstance(value, list) and not value):
+            return LeakedApiKeyDetectionPolicy.DEFAULT_PATTERNS
+        return value
+
+    @model_validator(mode="after")
+    def compile_patterns(self):
+        """Build the scanner after validation."""
+        self._scanner = SecretScanner(self.patterns)
+        return self
+
+    async def apply(
+        self,
+        transaction: Transaction,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> Transaction:
+        """
+        Checks the backend response for potentially leaked API keys.
+
+        Args:
+            transaction: The current transaction.
+            container: The application dependency container.
+            session: An active SQLAlchemy AsyncSession.
+
+        Returns:
+            The transaction, with redacted response content or, for streamed responses, its
+            stream wrapped by the scan.
+
+        Raises:
+            LeakedApiKeyError: If `action` is `block` and a potential API key is found in a
+                non-streamed response.
+        """
+        response = transaction.response
+        if response.stream is not None:
+            self.logger.info(f"Scanning streamed response for leaked API keys ({self.name}).")
+            response.stream = self._scan_stream(response.stream, transaction)
+            return transaction
+
+        if response.payload is None:
+            self.logger.warning(f"No response to check for leaked API keys ({self.name}).")
+            return transaction
+
+        self.logger.info(f"Checking for leaked API keys in response content ({self.name}).")
+        for choice in response.payload.choices:
+            for owner, field in message_text_fields(choice.message):
+                text = getattr(owner, field)
+                matches = self._scanner.scan(text)
+                if not matches:
+                    continue
+                self._report(transaction, matches)
+                if self.action == "block":
+                    error_message = (
+                        "Potential API key detected in response content. For security, the response has been blocked."
+                    )
+                    raise LeakedApiKeyError(detail=error_message)
+                if self.action == "redact":
+                    setattr(owner, field, self._redact(text, matches))
+        return transaction
+
+    async def _scan_stream(
+        self, stream: AsyncIterator[ChatCompletionChunk], transaction: Transaction
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        """Passes `stream` through, scanning each choice's content and ending it once every choice is done."""
+        choice_count = transaction.request.payload.n or 1
+        scanners: Dict[int, IncrementalSecretScanner] = {}
+        finished: Set[int] = set()
+        blocked: Set[int] = set()
+        last_chunk: Optional[ChatCompletionChunk] = None
+        try:
+            async for chunk in stream:
+                last_chunk = chunk
+                if chunk.choices:
+                    chunk.choices = [choice for choice in chunk.choices if choice.index not in blocked]
+                    if not chunk.choices:
+                        continue
+                for choice in chunk.choices:
+                    final = choice.finish_reason is not None
+                    scanner = scanners.get(choice.index)
+                    if scanner is None:
+                        scanner = scanners[choice.index] = self._new_scanner()
+                    if self._scan_choice(transaction, choice, scanner, final=final):
+                        blocked.add(choice.index)
+                    elif final:
+                        finished.add(choice.index)
+                yield chunk
+                if blocked and len(finished | blocked) >= choice_count:
+                    # Nothing more may reach the client, so stop reading the backend.
+                    return
+
+            # The stream ended without finishing some choices: release what they held back.
+            if last_chunk is None:
+                return
+            tail_choices = []
+            for index, scanner in scanners.items():
+                if index in finished or index in blocked:
+                    continue
+                choice = ChunkChoice(index=index, delta=ChoiceDelta())
+                self._scan_choice(transaction, choice, scanner, final=True)
+                if choice.delta.content or choice.finish_reason is not None:
+                    tail_choices.append(choice)
+            if tail_choices:
+                yield last_chunk.model_copy(update={"choices": tail_choices, "usage": None})
+        finally:
+            close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+            if close is not None:
+                await close()
+
+    def _new_scanner(self) -> IncrementalSecretScanner:
+        return IncrementalSecretScanner(
+            self._scanner,
+            max_secret_length=self._scanner.max_match_length or self.max_secret_length,
+            hold_back=self.action != "flag",
+        )
+
+    def _scan_choice(
+        self, transaction: Transaction, choice: ChunkChoice, scanner: IncrementalSecretScanner, final: bool
+    ) -> bool:
+        """Scans the content delta of `choice`, releasing held-back text if `final`.
+
+        Returns:
+            True if the choice was blocked, i.e. cut off before a key and finished with `content_filter`.
+        """
+        content = choice.delta.content
+        released, matches = scanner.feed(content) if content else ("", [])
+        if final:
+            tail, tail_matches = scanner.flush()
+            matches += [SecretMatch(m.pattern, m.start + len(released), m.end + len(released)) for m in tail_matches]
+            released += tail
+        if matches:
+            self._report(transaction, matches)
+            if self.action == "block":
+                choice.delta.content = released[: matches[0].start]
+                choice.finish_reason = "content_filter"
+                return True
+            if self.action == "redact":
+                released = self._redact(released, matches)
+        if content is not None or released:
+            choice.delta.content = released
+        return False
+
+    def _redact(self, text: str, matches: Sequence[SecretMatch]) -> str:
+        """Replaces each (possibly overlapping) match in `text` with `redaction_text`."""
+        parts = []
+        position = 0
+        for match in matches:
+            if match.start >= position:
+                parts += [text[position : match.start], self.redaction_text]
+            position = max(position, match.end)
+        parts.append(text[position:])
+        return "".join(parts)
+
+    def _report(self, transaction: Transaction, matches: Sequence[SecretMatch]) -> None:
+        patterns = sorted({match.pattern for match in matches})
+        self.logger.warning(
+            f"Potential API key detected in response content, matching {patterns}; action: {self.action} ({self.name})"
+        )
+        flagged: List[Any] = list(transaction.data.get(self.FLAGGED_PATTERNS_KEY, []))
+        flagged.extend(pattern for pattern in patterns if pattern not in flagged)
+        transaction.data[self.FLAGGED_PATTERNS_KEY] = flagged
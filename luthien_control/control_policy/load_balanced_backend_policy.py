@@ -0,0 +1,200 @@
+"""
+Control Policy that spreads requests over a pool of backend endpoints.
+"""
+
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+
+from openai.types.chat import ChatCompletionChunk
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.exceptions import ApiKeyNotFoundError
+from luthien_control.control_policy.send_backend_request import SendBackendRequestPolicy
+from luthien_control.control_policy.serialization import SerializableDict
+from luthien_control.core.backend_health import BackendHealthRegistry, EndpointHealth, is_backend_failure
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.response import ObservedStream
+from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import BACKEND_ENDPOINT_EJECTIONS, time_policy_apply
+
+LoadBalancingStrategy = Literal["weighted_round_robin", "least_in_flight", "ewma_latency"]
+
+
+class BackendEndpoint(BaseModel):
+    """A backend endpoint of a `LoadBalancedBackendPolicy` pool."""
+
+    api_endpoint: str = Field(...)
+    api_key_env_var: Optional[str] = Field(
+        default=None,
+        description="Environment variable holding the endpoint's API key. The request's API key is kept if unset.",
+    )
+    weight: float = Field(default=1.0, gt=0)
+
+
+class LoadBalancedBackendPolicy(ControlPolicy):
+    """Sends each request to one of a pool of backend endpoints, avoiding unhealthy ones.
+
+    This policy wraps the policy that sends the backend request (`SendBackendRequestPolicy`,
+    possibly inside a `BackendRateLimitPolicy`): it sets the request's backend URL (and API
+    key, from the endpoint's `api_key_env_var`) to the chosen endpoint, then applies the
+    wrapped policy. Endpoints are chosen with `strategy`:
+    - `weighted_round_robin`: in turn, in proportion to their `weight`;
+    - `least_in_flight`: the one with the fewest requests in flight relative to its weight;
+    - `ewma_latency`: the one with the lowest moving average latency, scaled by its requests in
+      flight and weight. Endpoints without a latency sample yet are tried first.
+    Ties are broken by weighted round robin.
+
+    Timeouts, connection errors, 429 and 5xx responses count as failures. After `max_failures`
+    failures in a row an endpoint is ejected from the pool for `ejection_seconds`. If every
+    endpoint is ejected, requests are sent to all of them (chosen with `strategy`) rather than
+    failed, until one succeeds: that endpoint is healthy again and takes the requests, while the
+    others stay out of the pool until their ejection ends.
+
+    The load and health of an endpoint are shared by every policy sending requests to its URL.
+
+    Attributes:
+        endpoints: The pool of backend endpoints.
+        strategy: How the endpoint of each request is chosen.
+        policy: The policy sending the backend request.
+        max_failures: Failures in a row after which an endpoint is ejected.
+        ejection_seconds: How long an ejected endpoint is left out of the pool.
+    """
+
+    name: Optional[str] = Field(default="LoadBalancedBackendPolicy")
+    endpoints: List[BackendEndpoint] = Field(..., min_length=1)
+    strategy: LoadBalancingStrategy = Field(default="weighted_round_robin")
+    policy: ControlPolicy = Field(default_factory=SendBackendRequestPolicy)
+    max_failures: int = Field(default=3, gt=0)
+    ejection_seconds: float = Field(default=30.0, gt=0)
+
+    # Current weights of the smooth weighted round robin, by endpoint index
+    _current_weights: Dict[int, float] = PrivateAttr(default_factory=dict)
+
+    @field_validator("policy", mode="before")
+    @classmethod
+    def validate_policy(cls, value: Any) -> Any:
+        """Load the wrapped policy from its serialized form."""
+        if isinstance(value, dict):
+            return ControlPolicy.from_serialized(value)
+        return value
+
+    async def apply(
+        self,
+        transaction: Transaction,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> Transaction:
+        """
+        Points the request at an endpoint of the pool, then applies the wrapped policy.
+
+        Args:
+            transaction: The current transaction.
+            container: The application dependency container, holding the endpoints' health.
+            session: An active SQLAlchemy AsyncSession, passed to the wrapped policy.
+
+        Returns:
+            The transaction, as returned by the wrapped policy.
+
+        Raises:
+            ApiKeyNotFoundError: If the chosen endpoint's API key environment variable is not set.
+            Exception: Propagates any exception raised by the wrapped policy.
+        """
+        index = self.select_endpoint(container.backend_health)
+        endpoint = self.endpoints[index]
+        if endpoint.api_key_env_var is not None:
+            api_key = os.environ.get(endpoint.api_key_env_var)
+            if not api_key:
+                raise ApiKeyNotFoundError(
+                    f"API key not found. Environment variable '{endpoint.api_key_env_var}' is not set or is empty. "
+                    f"({self.name})"
+                )
+            transaction.request.api_key = api_key
+        transaction.request.api_endpoint = endpoint.api_endpoint
+        self.logger.info(f"Sending request to backend endpoint {endpoint.api_endpoint} ({self.name})")
+
+        health = container.backend_health.get(endpoint.api_endpoint)
+        health.start()
+        start_time = time.perf_counter()
+        try:
+            with time_policy_apply(self.policy):
+                transaction = await self.policy.apply(transaction, container, session)
+        except BaseException as e:
+            health.finish()
+            if isinstance(e, Exception) and is_backend_failure(e):
+                self._record_failure(health, endpoint.api_endpoint)
+            raise
+
+        health.record_success(time.perf_counter() - start_time)
+        if transaction.response.stream is not None:
+            transaction.response.stream = self._finish_after(transaction.response.stream, health, endpoint.api_endpoint)
+        else:
+            health.finish()
+        return transaction
+
+    def select_endpoint(self, registry: BackendHealthRegistry) -> int:
+        """Returns the index in `endpoints` of the endpoint the next request should be sent to."""
+        now = time.monotonic()
+        healths = [registry.get(endpoint.api_endpoint) for endpoint in self.endpoints]
+        candidates = [i for i, health in enumerate(healths) if health.is_healthy(now)]
+        if not candidates:
+            self.logger.warning(f"Every backend endpoint is ejected; using all of them ({self.name})")
+            candidates = list(range(len(self.endpoints)))
+
+        if self.strategy == "least_in_flight":
+            loads = {i: healths[i].in_flight / self.endpoints[i].weight for i in candidates}
+            lowest = min(loads.values())
+            candidates = [i for i in candidates if loads[i] == lowest]
+        elif self.strategy == "ewma_latency":
+            unsampled = [i for i in candidates if healths[i].ewma_latency is None]
+            if unsampled:
+                candidates = unsampled
+            else:
+                costs = {
+                    i: (healths[i].ewma_latency or 0.0) * (healths[i].in_flight + 1) / self.endpoints[i].weight
+                    for i in candidates
+                }
+                lowest = min(costs.values())
+                candidates = [i for i in candidates if costs[i] == lowest]
+        return self._weighted_round_robin(candidates)
+
+    def _weighted_round_robin(self, candidates: List[int]) -> int:
+        """Picks one of `candidates` by smooth weighted round robin, which interleaves heavier endpoints evenly."""
+        if len(candidates) == 1:
+            return candidates[0]
+        total = 0.0
+        for i in candidates:
+            weight = self.endpoints[i].weight
+            self._current_weights[i] = self._current_weights.get(i, 0.0) + weight
+            total += weight
+        chosen = max(candidates, key=lambda i: self._current_weights[i])
+        self._current_weights[chosen] -= total
+        return chosen
+
+    def _record_failure(self, health: EndpointHealth, backend_url: str) -> None:
+        if health.record_failure(self.max_failures, self.ejection_seconds):
+            BACKEND_ENDPOINT_EJECTIONS.inc(backend=backend_url)
+            self.logger.warning(
+                f"Ejecting backend endpoint {backend_url} for {self.ejection_seconds}s after "
+                f"{health.consecutive_failures} failures in a row ({self.name})"
+            )
+
+    def _finish_after(
+        self, stream: AsyncIterator[ChatCompletionChunk], health: EndpointHealth, backend_url: str
+    ) -> ObservedStream:
+        """Passes the stream through, counting the request as in flight until it ends or is closed."""
+
+        def on_close(error: Optional[BaseException]) -> None:
+            if isinstance(error, Exception) and is_backend_failure(error):
+                self._record_failure(health, backend_url)
+            health.finish()
+
+        return ObservedStream(stream, on_close)
+
+    def serialize(self) -> SerializableDict:
+        """Serialize the wrapped policy with its own `serialize`, keeping its type-specific fields."""
+        data = super().serialize()
+        data["policy"] = self.policy.serialize()
+        return data
@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import ClassVar, Dict, Optional
 
 from pydantic import Field
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,6 +18,8 @@ class ModelNameReplacementPolicy(ControlPolicy):
     known models must route through specific endpoints.
     """
 
+    modifies_payloads: ClassVar[bool] = True
+
     name: Optional[str] = Field(default="ModelNameReplacementPolicy")
     model_mapping: Dict[str, str] = Field(default_factory=dict)
 
@@ -0,0 +1,311 @@
+# Parallel Policy that applies independent policies concurrently.
+
+import asyncio
+import copy
+from contextlib import AsyncExitStack, nullcontext
+from functools import cached_property
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from psygnal.containers import EventedDict
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.exceptions import PolicyLoadError, PolicyTimeoutError
+from luthien_control.control_policy.serialization import SerializableDict
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.request import Request
+from luthien_control.core.response import Response
+from luthien_control.core.tracked_context import TrackedContext
+from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import time_policy_apply
+from luthien_control.utils import deep_events
+
+_REMOVED = object()
+
+
+def _dump(payload: Optional[BaseModel]) -> Optional[Dict[str, Any]]:
+    return payload.model_dump() if payload is not None else None
+
+
+def _any_member_declares(policy: ControlPolicy, flag: str) -> bool:
+    """Whether `policy`, or any policy nested within it, sets the class-level `flag`."""
+    return any(getattr(member, flag) for member in policy.iter_policies())
+
+
+class _TransactionSnapshot:
+    """The state of a transaction before the members run, used to build views and find their changes."""
+
+    def __init__(self, transaction: Transaction):
+        self.transaction = transaction
+        # The merge replaces the transaction's request and response, so keep the originals
+        self.request = transaction.request
+        self.response = transaction.response
+        self.response_hooks = list(transaction.response.chunk_hooks)
+        self.data = dict(transaction.data)
+
+    @cached_property
+    def request_payload(self) -> Dict[str, Any]:
+        return self.request.payload.model_dump()
+
+    @cached_property
+    def response_payload(self) -> Optional[Dict[str, Any]]:
+        return _dump(self.response.payload)
+
+    def view(self, copy_payloads: bool) -> Transaction:
+        """Builds a view of the transaction for one member.
+
+        The view's request, response and data are its own, so a member can change or replace
+        them. Unless `copy_payloads` is set, the view shares the transaction's payloads, which
+        the member must then not change in place.
+        """
+        request_payload = self.request.payload
+        response_payload = self.response.payload
+        if copy_payloads:
+            request_payload = type(request_payload).model_validate(self.request_payload)
+            if response_payload is not None:
+                response_payload = type(response_payload).model_validate(self.response_payload)
+        # A shared payload must not be wired to the view, or it would relay into it for as
+        # long as the transaction lives.
+        with nullcontext() if copy_payloads else deep_events(False):
+            request = Request(
+                payload=request_payload,
+                api_endpoint=self.request.api_endpoint,
+                api_key=self.request.api_key,
+            )
+            response = Response(
+                api_endpoint=self.response.api_endpoint,
+                stream=self.response.stream,
+                chunk_hooks=list(self.response_hooks),
+                backend_headers=dict(self.response.backend_headers),
+            )
+            if response_payload is not None:
+                raw_body = self.response.raw_body
+                if raw_body is not None:
+                    response.set_backend_payload(response_payload, raw_body)
+                else:
+                    response.payload = response_payload
+            return Transaction(
+                transaction_id=self.transaction.transaction_id,
+                request=request,
+                response=response,
+                data=EventedDict(copy.deepcopy(self.data)),
+            )
+
+    def request_changed(self, view: Transaction) -> bool:
+        original = self.request
+        request = view.request
+        return (
+            request.api_endpoint != original.api_endpoint
+            or request.api_key != original.api_key
+            or (request.payload is not original.payload and request.payload.model_dump() != self.request_payload)
+        )
+
+    def response_changed(self, view: Transaction) -> bool:
+        original = self.response
+        response = view.response
+        return (
+            response.api_endpoint != original.api_endpoint
+            or response.stream is not original.stream
+            or response.chunk_hooks != self.response_hooks
+            or (response.payload is not original.payload and _dump(response.payload) != self.response_payload)
+        )
+
+    def data_changes(self, view: Transaction) -> Dict[str, Any]:
+        """Returns the data keys the view added or changed (and `_REMOVED` for those it removed)."""
+        changes: Dict[str, Any] = {key: _REMOVED for key in self.data if key not in view.data}
+        for key, value in view.data.items():
+            if key not in self.data or value != self.data[key]:
+                changes[key] = value
+        return changes
+
+
+class ParallelPolicy(ControlPolicy):
+    """
+    A Control Policy that applies independent policies concurrently.
+
+    Use this in place of a `SerialPolicy` for members that do not depend on each other's
+    results, such as authentication and remote moderation calls, so that their latencies
+    overlap instead of adding up.
+
+    Each member works on its own view of the transaction, so members cannot observe each
+    other's changes. Views share the request and response payloads, except for members
+    containing a policy that changes them in place (`modifies_payloads`), which get copies.
+    Once all members have finished, their changes are merged into the transaction in
+    member order:
+    - `data` keys a member added, changed or removed are applied key by key;
+    - a request or response a member changed replaces the transaction's.
+    When members change the same key, or both change the request (or response), the later
+    member in `policies` wins, regardless of which finished first.
+
+    If a member raises, or exceeds `timeout_seconds`, the other members are cancelled, the
+    transaction is left unchanged and the first error propagates. Members are given the
+    request's database session, except that, since a session cannot be used concurrently,
+    every member querying it (`uses_db_session`) after the first opens its own.
+
+    Attributes:
+        policies (Sequence[ControlPolicy]): The policies to apply concurrently.
+        timeout_seconds (Optional[float]): The longest each member may take, or None for no limit.
+        name (str): The name of this policy instance, used for logging and
+            identification.
+    """
+
+    name: Optional[str] = Field(default="ParallelPolicy")
+    policies: Sequence[ControlPolicy] = Field(...)
+    timeout_seconds: Optional[float] = Field(default=None, gt=0)
+
+    async def apply(
+        self,
+        transaction: Transaction,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> Transaction:
+        """
+        Applies the contained policies concurrently and merges their changes into the transaction.
+
+        Args:
+            transaction: The current transaction.
+            container: The application dependency container.
+            session: An active SQLAlchemy AsyncSession, passed to the first member policy.
+
+        Returns:
+            The transaction with the changes of all contained policies merged in.
+
+        Raises:
+            PolicyTimeoutError: If a contained policy exceeds `timeout_seconds`.
+            Exception: Propagates the first exception raised by a contained policy.
+        """
+        if not self.policies:
+            return transaction
+        self.logger.debug(f"Entering ParallelPolicy: {self.name}")
+        snapshot = _TransactionSnapshot(transaction)
+        results: List[Transaction] = [
+            snapshot.view(copy_payloads=_any_member_declares(policy, "modifies_payloads")) for policy in self.policies
+        ]
+
+        session_in_use = False
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for i, policy in enumerate(self.policies):
+                    open_session = False
+                    if _any_member_declares(policy, "uses_db_session"):
+                        open_session, session_in_use = session_in_use, True
+                    task_group.create_task(self._apply_member(i, policy, results, container, session, open_session))
+        except BaseExceptionGroup as group:
+            # Surface the error that stopped the group rather than the group itself, so that
+            # policy errors reach the usual handlers.
+            raise group.exceptions[0] from None
+
+        for result in results:
+            self._merge(transaction, snapshot, result)
+        self.logger.debug(f"Exiting ParallelPolicy: {self.name}")
+        return transaction
+
+    async def _apply_member(
+        self,
+        index: int,
+        policy: ControlPolicy,
+        results: List[Transaction],
+        container: DependencyContainer,
+        session: AsyncSession,
+        open_session: bool,
+    ) -> None:
+        """Applies a member policy to its view of the transaction, `results[index]`.
+
+        The member uses `session`, or a session of its own if `open_session` is set.
+        """
+        member_policy_name = getattr(policy, "name", policy.__class__.__name__)
+        self.logger.info(f"Applying policy {index + 1}/{len(self.policies)} in {self.name}: {member_policy_name}")
+        try:
+            with time_policy_apply(policy):
+                async with asyncio.timeout(self.timeout_seconds), AsyncExitStack() as stack:
+                    if open_session:
+                        session = await stack.enter_async_context(container.db_session_factory())
+                    results[index] = await policy.apply(results[index], container=container, session=session)
+        except TimeoutError:
+            message = f"Policy {member_policy_name} within {self.name} timed out after {self.timeout_seconds}s"
+            self.logger.error(message)
+            raise PolicyTimeoutError(message, policy_name=member_policy_name)
+        except Exception as e:
+            self.logger.error(f"Error applying policy {member_policy_name} within {self.name}: {e}", exc_info=True)
+            raise
+
+    async def apply_headers(
+        self,
+        context: TrackedContext,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> TrackedContext:
+        """Applies the contained policies' header-level steps to a raw passthrough request.
+
+        These steps are cheap and share the request, so they run one after another in member order.
+        """
+        for policy in self.policies:
+            context = await policy.apply_headers(context, container=container, session=session)
+        return context
+
+    def iter_header_policies(self) -> Iterator[ControlPolicy]:
+        yield self
+        for policy in self.policies:
+            yield from policy.iter_header_policies()
+
+    def _merge(self, transaction: Transaction, snapshot: _TransactionSnapshot, result: Transaction) -> None:
+        """Applies the changes one member made to its view to the transaction."""
+        if snapshot.request_changed(result):
+            transaction.request = result.request
+        if snapshot.response_changed(result):
+            transaction.response = result.response
+        for key, value in snapshot.data_changes(result).items():
+            if value is _REMOVED:
+                transaction.data.pop(key, None)
+            else:
+                transaction.data[key] = value
+
+    def __repr__(self) -> str:
+        """Provides a developer-friendly representation."""
+        policy_reprs = [f"{p.name} <{p.__class__.__name__}>" for p in self.policies]
+        return f"<{self.name}(policies=[{', '.join(policy_reprs)}])>"
+
+    @classmethod
+    def from_serialized(cls, config: SerializableDict) -> "ParallelPolicy":
+        """
+        Constructs a ParallelPolicy from serialized data, loading member policies.
+
+        Args:
+            config: The serialized configuration dictionary. Expects a 'policies' key
+                    containing a list of serialized policies, each with a 'type' and either
+                    its settings alongside or a nested 'config' dictionary.
+
+        Returns:
+            An instance of ParallelPolicy.
+
+        Raises:
+            PolicyLoadError: If 'policies' is missing or not a list, or if loading a member
+                             policy fails.
+        """
+        member_configs = config.get("policies")
+        if member_configs is None:
+            raise PolicyLoadError("ParallelPolicy config missing 'policies' list (key not found).")
+        if not isinstance(member_configs, Iterable) or isinstance(member_configs, (str, dict)):
+            raise PolicyLoadError(f"ParallelPolicy 'policies' must be a list. Got {type(member_configs)}")
+
+        policies = []
+        for i, member_config in enumerate(member_configs):
+            if not isinstance(member_config, dict):
+                raise PolicyLoadError(
+                    f"Item at index {i} in ParallelPolicy 'policies' is not a dictionary. Got {type(member_config)}"
+                )
+            # Members may also be given as {"type": ..., "config": {...}}, as in SerialPolicy configs
+            nested_config = member_config.get("config")
+            if isinstance(nested_config, dict):
+                member_config = {**{k: v for k, v in member_config.items() if k != "config"}, **nested_config}
+            try:
+                policies.append(ControlPolicy.from_serialized(member_config))
+            except Exception as e:
+                raise PolicyLoadError(
+                    f"Failed to load member policy at index {i} "
+                    f"(name: {member_config.get('name', 'unknown')}) within ParallelPolicy: {e}"
+                ) from e
+
+        # The remaining keys (name, timeout_seconds, ...) are validated as the model's own fields
+        return cls.model_validate({**config, "policies": policies})
@@ -5,12 +5,20 @@ from typing import Dict, Type
 from .add_api_key_header import AddApiKeyHeaderPolicy
 from .add_api_key_header_from_env import AddApiKeyHeaderFromEnvPolicy
 from .backend_call_policy import BackendCallPolicy
+from .backend_rate_limit_policy import BackendRateLimitPolicy
 from .branching_policy import BranchingPolicy
+from .circuit_breaker_policy import CircuitBreakerPolicy
 from .client_api_key_auth import ClientApiKeyAuthPolicy
+from .client_quota_policy import ClientQuotaPolicy
 from .control_policy import ControlPolicy
+from .embeddings_batching_policy import EmbeddingsBatchingPolicy
 from .leaked_api_key_detection import LeakedApiKeyDetectionPolicy
+from .leaked_api_key_response_detection import LeakedApiKeyResponseDetectionPolicy
+from .load_balanced_backend_policy import LoadBalancedBackendPolicy
 from .model_name_replacement import ModelNameReplacementPolicy
 from .noop_policy import NoopPolicy
+from .parallel_policy import ParallelPolicy
+from .response_cache_policy import ResponseCachePolicy
 from .send_backend_request import SendBackendRequestPolicy
 from .serial_policy import SerialPolicy
 from .set_backend_policy import SetBackendPolicy
@@ -19,13 +27,21 @@ from .set_backend_policy import SetBackendPolicy
 POLICY_NAME_TO_CLASS: Dict[str, Type["ControlPolicy"]] = {
     "AddApiKeyHeader": AddApiKeyHeaderPolicy,
     "BackendCallPolicy": BackendCallPolicy,
+    "BackendRateLimit": BackendRateLimitPolicy,
     "BranchingPolicy": BranchingPolicy,
+    "CircuitBreaker": CircuitBreakerPolicy,
     "ClientApiKeyAuth": ClientApiKeyAuthPolicy,
+    "ClientQuota": ClientQuotaPolicy,
+    "EmbeddingsBatching": EmbeddingsBatchingPolicy,
     "SendBackendRequest": SendBackendRequestPolicy,
     "SerialPolicy": SerialPolicy,
+    "ParallelPolicy": ParallelPolicy,
     "AddApiKeyHeaderFromEnv": AddApiKeyHeaderFromEnvPolicy,
     "LeakedApiKeyDetection": LeakedApiKeyDetectionPolicy,
+    "LeakedApiKeyResponseDetection": LeakedApiKeyResponseDetectionPolicy,
+    "LoadBalancedBackend": LoadBalancedBackendPolicy,
     "ModelNameReplacement": ModelNameReplacementPolicy,
+    "ResponseCache": ResponseCachePolicy,
     "SetBackendPolicy": SetBackendPolicy,
     "NoopPolicy": NoopPolicy,
 }
@@ -0,0 +1,144 @@
+"""
+Control Policy for serving repeated chat completion requests from a cache.
+"""
+
+from typing import Any, ClassVar, Optional
+
+from pydantic import Field, field_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.api.openai_chat_completions import OpenAIChatCompletionsResponse
+from luthien_control.api.openai_chat_completions.request import OpenAIChatCompletionsRequest
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.serialization import SerializableDict
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.response_cache import ResponseCacheStore, is_deterministic_request, response_cache_key
+from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import RESPONSE_CACHE_REQUESTS, time_policy_apply
+from luthien_control.utils import json_codec
+
+
+class ResponseCachePolicy(ControlPolicy):
+    """Serves identical chat completion requests from a cache instead of the backend.
+
+    This policy wraps the policy that sends the backend request (typically
+    `SendBackendRequestPolicy`). Each request is keyed by a hash of its canonicalized form,
+    its backend URL and its backend API key, so that responses are only served to requests
+    authorized with the same key; fields that do not affect the completion, such as
+    `metadata` and `user`, are left out of the key. On a hit the cached response is returned and the wrapped
+    policy is skipped; on a miss the wrapped policy runs and its response is cached for
+    `ttl_seconds`.
+
+    Only non-streamed requests are cached. With `deterministic_only` (the default), so are
+    only requests whose completion is reproducible: those with `temperature` 0 or a `seed`.
+
+    Clients can opt out per request with a `cache_control` entry in the request `metadata`:
+    - `no-cache`: skip the lookup and fetch a fresh response, which replaces the cached one.
+    - `no-store`: bypass the cache entirely.
+
+    The outcome (`hit`, `miss` or `bypass`) is recorded in `transaction.data[RESULT_KEY]` and
+    in the `luthien_response_cache_requests_total` metric; the store itself counts hits and
+    misses, see `ResponseCacheStore.stats`.
+
+    Attributes:
+        policy: The policy producing responses on a cache miss.
+        store: Name of the store in the container's `response_caches`: `memory` for the
+            in-process cache or `database` for the `response_cache` table.
+        ttl_seconds: How long a cached response is served.
+        deterministic_only: Whether to cache only requests with `temperature` 0 or a `seed`.
+    """
+
+    RESULT_KEY: ClassVar[str] = "response_cache"
+    CACHE_CONTROL_KEY: ClassVar[str] = "cache_control"
+
+    name: Optional[str] = Field(default="ResponseCachePolicy")
+    policy: ControlPolicy = Field(...)
+    store: str = Field(default="memory")
+    ttl_seconds: float = Field(default=3600.0, gt=0)
+    deterministic_only: bool = Field(default=True)
+
+    @field_validator("policy", mode="before")
+    @classmethod
+    def validate_policy(cls, value: Any) -> Any:
+        """Load the wrapped policy from its serialized form."""
+        if isinstance(value, dict):
+            return ControlPolicy.from_serialized(value)
+        return value
+
+    async def apply(
+        self,
+        transaction: Transaction,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> Transaction:
+        """
+        Serves the response from the cache, or applies the wrapped policy and caches its response.
+
+        Args:
+            transaction: The current transaction.
+            container: The application dependency container, holding the cache stores.
+            session: An active SQLAlchemy AsyncSession, passed to the wrapped policy. The
+                database store uses sessions of its own.
+
+        Returns:
+            The transaction, with the cached response or the one produced by the wrapped policy.
+
+        Raises:
+            ValueError: If `store` does not name one of the container's response caches.
+            Exception: Propagates any exception raised by the wrapped policy.
+        """
+        store = container.response_caches.get(self.store)
+        if store is None:
+            raise ValueError(f"Unknown response cache store '{self.store}' ({self.name})")
+
+        request = transaction.request
+        payload = request.payload
+        cache_control = (payload.metadata or {}).get(self.CACHE_CONTROL_KEY)
+        if cache_control == "no-store" or not self._is_cacheable(payload):
+            self._record(transaction, "bypass")
+            return await self._apply_policy(transaction, container, session)
+
+        key = response_cache_key(payload, request.api_endpoint, request.api_key)
+        if cache_control != "no-cache":
+            body = await store.get(key)
+            if body is not None:
+                self.logger.info(f"Serving response from the '{self.store}' cache ({self.name})")
+                transaction.response.set_backend_payload(
+                    json_codec.decode_model(OpenAIChatCompletionsResponse, body), body
+                )
+                transaction.response.api_endpoint = request.api_endpoint
+                self._record(transaction, "hit")
+                return transaction
+
+        self._record(transaction, "miss")
+        transaction = await self._apply_policy(transaction, container, session)
+        await self._store_response(transaction, store, key)
+        return transaction
+
+    def _is_cacheable(self, payload: OpenAIChatCompletionsRequest) -> bool:
+        if payload.stream:
+            return False
+        return not self.deterministic_only or is_deterministic_request(payload)
+
+    async def _apply_policy(
+        self, transaction: Transaction, container: DependencyContainer, session: AsyncSession
+    ) -> Transaction:
+        with time_policy_apply(self.policy):
+            return await self.policy.apply(transaction, container, session)
+
+    async def _store_response(self, transaction: Transaction, store: ResponseCacheStore, key: str) -> None:
+        response = transaction.response
+        if response.stream is not None or response.payload is None:
+            return
+        body = response.raw_body if response.raw_body is not None else json_codec.encode_model(response.payload)
+        await store.put(key, body, self.ttl_seconds)
+
+    def _record(self, transaction: Transaction, result: str) -> None:
+        transaction.data[self.RESULT_KEY] = result
+        RESPONSE_CACHE_REQUESTS.inc(store=self.store, result=result)
+
+    def serialize(self) -> SerializableDict:
+        """Serialize the wrapped policy with its own `serialize`, keeping its type-specific fields."""
+        data = super().serialize()
+        data["policy"] = self.policy.serialize()
+        return data
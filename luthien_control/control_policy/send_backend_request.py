@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import openai
 from pydantic import Field
@@ -8,7 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from luthien_control.api.openai_chat_completions import OpenAIChatCompletionsResponse
 from luthien_control.control_policy.control_policy import ControlPolicy
 from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.response_cache import is_deterministic_request, response_cache_key
 from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import BACKEND_REQUEST_DURATION, BACKEND_REQUESTS_COALESCED
+from luthien_control.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
@@ -18,14 +21,20 @@ class SendBackendRequestPolicy(ControlPolicy):
     Policy responsible for sending the chat completions request to the OpenAI-compatible backend
     using the OpenAI SDK and storing the structured response.
 
+    Identical deterministic requests (`temperature` 0 or a `seed`) sent while one is already in
+    flight to the same backend with the same API key wait for that request's response instead
+    of calling the backend again; each gets its own copy of the response.
+
     Attributes:
         name (str): The name of this policy instance, used for logging and
             identification. It defaults to the class name if not provided
             during initialization.
+        coalesce (bool): Whether identical concurrent deterministic requests share one backend call.
         logger (logging.Logger): The logger instance for this policy.
     """
 
     name: Optional[str] = Field(default="SendBackendRequestPolicy")
+    coalesce: bool = Field(default=True)
 
     def _create_debug_info(
         self, backend_url: str, request_payload: Any, error: Exception, api_key: str = ""
@@ -80,6 +89,8 @@ class SendBackendRequestPolicy(ControlPolicy):
         This policy uses the OpenAI SDK to send the structured chat completions request
         from transaction.request.payload to the backend API endpoint. The response
         is stored as a structured OpenAIChatCompletionsResponse in transaction.response.payload.
+        If the request asks for a streamed response (`stream: true`), the backend chunk stream
+        is stored in transaction.response.stream instead and the payload is left unset.
 
         Args:
             transaction: The current transaction, containing the request payload to be sent.
@@ -88,7 +99,8 @@ class SendBackendRequestPolicy(ControlPolicy):
 
         Returns:
             The Transaction, updated with transaction.response.payload containing the
-            OpenAIChatCompletionsResponse from the backend.
+            OpenAIChatCompletionsResponse from the backend (or transaction.response.stream
+            for streamed requests).
 
         Raises:
             ValueError: If backend URL or API key is not configured.
@@ -120,18 +132,40 @@ class SendBackendRequestPolicy(ControlPolicy):
 
         try:
             # Send request using OpenAI SDK
-            # Use the request payload directly - the OpenAI SDK should accept our Pydantic model
-            request_dict = request_payload.model_dump()
-            # Remove any None values to avoid issues with the OpenAI SDK
-            request_dict = {k: v for k, v in request_dict.items() if v is not None}
-
-            backend_response = await openai_client.chat.completions.create(**request_dict)
-
-            # Convert OpenAI SDK response to our structured response model
-            response_payload = OpenAIChatCompletionsResponse.model_validate(backend_response.model_dump())
+            # Leave out None values to avoid issues with the OpenAI SDK
+            request_dict = request_payload.model_dump(exclude_none=True)
+
+            if request_dict.get("stream"):
+                # Hand the chunk stream to the orchestrator, which forwards chunks to the client as they arrive
+                with BACKEND_REQUEST_DURATION.time(backend=backend_url):
+                    transaction.response.stream = await openai_client.chat.completions.create(**request_dict)
+                transaction.response.api_endpoint = backend_url
+                self.logger.info(f"Opened streaming backend response. ({self.name})")
+                return transaction
+
+            # Take the raw response so the body is parsed once, straight into our model, and the
+            # original bytes can be returned to the client untouched if no policy modifies it.
+            async def send() -> Tuple[bytes, Dict[str, str]]:
+                with BACKEND_REQUEST_DURATION.time(backend=backend_url):
+                    raw_response = await openai_client.chat.completions.with_raw_response.create(**request_dict)
+                    headers = {key.lower(): value for key, value in raw_response.headers.items()}
+                    return raw_response.content, headers
+
+            if self.coalesce and is_deterministic_request(request_payload):
+                in_flight = container.backend_requests_in_flight
+                key = response_cache_key(request_payload, backend_url, api_key)
+                if in_flight.in_flight(key):
+                    self.logger.info(f"Waiting for an identical backend request already in flight. ({self.name})")
+                    BACKEND_REQUESTS_COALESCED.inc(backend=backend_url)
+                raw_body, headers = await in_flight.run(key, send)
+            else:
+                raw_body, headers = await send()
+            # Each request parses its own copy of the (possibly shared) body
+            response_payload = json_codec.decode_model(OpenAIChatCompletionsResponse, raw_body)
 
             # Store the structured response in the transaction
-            transaction.response.payload = response_payload
+            transaction.response.set_backend_payload(response_payload, raw_body)
+            transaction.response.backend_headers = dict(headers)
             transaction.response.api_endpoint = backend_url
 
             self.logger.info(
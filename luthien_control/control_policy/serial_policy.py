@@ -1,6 +1,6 @@
 # Serial Policy that applies a sequence of other policies.
 
-from typing import Iterable, Optional, Sequence
+from typing import Iterable, Iterator, Optional, Sequence
 
 from pydantic import Field
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,7 +9,9 @@ from luthien_control.control_policy.control_policy import ControlPolicy
 from luthien_control.control_policy.exceptions import PolicyLoadError
 from luthien_control.control_policy.serialization import SerializableDict, SerializedPolicy
 from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.tracked_context import TrackedContext
 from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import time_policy_apply
 
 
 class SerialPolicy(ControlPolicy):
@@ -65,7 +67,8 @@ class SerialPolicy(ControlPolicy):
             member_policy_name = getattr(policy, "name", policy.__class__.__name__)  # Get policy name if available
             self.logger.info(f"Applying policy {i + 1}/{len(self.policies)} in {self.name}: {member_policy_name}")
             try:
-                current_transaction = await policy.apply(current_transaction, container=container, session=session)
+                with time_policy_apply(policy):
+                    current_transaction = await policy.apply(current_transaction, container=container, session=session)
             except Exception as e:
                 self.logger.error(
                     f"Error applying policy {member_policy_name} within {self.name}: {e}",
@@ -75,6 +78,22 @@ class SerialPolicy(ControlPolicy):
         self.logger.debug(f"Exiting SerialPolicy: {self.name}")
         return current_transaction
 
+    async def apply_headers(
+        self,
+        context: TrackedContext,
+        container: DependencyContainer,
+        session: AsyncSession,
+    ) -> TrackedContext:
+        """Applies the contained policies' header-level steps to a raw passthrough request, in order."""
+        for policy in self.policies:
+            context = await policy.apply_headers(context, container=container, session=session)
+        return context
+
+    def iter_header_policies(self) -> Iterator[ControlPolicy]:
+        yield self
+        for policy in self.policies:
+            yield from policy.iter_header_policies()
+
     def __repr__(self) -> str:
         """Provides a developer-friendly representation."""
         # Get the name of each policy, using getattr as fallback like in apply
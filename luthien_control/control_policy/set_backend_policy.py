@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from luthien_control.control_policy.control_policy import ControlPolicy
 from luthien_control.control_policy.serialization import SerializableDict
 from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.tracked_context import BACKEND_URL_KEY, TrackedContext
 from luthien_control.core.transaction import Transaction
 
 
@@ -24,6 +25,14 @@ class SetBackendPolicy(ControlPolicy):
             transaction.request.api_endpoint = self.backend_url
         return transaction
 
+    async def apply_headers(
+        self, context: TrackedContext, container: DependencyContainer, session: AsyncSession
+    ) -> TrackedContext:
+        if self.backend_url is not None:
+            # The raw passthrough engine appends the requested path to this base URL
+            context.set_data(BACKEND_URL_KEY, self.backend_url)
+        return context
+
     def _get_policy_specific_config(self) -> SerializableDict:
         """Return policy-specific configuration for backward compatibility with tests."""
         return SerializableDict(
@@ -0,0 +1,117 @@
+# Process-level cache of client API key lookups.
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from luthien_control.db.sqlmodel_models import ClientApiKey
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedApiKey:
+    """A snapshot of the `ClientApiKey` fields needed to authenticate a request.
+
+    We keep a detached copy rather than the ORM instance itself, since the instance belongs
+    to the session of the request that loaded it.
+    """
+
+    id: Optional[int]
+    name: str
+    is_active: bool
+    metadata: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_db(cls, api_key: ClientApiKey) -> "CachedApiKey":
+        metadata = dict(api_key.metadata_) if api_key.metadata_ is not None else None
+        return cls(id=api_key.id, name=api_key.name, is_active=api_key.is_active, metadata=metadata)
+
+
+@dataclass
+class ApiKeyCacheEntry:
+    """A cached lookup result. `api_key` is None for keys known not to exist (negative caching)."""
+
+    api_key: Optional[CachedApiKey]
+    expires_at: float
+
+
+class ApiKeyCache:
+    """LRU cache of client API key lookups with separate TTLs for found and unknown keys.
+
+    Known keys are cached for `ttl` seconds; keys that were not found are cached for the
+    (typically much shorter) `negative_ttl`, so repeated requests with a bad key don't
+    each hit the database. Entries are keyed by a hash of the key value.
+
+    All operations are synchronous, so they are atomic with respect to other coroutines.
+    """
+
+    def __init__(self, ttl: float = 60.0, negative_ttl: float = 5.0, max_size: int = 10000) -> None:
+        """Initializes the cache.
+
+        Args:
+            ttl: Seconds a found key is trusted without checking the database. Use 0 to disable caching.
+            negative_ttl: Seconds an unknown key is remembered as invalid. Use 0 to disable negative caching.
+            max_size: Maximum number of entries; the least recently used entries are evicted first.
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, ApiKeyCacheEntry] = OrderedDict()
+
+    @staticmethod
+    def _key(key_value: str) -> str:
+        return hashlib.sha256(key_value.encode()).hexdigest()
+
+    def get(self, key_value: str) -> Optional[ApiKeyCacheEntry]:
+        """Returns the unexpired entry for `key_value`, or None on a cache miss."""
+        key = self._key(key_value)
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key_value: str, api_key: ClientApiKey) -> CachedApiKey:
+        """Caches a key loaded from the database and returns its cached snapshot."""
+        cached = CachedApiKey.from_db(api_key)
+        self._store(key_value, cached, self.ttl)
+        return cached
+
+    def put_missing(self, key_value: str) -> None:
+        """Remembers that `key_value` does not match any active key."""
+        self._store(key_value, None, self.negative_ttl)
+
+    def _store(self, key_value: str, api_key: Optional[CachedApiKey], ttl: float) -> None:
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        key = self._key(key_value)
+        self._entries[key] = ApiKeyCacheEntry(api_key=api_key, expires_at=time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key_value: Optional[str] = None) -> None:
+        """Drops the cached entry for `key_value`, or every entry if `key_value` is None."""
+        if key_value is None:
+            self._entries.clear()
+            logger.info("Invalidated all cached client API keys.")
+        elif self._entries.pop(self._key(key_value), None) is not None:
+            logger.info("Invalidated cached client API key.")
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters and the current number of entries."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,86 @@
+# Observed load, latency and health of backend endpoints.
+
+import logging
+import time
+from typing import Dict, Optional
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest sample in the exponentially weighted moving average of latencies
+EWMA_ALPHA = 0.3
+
+
+def is_backend_failure(error: BaseException) -> bool:
+    """Returns whether `error` says the backend is unhealthy (timeout, connection error, 429 or 5xx)."""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+class EndpointHealth:
+    """Load, latency and health of one backend endpoint, as observed from the requests sent to it.
+
+    An endpoint is ejected (considered unhealthy) for `ejection_seconds` once `max_failures`
+    requests in a row have failed; after that, requests are sent to it again and the first
+    failure ejects it anew, until a request succeeds.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.ewma_latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    def is_healthy(self, now: Optional[float] = None) -> bool:
+        """Returns whether the endpoint is not currently ejected."""
+        return (now if now is not None else time.monotonic()) >= self.ejected_until
+
+    def start(self) -> None:
+        """Records that a request to the endpoint was sent."""
+        self.in_flight += 1
+
+    def finish(self) -> None:
+        """Records that a request to the endpoint ended (including a streamed response being fully read)."""
+        self.in_flight = max(0, self.in_flight - 1)
+
+    def record_success(self, latency: float) -> None:
+        """Records a successful response, received `latency` seconds after the request was sent."""
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += EWMA_ALPHA * (latency - self.ewma_latency)
+
+    def record_failure(self, max_failures: int, ejection_seconds: float) -> bool:
+        """Records a failed request (an error or timeout of the backend itself).
+
+        Returns:
+            Whether this failure ejected the endpoint.
+        """
+        self.consecutive_failures += 1
+        if self.consecutive_failures < max_failures:
+            return False
+        self.ejected_until = time.monotonic() + ejection_seconds
+        return True
+
+
+class BackendHealthRegistry:
+    """Process-level `EndpointHealth`s, one per backend URL, shared by every policy sending requests to it."""
+
+    def __init__(self) -> None:
+        self._endpoints: Dict[str, EndpointHealth] = {}
+
+    def get(self, backend_url: str) -> EndpointHealth:
+        """Returns the health of `backend_url`, creating a healthy one without history on first use."""
+        health = self._endpoints.get(backend_url)
+        if health is None:
+            health = self._endpoints[backend_url] = EndpointHealth()
+        return health
+
+    def __len__(self) -> int:
+        return len(self._endpoints)
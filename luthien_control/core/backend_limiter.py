@@ -0,0 +1,316 @@
+# Flow control between the proxy and its backends.
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parses a duration such as `1s`, `6m0s` or `20ms` (as in `x-ratelimit-reset-*` headers) into seconds.
+
+    Plain numbers are taken as seconds. Returns None if `value` is not a duration.
+    """
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+class TokenBucket:
+    """A token bucket refilled continuously at `per_minute` tokens per minute, holding at most a minute's worth."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.per_minute = per_minute
+        self._tokens = per_minute
+        self._updated = time.monotonic()
+
+    @property
+    def capacity(self) -> float:
+        return self.per_minute
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """The number of tokens currently available (negative while in debt)."""
+        self._refill()
+        return self._tokens
+
+    def delay(self, amount: float) -> float:
+        """Returns the seconds until `amount` tokens (at most the capacity) are available."""
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing * 60 / self.per_minute)
+
+    def consume(self, amount: float) -> None:
+        """Takes `amount` tokens; a negative amount returns tokens. The bucket may go into debt."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+    def limit_to(self, available: float) -> None:
+        """Lowers the available tokens to `available`, e.g. as reported by the backend."""
+        self._refill()
+        self._tokens = min(self._tokens, available)
+
+    def set_rate(self, per_minute: float) -> None:
+        """Changes the refill rate (and capacity), keeping the available tokens within the new capacity."""
+        self._refill()
+        self.per_minute = per_minute
+        self._tokens = min(self._tokens, self.capacity)
+
+
+class BackendLimitExceeded(Exception):
+    """Raised when a backend request cannot be admitted by its `BackendLimiter`.
+
+    Attributes:
+        reason: `queue_full` if too many requests were already waiting, `deadline` if the
+            request waited longer than allowed.
+    """
+
+    def __init__(self, message: str, reason: str) -> None:
+        super().__init__(message)
+        self.reason = reason
+
+
+def _min_limit(*limits: Optional[float]) -> Optional[float]:
+    present = [limit for limit in limits if limit is not None]
+    return min(present) if present else None
+
+
+class BackendLimiter:
+    """Admits requests to one backend within request and token rate limits and a concurrency limit.
+
+    Requests are admitted in arrival order. A request waits until a concurrency slot is free and
+    both token buckets (requests per minute, and tokens per minute for its estimated size) can
+    cover it. At most `max_queue` requests wait at once, each for at most the deadline given to
+    `acquire`; others are rejected with `BackendLimitExceeded`.
+
+    Limits reported by the backend in `x-ratelimit-*` headers are learned with `update_from_headers`:
+    a reported limit lower than the configured one (or one that was not configured) is adopted,
+    the remaining quota lowers the available tokens, and an exhausted quota or a `retry-after`
+    pauses admission until it resets.
+
+    All state changes are synchronous, so they are atomic with respect to other coroutines.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ) -> None:
+        """Initializes the limiter.
+
+        Args:
+            requests_per_minute: Maximum request rate, or None for no limit.
+            tokens_per_minute: Maximum rate of (estimated) tokens, or None for no limit.
+            max_in_flight: Maximum number of concurrent requests, or None for no limit.
+            max_queue: Maximum number of requests waiting for admission, or None for no limit.
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._configured_rpm: Optional[float] = None
+        self._configured_tpm: Optional[float] = None
+        self._reported_rpm: Optional[float] = None
+        self._reported_tpm: Optional[float] = None
+        self.requests: Optional[TokenBucket] = None
+        self.tokens: Optional[TokenBucket] = None
+        self._paused_until = 0.0
+        self._queue: Deque[object] = deque()
+        self._changed = asyncio.Event()
+        self._configured_rpm = requests_per_minute
+        self._configured_tpm = tokens_per_minute
+        self._update_buckets()
+
+    def _update_buckets(self) -> None:
+        self.requests = self._resized(self.requests, _min_limit(self._configured_rpm, self._reported_rpm))
+        self.tokens = self._resized(self.tokens, _min_limit(self._configured_tpm, self._reported_tpm))
+
+    @staticmethod
+    def _resized(bucket: Optional[TokenBucket], per_minute: Optional[float]) -> Optional[TokenBucket]:
+        if per_minute is None or per_minute <= 0:
+            return None
+        if bucket is None:
+            return TokenBucket(per_minute)
+        if bucket.per_minute != per_minute:
+            bucket.set_rate(per_minute)
+        return bucket
+
+    def _delay(self, tokens: float) -> Optional[float]:
+        """Seconds until a request of `tokens` tokens can be admitted, or None if it must wait for a free slot."""
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            return None
+        delay = max(0.0, self._paused_until - time.monotonic())
+        if self.requests is not None:
+            delay = max(delay, self.requests.delay(1))
+        if self.tokens is not None and tokens > 0:
+            delay = max(delay, self.tokens.delay(tokens))
+        return delay
+
+    def _admit(self, tokens: float) -> None:
+        self.in_flight += 1
+        self.admitted += 1
+        if self.requests is not None:
+            self.requests.consume(1)
+        if self.tokens is not None and tokens > 0:
+            self.tokens.consume(min(tokens, self.tokens.capacity))
+
+    def _notify(self) -> None:
+        """Wakes up the waiting requests to re-check whether they can be admitted."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def acquire(self, tokens: float = 0, timeout: Optional[float] = None) -> None:
+        """Waits until a request of `tokens` (estimated) tokens may be sent. Call `release` once it completes.
+
+        Args:
+            tokens: Estimated number of tokens the request will use.
+            timeout: Longest time to wait, or None to wait indefinitely.
+
+        Raises:
+            BackendLimitExceeded: If `max_queue` requests are already waiting, or `timeout` expires.
+        """
+        if not self._queue and self._delay(tokens) == 0:
+            self._admit(tokens)
+            return
+        if self.max_queue is not None and len(self._queue) >= self.max_queue:
+            self.rejected += 1
+            raise BackendLimitExceeded(f"{len(self._queue)} requests are already waiting for the backend", "queue_full")
+
+        ticket = object()
+        self._queue.append(ticket)
+        try:
+            async with asyncio.timeout(timeout):
+                while True:
+                    delay = self._delay(tokens) if self._queue[0] is ticket else None
+                    if delay == 0:
+                        self._admit(tokens)
+                        return
+                    changed = self._changed
+                    try:
+                        await asyncio.wait_for(changed.wait(), delay)
+                    except TimeoutError:
+                        pass
+        except TimeoutError:
+            self.rejected += 1
+            raise BackendLimitExceeded(f"Waited more than {timeout}s for the backend", "deadline") from None
+        finally:
+            self._queue.remove(ticket)
+            self._notify()
+
+    def release(self, estimated_tokens: float = 0, used_tokens: Optional[float] = None) -> None:
+        """Frees the slot of a completed request.
+
+        Args:
+            estimated_tokens: The token estimate the request was admitted with.
+            used_tokens: The tokens the request actually used, if known; the difference from
+                the estimate is returned to (or taken from) the tokens-per-minute bucket.
+        """
+        self.in_flight = max(0, self.in_flight - 1)
+        if self.tokens is not None and used_tokens is not None:
+            self.tokens.consume(used_tokens - min(estimated_tokens, self.tokens.capacity))
+        self._notify()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Adjusts the limits to the rate limit state reported by the backend.
+
+        Understands the `x-ratelimit-{limit,remaining,reset}-{requests,tokens}` headers sent by
+        OpenAI-compatible backends and `retry-after`.
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
+        reported_rpm = self._number(headers.get("x-ratelimit-limit-requests"))
+        reported_tpm = self._number(headers.get("x-ratelimit-limit-tokens"))
+        if (reported_rpm, reported_tpm) != (None, None):
+            self._reported_rpm = reported_rpm if reported_rpm is not None else self._reported_rpm
+            self._reported_tpm = reported_tpm if reported_tpm is not None else self._reported_tpm
+            self._update_buckets()
+
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            remaining = self._number(headers.get(f"x-ratelimit-remaining-{kind}"))
+            if remaining is None:
+                continue
+            if bucket is not None:
+                bucket.limit_to(remaining)
+            reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}", ""))
+            if remaining <= 0 and reset:
+                self.pause(reset)
+
+        retry_after = parse_duration(headers.get("retry-after", ""))
+        if retry_after:
+            self.pause(retry_after)
+        self._notify()
+
+    def pause(self, seconds: float) -> None:
+        """Stops admitting requests for `seconds`."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.info(f"Pausing backend requests for {seconds:.2f}s")
+
+    @staticmethod
+    def _number(value: Optional[str]) -> Optional[float]:
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    @property
+    def waiting(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, float]:
+        """Returns admission counters, the current queue and in-flight counts and the effective limits."""
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "requests_per_minute": self.requests.per_minute if self.requests is not None else 0,
+            "tokens_per_minute": self.tokens.per_minute if self.tokens is not None else 0,
+        }
+
+
+class BackendLimiterRegistry:
+    """Process-level `BackendLimiter`s, one per backend URL and limits, shared by every policy using them.
+
+    Policies configured with different limits for the same backend each get a limiter of
+    their own, rather than overwriting each other's limits.
+    """
+
+    def __init__(self) -> None:
+        self._limiters: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], BackendLimiter] = {}
+
+    def get(self, backend_url: str, **limits: Any) -> BackendLimiter:
+        """Returns the limiter of `backend_url` with `limits`, creating one on first use.
+
+        Args:
+            backend_url: The backend URL.
+            **limits: Keyword arguments of `BackendLimiter`; limits not given are not enforced.
+        """
+        key = (backend_url, tuple(sorted(limits.items())))
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = BackendLimiter(**limits)
+        return limiter
+
+    def __len__(self) -> int:
+        return len(self._limiters)
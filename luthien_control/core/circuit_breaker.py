@@ -0,0 +1,208 @@
+# Circuit breakers failing requests fast while a backend is degraded.
+
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Literal, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class _Outcome(NamedTuple):
+    time: float
+    failed: bool
+    slow: bool
+
+
+class CircuitBreaker:
+    """Tracks the outcome of the requests sent to one backend, and stops sending them while it is degraded.
+
+    The breaker is `closed` while the backend is healthy: requests are sent and their outcomes
+    recorded over a sliding window of `window_seconds`. Once the window holds at least
+    `minimum_calls` outcomes, the breaker opens if the share of failures reaches
+    `failure_rate_threshold`, or the share of responses slower than `slow_call_seconds`
+    reaches `slow_call_rate_threshold`.
+
+    While `open`, requests are rejected without being sent. After `open_seconds` the breaker
+    becomes `half_open` and lets `half_open_max_calls` probe requests through: it closes again
+    once all of them succeed, and reopens as soon as one fails or is slow. A probe still in
+    flight after `open_seconds` counts as failed, so a probe whose outcome is never recorded
+    cannot keep the breaker half open forever.
+
+    `transitions` counts the state changes, so that callers can tell whether an operation changed
+    the state. All state changes are synchronous, so they are atomic with respect to other coroutines.
+    """
+
+    def __init__(
+        self,
+        backend_url: str = "",
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: Optional[float] = None,
+        slow_call_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_seconds: float = 60.0,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        """Initializes a closed breaker without history.
+
+        Args:
+            backend_url: The backend URL, for logging.
+            failure_rate_threshold: Share of failed requests in the window that opens the breaker.
+            slow_call_seconds: Latency above which a response counts as slow, or None to ignore latency.
+            slow_call_rate_threshold: Share of slow responses in the window that opens the breaker.
+            minimum_calls: Outcomes the window must hold before the breaker can open.
+            window_seconds: How long outcomes are kept in the window.
+            open_seconds: How long the breaker stays open before letting probe requests through.
+            half_open_max_calls: Probe requests that must succeed for the breaker to close again.
+        """
+        self.backend_url = backend_url
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.transitions = 0
+        self._state: CircuitState = "closed"
+        self._opened_at = 0.0
+        self._outcomes: Deque[_Outcome] = deque()
+        # Start times of the probe requests in flight, oldest first
+        self._probes_in_flight: Deque[float] = deque()
+        self._probe_successes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state, moving from `open` to `half_open` once `open_seconds` have passed.
+
+        A `half_open` breaker reopens once its oldest probe has been in flight for `open_seconds`.
+        """
+        now = time.monotonic()
+        if self._state == "open" and now >= self._opened_at + self.open_seconds:
+            self._transition("half_open")
+        elif (
+            self._state == "half_open"
+            and self._probes_in_flight
+            and now >= self._probes_in_flight[0] + self.open_seconds
+        ):
+            logger.warning(f"Reopening circuit breaker of {self.backend_url}: a probe request got no outcome in time")
+            self._open()
+        return self._state
+
+    def retry_after(self) -> float:
+        """Returns the seconds until an open breaker lets probe requests through (0 if it is not open)."""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def admit(self) -> Optional[CircuitState]:
+        """Admits a request, if the breaker allows it.
+
+        Returns:
+            The state the request was admitted in (`half_open` for a probe request), to pass to
+            `record_success`, `record_failure` or `release`, or None if the request is rejected.
+        """
+        state = self.state
+        if state == "closed":
+            return state
+        if state == "half_open" and len(self._probes_in_flight) + self._probe_successes < self.half_open_max_calls:
+            self._probes_in_flight.append(time.monotonic())
+            return state
+        return None
+
+    def record_success(self, latency: float, admitted_in: CircuitState) -> None:
+        """Records a response from the backend, received `latency` seconds after the request was sent."""
+        slow = self.slow_call_seconds is not None and latency > self.slow_call_seconds
+        if admitted_in == "half_open":
+            self._end_probe(success=not slow)
+        elif self._state == "closed":
+            self._record(_Outcome(time.monotonic(), failed=False, slow=slow))
+
+    def record_failure(self, admitted_in: CircuitState) -> None:
+        """Records a failed request (an error or timeout of the backend itself)."""
+        if admitted_in == "half_open":
+            self._end_probe(success=False)
+        elif self._state == "closed":
+            self._record(_Outcome(time.monotonic(), failed=True, slow=False))
+
+    def release(self, admitted_in: CircuitState) -> None:
+        """Records that a request ended without telling anything about the backend (e.g. it was cancelled)."""
+        if admitted_in == "half_open" and self._state == "half_open" and self._probes_in_flight:
+            self._probes_in_flight.popleft()
+
+    def _end_probe(self, success: bool) -> None:
+        if self._state != "half_open":
+            return
+        if self._probes_in_flight:
+            self._probes_in_flight.popleft()
+        if not success:
+            self._open()
+            return
+        self._probe_successes += 1
+        if self._probe_successes >= self.half_open_max_calls:
+            self._transition("closed")
+
+    def _record(self, outcome: _Outcome) -> None:
+        self._outcomes.append(outcome)
+        horizon = outcome.time - self.window_seconds
+        while self._outcomes and self._outcomes[0].time < horizon:
+            self._outcomes.popleft()
+
+        calls = len(self._outcomes)
+        if calls < self.minimum_calls:
+            return
+        failure_rate = sum(o.failed for o in self._outcomes) / calls
+        slow_rate = sum(o.slow for o in self._outcomes) / calls
+        if failure_rate >= self.failure_rate_threshold:
+            logger.warning(
+                f"Opening circuit breaker of {self.backend_url}: {failure_rate:.0%} of the last {calls} requests failed"
+            )
+            self._open()
+        elif self.slow_call_seconds is not None and slow_rate >= self.slow_call_rate_threshold:
+            logger.warning(
+                f"Opening circuit breaker of {self.backend_url}: {slow_rate:.0%} of the last {calls} requests "
+                f"took over {self.slow_call_seconds}s"
+            )
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._transition("open")
+
+    def _transition(self, state: CircuitState) -> None:
+        logger.info(f"Circuit breaker of {self.backend_url} is now {state}")
+        self.transitions += 1
+        self._state = state
+        self._outcomes.clear()
+        self._probes_in_flight.clear()
+        self._probe_successes = 0
+
+
+class CircuitBreakerRegistry:
+    """Process-level `CircuitBreaker`s, one per backend URL and thresholds, shared by every policy using them.
+
+    Policies configured with different thresholds for the same backend each get a breaker of
+    their own, rather than overwriting each other's thresholds.
+    """
+
+    def __init__(self) -> None:
+        self._breakers: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], CircuitBreaker] = {}
+
+    def get(self, backend_url: str, **thresholds: Any) -> CircuitBreaker:
+        """Returns the breaker of `backend_url` with `thresholds`, creating a closed one on first use.
+
+        Args:
+            backend_url: The backend URL.
+            **thresholds: Keyword arguments of `CircuitBreaker`; defaults are used for those not given.
+        """
+        key = (backend_url, tuple(sorted(thresholds.items())))
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(backend_url, **thresholds)
+        return breaker
+
+    def __len__(self) -> int:
+        return len(self._breakers)
@@ -0,0 +1,314 @@
+# Per-client-key request and token quotas.
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncContextManager, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.db.client_api_key_usage_crud import create_usage_records, delete_usage_before, sum_usage_since
+
+logger = logging.getLogger(__name__)
+
+QUOTA_METADATA_KEY = "quota"
+
+# Quantities a quota can limit; "tokens" is the sum of prompt and completion tokens
+QUOTA_METRICS = ("requests", "tokens", "prompt_tokens", "completion_tokens")
+QUOTA_WINDOWS = {"minute": 60.0, "hour": 3600.0, "day": 86400.0}
+
+# The quantities actually counted, from which every metric is derived
+_COUNTED = ("requests", "prompt_tokens", "completion_tokens")
+
+
+@dataclass(frozen=True)
+class QuotaLimits:
+    """The quota limits of one client API key.
+
+    Attributes:
+        limits: Maximum counts by limit name, e.g. `{"requests_per_minute": 60, "tokens_per_day": 100000}`.
+            Names combine a metric (`requests`, `tokens`, `prompt_tokens`, `completion_tokens`)
+            and a window (`minute`, `hour`, `day`).
+    """
+
+    limits: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_metadata(cls, metadata: Optional[Mapping[str, Any]]) -> "QuotaLimits":
+        """Reads the limits from the `quota` object of a client API key's `metadata_`.
+
+        Raises:
+            ValueError: If the quota object contains an unknown limit name or a non-numeric limit.
+        """
+        quota = (metadata or {}).get(QUOTA_METADATA_KEY) or {}
+        if not isinstance(quota, Mapping):
+            raise ValueError(f"'{QUOTA_METADATA_KEY}' metadata must be an object (got {type(quota).__name__})")
+        limits: Dict[str, float] = {}
+        for name, limit in quota.items():
+            _parse_limit_name(name)
+            if limit is None:
+                continue
+            if isinstance(limit, bool) or not isinstance(limit, (int, float)):
+                raise ValueError(f"Quota limit '{name}' must be a number (got {limit!r})")
+            limits[name] = float(limit)
+        return cls(limits=limits)
+
+    def __bool__(self) -> bool:
+        return bool(self.limits)
+
+
+def _parse_limit_name(name: str) -> Tuple[str, float]:
+    """Splits a limit name such as `tokens_per_hour` into its metric and its window in seconds."""
+    metric, _, window = name.rpartition("_per_")
+    if metric not in QUOTA_METRICS or window not in QUOTA_WINDOWS:
+        raise ValueError(
+            f"Unknown quota limit '{name}'; expected '<metric>_per_<window>' with metric in "
+            f"{', '.join(QUOTA_METRICS)} and window in {', '.join(QUOTA_WINDOWS)}"
+        )
+    return metric, QUOTA_WINDOWS[window]
+
+
+class SlidingWindowCounter:
+    """Approximates the count over the last `window` seconds from the current and previous fixed windows.
+
+    The previous window's count is weighted by how much of it still overlaps the sliding window,
+    which bounds memory to two numbers per counter while smoothing out the burst allowed at the
+    boundary of fixed windows.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self.current = 0.0
+        self.previous = 0.0
+        self._current_start = time.monotonic()
+
+    def _roll(self, now: float) -> None:
+        elapsed_windows = int((now - self._current_start) // self.window)
+        if elapsed_windows <= 0:
+            return
+        self.previous = self.current if elapsed_windows == 1 else 0.0
+        self.current = 0.0
+        self._current_start += elapsed_windows * self.window
+
+    def add(self, amount: float) -> None:
+        self._roll(time.monotonic())
+        self.current += amount
+
+    def count(self) -> float:
+        now = time.monotonic()
+        self._roll(now)
+        overlap = 1 - (now - self._current_start) / self.window
+        return self.previous * overlap + self.current
+
+
+class _KeyUsage:
+    """The counters of one client API key: one per counted quantity and window."""
+
+    def __init__(self) -> None:
+        self.counters = {
+            (counted, window): SlidingWindowCounter(window) for counted in _COUNTED for window in QUOTA_WINDOWS.values()
+        }
+
+    def add(self, amounts: Mapping[str, float]) -> None:
+        for (counted, _), counter in self.counters.items():
+            if amounts.get(counted):
+                counter.add(amounts[counted])
+
+    def count(self, metric: str, window: float) -> float:
+        if metric == "tokens":
+            return self.count("prompt_tokens", window) + self.count("completion_tokens", window)
+        return self.counters[(metric, window)].count()
+
+
+class ClientQuotaTracker:
+    """Tracks requests and tokens per client API key and checks them against quota limits.
+
+    Counts are kept in memory in sliding windows (see `SlidingWindowCounter`), so checking a
+    quota never touches the database. Recorded usage is also accumulated per key and written to
+    the `client_api_key_usage` table in batches, every `flush_interval` seconds, by a background
+    task (see `start`), which also deletes, every `cleanup_interval` seconds, the rows too old
+    to count towards any quota window. The first time a key's quota is checked with a session, its counters are
+    seeded from the usage persisted in the database, so quotas survive restarts.
+
+    Counters are per process: with several replicas, each enforces the limits on the requests it
+    handles, on top of the usage persisted by the others before the key was first seen.
+
+    All counter operations are synchronous, so they are atomic with respect to other coroutines.
+    """
+
+    def __init__(
+        self,
+        db_session_factory: Optional[Callable[[], AsyncContextManager[AsyncSession]]] = None,
+        flush_interval: float = 10.0,
+        cleanup_interval: float = 3600.0,
+    ) -> None:
+        """Initializes the tracker. Call `start` to begin persisting usage.
+
+        Args:
+            db_session_factory: Factory returning an async context manager that yields a session.
+                Usage is only kept in memory if not provided.
+            flush_interval: Seconds between writes of the accumulated usage.
+            cleanup_interval: Seconds between deletions of usage older than the longest quota window.
+        """
+        self.db_session_factory = db_session_factory
+        self.flush_interval = flush_interval
+        self.cleanup_interval = cleanup_interval
+        self.rejected = 0
+        self.flushed = 0
+        self.failed = 0
+        self._usage: Dict[int, _KeyUsage] = {}
+        self._pending: Dict[int, Dict[str, int]] = {}
+        self._seeding: Dict[int, asyncio.Future] = {}
+        self._seeded: Set[int] = set()
+        # Usage of keys not seeded yet that was already persisted, which seeding must not count twice
+        self._persisted_before_seeding: Dict[int, Dict[str, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self, key_id: int, limits: QuotaLimits, session: Optional[AsyncSession] = None) -> Optional[str]:
+        """Checks whether a key may make another request.
+
+        Args:
+            key_id: The id of the client API key.
+            limits: The key's quota limits.
+            session: Session used to seed the key's counters from the database the first time it is seen.
+
+        Returns:
+            The name of the first limit the key has reached, or None if it is within every limit.
+        """
+        if not limits:
+            return None
+        usage = await self._get_usage(key_id, session)
+        for name, limit in limits.limits.items():
+            metric, window = _parse_limit_name(name)
+            if usage.count(metric, window) >= limit:
+                self.rejected += 1
+                return name
+        return None
+
+    def record(self, key_id: int, requests: int = 0, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        """Adds usage to a key's counters and queues it for persistence."""
+        amounts = {"requests": requests, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+        if not any(amounts.values()):
+            return
+        self._usage.setdefault(key_id, _KeyUsage()).add(amounts)
+        pending = self._pending.setdefault(key_id, dict.fromkeys(_COUNTED, 0))
+        for counted, amount in amounts.items():
+            pending[counted] += amount
+
+    async def _get_usage(self, key_id: int, session: Optional[AsyncSession]) -> _KeyUsage:
+        if key_id in self._seeded or session is None or self.db_session_factory is None:
+            return self._usage.setdefault(key_id, _KeyUsage())
+        seeding = self._seeding.get(key_id)
+        if seeding is None:
+            # Concurrent first requests of a key share one seeding query
+            seeding = self._seeding[key_id] = asyncio.ensure_future(self._seed(key_id, session))
+        await asyncio.shield(seeding)
+        return self._usage[key_id]
+
+    async def _seed(self, key_id: int, session: AsyncSession) -> None:
+        usage = self._usage.setdefault(key_id, _KeyUsage())
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        windows = list(QUOTA_WINDOWS.values())
+        try:
+            sums = await sum_usage_since(session, key_id, [now - timedelta(seconds=window) for window in windows])
+        except Exception as e:
+            logger.error(f"Failed to load persisted usage of client API key {key_id}; counting from zero: {e}")
+            return
+        finally:
+            # A key is only seeded once, even if loading its usage failed
+            self._seeding.pop(key_id, None)
+            self._seeded.add(key_id)
+            persisted = self._persisted_before_seeding.pop(key_id, {})
+        for window, totals in zip(windows, sums):
+            for counted, total in zip(_COUNTED, totals):
+                # Usage recorded by this process is already counted, whether or not it was persisted since
+                total = max(0, total - persisted.get(counted, 0))
+                # Persisted usage decays out of the sliding window as if it had all happened just before now
+                usage.counters[(counted, window)].previous += total
+
+    def start(self) -> None:
+        """Starts the background task persisting usage. Calling it again while running is a no-op."""
+        if self.db_session_factory is not None and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="client-quota-flush")
+
+    async def aclose(self) -> None:
+        """Stops the background task and persists any usage not yet written."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        last_cleanup = time.monotonic()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.shield(self.flush())
+            if time.monotonic() - last_cleanup >= self.cleanup_interval:
+                last_cleanup = time.monotonic()
+                deleted = await asyncio.shield(self.delete_expired())
+                if deleted:
+                    logger.info(f"Deleted {deleted} expired client API key usage record(s)")
+
+    async def delete_expired(self) -> int:
+        """Deletes the persisted usage older than the longest quota window, which no quota counts anymore.
+
+        Returns:
+            The number of rows deleted, 0 if the deletion failed.
+        """
+        if self.db_session_factory is None:
+            return 0
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        try:
+            async with self.db_session_factory() as session:
+                return await delete_usage_before(session, now - timedelta(seconds=max(QUOTA_WINDOWS.values())))
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Failed to delete expired client API key usage: {e}")
+            return 0
+
+    async def flush(self) -> int:
+        """Writes the usage recorded since the last flush, one row per key.
+
+        Returns:
+            The number of rows written. Usage that failed to be written is kept for the next flush.
+        """
+        if self.db_session_factory is None or not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        recorded_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        rows: List[Dict[str, Any]] = [
+            {"api_key_id": key_id, "recorded_at": recorded_at, **amounts} for key_id, amounts in pending.items()
+        ]
+        try:
+            async with self.db_session_factory() as session:
+                count = await create_usage_records(session, rows)
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Failed to persist usage of {len(rows)} client API key(s); retrying later: {e}")
+            for key_id, amounts in pending.items():
+                merged = self._pending.setdefault(key_id, dict.fromkeys(_COUNTED, 0))
+                for counted, amount in amounts.items():
+                    merged[counted] += amount
+            return 0
+        for key_id, amounts in pending.items():
+            if key_id not in self._seeded:
+                persisted = self._persisted_before_seeding.setdefault(key_id, dict.fromkeys(_COUNTED, 0))
+                for counted, amount in amounts.items():
+                    persisted[counted] += amount
+        self.flushed += count
+        return count
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of tracked keys, rejected checks, and written and failed flushes."""
+        return {
+            "keys": len(self._usage),
+            "rejected": self.rejected,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "pending": len(self._pending),
+        }
@@ -1,4 +1,6 @@
+import importlib.util
 import logging
+import os
 from typing import AsyncGenerator
 
 import httpx
@@ -7,11 +9,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from luthien_control.control_policy.control_policy import ControlPolicy
 from luthien_control.control_policy.loader import load_policy_from_file
+from luthien_control.core.api_key_cache import ApiKeyCache
+from luthien_control.core.client_quota import ClientQuotaTracker
 from luthien_control.core.dependency_container import DependencyContainer
-from luthien_control.db.control_policy_crud import PolicyLoadError, load_policy_from_db
+from luthien_control.core.log_sink import TransactionLogSink
+from luthien_control.core.openai_client_registry import OpenAIClientRegistry
+from luthien_control.core.policy_cache import PolicyCache
+from luthien_control.core.response_cache import DatabaseResponseCache, InMemoryResponseCache
+from luthien_control.db.control_policy_crud import PolicyLoadError, get_policy_version, load_policy_from_db
 from luthien_control.db.database_async import create_db_engine
 from luthien_control.db.database_async import get_db_session as db_get_session
+from luthien_control.db.exceptions import LuthienDBQueryError
 from luthien_control.settings import Settings
+from luthien_control.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
@@ -70,35 +80,68 @@ async def get_main_control_policy(
     """
     Dependency to load and provide the main ControlPolicy instance.
 
-    Uses the DependencyContainer to access settings, http_client, and a database session.
+    Instantiated policies are cached in the container's PolicyCache, keyed by policy name
+    (or file path) and version (the policy's `updated_at` in the database, or the file's
+    modification time), so the policy tree is only rebuilt when its source changes.
     """
     settings = dependencies.settings
+    policy_cache = dependencies.policy_cache
     policy_filepath = settings.get_policy_filepath()
     if policy_filepath:
+        file_version = os.path.getmtime(policy_filepath)
+        cached_policy = policy_cache.get(policy_filepath, file_version)
+        if cached_policy is not None:
+            return cached_policy
         logger.info(f"Loading main control policy from file: {policy_filepath}")
-        return load_policy_from_file(policy_filepath)
+        main_policy = load_policy_from_file(policy_filepath)
+        policy_cache.put(policy_filepath, file_version, main_policy)
+        return main_policy
 
     top_level_policy_name = settings.get_top_level_policy_name()
     if not top_level_policy_name:
         logger.error("TOP_LEVEL_POLICY_NAME is not configured in settings.")
         raise HTTPException(status_code=500, detail="Internal server error: Control policy name not configured.")
+
+    cached_policy = policy_cache.get_fresh(top_level_policy_name)
+    if cached_policy is not None:
+        return cached_policy
+
     try:
-        # Get a session using the container's factory - No longer needed here, load_policy_from_db handles it
-        # async with session_factory() as session:
-        # Pass the container directly to load_policy_from_db
-        main_policy = await load_policy_from_db(
-            name=top_level_policy_name,
-            container=dependencies,  # Pass the whole container
-        )
+        # Serialize reloads so a burst of requests after invalidation only rebuilds the policy once
+        async with policy_cache.lock(top_level_policy_name):
+            cached_policy = policy_cache.get_fresh(top_level_policy_name)
+            if cached_policy is not None:
+                return cached_policy
+
+            try:
+                async with dependencies.db_session_factory() as session:
+                    policy_version = await get_policy_version(session, top_level_policy_name)
+            except LuthienDBQueryError:
+                # Let the full load below report the missing policy in its usual way
+                policy_version = None
+            cached_policy = policy_cache.get(top_level_policy_name, policy_version)
+            if cached_policy is not None:
+                return cached_policy
 
-        if not main_policy:
-            logger.error(f"Main control policy '{top_level_policy_name}' could not be loaded (not found or inactive).")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Internal server error: Main control policy '{top_level_policy_name}' not found or inactive.",
+            main_policy = await load_policy_from_db(
+                name=top_level_policy_name,
+                container=dependencies,  # Pass the whole container
             )
 
-        return main_policy
+            if not main_policy:
+                logger.error(
+                    f"Main control policy '{top_level_policy_name}' could not be loaded (not found or inactive)."
+                )
+                raise HTTPException(
+                    status_code=500,
+                    detail=(
+                        f"Internal server error: Main control policy '{top_level_policy_name}' not found or inactive."
+                    ),
+                )
+
+            if policy_version is not None:
+                policy_cache.put(top_level_policy_name, policy_version, main_policy)
+            return main_policy
 
     except PolicyLoadError as e:
         logger.exception(f"Failed to load main control policy '{top_level_policy_name}': {e}")
@@ -131,11 +174,26 @@ async def initialize_app_dependencies(app_settings: Settings) -> DependencyConta
     """
     logger.info("Initializing core application dependencies...")
 
-    # Initialize HTTP client
+    # Initialize HTTP client. Its connection pool is shared by every backend client, so keep-alive
+    # connections to backends are reused across requests.
     timeout = httpx.Timeout(5.0, connect=5.0, read=60.0, write=5.0)
-    http_client = httpx.AsyncClient(timeout=timeout)
+    limits = httpx.Limits(
+        max_connections=app_settings.get_backend_max_connections(),
+        max_keepalive_connections=app_settings.get_backend_max_keepalive_connections(),
+        keepalive_expiry=app_settings.get_backend_keepalive_expiry(),
+    )
+    http2 = bool(app_settings.get_backend_http2())
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("BACKEND_HTTP2 is enabled but the 'h2' package is not installed; falling back to HTTP/1.1.")
+        http2 = False
+    http_client = httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2)
     logger.info("HTTP Client initialized for DependencyContainer.")
 
+    try:
+        logger.info(f"Using the {json_codec.use_backend(app_settings.get_json_codec())} JSON codec.")
+    except (ValueError, ImportError) as e:
+        logger.warning(f"JSON_CODEC setting ignored ({e}); using the {json_codec.use_backend('auto')} JSON codec.")
+
     # Initialize Database Engine and Session Factory
     try:
         logger.info("Attempting to create main DB engine and session factory for DependencyContainer...")
@@ -155,11 +213,45 @@ async def initialize_app_dependencies(app_settings: Settings) -> DependencyConta
 
     # Create and return Dependency Container
     try:
+        log_sink = None
+        if app_settings.get_transaction_log_enabled():
+            log_sink = TransactionLogSink(
+                db_session_factory,
+                max_queue_size=app_settings.get_transaction_log_queue_size(),
+                batch_size=app_settings.get_transaction_log_batch_size(),
+                flush_interval=app_settings.get_transaction_log_flush_interval(),
+                overflow=app_settings.get_transaction_log_overflow(),  # type: ignore
+            )
         dependencies = DependencyContainer(
             settings=app_settings,
             http_client=http_client,
             db_session_factory=db_session_factory,
+            policy_cache=PolicyCache(revalidate_interval=app_settings.get_policy_cache_revalidate_seconds()),
+            openai_clients=OpenAIClientRegistry(
+                http_client, idle_timeout=app_settings.get_openai_client_idle_timeout()
+            ),
+            api_key_cache=ApiKeyCache(
+                ttl=app_settings.get_api_key_cache_ttl_seconds(),
+                negative_ttl=app_settings.get_api_key_cache_negative_ttl_seconds(),
+                max_size=app_settings.get_api_key_cache_max_size(),
+            ),
+            log_sink=log_sink,
+            response_caches={
+                "memory": InMemoryResponseCache(max_bytes=app_settings.get_response_cache_max_bytes()),
+                "database": DatabaseResponseCache(
+                    db_session_factory, cleanup_interval=app_settings.get_response_cache_cleanup_interval()
+                ),
+            },
+            client_quotas=ClientQuotaTracker(
+                db_session_factory, flush_interval=app_settings.get_client_quota_flush_interval()
+            ),
         )
+        if log_sink is not None:
+            log_sink.start()
+            logger.info("Transaction log sink started.")
+        dependencies.client_quotas.start()
+        for response_cache in dependencies.response_caches.values():
+            response_cache.start()
         logger.info("Dependency Container created successfully.")
         return dependencies
     except Exception as container_exc:
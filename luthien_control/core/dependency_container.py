@@ -1,11 +1,22 @@
 # Dependency Injection Container.
 
-from typing import AsyncContextManager, Callable
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional, Tuple
 
 import httpx
 import openai
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from luthien_control.core.api_key_cache import ApiKeyCache
+from luthien_control.core.backend_health import BackendHealthRegistry
+from luthien_control.core.backend_limiter import BackendLimiterRegistry
+from luthien_control.core.circuit_breaker import CircuitBreakerRegistry
+from luthien_control.core.client_quota import ClientQuotaTracker
+from luthien_control.core.log_sink import TransactionLogSink
+from luthien_control.core.micro_batch import MicroBatcher
+from luthien_control.core.openai_client_registry import OpenAIClientRegistry
+from luthien_control.core.policy_cache import PolicyCache
+from luthien_control.core.response_cache import DatabaseResponseCache, InMemoryResponseCache, ResponseCacheStore
+from luthien_control.core.single_flight import SingleFlight
 from luthien_control.settings import Settings
 
 
@@ -21,6 +32,17 @@ class DependencyContainer:
         settings: Settings,
         http_client: httpx.AsyncClient,
         db_session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        policy_cache: Optional[PolicyCache] = None,
+        openai_clients: Optional[OpenAIClientRegistry] = None,
+        api_key_cache: Optional[ApiKeyCache] = None,
+        log_sink: Optional[TransactionLogSink] = None,
+        response_caches: Optional[Dict[str, ResponseCacheStore]] = None,
+        backend_requests_in_flight: Optional[SingleFlight[Tuple[bytes, Dict[str, str]]]] = None,
+        backend_limiters: Optional[BackendLimiterRegistry] = None,
+        client_quotas: Optional[ClientQuotaTracker] = None,
+        embeddings_batcher: Optional[MicroBatcher[List[Any], Tuple[int, bytes]]] = None,
+        backend_health: Optional[BackendHealthRegistry] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
     ) -> None:
         """
         Initializes the container.
@@ -30,14 +52,70 @@ class DependencyContainer:
             http_client: Shared asynchronous HTTP client.
             db_session_factory: A factory function that returns an async context manager
                                 yielding an SQLAlchemy AsyncSession.
+            policy_cache: Process-level cache of instantiated control policies.
+                          A new, empty cache is created if not provided.
+            openai_clients: Registry of pooled OpenAI clients. A registry built on
+                            `http_client` is created if not provided.
+            api_key_cache: Cache of client API key lookups. A new, empty cache is
+                           created if not provided.
+            log_sink: Background writer for transaction log records. Transactions are
+                      not logged to the database if not provided.
+            response_caches: Response cache stores by name, as selected by `ResponseCachePolicy`.
+                             An empty in-process cache ("memory") and a database-backed
+                             cache ("database") are created if not provided.
+            backend_requests_in_flight: Coalesces identical concurrent backend requests.
+                                        A new one is created if not provided.
+            backend_limiters: Per-backend rate and concurrency limiters, as used by
+                              `BackendRateLimitPolicy`. A new registry is created if not provided.
+            client_quotas: Per-client-key usage counters, as checked by `ClientQuotaPolicy`.
+                           A tracker that keeps usage in memory only is created if not provided.
+            embeddings_batcher: Batches concurrent embeddings requests, as used by
+                                `EmbeddingsBatchingPolicy`. A new one is created if not provided.
+            backend_health: Observed load, latency and health of backend endpoints, as used by
+                            `LoadBalancedBackendPolicy`. A new registry is created if not provided.
+            circuit_breakers: Per-backend circuit breakers, as used by `CircuitBreakerPolicy`.
+                              A new registry is created if not provided.
         """
         self.settings = settings
         self.http_client = http_client
         self.db_session_factory = db_session_factory
+        self.policy_cache = policy_cache if policy_cache is not None else PolicyCache()
+        self.openai_clients = openai_clients if openai_clients is not None else OpenAIClientRegistry(http_client)
+        self.api_key_cache = api_key_cache if api_key_cache is not None else ApiKeyCache()
+        self.log_sink = log_sink
+        self.response_caches = (
+            response_caches
+            if response_caches is not None
+            else {"memory": InMemoryResponseCache(), "database": DatabaseResponseCache(db_session_factory)}
+        )
+        self.backend_requests_in_flight: SingleFlight[Tuple[bytes, Dict[str, str]]] = (
+            backend_requests_in_flight if backend_requests_in_flight is not None else SingleFlight()
+        )
+        self.backend_limiters = backend_limiters if backend_limiters is not None else BackendLimiterRegistry()
+        self.client_quotas = client_quotas if client_quotas is not None else ClientQuotaTracker()
+        self.embeddings_batcher: MicroBatcher[List[Any], Tuple[int, bytes]] = (
+            embeddings_batcher if embeddings_batcher is not None else MicroBatcher()
+        )
+        self.backend_health = backend_health if backend_health is not None else BackendHealthRegistry()
+        self.circuit_breakers = circuit_breakers if circuit_breakers is not None else CircuitBreakerRegistry()
+
+    def invalidate_policy_cache(self, name: Optional[str] = None) -> None:
+        """
+        Drops a cached control policy so that it is reloaded on the next request.
+
+        Args:
+            name: The policy name (or policy file path) to invalidate. If None, all cached
+                  policies are invalidated.
+        """
+        self.policy_cache.invalidate(name)
 
     def create_openai_client(self, base_url: str, api_key: str) -> openai.AsyncOpenAI:
         """
-        Creates an OpenAI client for the specified backend URL and API key.
+        Returns an OpenAI client for the specified backend URL and API key.
+
+        Clients are pooled in `openai_clients`: repeated calls with the same URL and key
+        return the same long-lived client, which shares the container's `http_client`
+        connection pool.
 
         We include this factory here for the sake of consistency with other external dependencies.
         By maintaining all external dependencies in one place, we can easily mock them for testing
@@ -59,4 +137,4 @@ class DependencyContainer:
         if not base_url.startswith(("http://", "https://")):
             raise ValueError(f"Base URL must start with 'http://' or 'https://': {base_url}")
 
-        return openai.AsyncOpenAI(api_key=api_key, base_url=base_url)
+        return self.openai_clients.get(base_url, api_key)
@@ -0,0 +1,182 @@
+# Background writer for transaction log records.
+
+import asyncio
+import contextlib
+import logging
+from typing import Any, AsyncContextManager, Callable, Dict, List, Literal, Optional
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.db.luthien_log_crud import create_logs
+
+logger = logging.getLogger(__name__)
+
+OverflowMode = Literal["drop_oldest", "drop_newest"]
+
+
+class TransactionLogSink:
+    """Writes `LuthienLog` records to the database in batches, off the request path.
+
+    Callers hand records to `submit`, which never waits: records go onto a bounded queue
+    and a background task writes them with one multi-row INSERT per batch. A batch is
+    written once `batch_size` records are waiting or `flush_interval` seconds after its
+    first record arrived, whichever comes first.
+
+    When the queue is full, records are dropped rather than slowing down requests; the
+    `overflow` mode decides whether the oldest queued record or the new one is lost.
+    Failed writes are logged and their records dropped, so a database outage never
+    backs up into the proxy.
+
+    Record values are made JSON-safe (`to_jsonable_python`) when the batch is written,
+    so callers may submit pydantic models and other rich values without serializing them
+    on the request path.
+    """
+
+    def __init__(
+        self,
+        db_session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow: OverflowMode = "drop_oldest",
+    ) -> None:
+        """Initializes the sink. Call `start` to begin writing.
+
+        Args:
+            db_session_factory: Factory returning an async context manager that yields a session.
+            max_queue_size: Maximum number of records waiting to be written.
+            batch_size: Maximum number of records written per INSERT.
+            flush_interval: Maximum seconds a record waits for its batch to fill up.
+            overflow: Which record to drop when the queue is full: "drop_oldest" or "drop_newest".
+        """
+        if overflow not in ("drop_oldest", "drop_newest"):
+            raise ValueError(f"overflow must be 'drop_oldest' or 'drop_newest' (got {overflow!r})")
+        self.db_session_factory = db_session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.submitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=max(1, max_queue_size))
+        self._batch_ready = asyncio.Event()
+        # Records taken off the queue for the batch being gathered, written by `aclose` if it is cut short
+        self._batch: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """Queues a record for writing without waiting.
+
+        Args:
+            record: Column values for one `LuthienLog` row (see `create_logs`).
+
+        Returns:
+            True if the record was queued, False if it was dropped because the queue was full.
+        """
+        self.submitted += 1
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self._record_drop()
+            if self.overflow == "drop_newest":
+                return False
+            self._queue.get_nowait()
+            self._queue.put_nowait(record)
+        if self._queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    def _record_drop(self) -> None:
+        self.dropped += 1
+        if self.dropped % 1000 == 1:
+            logger.warning(f"Transaction log queue is full; {self.dropped} record(s) dropped so far ({self.overflow}).")
+
+    def start(self) -> None:
+        """Starts the background writer task. Calling it again while running is a no-op."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="transaction-log-sink")
+
+    async def aclose(self) -> None:
+        """Stops the background writer and writes any records still queued or gathered into a batch."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._inflight is not None:
+            await self._inflight
+            self._inflight = None
+        if self._batch:
+            batch, self._batch = self._batch, []
+            await self._write(batch)
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Writes every queued record now.
+
+        Returns:
+            The number of records written successfully.
+        """
+        written = 0
+        while not self._queue.empty():
+            written += await self._write(self._drain(self.batch_size))
+        return written
+
+    def stats(self) -> Dict[str, int]:
+        """Returns counters for submitted, dropped, written and failed records, and the queue depth."""
+        return {
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "queued": self._queue.qsize() + len(self._batch),
+        }
+
+    def _drain(self, limit: int, batch: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        batch = batch if batch is not None else []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        self._batch.append(await self._queue.get())
+        self._drain(self.batch_size, self._batch)
+        if len(self._batch) < self.batch_size:
+            # Give the batch a chance to fill up; `submit` wakes us early once it is full.
+            self._batch_ready.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+            self._drain(self.batch_size, self._batch)
+        batch, self._batch = self._batch, []
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            # Shield the write so that cancellation on shutdown doesn't lose a batch half-way;
+            # `aclose` waits for it instead.
+            self._inflight = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> int:
+        try:
+            rows = [
+                {
+                    **record,
+                    "data": to_jsonable_python(record.get("data"), fallback=str),
+                    "notes": to_jsonable_python(record.get("notes"), fallback=str),
+                }
+                for record in batch
+            ]
+            async with self.db_session_factory() as session:
+                count = await create_logs(session, rows)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Failed to write {len(batch)} transaction log record(s): {e}")
+            return 0
+        self.written += count
+        return count
@@ -0,0 +1,122 @@
+# Micro-batching of concurrent calls into one.
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+# Sends a batch of items in one call and returns one result per item, in order
+BatchFn = Callable[[List[ItemT]], Awaitable[Sequence[ResultT]]]
+
+
+@dataclass
+class _Batch(Generic[ItemT, ResultT]):
+    run: BatchFn[ItemT, ResultT]
+    items: List[ItemT] = field(default_factory=list)
+    futures: List["asyncio.Future[ResultT]"] = field(default_factory=list)
+    size: int = 0
+    weight: float = 0
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher(Generic[ItemT, ResultT]):
+    """Collects items submitted concurrently under the same key into batches sent in one call.
+
+    A batch is sent once it reaches `max_batch_size`, or `max_wait` seconds after its first item
+    was submitted, whichever comes first. An item that would take a batch over `max_batch_size`
+    starts a new one (so an item larger than `max_batch_size` is sent on its own). Items can
+    also have a `weight` (e.g. their estimated tokens), limited per batch by `max_batch_weight`
+    in the same way.
+
+    The batch runs in its own task, so a caller that is cancelled (e.g. because its client
+    disconnected) does not cancel the call for the others; its result is simply dropped. If the
+    call raises, every caller in the batch receives the exception.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[Hashable, _Batch[ItemT, ResultT]] = {}
+        self._running: set["asyncio.Task[None]"] = set()
+
+    async def submit(
+        self,
+        key: Hashable,
+        item: ItemT,
+        run: BatchFn[ItemT, ResultT],
+        *,
+        size: int = 1,
+        max_batch_size: int,
+        max_wait: float,
+        weight: float = 0,
+        max_batch_weight: Optional[float] = None,
+    ) -> ResultT:
+        """Adds `item` to the pending batch for `key` and returns its result once the batch has been sent.
+
+        Args:
+            key: Identifies items that can be sent together.
+            item: The item to send.
+            run: Sends a batch; only the function given with a batch's first item is used.
+            size: How much of `max_batch_size` the item takes up (e.g. its number of inputs).
+            max_batch_size: The largest total size of a batch.
+            max_wait: The longest (in seconds) a batch waits for more items before it is sent.
+            weight: How much of `max_batch_weight` the item takes up.
+            max_batch_weight: The largest total weight of a batch, unlimited if None.
+
+        Returns:
+            The result `run` returned for this item.
+        """
+        batch = self._pending.get(key)
+        over_weight = max_batch_weight is not None and batch is not None and batch.weight + weight > max_batch_weight
+        if batch is not None and (batch.size + size > max_batch_size or over_weight):
+            self._dispatch(key, batch)
+            batch = None
+        if batch is None:
+            batch = _Batch(run=run)
+            self._pending[key] = batch
+            batch.timer = asyncio.get_running_loop().call_later(max_wait, self._dispatch, key, batch)
+
+        future: "asyncio.Future[ResultT]" = asyncio.get_running_loop().create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        batch.size += size
+        batch.weight += weight
+        if batch.size >= max_batch_size or (max_batch_weight is not None and batch.weight >= max_batch_weight):
+            self._dispatch(key, batch)
+        return await future
+
+    def _dispatch(self, key: Hashable, batch: "_Batch[ItemT, ResultT]") -> None:
+        if self._pending.get(key) is not batch:
+            return
+        del self._pending[key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        logger.debug(f"Sending a batch of {len(batch.items)} items (size {batch.size})")
+        task = asyncio.create_task(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: "_Batch[ItemT, ResultT]") -> None:
+        try:
+            results = await batch.run(batch.items)
+            if len(results) != len(batch.items):
+                raise RuntimeError(f"Batch call returned {len(results)} results for {len(batch.items)} items")
+        except asyncio.CancelledError:
+            for future in batch.futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    def __len__(self) -> int:
+        """Returns the number of batches waiting to be sent."""
+        return len(self._pending)
@@ -0,0 +1,100 @@
+# Registry of long-lived OpenAI clients sharing a pooled HTTP transport.
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import httpx
+import openai
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _RegisteredClient:
+    client: openai.AsyncOpenAI
+    last_used: float
+
+
+class OpenAIClientRegistry:
+    """Hands out one `openai.AsyncOpenAI` per (base URL, API key) pair.
+
+    All clients are built on top of the application's shared `httpx.AsyncClient`, so
+    backend connections (and their TCP/TLS handshakes) are reused across requests
+    instead of every request opening a fresh connection pool.
+
+    Clients that have not been used for `idle_timeout` seconds are dropped the next
+    time the registry is accessed. Since the underlying transport is shared, dropping
+    a client never closes connections; the transport is closed by the owner of the
+    `httpx.AsyncClient` on shutdown.
+    """
+
+    def __init__(self, http_client: httpx.AsyncClient, idle_timeout: float = 600.0) -> None:
+        """Initializes the registry.
+
+        Args:
+            http_client: The shared HTTP client whose connection pool all OpenAI clients use.
+            idle_timeout: Seconds after which an unused client is evicted.
+        """
+        self.http_client = http_client
+        self.idle_timeout = idle_timeout
+        self._clients: Dict[Tuple[str, str], _RegisteredClient] = {}
+
+    @staticmethod
+    def _key(base_url: str, api_key: str) -> Tuple[str, str]:
+        # Hash the API key so plaintext keys aren't kept around as dict keys
+        return base_url.rstrip("/"), hashlib.sha256(api_key.encode()).hexdigest()
+
+    def get(self, base_url: str, api_key: str) -> openai.AsyncOpenAI:
+        """Returns the client for `base_url` and `api_key`, creating it on first use.
+
+        Args:
+            base_url: The base URL for the OpenAI-compatible API endpoint.
+            api_key: The API key for authentication.
+
+        Returns:
+            A long-lived OpenAI AsyncClient bound to the shared HTTP client.
+        """
+        now = time.monotonic()
+        self.evict_idle(now)
+
+        key = self._key(base_url, api_key)
+        entry = self._clients.get(key)
+        if entry is None:
+            client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self.http_client)
+            entry = self._clients[key] = _RegisteredClient(client=client, last_used=now)
+            logger.debug(f"Created pooled OpenAI client for {key[0]} ({len(self._clients)} registered).")
+        else:
+            entry.last_used = now
+        return entry.client
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drops clients that have been idle for longer than `idle_timeout`.
+
+        Args:
+            now: Current monotonic time. Defaults to `time.monotonic()`.
+
+        Returns:
+            The number of clients evicted.
+        """
+        if now is None:
+            now = time.monotonic()
+        idle = [key for key, entry in self._clients.items() if now - entry.last_used > self.idle_timeout]
+        for key in idle:
+            del self._clients[key]
+        if idle:
+            logger.debug(f"Evicted {len(idle)} idle OpenAI client(s).")
+        return len(idle)
+
+    async def aclose(self) -> None:
+        """Forgets all registered clients.
+
+        The shared `httpx.AsyncClient` is left open; it is owned (and closed) by the
+        application lifespan.
+        """
+        self._clients.clear()
+
+    def __len__(self) -> int:
+        return len(self._clients)
@@ -0,0 +1,91 @@
+# Process-level cache of instantiated control policies.
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from luthien_control.control_policy.control_policy import ControlPolicy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedPolicy:
+    """A loaded policy together with the version it was built from.
+
+    Attributes:
+        policy: The instantiated policy tree.
+        version: An opaque version marker for the policy source (e.g. the `updated_at`
+            column of the `policies` table, or a file's modification time).
+        checked_at: Monotonic timestamp of the last time the version was confirmed
+            against the source.
+    """
+
+    policy: "ControlPolicy"
+    version: Any
+    checked_at: float
+
+
+class PolicyCache:
+    """Caches instantiated policies keyed by policy name (or file path) and version.
+
+    Building a policy tree requires a database round trip and a full recursive
+    `from_serialized` rebuild, so we keep the result around for as long as the
+    source version is unchanged. Entries are revalidated against the source at most
+    once every `revalidate_interval` seconds, and can be dropped explicitly with
+    `invalidate` (e.g. when a policy is saved through the admin UI).
+    """
+
+    def __init__(self, revalidate_interval: float = 5.0) -> None:
+        """Initializes the cache.
+
+        Args:
+            revalidate_interval: Seconds during which a cached entry is trusted without
+                checking the source version again. Use 0 to check on every lookup.
+        """
+        self.revalidate_interval = revalidate_interval
+        self._entries: Dict[str, CachedPolicy] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def get_fresh(self, key: str) -> Optional["ControlPolicy"]:
+        """Returns the cached policy if it was validated within the revalidation interval."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.checked_at >= self.revalidate_interval:
+            return None
+        return entry.policy
+
+    def get(self, key: str, version: Any) -> Optional["ControlPolicy"]:
+        """Returns the cached policy if it matches `version`, marking it as freshly validated."""
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version:
+            return None
+        entry.checked_at = time.monotonic()
+        return entry.policy
+
+    def put(self, key: str, version: Any, policy: "ControlPolicy") -> None:
+        """Stores a freshly loaded policy for `key` at `version`."""
+        self._entries[key] = CachedPolicy(policy=policy, version=version, checked_at=time.monotonic())
+        logger.debug(f"Cached policy '{key}' at version {version!r}.")
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drops the cached entry for `key`, or every entry if `key` is None."""
+        if key is None:
+            self._entries.clear()
+            logger.info("Invalidated all cached policies.")
+        elif self._entries.pop(key, None) is not None:
+            logger.info(f"Invalidated cached policy '{key}'.")
+
+    def lock(self, key: str) -> asyncio.Lock:
+        """Returns the lock serializing (re)loads of `key`, so concurrent misses only load once."""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,13 +1,156 @@
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 
-from pydantic import Field
+from openai.types.chat import ChatCompletionChunk
+from pydantic import Field, PrivateAttr
 
 from luthien_control.api.openai_chat_completions import OpenAIChatCompletionsResponse
 from luthien_control.utils import DeepEventedModel
 
+ChunkHook = Callable[[ChatCompletionChunk], Awaitable[Optional[ChatCompletionChunk]]]
+"""An async callable applied to each streamed chunk. Returns the (possibly modified) chunk, or None to drop it."""
+
+
+async def close_stream(stream: Any) -> None:
+    """Closes a stream of chunks, releasing its backend connection.
+
+    openai's AsyncStream exposes `close`, async generators expose `aclose`.
+    """
+    close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+    if close is not None:
+        await close()
+
+
+class ObservedStream(AsyncIterator[ChatCompletionChunk]):
+    """Passes a stream of chunks through, calling `on_close` exactly once when it ends, fails or is closed.
+
+    Unlike an async generator wrapping the stream, whose `finally` is skipped if it is closed
+    before it was first iterated, `aclose` always calls `on_close` and closes the wrapped
+    stream. Use it for anything held for the duration of a stream (a concurrency slot, a
+    circuit breaker probe) that must be released however the stream is abandoned.
+    """
+
+    def __init__(
+        self,
+        stream: AsyncIterator[ChatCompletionChunk],
+        on_close: Callable[[Optional[BaseException]], None],
+        on_chunk: Optional[Callable[[ChatCompletionChunk], None]] = None,
+    ) -> None:
+        """Initializes the stream.
+
+        Args:
+            stream: The stream to pass through.
+            on_close: Called with the exception that ended the stream, or None if it ended or
+                was closed without one.
+            on_chunk: Called with each chunk as it passes through.
+        """
+        self._stream = stream
+        self._on_close = on_close
+        self._on_chunk = on_chunk
+        self._closed = False
+
+    def __aiter__(self) -> "ObservedStream":
+        return self
+
+    async def __anext__(self) -> ChatCompletionChunk:
+        if self._closed:
+            raise StopAsyncIteration
+        try:
+            chunk = await self._stream.__anext__()
+        except StopAsyncIteration:
+            await self.aclose()
+            raise
+        except BaseException as e:
+            await self._close(e)
+            raise
+        if self._on_chunk is not None:
+            self._on_chunk(chunk)
+        return chunk
+
+    async def aclose(self) -> None:
+        """Closes the wrapped stream, calling `on_close` if it was not called yet."""
+        await self._close(None)
+
+    async def _close(self, error: Optional[BaseException]) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._on_close(error)
+        finally:
+            await close_stream(self._stream)
+
 
 class Response(DeepEventedModel):
-    """A response from the Luthien Control API."""
+    """A response from the Luthien Control API.
+
+    When the payload comes straight from the backend, the original response bytes are kept
+    in `raw_body` so they can be returned to the client without re-serializing. They are
+    discarded as soon as the payload is modified or replaced.
+
+    For streamed (`stream: true`) requests, `payload` stays unset and the backend chunks are
+    exposed through `stream` instead. Policies that need to inspect or modify a streamed
+    response register a chunk hook with `add_chunk_hook`; hooks run in registration order
+    as each chunk passes through the proxy.
+
+    `backend_headers` holds the HTTP headers of the backend response (lower-cased), when the
+    policy that sent the request recorded them, e.g. for rate limit information.
+    """
 
     payload: Optional[OpenAIChatCompletionsResponse] = Field(default=None)
     api_endpoint: Optional[str] = Field(default=None)
+    stream: Optional[AsyncIterator[ChatCompletionChunk]] = Field(default=None, exclude=True)
+    chunk_hooks: List[ChunkHook] = Field(default_factory=list, exclude=True)
+    backend_headers: Dict[str, str] = Field(default_factory=dict, exclude=True)
+    _raw_body: Optional[bytes] = PrivateAttr(default=None)
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.events.payload.connect(self._discard_raw_body, max_args=0)
+
+    @property
+    def raw_body(self) -> Optional[bytes]:
+        """The backend's response bytes, if `payload` is still exactly what the backend sent."""
+        return self._raw_body
+
+    def set_backend_payload(self, payload: OpenAIChatCompletionsResponse, raw_body: bytes) -> None:
+        """Stores a payload parsed from `raw_body`, keeping the bytes until the payload changes.
+
+        Args:
+            payload: The parsed backend response.
+            raw_body: The exact bytes the backend returned, from which `payload` was parsed.
+        """
+        self.payload = payload
+        # Any in-place change to the payload must invalidate the raw bytes, so the payload is
+        # always change-tracked even when the rest of the transaction isn't.
+        payload.connect_deep_events()
+        payload.changed.connect(self._discard_raw_body, max_args=0)
+        self._raw_body = raw_body
+
+    def _discard_raw_body(self) -> None:
+        self._raw_body = None
+
+    def add_chunk_hook(self, hook: ChunkHook) -> None:
+        """Registers a hook to be applied to every chunk of a streamed response."""
+        self.chunk_hooks.append(hook)
+
+    async def iter_chunks(self) -> AsyncIterator[ChatCompletionChunk]:
+        """Yields the chunks of `stream` after passing them through the registered chunk hooks.
+
+        Raises:
+            ValueError: If the response is not streamed.
+        """
+        if self.stream is None:
+            raise ValueError("Response has no stream to iterate")
+        stream = self.stream
+        try:
+            async for chunk in stream:
+                current: Optional[ChatCompletionChunk] = chunk
+                for hook in self.chunk_hooks:
+                    current = await hook(current)
+                    if current is None:
+                        break
+                if current is not None:
+                    yield current
+        finally:
+            # Release the backend connection even if the client went away mid-stream.
+            await close_stream(stream)
@@ -0,0 +1,239 @@
+# Stores for cached chat completion responses.
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncContextManager, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.api.openai_chat_completions.request import OpenAIChatCompletionsRequest
+from luthien_control.db.exceptions import LuthienDBException
+from luthien_control.db.response_cache_crud import (
+    delete_expired_cached_responses,
+    get_cached_response,
+    put_cached_response,
+)
+
+logger = logging.getLogger(__name__)
+
+# Request fields that do not affect the completion returned by the backend. Only non-streamed
+# responses are cached, so `stream` only ever distinguishes `false` from unset.
+_UNKEYED_REQUEST_FIELDS = {"metadata", "user", "stream", "stream_options"}
+
+
+def is_deterministic_request(request: OpenAIChatCompletionsRequest) -> bool:
+    """Whether repeating `request` should reproduce its completion: it has `temperature` 0 or a `seed`."""
+    return request.temperature == 0 or request.seed is not None
+
+
+def response_cache_key(request: OpenAIChatCompletionsRequest, api_endpoint: str, api_key: Optional[str] = None) -> str:
+    """Returns the cache key of a request: a hash of its canonicalized form and the backend it is sent to.
+
+    Requests that differ only in field order, unset fields or fields that do not affect the
+    completion (such as `metadata` and `user`) share a key.
+
+    Args:
+        request: The request payload.
+        api_endpoint: The backend URL the request is sent to.
+        api_key: If given, the backend API key is part of the key, so that only requests
+            authorized with the same key share it.
+    """
+    canonical = {
+        field: value
+        for field, value in request.model_dump(mode="json", exclude_none=True).items()
+        if field not in _UNKEYED_REQUEST_FIELDS
+    }
+    canonical["api_endpoint"] = api_endpoint
+    if api_key is not None:
+        canonical["api_key"] = api_key
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResponseCacheStore(ABC):
+    """A store of response bodies keyed by `response_cache_key`, counting hits and misses."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Returns the unexpired body cached under `key`, or None on a cache miss."""
+        body = await self._get(key)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    async def put(self, key: str, body: bytes, ttl: float) -> None:
+        """Caches `body` under `key` for `ttl` seconds."""
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def start(self) -> None:
+        """Starts the store's background maintenance, if it has any."""
+
+    async def aclose(self) -> None:
+        """Stops the store's background maintenance, if it has any."""
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    expires_at: float
+
+
+class InMemoryResponseCache(ResponseCacheStore):
+    """Process-level LRU cache of response bodies, bounded by their total size.
+
+    All operations are synchronous underneath, so they are atomic with respect to other coroutines.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """Initializes the cache.
+
+        Args:
+            max_bytes: Maximum total size of the cached bodies; the least recently used entries
+                are evicted first. Bodies larger than this are not cached.
+        """
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.body
+
+    async def put(self, key: str, body: bytes, ttl: float) -> None:
+        if ttl <= 0 or len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CachedResponse(body=body, expires_at=time.monotonic() + ttl)
+        self.total_bytes += len(body)
+        while self.total_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        self.total_bytes -= len(self._entries.pop(key).body)
+
+    def clear(self) -> None:
+        """Drops every cached response."""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters, the number of entries and their total size."""
+        return {**super().stats(), "size": len(self._entries), "bytes": self.total_bytes}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DatabaseResponseCache(ResponseCacheStore):
+    """Response bodies stored in the `response_cache` table, shared by every server process.
+
+    Each operation runs in a session of its own, so that a failed cache read or write never
+    affects the session of the request. Database errors are logged and treated as cache
+    misses, so that an unavailable cache never fails a request.
+
+    Expired entries are never returned, and once started (see `start`) a background task
+    deletes them from the table every `cleanup_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        db_session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        cleanup_interval: float = 300.0,
+    ) -> None:
+        """Initializes the cache.
+
+        Args:
+            db_session_factory: Factory returning an async context manager that yields a session.
+            cleanup_interval: Seconds between deletions of expired entries.
+        """
+        super().__init__()
+        self.db_session_factory = db_session_factory
+        self.cleanup_interval = cleanup_interval
+        self.errors = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        try:
+            async with self.db_session_factory() as session:
+                return await get_cached_response(session, key)
+        except LuthienDBException as e:
+            self.errors += 1
+            logger.warning(f"Could not read cached response, treating it as a miss: {e}")
+            return None
+
+    async def put(self, key: str, body: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=ttl)
+        try:
+            async with self.db_session_factory() as session:
+                await put_cached_response(session, key, body, expires_at)
+        except LuthienDBException as e:
+            self.errors += 1
+            logger.warning(f"Could not store response in the cache: {e}")
+
+    async def delete_expired(self) -> int:
+        """Deletes the expired entries from the table.
+
+        Returns:
+            The number of entries deleted, 0 if the deletion failed.
+        """
+        try:
+            async with self.db_session_factory() as session:
+                return await delete_expired_cached_responses(session)
+        except LuthienDBException as e:
+            self.errors += 1
+            logger.warning(f"Could not delete expired cached responses: {e}")
+            return 0
+
+    def start(self) -> None:
+        """Starts the background task deleting expired entries. Calling it again while running is a no-op."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="response-cache-cleanup")
+
+    async def aclose(self) -> None:
+        """Stops the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            deleted = await asyncio.shield(self.delete_expired())
+            if deleted:
+                logger.info(f"Deleted {deleted} expired cached response(s)")
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters and the number of failed database operations."""
+        return {**super().stats(), "errors": self.errors}
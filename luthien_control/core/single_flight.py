@@ -0,0 +1,79 @@
+# Coalescing of concurrent identical calls.
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight(Generic[T]):
+    task: "asyncio.Task[T]"
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """Runs at most one call per key at a time, sharing its result with every concurrent caller.
+
+    The call runs in its own task rather than in the caller that started it, so a caller that
+    is cancelled (e.g. because its client disconnected) does not cancel the call for the
+    others. The call is only cancelled once every caller waiting for it has been cancelled.
+    If the call raises, every waiting caller receives the exception.
+
+    Callers share the result object, so it should be immutable (e.g. `bytes`) or copied by each caller.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[str, _Flight[T]] = {}
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Returns the result of `fn()`, or of the call already in flight for `key`.
+
+        Args:
+            key: Identifies calls whose results are interchangeable.
+            fn: Starts the call; only invoked if no call for `key` is in flight.
+
+        Returns:
+            The result of the call.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(task=asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+        else:
+            logger.debug(f"Joining in-flight call {key[:12]} ({flight.waiters} already waiting)")
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Nobody is left waiting; later callers start a new call instead of joining this one
+                self._forget(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: str, flight: "_Flight[T]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _finish(self, key: str, flight: "_Flight[T]") -> None:
+        self._forget(key, flight)
+        # Retrieve the exception so that asyncio does not report it as never retrieved when
+        # every waiter was cancelled
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def in_flight(self, key: str) -> int:
+        """Returns the number of callers waiting for the call in flight for `key` (0 if there is none)."""
+        flight = self._flights.get(key)
+        return flight.waiters if flight is not None else 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
@@ -1,6 +1,6 @@
 """TrackedContext module with explicit mutation API and event tracking."""
 
-from .tracked_context import TrackedContext, _update_headers
+from .tracked_context import BACKEND_URL_KEY, TrackedContext, _update_headers
 from .util import get_tx_value
 
-__all__ = ["TrackedContext", "get_tx_value", "_update_headers"]
+__all__ = ["BACKEND_URL_KEY", "TrackedContext", "get_tx_value", "_update_headers"]
@@ -1,9 +1,10 @@
 """TrackedContext with explicit mutation API and event tracking."""
 
+import json
 import uuid
 from copy import copy
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Union
+from typing import Any, AsyncIterable, Dict, Optional, Tuple, Union
 
 import httpx
 
@@ -11,6 +12,13 @@ from ..generic_events import Event
 
 httpx_resomething = Union[httpx.Request, httpx.Response]
 
+# Stands in for the content of a streamed request body in mutation events; it cannot be read twice.
+STREAMED_CONTENT = "<stream>"
+
+# Data key under which header-level policies set the backend of a raw passthrough request
+# (see `ControlPolicy.apply_headers`)
+BACKEND_URL_KEY = "backend_url"
+
 
 def _update_headers(
     request: httpx_resomething, headers: Dict[str, str], preserve_existing_headers: bool
@@ -41,7 +49,11 @@ class ContextEvents:
 
 
 class TrackedContext:
-    """Transaction context with explicit mutation API and event tracking."""
+    """Transaction context with explicit mutation API and event tracking.
+
+    Lookups made with `get_tx_value` are memoized per context and invalidated whenever the
+    context is mutated through this API. Values obtained from it should be treated as read-only.
+    """
 
     def __init__(self, transaction_id: Optional[uuid.UUID] = None):
         """Initialize tracked context."""
@@ -50,22 +62,51 @@ class TrackedContext:
         self._response: Optional[httpx.Response] = None
         self._data: Dict[str, Any] = {}
         self.events = ContextEvents()
+        # Memoized lookups, cleared by every mutation made through this API
+        self._resolved_paths: Dict[str, Any] = {}
+        self._parsed_json: Dict[int, Tuple[bytes, Any]] = {}
 
     @property
     def transaction_id(self) -> uuid.UUID:
         """Get transaction ID."""
         return self._transaction_id
 
+    @property
+    def resolved_paths(self) -> Dict[str, Any]:
+        """Values already resolved by path (see `get_tx_value`), valid until the next mutation."""
+        return self._resolved_paths
+
+    def parse_json(self, content: bytes) -> Any:
+        """Parse JSON content, reusing the result for the same bytes object until the next mutation.
+
+        Raises:
+            json.JSONDecodeError: If the content is not valid JSON.
+        """
+        cached = self._parsed_json.get(id(content))
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        parsed = json.loads(content)
+        self._parsed_json[id(content)] = (content, parsed)
+        return parsed
+
+    def _invalidate_caches(self) -> None:
+        self._resolved_paths.clear()
+        self._parsed_json.clear()
+
     def update_request(
         self,
         method: Optional[str] = None,
         url: Optional[str] = None,
         headers: Optional[Dict[str, str]] = None,
-        content: Optional[bytes] = None,
+        content: Optional[Union[bytes, AsyncIterable[bytes]]] = None,
         from_scratch: bool = False,
         preserve_existing_headers: bool = True,
     ) -> httpx.Request:
-        """Create or set the request."""
+        """Create or set the request.
+
+        A new request's `content` may be an async iterable, in which case the body is streamed
+        when the request is sent rather than held in memory.
+        """
         differences = {}
         if from_scratch or self._request is None:
             if not all([method, url]):
@@ -73,9 +114,9 @@ class TrackedContext:
             method = str(method)
             url = str(url)
             self._request = httpx.Request(method=method, url=url, headers=headers, content=content)
-            differences = {
-                k: {"old": None, "new": getattr(self._request, k)} for k in ["method", "url", "headers", "content"]
-            }
+            differences = {k: {"old": None, "new": getattr(self._request, k)} for k in ["method", "url", "headers"]}
+            streamed = content is not None and not isinstance(content, bytes)
+            differences["content"] = {"old": None, "new": STREAMED_CONTENT if streamed else self._request.content}
         else:
             if method is not None:
                 differences["method"] = {"old": self._request.method, "new": method}
@@ -87,9 +128,12 @@ class TrackedContext:
                 header_diffs = _update_headers(self._request, headers, preserve_existing_headers)
                 differences["headers"] = header_diffs
             if content is not None:
+                if not isinstance(content, bytes):
+                    raise ValueError("Only a new request can have streamed content")
                 differences["content"] = {"old": self._request.content, "new": content}
                 self._request._content = content
 
+        self._invalidate_caches()
         self.events.mutation.dispatch(
             MutationEventPayload(
                 transaction_id=self._transaction_id,
@@ -104,6 +148,29 @@ class TrackedContext:
         """Get a copy of the tracked request."""
         return copy(self._request)
 
+    def request_to_send(self) -> httpx.Request:
+        """Get the tracked request itself, to send it once every policy is done with it.
+
+        Unlike `request`, this is not a copy, so a streamed body is still attached to it.
+        Changes must still be made through `update_request`.
+
+        Raises:
+            ValueError: If there is no request.
+        """
+        if self._request is None:
+            raise ValueError("Attempted to send a missing request")
+        return self._request
+
+    async def read_request_body(self) -> bytes:
+        """Read the tracked request's body, buffering a streamed body so that the request can still be sent.
+
+        Raises:
+            ValueError: If there is no request.
+        """
+        if self._request is None:
+            raise ValueError("Attempted to read the body of a missing request")
+        return await self._request.aread()
+
     def update_response(
         self,
         status_code: Optional[int] = None,
@@ -136,6 +203,7 @@ class TrackedContext:
                 differences["content"] = {"old": self._response.content, "new": content}
                 self._response._content = content
 
+        self._invalidate_caches()
         self.events.mutation.dispatch(
             MutationEventPayload(
                 transaction_id=self._transaction_id,
@@ -158,6 +226,7 @@ class TrackedContext:
         """Set data value."""
         old_value = self._data.get(key)
         self._data[key] = value
+        self._invalidate_caches()
         self.events.mutation.dispatch(
             MutationEventPayload(
                 transaction_id=self._transaction_id,
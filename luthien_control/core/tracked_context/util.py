@@ -13,12 +13,19 @@ def get_tx_value(tracked_context: TrackedContext, path: str) -> Any:
         tracked_context: The tracked context.
         path: The path to the value e.g. "request.headers.user-agent", "response.status_code", "data.user_id".
 
+    Results, and the JSON parsed from `bytes` content along the way, are memoized in the
+    tracked context until it is next mutated.
+
     Returns:
         The value at the path.
 
     Raises:
         ValueError: If the path is invalid or the value cannot be accessed.
     """
+    cache = tracked_context.resolved_paths
+    if path in cache:
+        return cache[path]
+
     vals = path.split(".")
     if len(vals) < 2:
         raise ValueError("Path must contain at least two components")
@@ -41,7 +48,7 @@ def get_tx_value(tracked_context: TrackedContext, path: str) -> Any:
     for next_segment in vals:
         if isinstance(x, bytes):
             try:
-                x = json.loads(x)
+                x = tracked_context.parse_json(x)
             except json.JSONDecodeError as e:
                 # Wrapping the original error for better diagnostics
                 raise ValueError(f"Failed to decode JSON content for path '{path}' at segment '{next_segment}'") from e
@@ -50,4 +57,5 @@ def get_tx_value(tracked_context: TrackedContext, path: str) -> Any:
             x = x[next_segment]
         else:
             x = getattr(x, next_segment)
+    cache[path] = x
     return x
@@ -1,8 +1,9 @@
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
 from uuid import UUID, uuid4
 
 from psygnal.containers import EventedDict
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from luthien_control.core.request import Request
 from luthien_control.core.response import Response
@@ -16,3 +17,41 @@ class Transaction(DeepEventedModel):
     request: Request = Field()
     response: Response = Field()
     data: EventedDict[str, Any] = Field(default_factory=EventedDict)
+    _resolved_paths: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _scoped_resolved_paths: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    @property
+    def resolved_paths(self) -> Optional[Dict[str, Any]]:
+        """Values already resolved by path (e.g. "request.payload.model") for this transaction.
+
+        While the `changed` signal is wired (see `deep_events`) the cache lives as long as the
+        transaction and is cleared whenever it or anything evented within it changes. Otherwise
+        changes cannot be observed, so there is only a cache inside `memoizing_paths`, and this
+        is None outside it.
+        """
+        if self.deep_events_connected:
+            return self._resolved_paths
+        return self._scoped_resolved_paths
+
+    @contextmanager
+    def memoizing_paths(self) -> Iterator[None]:
+        """Memoizes resolved paths within the block, even without change events.
+
+        The transaction must not be modified within the block, e.g. while evaluating conditions.
+        """
+        if self.resolved_paths is not None:
+            yield
+            return
+        self._scoped_resolved_paths = {}
+        try:
+            yield
+        finally:
+            self._scoped_resolved_paths = None
+
+    def connect_deep_events(self) -> None:
+        if not self.deep_events_connected:
+            self.changed.connect(self._clear_resolved_paths, max_args=0)
+        super().connect_deep_events()
+
+    def _clear_resolved_paths(self) -> None:
+        self._resolved_paths.clear()
@@ -1,7 +1,7 @@
 # CRUD operations specific to ClientApiKey model.
 
 import logging
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from luthien_control.db.exceptions import (
     LuthienDBIntegrityError,
+    LuthienDBNotFoundError,
     LuthienDBOperationError,
     LuthienDBQueryError,
     LuthienDBTransactionError,
@@ -16,6 +17,9 @@ from luthien_control.db.exceptions import (
 
 from .sqlmodel_models import ClientApiKey
 
+if TYPE_CHECKING:
+    from luthien_control.core.api_key_cache import ApiKeyCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,7 +34,8 @@ async def get_api_key_by_value(session: AsyncSession, key_value: str) -> ClientA
         The API key
 
     Raises:
-        LuthienDBQueryError: If the API key is not found or if the query execution fails
+        LuthienDBNotFoundError: If no active API key has this value
+        LuthienDBQueryError: If the query execution fails
         LuthienDBOperationError: For unexpected errors during lookup
     """
     try:
@@ -48,7 +53,7 @@ async def get_api_key_by_value(session: AsyncSession, key_value: str) -> ClientA
         raise LuthienDBOperationError(f"Unexpected error during API key lookup: {e}") from e
 
     if not api_key:
-        raise LuthienDBQueryError(f"Active API key with value '{key_value}' not found")
+        raise LuthienDBNotFoundError(f"Active API key with value '{key_value}' not found")
 
     return api_key
 
@@ -56,12 +61,16 @@ async def get_api_key_by_value(session: AsyncSession, key_value: str) -> ClientA
 # --- ClientApiKey CRUD Operations ---
 
 
-async def create_api_key(session: AsyncSession, api_key: ClientApiKey) -> ClientApiKey:
+async def create_api_key(
+    session: AsyncSession, api_key: ClientApiKey, api_key_cache: Optional["ApiKeyCache"] = None
+) -> ClientApiKey:
     """Create a new API key in the database.
 
     Args:
         session: The database session
         api_key: The API key to create
+        api_key_cache: If given, any cached lookup of this key's value (e.g. a cached
+            "not found") is invalidated once the key is created
 
     Returns:
         The created API key with updated ID
@@ -76,6 +85,8 @@ async def create_api_key(session: AsyncSession, api_key: ClientApiKey) -> Client
         await session.commit()
         await session.refresh(api_key)
         logger.info(f"Successfully created API key with ID: {api_key.id}")
+        if api_key_cache is not None:
+            api_key_cache.invalidate(api_key.key_value)
         return api_key
     except IntegrityError as ie:
         await session.rollback()
@@ -120,13 +131,22 @@ async def list_api_keys(session: AsyncSession, active_only: bool = False) -> Lis
         raise LuthienDBOperationError(f"Unexpected error during API key listing: {e}") from e
 
 
-async def update_api_key(session: AsyncSession, key_id: int, api_key_update: ClientApiKey) -> ClientApiKey:
+async def update_api_key(
+    session: AsyncSession,
+    key_id: int,
+    api_key_update: ClientApiKey,
+    api_key_cache: Optional["ApiKeyCache"] = None,
+) -> ClientApiKey:
     """Update an existing API key.
 
     Args:
         session: The database session
         key_id: The ID of the API key to update
         api_key_update: The updated API key data
+        api_key_cache: If given, the cached lookup of this key is invalidated once the
+            update is committed, so deactivation takes effect immediately in this process.
+            Other processes (e.g. the server, when called from a script) keep accepting the
+            key until their cache entry expires
 
     Returns:
         The updated API key
@@ -160,6 +180,8 @@ async def update_api_key(session: AsyncSession, key_id: int, api_key_update: Cli
         await session.commit()
         await session.refresh(api_key)
         logger.info(f"Successfully updated API key with ID: {api_key.id}")
+        if api_key_cache is not None:
+            api_key_cache.invalidate(api_key.key_value)
         return api_key
     except IntegrityError as ie:
         await session.rollback()
@@ -0,0 +1,126 @@
+# CRUD operations specific to ClientApiKeyUsage model.
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col
+
+from luthien_control.db.exceptions import (
+    LuthienDBOperationError,
+    LuthienDBQueryError,
+    LuthienDBTransactionError,
+)
+
+from .sqlmodel_models import ClientApiKeyUsage
+
+logger = logging.getLogger(__name__)
+
+_USAGE_COLUMNS = ("requests", "prompt_tokens", "completion_tokens")
+
+
+async def create_usage_records(session: AsyncSession, records: Sequence[Dict[str, Any]]) -> int:
+    """Insert a batch of usage records in a single statement and commit.
+
+    Args:
+        session: The database session
+        records: Column values for each record (`api_key_id`, `recorded_at`, `requests`,
+            `prompt_tokens` and `completion_tokens`)
+
+    Returns:
+        The number of records inserted
+
+    Raises:
+        LuthienDBTransactionError: If the insert or commit fails
+        LuthienDBOperationError: For unexpected errors
+    """
+    if not records:
+        return 0
+    try:
+        await session.execute(insert(ClientApiKeyUsage).values(list(records)))
+        await session.commit()
+    except SQLAlchemyError as sqla_err:
+        await session.rollback()
+        logger.error(f"SQLAlchemy error inserting {len(records)} usage records: {sqla_err}")
+        raise LuthienDBTransactionError(
+            f"Database transaction failed while inserting usage records: {sqla_err}"
+        ) from sqla_err
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"Unexpected error inserting {len(records)} usage records: {e}")
+        raise LuthienDBOperationError(f"Unexpected error during usage record insertion: {e}") from e
+    return len(records)
+
+
+async def delete_usage_before(session: AsyncSession, before: datetime) -> int:
+    """Delete every usage record recorded before a point in time and commit.
+
+    Args:
+        session: The database session
+        before: Records older than this (naive UTC) are deleted
+
+    Returns:
+        The number of records deleted
+
+    Raises:
+        LuthienDBTransactionError: If the delete or commit fails
+        LuthienDBOperationError: For unexpected errors
+    """
+    try:
+        result = await session.execute(delete(ClientApiKeyUsage).where(col(ClientApiKeyUsage.recorded_at) < before))
+        await session.commit()
+        return result.rowcount or 0  # type: ignore[attr-defined]
+    except SQLAlchemyError as sqla_err:
+        await session.rollback()
+        logger.error(f"SQLAlchemy error deleting usage records before {before}: {sqla_err}")
+        raise LuthienDBTransactionError(
+            f"Database transaction failed while deleting usage records: {sqla_err}"
+        ) from sqla_err
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"Unexpected error deleting usage records before {before}: {e}")
+        raise LuthienDBOperationError(f"Unexpected error during usage record cleanup: {e}") from e
+
+
+async def sum_usage_since(
+    session: AsyncSession, api_key_id: int, since: Sequence[datetime]
+) -> List[Tuple[int, int, int]]:
+    """Sum the usage of a client API key recorded since each of several points in time, in one query.
+
+    Args:
+        session: The database session
+        api_key_id: The id of the client API key
+        since: Start of each period (naive UTC)
+
+    Returns:
+        The total (requests, prompt_tokens, completion_tokens) of each period, in the order of `since`
+
+    Raises:
+        LuthienDBQueryError: If the query execution fails
+        LuthienDBOperationError: For unexpected errors during the query
+    """
+    if not since:
+        return []
+    recorded_at = col(ClientApiKeyUsage.recorded_at)
+    columns = [
+        func.coalesce(func.sum(case((recorded_at >= start, getattr(ClientApiKeyUsage, column)), else_=0)), 0)
+        for start in since
+        for column in _USAGE_COLUMNS
+    ]
+    try:
+        stmt = select(*columns).where(
+            col(ClientApiKeyUsage.api_key_id) == api_key_id,
+            recorded_at >= min(since),
+        )
+        row = (await session.execute(stmt)).one()
+    except SQLAlchemyError as sqla_err:
+        logger.error(f"SQLAlchemy error summing usage of client API key {api_key_id}: {sqla_err}", exc_info=True)
+        raise LuthienDBQueryError(f"Database query failed while summing usage: {sqla_err}") from sqla_err
+    except Exception as e:
+        logger.error(f"Unexpected error summing usage of client API key {api_key_id}: {e}", exc_info=True)
+        raise LuthienDBOperationError(f"Unexpected error during usage lookup: {e}") from e
+    totals = [int(value) for value in row]
+    return [(totals[i], totals[i + 1], totals[i + 2]) for i in range(0, len(totals), len(_USAGE_COLUMNS))]
@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime, timezone
 from typing import List
 
 from sqlalchemy import select
@@ -91,6 +92,42 @@ async def get_policy_by_name(session: AsyncSession, name: str) -> DBControlPolic
         raise LuthienDBOperationError(f"Unexpected error during policy lookup: {e}") from e
 
 
+async def get_policy_version(session: AsyncSession, name: str) -> datetime:
+    """Get the `updated_at` timestamp of an active policy, without loading its configuration.
+
+    This is a cheap query used to decide whether a cached policy instance is still current.
+
+    Args:
+        session: The database session
+        name: The name of the policy
+
+    Returns:
+        The policy's `updated_at` timestamp
+
+    Raises:
+        LuthienDBQueryError: If the policy is not found or if the query execution fails
+        LuthienDBOperationError: For unexpected errors during lookup
+    """
+    try:
+        stmt = select(DBControlPolicy.updated_at).where(  # type: ignore[arg-type]
+            DBControlPolicy.name == name,  # type: ignore[arg-type]
+            DBControlPolicy.is_active,  # type: ignore[arg-type]
+        )
+        result = await session.execute(stmt)
+        updated_at = result.scalar_one_or_none()
+        if updated_at is None:
+            raise LuthienDBQueryError(f"Policy with name '{name}' not found")
+        return updated_at
+    except LuthienDBQueryError:
+        raise
+    except SQLAlchemyError as sqla_err:
+        logger.error(f"SQLAlchemy error fetching version of policy '{name}': {sqla_err}", exc_info=True)
+        raise LuthienDBQueryError(f"Database query failed while fetching version of policy '{name}'") from sqla_err
+    except Exception as e:
+        logger.error(f"Unexpected error fetching version of policy '{name}': {e}", exc_info=True)
+        raise LuthienDBOperationError(f"Unexpected error during policy version lookup: {e}") from e
+
+
 async def list_policies(session: AsyncSession, active_only: bool = False) -> List[DBControlPolicy]:
     """Get a list of all policies.
 
@@ -150,6 +187,7 @@ async def update_policy(session: AsyncSession, policy_id: int, policy_update: DB
         policy.config = policy_update.config
         policy.is_active = policy_update.is_active
         policy.description = policy_update.description
+        policy.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
 
         await session.commit()
         await session.refresh(policy)
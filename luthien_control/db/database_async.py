@@ -1,6 +1,6 @@
 import contextlib
 import logging
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Callable, Dict, Optional
 from urllib.parse import urlparse, urlunparse
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
@@ -128,6 +128,30 @@ async def close_db_engine() -> None:
         logger.info("Database engine was already None or not initialized during shutdown.")
 
 
+def get_db_pool_status() -> Dict[str, int]:
+    """Returns connection counts for the main engine's pool.
+
+    Returns:
+        A mapping of pool state ("size", "checked_in", "checked_out", "overflow") to the number
+        of connections, or an empty dict if the engine is not initialized. States the pool
+        class doesn't track (e.g. with SQLite's pools) are left out.
+    """
+    if _db_engine is None:
+        return {}
+    pool = _db_engine.pool
+    status = {}
+    for state, method_name in (
+        ("size", "size"),
+        ("checked_in", "checkedin"),
+        ("checked_out", "checkedout"),
+        ("overflow", "overflow"),
+    ):
+        method: Optional[Callable[[], int]] = getattr(pool, method_name, None)
+        if callable(method):
+            status[state] = int(method())
+    return status
+
+
 @contextlib.asynccontextmanager
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Get a SQLAlchemy async session for the database as a context manager."""
@@ -26,6 +26,12 @@ class LuthienDBQueryError(LuthienDBOperationError):
     pass
 
 
+class LuthienDBNotFoundError(LuthienDBQueryError):
+    """Exception raised when a query succeeds but the requested record does not exist."""
+
+    pass
+
+
 class LuthienDBTransactionError(LuthienDBOperationError):
     """Exception raised when a database transaction fails.
 
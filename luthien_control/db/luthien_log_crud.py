@@ -2,9 +2,9 @@
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlalchemy import desc, select
+from sqlalchemy import desc, insert, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col
@@ -12,7 +12,9 @@ from sqlmodel import col
 from luthien_control.db.exceptions import (
     LuthienDBOperationError,
     LuthienDBQueryError,
+    LuthienDBTransactionError,
 )
+from luthien_control.db.naive_datetime import NaiveDatetime
 
 from .sqlmodel_models import LuthienLog
 
@@ -72,6 +74,42 @@ async def list_logs(
         raise LuthienDBOperationError(f"Unexpected error during log listing: {e}") from e
 
 
+async def create_logs(session: AsyncSession, logs: Sequence[Dict[str, Any]]) -> int:
+    """Insert a batch of log entries in a single statement and commit.
+
+    Rows are plain dicts of `LuthienLog` column values rather than model instances, so the
+    whole batch is sent as one multi-row INSERT without per-object ORM bookkeeping.
+
+    Args:
+        session: The database session
+        logs: Column values for each log entry (`transaction_id`, `datatype`, and optionally
+            `datetime`, `data` and `notes`). Entries without a `datetime` are stamped with the
+            time of the insert, so callers that queue entries should set it when they are created
+
+    Returns:
+        The number of log entries inserted
+
+    Raises:
+        LuthienDBTransactionError: If the insert or commit fails
+        LuthienDBOperationError: For unexpected errors
+    """
+    if not logs:
+        return 0
+    rows = [{"datetime": NaiveDatetime.now(), "data": None, "notes": None, **log} for log in logs]
+    try:
+        await session.execute(insert(LuthienLog).values(rows))
+        await session.commit()
+    except SQLAlchemyError as sqla_err:
+        await session.rollback()
+        logger.error(f"SQLAlchemy error inserting {len(rows)} logs: {sqla_err}")
+        raise LuthienDBTransactionError(f"Database transaction failed while inserting logs: {sqla_err}") from sqla_err
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"Unexpected error inserting {len(rows)} logs: {e}")
+        raise LuthienDBOperationError(f"Unexpected error during log insertion: {e}") from e
+    return len(rows)
+
+
 async def get_log_by_id(session: AsyncSession, log_id: int) -> LuthienLog:
     """Get a specific log by its ID.
 
@@ -0,0 +1,112 @@
+# CRUD operations specific to ResponseCacheEntry model.
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col
+
+from luthien_control.db.exceptions import (
+    LuthienDBOperationError,
+    LuthienDBQueryError,
+    LuthienDBTransactionError,
+)
+
+from .sqlmodel_models import ResponseCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def get_cached_response(session: AsyncSession, key: str) -> Optional[bytes]:
+    """Get the body of an unexpired cached response.
+
+    Args:
+        session: The database session
+        key: The cache key of the response
+
+    Returns:
+        The cached response body, or None if there is no unexpired entry for `key`
+
+    Raises:
+        LuthienDBQueryError: If the query execution fails
+        LuthienDBOperationError: For unexpected errors during lookup
+    """
+    try:
+        stmt = select(col(ResponseCacheEntry.body)).where(
+            col(ResponseCacheEntry.key) == key,
+            col(ResponseCacheEntry.expires_at) > _utcnow(),
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+    except SQLAlchemyError as sqla_err:
+        logger.error(f"SQLAlchemy error fetching cached response: {sqla_err}", exc_info=True)
+        raise LuthienDBQueryError(f"Database query failed while fetching cached response: {sqla_err}") from sqla_err
+    except Exception as e:
+        logger.error(f"Unexpected error fetching cached response: {e}", exc_info=True)
+        raise LuthienDBOperationError(f"Unexpected error during cached response lookup: {e}") from e
+
+
+async def put_cached_response(session: AsyncSession, key: str, body: bytes, expires_at: datetime) -> None:
+    """Store a response body, replacing any existing entry for the same key.
+
+    Args:
+        session: The database session
+        key: The cache key of the response
+        body: The response body
+        expires_at: When the entry expires (naive UTC)
+
+    Raises:
+        LuthienDBTransactionError: If the transaction fails
+        LuthienDBOperationError: For other database errors
+    """
+    try:
+        await session.merge(ResponseCacheEntry(key=key, body=body, created_at=_utcnow(), expires_at=expires_at))
+        await session.commit()
+    except SQLAlchemyError as sqla_err:
+        await session.rollback()
+        logger.error(f"SQLAlchemy error storing cached response: {sqla_err}")
+        raise LuthienDBTransactionError(
+            f"Database transaction failed while storing cached response: {sqla_err}"
+        ) from sqla_err
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"Unexpected error storing cached response: {e}")
+        raise LuthienDBOperationError(f"Unexpected error during cached response storage: {e}") from e
+
+
+async def delete_expired_cached_responses(session: AsyncSession) -> int:
+    """Delete every expired cached response.
+
+    Args:
+        session: The database session
+
+    Returns:
+        The number of entries deleted
+
+    Raises:
+        LuthienDBTransactionError: If the transaction fails
+        LuthienDBOperationError: For other database errors
+    """
+    try:
+        result = await session.execute(
+            delete(ResponseCacheEntry).where(col(ResponseCacheEntry.expires_at) <= _utcnow())
+        )
+        await session.commit()
+        return result.rowcount or 0  # type: ignore[attr-defined]
+    except SQLAlchemyError as sqla_err:
+        await session.rollback()
+        logger.error(f"SQLAlchemy error deleting expired cached responses: {sqla_err}")
+        raise LuthienDBTransactionError(
+            f"Database transaction failed while deleting expired cached responses: {sqla_err}"
+        ) from sqla_err
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"Unexpected error deleting expired cached responses: {e}")
+        raise LuthienDBOperationError(f"Unexpected error during cached response cleanup: {e}") from e
@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from pydantic import model_validator
-from sqlalchemy import JSON, Column, DateTime, Index, String, types
+from sqlalchemy import JSON, Column, DateTime, Index, LargeBinary, String, types
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from sqlmodel import Field, SQLModel
@@ -183,3 +183,49 @@ class AdminSession(SQLModel, table=True):
         Index("idx_session_token", "session_token"),
         Index("idx_session_expires", "expires_at"),
     )
+
+
+class ResponseCacheEntry(SQLModel, table=True):
+    """
+    A cached backend response, stored by `DatabaseResponseCache`.
+
+    Attributes:
+        key: Hash of the canonicalized request the response answers (primary key).
+        body: The response body, as returned by the backend.
+        created_at: When the entry was stored (naive UTC).
+        expires_at: When the entry stops being served (naive UTC).
+    """
+
+    __tablename__ = "response_cache"  # type: ignore
+
+    key: str = Field(sa_column=Column(String(64), primary_key=True))
+    body: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    created_at: dt.datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False
+    )
+    expires_at: dt.datetime = Field(nullable=False, index=True)
+
+
+class ClientApiKeyUsage(SQLModel, table=True):
+    """
+    Usage of a client API key over a flush interval, written by `ClientQuotaTracker`.
+
+    Attributes:
+        id: Primary key.
+        api_key_id: The client API key the usage belongs to.
+        recorded_at: When the usage was written (naive UTC).
+        requests: Number of requests made.
+        prompt_tokens: Number of prompt tokens used.
+        completion_tokens: Number of completion tokens used.
+    """
+
+    __tablename__ = "client_api_key_usage"  # type: ignore
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    api_key_id: int = Field(foreign_key="client_api_keys.id", ondelete="CASCADE", nullable=False, index=True)
+    recorded_at: dt.datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False, index=True
+    )
+    requests: int = Field(default=0, nullable=False)
+    prompt_tokens: int = Field(default=0, nullable=False)
+    completion_tokens: int = Field(default=0, nullable=False)
@@ -16,10 +16,11 @@ from luthien_control.db.luthien_log_crud import (
     get_unique_transaction_ids,
     list_logs,
 )
+from luthien_control.utils.json_codec import CodecJSONResponse
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=CodecJSONResponse)
 templates = Jinja2Templates(directory="luthien_control/logs/templates")
 
 
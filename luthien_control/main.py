@@ -11,6 +11,8 @@ from luthien_control.core.logging import setup_logging
 from luthien_control.custom_openapi_schema import create_custom_openapi
 from luthien_control.db.database_async import close_db_engine
 from luthien_control.logs.router import router as logs_router
+from luthien_control.metrics.middleware import MetricsMiddleware
+from luthien_control.metrics.router import router as metrics_router
 from luthien_control.proxy.debugging import DebugLoggingMiddleware
 from luthien_control.proxy.server import router as proxy_router
 from luthien_control.settings import Settings
@@ -78,10 +80,23 @@ async def lifespan(app: FastAPI):
     # Shutdown: Clean up resources
     logger.info("Application shutdown sequence initiated.")
 
+    # Shutdown: Write out queued transaction logs while the DB engine is still open
+    if initialized_dependencies.log_sink is not None:
+        await initialized_dependencies.log_sink.aclose()
+        logger.info("Transaction log sink flushed and stopped.")
+    await initialized_dependencies.client_quotas.aclose()
+    logger.info("Client quota usage flushed.")
+    for response_cache in initialized_dependencies.response_caches.values():
+        await response_cache.aclose()
+
     # Close main DB engine (handles its own check if already closed or never initialized)
     await close_db_engine()
     logger.info("Main DB Engine closed.")
 
+    # Shutdown: Drop pooled OpenAI clients before closing the HTTP client they share
+    await initialized_dependencies.openai_clients.aclose()
+    logger.info("Pooled OpenAI clients released.")
+
     # Shutdown: Close the HTTP client via the container if available
     await initialized_dependencies.http_client.aclose()
     logger.info("HTTP Client from DependencyContainer closed.")
@@ -97,6 +112,8 @@ app = FastAPI(
 )
 
 app.add_middleware(DebugLoggingMiddleware)
+# Added last so it is outermost and times the whole request, including other middleware
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/health", tags=["General"], status_code=200)
@@ -114,6 +131,7 @@ async def health_check():
 
 app.include_router(proxy_router)
 app.include_router(logs_router)
+app.include_router(metrics_router)
 app.include_router(admin_router)
 
 
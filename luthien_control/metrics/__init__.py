@@ -0,0 +1 @@
+# Metrics package for exposing Prometheus-compatible instrumentation
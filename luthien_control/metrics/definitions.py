@@ -0,0 +1,94 @@
+# Metrics recorded by the proxy, registered on the application-wide registry.
+
+from typing import TYPE_CHECKING, ContextManager, Dict
+
+from luthien_control.db.database_async import get_db_pool_status
+from luthien_control.metrics.registry import REGISTRY, LabelValues
+
+if TYPE_CHECKING:
+    from luthien_control.control_policy.control_policy import ControlPolicy
+
+
+def _db_pool_connections() -> Dict[LabelValues, float]:
+    return {(state,): float(count) for state, count in get_db_pool_status().items()}
+
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "luthien_http_requests_total",
+    "HTTP requests served, by route template, method and status code.",
+    ("path", "method", "status"),
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "luthien_http_request_duration_seconds",
+    "Time to fully serve an HTTP request (including streamed bodies), by route template and method.",
+    ("path", "method"),
+)
+BACKEND_REQUEST_DURATION = REGISTRY.histogram(
+    "luthien_backend_request_duration_seconds",
+    "Time until the backend API returned a response (headers only for streamed responses), by endpoint.",
+    ("backend",),
+)
+BACKEND_REQUESTS_COALESCED = REGISTRY.counter(
+    "luthien_backend_requests_coalesced_total",
+    "Backend requests answered by an identical request already in flight instead of a new call, by endpoint.",
+    ("backend",),
+)
+BACKEND_LIMITER_WAIT_DURATION = REGISTRY.histogram(
+    "luthien_backend_limiter_wait_duration_seconds",
+    "Time requests waited for admission by a backend rate limiter, by endpoint.",
+    ("backend",),
+)
+BACKEND_LIMITER_REJECTIONS = REGISTRY.counter(
+    "luthien_backend_limiter_rejections_total",
+    "Requests rejected by a backend rate limiter, by endpoint and reason (queue_full or deadline).",
+    ("backend", "reason"),
+)
+BACKEND_ENDPOINT_EJECTIONS = REGISTRY.counter(
+    "luthien_backend_endpoint_ejections_total",
+    "Backend endpoints ejected from a load balancing pool after failing repeatedly, by endpoint.",
+    ("backend",),
+)
+CIRCUIT_BREAKER_TRANSITIONS = REGISTRY.counter(
+    "luthien_circuit_breaker_transitions_total",
+    "Backend circuit breaker state changes, by endpoint and new state (open, half_open or closed).",
+    ("backend", "state"),
+)
+CIRCUIT_BREAKER_REJECTIONS = REGISTRY.counter(
+    "luthien_circuit_breaker_rejections_total",
+    "Requests not sent because the circuit breaker of their backend was open, by endpoint and outcome "
+    "(fallback or error).",
+    ("backend", "outcome"),
+)
+CLIENT_QUOTA_REJECTIONS = REGISTRY.counter(
+    "luthien_client_quota_rejections_total",
+    "Requests rejected because their client API key reached a quota, by quota limit.",
+    ("limit",),
+)
+EMBEDDINGS_BATCH_INPUTS = REGISTRY.histogram(
+    "luthien_embeddings_batch_inputs",
+    "Inputs sent in one batched embeddings backend call, by endpoint.",
+    ("backend",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048),
+)
+POLICY_APPLY_DURATION = REGISTRY.histogram(
+    "luthien_policy_apply_duration_seconds",
+    "Time spent in a control policy's apply, by policy name and type. Composite policies include their members.",
+    ("policy_name", "policy_type"),
+)
+RESPONSE_CACHE_REQUESTS = REGISTRY.counter(
+    "luthien_response_cache_requests_total",
+    "Requests seen by response cache policies, by store and result (hit, miss or bypass).",
+    ("store", "result"),
+)
+DB_POOL_CONNECTIONS = REGISTRY.gauge(
+    "luthien_db_pool_connections",
+    "Connections in the main database pool, by state.",
+    ("state",),
+    callback=_db_pool_connections,
+)
+
+
+def time_policy_apply(policy: "ControlPolicy") -> ContextManager[None]:
+    """Returns a context manager that records the duration of `policy.apply` in `POLICY_APPLY_DURATION`."""
+    policy_type = policy.type or policy.__class__.__name__
+    return POLICY_APPLY_DURATION.time(policy_name=policy.name or policy_type, policy_type=policy_type)
@@ -0,0 +1,60 @@
+import time
+from typing import Any, Dict
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from luthien_control.metrics.definitions import HTTP_REQUEST_DURATION, HTTP_REQUESTS
+
+UNMATCHED_PATH = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware counting HTTP requests and timing them until the last body chunk is sent.
+
+    Requests are labelled with the template of the route that served them (e.g.
+    `/api/{full_path:path}`) rather than the raw URL, so the number of label values
+    stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._endpoint_paths: Dict[Any, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            path = self._route_path(scope)
+            HTTP_REQUESTS.inc(path=path, method=scope["method"], status=status_code)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, path=path, method=scope["method"])
+
+    def _route_path(self, scope: Scope) -> str:
+        route = scope.get("route")
+        if route is not None and hasattr(route, "path"):
+            return route.path
+        # Older Starlette versions only leave the matched endpoint in the scope
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_PATH
+        path = self._endpoint_paths.get(endpoint)
+        if path is None:
+            app = scope.get("app")
+            for candidate in getattr(app, "routes", ()):
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    path = candidate.path
+                    break
+            path = self._endpoint_paths[endpoint] = path or UNMATCHED_PATH
+        return path
@@ -0,0 +1,239 @@
+# In-process metrics registry, rendered in the Prometheus text exposition format.
+
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, ClassVar, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """Base class for a named metric with a fixed set of label names."""
+
+    type_name: ClassVar[str] = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _label_values(self, labels: Mapping[str, object]) -> LabelValues:
+        if len(labels) != len(self.labelnames) or any(name not in labels for name in self.labelnames):
+            raise ValueError(f"Metric '{self.name}' expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterator[str]:
+        """Yields the sample lines for this metric."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Renders the metric's HELP/TYPE header followed by its samples."""
+        header = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        return "\n".join(header + list(self.samples()))
+
+
+class Counter(Metric):
+    """A monotonically increasing count, e.g. of requests served."""
+
+    type_name: ClassVar[str] = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Increments the counter for the given label values."""
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        key = self._label_values(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: object) -> float:
+        """Returns the current count for the given label values."""
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """A value that can go up and down.
+
+    Gauges are either set explicitly, or computed when the registry is rendered by a
+    `callback` returning a value per label-value tuple (use `()` for a gauge without labels).
+    """
+
+    type_name: ClassVar[str] = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Mapping[LabelValues, float]]] = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        """Sets the gauge for the given label values."""
+        self._values[self._label_values(labels)] = value
+
+    def samples(self) -> Iterator[str]:
+        values = dict(self._values)
+        if self.callback is not None:
+            values.update(self.callback())
+        for key, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class _HistogramState:
+    __slots__ = ("bucket_counts", "sum", "count")
+
+    def __init__(self, n_buckets: int) -> None:
+        # One slot per finite bucket plus one for observations above the largest bucket
+        self.bucket_counts: List[int] = [0] * (n_buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """Distribution of observed values (typically durations in seconds) over fixed buckets."""
+
+    type_name: ClassVar[str] = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        if "le" in labelnames:
+            raise ValueError("'le' is reserved for histogram buckets")
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        self._states: Dict[LabelValues, _HistogramState] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Records one observation for the given label values."""
+        key = self._label_values(labels)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _HistogramState(len(self.buckets))
+        state.bucket_counts[bisect_left(self.buckets, value)] += 1
+        state.sum += value
+        state.count += 1
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """Observes the wall-clock duration of the `with` block, including when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get_count(self, **labels: object) -> int:
+        """Returns the number of observations for the given label values."""
+        state = self._states.get(self._label_values(labels))
+        return state.count if state is not None else 0
+
+    def samples(self) -> Iterator[str]:
+        bucket_labelnames = self.labelnames + ("le",)
+        for key, state in self._states.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state.bucket_counts):
+                cumulative += count
+                labels = _format_labels(bucket_labelnames, key + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(state.sum)}"
+            yield f"{self.name}_count{labels} {state.count}"
+
+
+class MetricsRegistry:
+    """Holds the application's metrics and renders them for scraping.
+
+    Metrics are plain in-memory counters updated from the event loop thread, so
+    recording a sample is a dict lookup and an addition rather than an I/O call.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Adds `metric` to the registry.
+
+        Raises:
+            ValueError: If a metric with the same name is already registered.
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Creates and registers a `Counter`."""
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Mapping[LabelValues, float]]] = None,
+    ) -> Gauge:
+        """Creates and registers a `Gauge`."""
+        metric = Gauge(name, documentation, labelnames, callback)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Creates and registers a `Histogram`."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        """Renders every registered metric in the Prometheus text exposition format."""
+        return "".join(metric.render() + "\n" for metric in self._metrics.values())
+
+
+# The application-wide registry served on /metrics
+REGISTRY = MetricsRegistry()
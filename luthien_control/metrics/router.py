@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from luthien_control.metrics.registry import CONTENT_TYPE, REGISTRY
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Expose the application's metrics in the Prometheus text format."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -1,92 +1,114 @@
 """Enhanced debugging utilities for the proxy pipeline."""
 
-import json
 import logging
 import time
 from datetime import UTC, datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from luthien_control.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
 
-class DebugLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to add detailed request/response logging for debugging."""
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        start_time = time.time()
-        request_id = request.headers.get("x-request-id", "no-id")
-
-        # Log request details
-        request_body = None
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                request_body = await request.body()
-
-                # Reconstruct request for downstream processing
-                async def receive():
-                    return {"type": "http.request", "body": request_body}
-
-                request._receive = receive
-
-                # Try to parse JSON for logging
-                try:
-                    parsed_body = json.loads(request_body) if request_body else None
-                    logger.debug(
-                        f"[{request_id}] Incoming {request.method} request",
-                        extra={
-                            "path": request.url.path,
-                            "headers": dict(request.headers),
-                            "body": parsed_body,
-                            "query_params": dict(request.query_params),
-                        },
-                    )
-                except json.JSONDecodeError:
-                    logger.debug(
-                        f"[{request_id}] Incoming {request.method} request (non-JSON body)",
-                        extra={
-                            "path": request.url.path,
-                            "headers": dict(request.headers),
-                            "body_length": len(request_body) if request_body else 0,
-                            "query_params": dict(request.query_params),
-                        },
-                    )
-            except Exception as e:
-                logger.error(f"[{request_id}] Error reading request body: {e}")
-        else:
-            logger.debug(
-                f"[{request_id}] Incoming {request.method} request",
-                extra={
-                    "path": request.url.path,
-                    "headers": dict(request.headers),
-                    "query_params": dict(request.query_params),
-                },
-            )
-
-        # Process request
-        response = await call_next(request)
-
-        # Calculate duration
-        duration = time.time() - start_time
-
-        # Log response details
-        logger.info(
-            f"[{request_id}] Request completed",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "duration_seconds": duration,
-            },
-        )
-
-        # Add debug headers
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Processing-Time"] = f"{duration:.3f}s"
-
-        return response
+class DebugLoggingMiddleware:
+    """Pure ASGI middleware that logs requests and adds `X-Request-ID` / `X-Processing-Time` headers.
+
+    Request details (headers, query parameters and the body) are only gathered when this
+    module's logger is enabled for DEBUG. The body is observed as the application reads it
+    rather than being buffered up front, and responses are passed through message by
+    message, so streamed responses are forwarded as they are produced.
+
+    `X-Processing-Time` is the time until the response headers were sent; the completion
+    log line reports the time until the last body chunk was sent.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.monotonic()
+        request_headers = Headers(scope=scope)
+        request_id = request_headers.get("x-request-id", "no-id")
+        method = scope["method"]
+        path = scope["path"]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            receive = self._debug_receive(scope, receive, request_id, request_headers)
+            if method not in _BODY_METHODS:
+                logger.debug(
+                    f"[{request_id}] Incoming {method} request",
+                    extra={
+                        "path": path,
+                        "headers": dict(request_headers),
+                        "query_params": dict(QueryParams(scope["query_string"])),
+                    },
+                )
+
+        status_code: Optional[int] = None
+
+        async def send_with_debug_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Processing-Time"] = f"{time.monotonic() - start_time:.3f}s"
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                logger.info(
+                    f"[{request_id}] Request completed",
+                    extra={
+                        "method": method,
+                        "path": path,
+                        "status_code": status_code,
+                        "duration_seconds": time.monotonic() - start_time,
+                    },
+                )
+
+        await self.app(scope, receive, send_with_debug_headers)
+
+    @staticmethod
+    def _debug_receive(scope: Scope, receive: Receive, request_id: str, request_headers: Headers) -> Receive:
+        """Wraps `receive` to log the request body once the application has read all of it."""
+        method = scope["method"]
+        if method not in _BODY_METHODS:
+            return receive
+        body_chunks: List[bytes] = []
+
+        async def receive_and_log() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                body_chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    _log_request_body(scope, request_id, request_headers, b"".join(body_chunks))
+            return message
+
+        return receive_and_log
+
+
+_BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+
+def _log_request_body(scope: Scope, request_id: str, request_headers: Headers, body: bytes) -> None:
+    method = scope["method"]
+    extra: Dict[str, Any] = {
+        "path": scope["path"],
+        "headers": dict(request_headers),
+        "query_params": dict(QueryParams(scope["query_string"])),
+    }
+    try:
+        extra["body"] = json_codec.loads(body) if body else None
+        logger.debug(f"[{request_id}] Incoming {method} request", extra=extra)
+    except json_codec.JSONDecodeError:
+        extra["body_length"] = len(body)
+        logger.debug(f"[{request_id}] Incoming {method} request (non-JSON body)", extra=extra)
 
 
 def log_transaction_state(transaction_id: str, stage: str, details: Dict[str, Any]) -> None:
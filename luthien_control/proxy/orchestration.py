@@ -1,24 +1,31 @@
 import logging
 import time
 import uuid
+from typing import Optional
 
 import fastapi
 from fastapi import status
-from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from luthien_control.api.openai_chat_completions.request import (
     fastapi_request_to_openai_chat_completions_request,
 )
-from luthien_control.api.openai_chat_completions.response import openai_chat_completions_response_to_fastapi_response
+from luthien_control.api.openai_chat_completions.response import (
+    openai_chat_completions_response_to_fastapi_response,
+    openai_chat_completions_stream_to_fastapi_response,
+)
 from luthien_control.control_policy.control_policy import ControlPolicy
 from luthien_control.control_policy.exceptions import ControlPolicyError
 from luthien_control.core.dependency_container import DependencyContainer
 from luthien_control.core.request import Request
-from luthien_control.core.response import Response
+from luthien_control.core.response import Response, close_stream
 from luthien_control.core.transaction import Transaction
+from luthien_control.db.naive_datetime import NaiveDatetime
+from luthien_control.metrics.definitions import time_policy_apply
 from luthien_control.proxy.debugging import create_debug_response, log_policy_execution, log_transaction_state
 from luthien_control.settings import Settings
+from luthien_control.utils import deep_events
+from luthien_control.utils.json_codec import CodecJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +37,43 @@ def _initialize_transaction(body: bytes, url: str, api_key: str) -> Transaction:
     return Transaction(transaction_id=transaction_id, request=request, response=Response())
 
 
+def _submit_transaction_log(
+    dependencies: DependencyContainer,
+    transaction: Transaction,
+    policy_name: Optional[str],
+    response: fastapi.Response,
+    duration: Optional[float],
+    error: Optional[str],
+) -> None:
+    """Hands a record of the finished transaction to the log sink, if one is configured.
+
+    Only references are collected here; the sink serializes the payloads when it writes
+    the batch, so logging adds no serialization work to the request itself. The record is
+    timestamped now, when the transaction finished, rather than when its batch is written.
+    """
+    log_sink = dependencies.log_sink
+    if log_sink is None:
+        return
+    log_sink.submit(
+        {
+            "transaction_id": str(transaction.transaction_id),
+            "datatype": "transaction",
+            "datetime": NaiveDatetime.now(),
+            "data": {
+                "api_endpoint": transaction.request.api_endpoint,
+                "policy_name": policy_name,
+                "status_code": response.status_code,
+                "duration_seconds": duration,
+                "streamed": transaction.response.stream is not None,
+                "error": error,
+                "request": transaction.request.payload,
+                "response": transaction.response.payload,
+                "transaction_data": dict(transaction.data),
+            },
+        }
+    )
+
+
 async def run_policy_flow(
     request: fastapi.Request,
     main_policy: ControlPolicy,
@@ -47,13 +91,18 @@ async def run_policy_flow(
         session: The database session for this request.
 
     Returns:
-        The final FastAPI response.
+        The final FastAPI response. For streamed requests this is a server-sent events
+        `StreamingResponse` that forwards backend chunks as they arrive.
     """
+    # Only wire deep change tracking into the payload models if some policy listens for it;
+    # for long conversations the wiring costs far more than parsing the body itself.
+    track_changes = any(policy.requires_change_events for policy in main_policy.iter_policies())
     # 1. Initialize Context
     body = await request.body()
     url = request.path_params["full_path"]
     api_key = request.headers.get("authorization", "").replace("Bearer ", "")
-    transaction = _initialize_transaction(body, url, api_key)
+    with deep_events(track_changes):
+        transaction = _initialize_transaction(body, url, api_key)
 
     # Log initial transaction state
     log_transaction_state(
@@ -70,6 +119,7 @@ async def run_policy_flow(
 
     # 2. Apply the main policy
     policy_start_time = None
+    error: Optional[str] = None
     try:
         logger.info(
             "Applying control policy",
@@ -81,7 +131,8 @@ async def run_policy_flow(
             },
         )
         policy_start_time = time.time()
-        transaction = await main_policy.apply(transaction=transaction, container=dependencies, session=session)
+        with deep_events(track_changes), time_policy_apply(main_policy):
+            transaction = await main_policy.apply(transaction=transaction, container=dependencies, session=session)
 
         # Log successful policy execution
         log_policy_execution(
@@ -89,7 +140,10 @@ async def run_policy_flow(
             main_policy.name or "unknown",
             "completed",
             duration=time.time() - policy_start_time if policy_start_time else None,
-            details={"has_response": transaction.response.payload is not None},
+            details={
+                "has_response": transaction.response.payload is not None,
+                "streaming": transaction.response.stream is not None,
+            },
         )
 
         logger.info(
@@ -100,10 +154,15 @@ async def run_policy_flow(
                 "duration_seconds": time.time() - policy_start_time if policy_start_time else None,
             },
         )
-        if transaction.response.payload is not None:
-            final_response = openai_chat_completions_response_to_fastapi_response(transaction.response.payload)
+        if transaction.response.stream is not None:
+            # Chunks (and any chunk hooks registered by policies) are processed as the client reads them
+            final_response = openai_chat_completions_stream_to_fastapi_response(transaction.response.iter_chunks())
+        elif transaction.response.payload is not None:
+            final_response = openai_chat_completions_response_to_fastapi_response(
+                transaction.response.payload, transaction.response.raw_body
+            )
         else:
-            final_response = JSONResponse(
+            final_response = CodecJSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={
                     "detail": "Internal Server Error: No response payload",
@@ -113,6 +172,7 @@ async def run_policy_flow(
             )
 
     except ControlPolicyError as e:
+        error = str(e)
         # Log policy error
         policy_duration = time.time() - policy_start_time if policy_start_time else None
         log_policy_execution(
@@ -136,7 +196,7 @@ async def run_policy_flow(
                 "policy_name": getattr(e, "policy_name", "unknown"),
             },
         )
-        # Directly build a JSONResponse for policy errors
+        # Directly build a JSON response for policy errors
         policy_name_for_error = getattr(e, "policy_name", "unknown")
         status_code = getattr(e, "status_code", None) or status.HTTP_400_BAD_REQUEST  # Use 400 if None or not specified
         error_detail = getattr(e, "detail", str(e))  # Use str(e) if no detail attribute
@@ -162,12 +222,13 @@ async def run_policy_flow(
             include_debug_info=settings.dev_mode(),
         )
 
-        final_response = JSONResponse(
+        final_response = CodecJSONResponse(
             status_code=status_code,
             content=response_content,
         )
 
     except Exception as e:
+        error = str(e)
         # Log unexpected error
         policy_duration = time.time() - policy_start_time if policy_start_time else None
         log_policy_execution(
@@ -213,9 +274,24 @@ async def run_policy_flow(
         # Add policy name to the response
         response_content["policy_name"] = policy_name_for_error
 
-        final_response = JSONResponse(
+        final_response = CodecJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content=response_content,
         )
 
+    if error is not None and transaction.response.stream is not None:
+        # A policy failed after the backend stream was opened; it will never be read.
+        try:
+            await close_stream(transaction.response.stream)
+        except Exception as e:
+            logger.warning(f"Failed to close the abandoned backend stream: {e}")
+
+    _submit_transaction_log(
+        dependencies,
+        transaction,
+        main_policy.name,
+        final_response,
+        time.time() - policy_start_time if policy_start_time else None,
+        error,
+    )
     return final_response
@@ -0,0 +1,198 @@
+"""Raw byte-level passthrough for `/api/` endpoints that are not chat completions.
+
+Requests whose path matches one of the `RAW_PASSTHROUGH_PATHS` patterns (e.g. `models*`,
+`embeddings`, `files*`, `audio/*`) are forwarded to the backend without parsing: the request
+body is streamed from the client to the backend, and the response body from the backend to
+the client, through the shared `httpx.AsyncClient`, chunk by chunk. Only the header-level steps
+of the main policy (`ControlPolicy.apply_headers`) are applied; they see the request as a
+`TrackedContext` whose URL is still the path relative to the backend.
+"""
+
+import fnmatch
+import logging
+import time
+import uuid
+from typing import AsyncIterator, Sequence
+
+import fastapi
+import httpx
+from fastapi import status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from luthien_control.control_policy.client_api_key_auth import ClientApiKeyAuthPolicy
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.exceptions import ControlPolicyError
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.tracked_context import BACKEND_URL_KEY, TrackedContext
+from luthien_control.proxy.debugging import create_debug_response
+from luthien_control.utils.json_codec import CodecJSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Connection-specific headers, which apply to a single hop and must not be forwarded
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
+
+def is_raw_passthrough_path(path: str, patterns: Sequence[str]) -> bool:
+    """Returns whether the `/api/` path (e.g. `models/gpt-4o`) matches one of the glob `patterns`."""
+    path = path.strip("/")
+    return any(fnmatch.fnmatchcase(path, pattern) for pattern in patterns)
+
+
+def _forwarded_request_headers(request: fastapi.Request) -> dict[str, str]:
+    return {key: value for key, value in request.headers.items() if key not in HOP_BY_HOP_HEADERS and key != "host"}
+
+
+def _has_body(request: fastapi.Request) -> bool:
+    content_length = request.headers.get("content-length")
+    return "transfer-encoding" in request.headers or (content_length is not None and content_length != "0")
+
+
+async def _stream_response_body(backend_response: httpx.Response) -> AsyncIterator[bytes]:
+    """Yields the backend response body as it arrives, closing the backend response however streaming ends."""
+    try:
+        async for chunk in backend_response.aiter_raw():
+            yield chunk
+    finally:
+        await backend_response.aclose()
+
+
+def _error_response(status_code: int, message: str, transaction_id: uuid.UUID) -> fastapi.Response:
+    return CodecJSONResponse(
+        status_code=status_code,
+        content=create_debug_response(
+            status_code=status_code,
+            message=message,
+            transaction_id=str(transaction_id),
+            include_debug_info=False,
+        ),
+    )
+
+
+async def run_raw_passthrough(
+    request: fastapi.Request,
+    main_policy: ControlPolicy,
+    dependencies: DependencyContainer,
+    session: AsyncSession,
+) -> fastapi.Response:
+    """
+    Forwards a request to the backend as raw bytes, applying only header-level policies.
+
+    The backend URL is the one set by a `SetBackendPolicy`, or `BACKEND_URL` if no policy sets one;
+    the requested path and query string are appended to it. If the main policy contains a
+    `ClientApiKeyAuthPolicy` that the header-level steps do not reach (e.g. one nested in a
+    `BranchingPolicy`), the request is rejected rather than forwarded unauthenticated. If a
+    policy sets the context's response, that response is returned and nothing is forwarded.
+
+    Args:
+        request: The incoming FastAPI request.
+        main_policy: The main policy instance, whose header-level steps are applied.
+        dependencies: The application's dependency container.
+        session: The database session for this request.
+
+    Returns:
+        A `StreamingResponse` relaying the backend's status, headers and body, or a JSON error response.
+    """
+    context = TrackedContext()
+    path = request.path_params["full_path"]
+    if request.url.query:
+        path = f"{path}?{request.url.query}"
+    context.update_request(
+        method=request.method,
+        url=path,
+        headers=_forwarded_request_headers(request),
+        content=request.stream() if _has_body(request) else None,
+    )
+    logger.info(
+        "Raw passthrough request",
+        extra={"transaction_id": str(context.transaction_id), "method": request.method, "path": path},
+    )
+
+    header_policies = {id(policy) for policy in main_policy.iter_header_policies()}
+    if any(
+        isinstance(policy, ClientApiKeyAuthPolicy) and id(policy) not in header_policies
+        for policy in main_policy.iter_policies()
+    ):
+        logger.error(
+            f"Main policy '{main_policy.name}' authenticates clients in a way raw passthrough cannot apply; "
+            f"rejecting transaction {context.transaction_id}"
+        )
+        return _error_response(
+            status.HTTP_403_FORBIDDEN,
+            "Client authentication for this endpoint is not supported by the configured policy",
+            context.transaction_id,
+        )
+
+    start_time = time.time()
+    try:
+        context = await main_policy.apply_headers(context, container=dependencies, session=session)
+    except ControlPolicyError as e:
+        logger.warning(
+            f"Control policy error in raw passthrough - transaction {context.transaction_id}",
+            extra={"transaction_id": str(context.transaction_id), "error": str(e), "error_type": e.__class__.__name__},
+        )
+        policy_name = getattr(e, "policy_name", None) or "unknown"
+        return _error_response(
+            getattr(e, "status_code", None) or status.HTTP_400_BAD_REQUEST,
+            f"Policy error in '{policy_name}': {getattr(e, 'detail', None) or e}",
+            context.transaction_id,
+        )
+    except Exception as e:
+        logger.exception(f"Unhandled exception in raw passthrough - transaction {context.transaction_id}: {e}")
+        return _error_response(status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal Server Error", context.transaction_id)
+
+    policy_response = context.response
+    if policy_response is not None:
+        # A policy answered the request itself (e.g. from a batched backend call)
+        return fastapi.Response(
+            content=policy_response.content,
+            status_code=policy_response.status_code,
+            headers={key: value for key, value in policy_response.headers.items() if key not in HOP_BY_HOP_HEADERS},
+        )
+
+    backend_url = context.get_data(BACKEND_URL_KEY) or dependencies.settings.get_backend_url()
+    if not backend_url:
+        return _error_response(
+            status.HTTP_500_INTERNAL_SERVER_ERROR, "Backend URL is not configured", context.transaction_id
+        )
+    url = httpx.URL(f"{backend_url.rstrip('/')}/{path}")
+    context.update_request(url=str(url), headers={"host": url.netloc.decode("ascii")})
+    # The tracked request itself rather than a copy, which would lose the streamed body
+    backend_request = context.request_to_send()
+
+    try:
+        backend_response = await dependencies.http_client.send(backend_request, stream=True)
+    except httpx.TimeoutException as e:
+        logger.error(f"Timeout during raw passthrough to {backend_request.url}: {e}")
+        return _error_response(status.HTTP_504_GATEWAY_TIMEOUT, "Backend request timed out", context.transaction_id)
+    except (httpx.RequestError, httpx.StreamError) as e:
+        logger.error(f"Error during raw passthrough to {backend_request.url}: {e}")
+        return _error_response(status.HTTP_502_BAD_GATEWAY, "Backend request failed", context.transaction_id)
+
+    logger.info(
+        "Raw passthrough response headers received",
+        extra={
+            "transaction_id": str(context.transaction_id),
+            "status_code": backend_response.status_code,
+            "duration_seconds": time.time() - start_time,
+        },
+    )
+    response = StreamingResponse(_stream_response_body(backend_response), status_code=backend_response.status_code)
+    response.raw_headers = [
+        (key, value)
+        for key, value in backend_response.headers.raw
+        if key.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS
+    ]
+    return response
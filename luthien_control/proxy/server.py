@@ -1,7 +1,7 @@
 import logging
 from typing import Any, Optional
 
-from fastapi import APIRouter, Body, Depends, Path, Request, Response, Security
+from fastapi import APIRouter, Depends, Path, Request, Response, Security
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,6 +13,7 @@ from luthien_control.core.dependencies import (
 )
 from luthien_control.core.dependency_container import DependencyContainer
 from luthien_control.proxy.orchestration import run_policy_flow
+from luthien_control.proxy.raw_passthrough import is_raw_passthrough_path, run_raw_passthrough
 
 logger = logging.getLogger(__name__)
 
@@ -34,21 +35,30 @@ default_path: str = Path(
     },
 )
 
-default_payload: dict[str, Any] = Body(
-    None,
-    openapi_examples={
-        "sqrt(64)": {
-            "value": {
-                "model": "gpt-3.5-turbo",
-                "messages": [
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": "What is the square root of 64?"},
-                ],
-                "max_tokens": 30,
-            },
+# The request body is documented here rather than declared as a `Body` parameter, which would make
+# FastAPI read and parse it before the handler runs; raw passthrough requests stream it unread.
+default_payload_openapi: dict[str, Any] = {
+    "requestBody": {
+        "required": False,
+        "content": {
+            "application/json": {
+                "schema": {"type": "object", "additionalProperties": True},
+                "examples": {
+                    "sqrt(64)": {
+                        "value": {
+                            "model": "gpt-3.5-turbo",
+                            "messages": [
+                                {"role": "system", "content": "You are a helpful assistant."},
+                                {"role": "user", "content": "What is the square root of 64?"},
+                            ],
+                            "max_tokens": 30,
+                        },
+                    },
+                },
+            }
         },
-    },
-)
+    }
+}
 
 default_token: Optional[str] = Security(http_bearer_auth)
 
@@ -61,7 +71,8 @@ async def _handle_api_request(
 ) -> Response:
     """
     Common handler for API proxy requests.
-    Orchestrates the policy flow for both GET and POST requests.
+    Orchestrates the policy flow for both GET and POST requests, or forwards the request
+    as raw bytes if its path is one of the configured `RAW_PASSTHROUGH_PATHS`.
     """
     # Log detailed proxy request information
     client_ip = request.client.host if request.client else "unknown"
@@ -82,13 +93,21 @@ async def _handle_api_request(
         },
     )
 
-    # Orchestrate the policy flow
-    response = await run_policy_flow(
-        request=request,
-        main_policy=main_policy,
-        dependencies=dependencies,
-        session=session,
-    )
+    if is_raw_passthrough_path(request.path_params["full_path"], dependencies.settings.get_raw_passthrough_paths()):
+        response = await run_raw_passthrough(
+            request=request,
+            main_policy=main_policy,
+            dependencies=dependencies,
+            session=session,
+        )
+    else:
+        # Orchestrate the policy flow
+        response = await run_policy_flow(
+            request=request,
+            main_policy=main_policy,
+            dependencies=dependencies,
+            session=session,
+        )
 
     # Log response details
     logger.info(
@@ -108,6 +127,7 @@ async def _handle_api_request(
 
 @router.post(
     "/api/{full_path:path}",
+    openapi_extra=default_payload_openapi,
 )
 async def api_proxy_endpoint(
     request: Request,
@@ -117,12 +137,11 @@ async def api_proxy_endpoint(
     main_policy: ControlPolicy = Depends(get_main_control_policy),
     session: AsyncSession = Depends(get_db_session),
     # --- Swagger UI Enhancements ---
-    # The 'payload' and 'token' parameters enhance the Swagger UI:
-    # - 'payload' (dict[str, Any], optional): Provides a schema for the request body.
+    # The 'token' parameter and `default_payload_openapi` enhance the Swagger UI:
+    # - `default_payload_openapi` provides a schema and example for the request body.
     #   Actual body content is read directly from the 'request' object.
     # - 'token' (Optional[str]): Enables the 'Authorize' button (Bearer token).
     #   Actual token validation is handled by the policy flow.
-    payload: dict[str, Any] = default_payload,
     token: Optional[str] = Security(http_bearer_auth),
 ):
     """
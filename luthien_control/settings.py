@@ -53,6 +53,156 @@ class Settings:
         """Returns the path to the policy file, if set."""
         return os.getenv("POLICY_FILEPATH")
 
+    def get_policy_cache_revalidate_seconds(self) -> float:
+        """Returns how long a cached control policy is trusted before its version is rechecked."""
+        try:
+            return float(os.getenv("POLICY_CACHE_REVALIDATE_SECONDS", "5"))
+        except ValueError:
+            raise ValueError("POLICY_CACHE_REVALIDATE_SECONDS environment variable must be a number.")
+
+    # --- Client API key cache settings ---
+    def get_api_key_cache_ttl_seconds(self) -> float:
+        """Returns how long a validated client API key is cached.
+
+        Keys are changed outside the server process, so this also bounds how long a deactivated
+        key keeps being accepted.
+        """
+        try:
+            return float(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60"))
+        except ValueError:
+            raise ValueError("API_KEY_CACHE_TTL_SECONDS environment variable must be a number.")
+
+    def get_api_key_cache_negative_ttl_seconds(self) -> float:
+        """Returns how long an unknown client API key is remembered as invalid."""
+        try:
+            return float(os.getenv("API_KEY_CACHE_NEGATIVE_TTL_SECONDS", "5"))
+        except ValueError:
+            raise ValueError("API_KEY_CACHE_NEGATIVE_TTL_SECONDS environment variable must be a number.")
+
+    def get_api_key_cache_max_size(self) -> int:
+        """Returns the maximum number of client API keys kept in the cache."""
+        try:
+            return int(os.getenv("API_KEY_CACHE_MAX_SIZE", "10000"))
+        except ValueError:
+            raise ValueError("API_KEY_CACHE_MAX_SIZE environment variable must be an integer.")
+
+    # --- Response cache settings ---
+    def get_response_cache_max_bytes(self) -> int:
+        """Returns the maximum total size of the responses kept in the in-process response cache."""
+        try:
+            return int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        except ValueError:
+            raise ValueError("RESPONSE_CACHE_MAX_BYTES environment variable must be an integer.")
+
+    def get_response_cache_cleanup_interval(self) -> float:
+        """Returns how often (in seconds) expired responses are deleted from the database response cache."""
+        try:
+            return float(os.getenv("RESPONSE_CACHE_CLEANUP_INTERVAL", "300"))
+        except ValueError:
+            raise ValueError("RESPONSE_CACHE_CLEANUP_INTERVAL environment variable must be a number.")
+
+    def get_json_codec(self) -> str:
+        """Returns the JSON backend to use: `auto` (orjson if installed, default), `orjson` or `stdlib`."""
+        return os.getenv("JSON_CODEC", "auto").lower()
+
+    # --- Raw passthrough settings ---
+    def get_raw_passthrough_paths(self) -> list[str]:
+        """Returns the glob patterns of `/api/` paths (e.g. `models*`) proxied as raw bytes, without parsing."""
+        value = os.getenv("RAW_PASSTHROUGH_PATHS", "")
+        return [pattern.strip().strip("/") for pattern in value.split(",") if pattern.strip()]
+
+    def get_client_quota_flush_interval(self) -> float:
+        """Returns how often (in seconds) client API key usage counted for quotas is written to the database."""
+        try:
+            return float(os.getenv("CLIENT_QUOTA_FLUSH_INTERVAL", "10"))
+        except ValueError:
+            raise ValueError("CLIENT_QUOTA_FLUSH_INTERVAL environment variable must be a number.")
+
+    # --- Backend HTTP connection pool settings ---
+    def get_backend_max_connections(self) -> int:
+        """Returns the maximum number of concurrent connections to backends."""
+        try:
+            return int(os.getenv("BACKEND_MAX_CONNECTIONS", "100"))
+        except ValueError:
+            raise ValueError("BACKEND_MAX_CONNECTIONS environment variable must be an integer.")
+
+    def get_backend_max_keepalive_connections(self) -> int:
+        """Returns the maximum number of idle keep-alive connections kept open to backends."""
+        try:
+            return int(os.getenv("BACKEND_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        except ValueError:
+            raise ValueError("BACKEND_MAX_KEEPALIVE_CONNECTIONS environment variable must be an integer.")
+
+    def get_backend_keepalive_expiry(self) -> float:
+        """Returns how long (in seconds) an idle backend connection is kept alive."""
+        try:
+            return float(os.getenv("BACKEND_KEEPALIVE_EXPIRY", "30"))
+        except ValueError:
+            raise ValueError("BACKEND_KEEPALIVE_EXPIRY environment variable must be a number.")
+
+    def get_backend_http2(self, default: bool = False) -> bool:
+        """Returns whether HTTP/2 should be negotiated with backends."""
+        http2 = os.getenv("BACKEND_HTTP2")
+        if http2 is None:
+            return default
+        elif http2.lower() == "true":
+            return True
+        elif http2.lower() == "false":
+            return False
+        else:
+            raise ValueError(f"BACKEND_HTTP2 environment variable must be 'true' or 'false' (got {http2}).")
+
+    def get_openai_client_idle_timeout(self) -> float:
+        """Returns how long (in seconds) an unused pooled OpenAI client is kept before eviction."""
+        try:
+            return float(os.getenv("OPENAI_CLIENT_IDLE_TIMEOUT", "600"))
+        except ValueError:
+            raise ValueError("OPENAI_CLIENT_IDLE_TIMEOUT environment variable must be a number.")
+
+    # --- Transaction log sink settings ---
+    def get_transaction_log_enabled(self, default: bool = False) -> bool:
+        """Returns whether a record of each proxied transaction is written to the `luthien_log` table."""
+        enabled = os.getenv("TRANSACTION_LOG_ENABLED")
+        if enabled is None:
+            return default
+        elif enabled.lower() == "true":
+            return True
+        elif enabled.lower() == "false":
+            return False
+        else:
+            raise ValueError(f"TRANSACTION_LOG_ENABLED environment variable must be 'true' or 'false' (got {enabled}).")
+
+    def get_transaction_log_queue_size(self) -> int:
+        """Returns the maximum number of transaction log records waiting to be written."""
+        try:
+            return int(os.getenv("TRANSACTION_LOG_QUEUE_SIZE", "10000"))
+        except ValueError:
+            raise ValueError("TRANSACTION_LOG_QUEUE_SIZE environment variable must be an integer.")
+
+    def get_transaction_log_batch_size(self) -> int:
+        """Returns the maximum number of transaction log records written in one INSERT."""
+        try:
+            return int(os.getenv("TRANSACTION_LOG_BATCH_SIZE", "500"))
+        except ValueError:
+            raise ValueError("TRANSACTION_LOG_BATCH_SIZE environment variable must be an integer.")
+
+    def get_transaction_log_flush_interval(self) -> float:
+        """Returns the maximum time (in seconds) a transaction log record waits before being written."""
+        try:
+            return float(os.getenv("TRANSACTION_LOG_FLUSH_INTERVAL", "1"))
+        except ValueError:
+            raise ValueError("TRANSACTION_LOG_FLUSH_INTERVAL environment variable must be a number.")
+
+    def get_transaction_log_overflow(self) -> str:
+        """Returns which records to drop when the transaction log queue is full."""
+        overflow = os.getenv("TRANSACTION_LOG_OVERFLOW", "drop_oldest").lower()
+        if overflow not in ("drop_oldest", "drop_newest"):
+            raise ValueError(
+                "TRANSACTION_LOG_OVERFLOW environment variable must be 'drop_oldest' or 'drop_newest' "
+                f"(got {overflow})."
+            )
+        return overflow
+
     # --- Database settings Getters using os.getenv ---
     def get_postgres_user(self) -> str | None:
         return os.getenv("DB_USER")
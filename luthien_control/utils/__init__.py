@@ -1,3 +1,3 @@
-from .deep_evented_model import DeepEventedModel
+from .deep_evented_model import DeepEventedModel, deep_events
 
-__all__ = ["DeepEventedModel"]
+__all__ = ["DeepEventedModel", "deep_events"]
@@ -1,8 +1,36 @@
-from typing import Any, ClassVar
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, ClassVar, Dict, Iterator
 
 from psygnal import EventedModel, Signal
 from psygnal.containers import EventedDict, EventedList
-from pydantic import ConfigDict, model_serializer
+from pydantic import ConfigDict, PrivateAttr, model_serializer
+
+_deep_events_enabled: ContextVar[bool] = ContextVar("deep_events_enabled", default=True)
+
+# `changed` takes no arguments, so tell psygnal up front rather than letting it inspect the slot's
+# signature on every connect (which formats the repr of the owning model and is O(model size)).
+# Relaying into another SignalInstance can't use a weak reference, so don't warn about it.
+_RELAY_CONNECT_KWARGS: Dict[str, Any] = {"max_args": 0, "on_ref_error": "ignore"}
+
+
+@contextmanager
+def deep_events(enabled: bool) -> Iterator[None]:
+    """Controls whether DeepEventedModels built in this context wire up their `changed` signal.
+
+    Wiring the signal means connecting to every nested model and container, which dominates
+    the cost of building large payloads (e.g. long conversations). When nothing is going to
+    listen for changes, build the models with `deep_events(False)`; they can still be wired
+    later with `DeepEventedModel.connect_deep_events`.
+
+    Args:
+        enabled: Whether models constructed inside the context are wired on construction.
+    """
+    token = _deep_events_enabled.set(enabled)
+    try:
+        yield
+    finally:
+        _deep_events_enabled.reset(token)
 
 
 class DeepEventedModel(EventedModel):
@@ -12,6 +40,9 @@ class DeepEventedModel(EventedModel):
     nested evented containers (like EventedList, EventedDict) or other
     DeepEventedModel instances.
 
+    Models built inside a `deep_events(False)` context skip this wiring (and the
+    `changed` signal never fires for them) until `connect_deep_events` is called.
+
     Attributes:
         changed: A signal that is emitted with no arguments when any value
                  in the model or its nested evented children changes.
@@ -19,25 +50,44 @@ class DeepEventedModel(EventedModel):
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
     changed: ClassVar[Signal] = Signal()
+    _deep_connected: bool = PrivateAttr(default=False)
 
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
+        if _deep_events_enabled.get():
+            self.connect_deep_events()
+
+    @property
+    def deep_events_connected(self) -> bool:
+        """Whether the `changed` signal is wired to this model's fields and children."""
+        return self._deep_connected
+
+    def connect_deep_events(self) -> None:
+        """Wires the `changed` signal to this model's fields and (recursively) its children.
+
+        This is a no-op if the model is already wired.
+        """
+        if self._deep_connected:
+            return
+        self._deep_connected = True
         # Connect our master `changed` signal to the base model's event group.
         # This handles all top-level field assignments.
-        self.events.connect(self.changed)
+        self.events.connect(self.changed, **_RELAY_CONNECT_KWARGS)
         # Connect to the event groups of any initial child objects.
         self._connect_children()
 
     def __setattr__(self, name: str, value: Any) -> None:
+        track_child = self._deep_connected and name in self.__class__.model_fields
+
         # Before the attribute is set, we must disconnect from the old child object.
-        if name in self.__class__.model_fields:
+        if track_child:
             old_value = getattr(self, name, None)
             self._disconnect_child(old_value)
 
         super().__setattr__(name, value)
 
         # After the attribute is set, we connect to the new child object.
-        if name in self.__class__.model_fields:
+        if track_child:
             new_value = getattr(self, name)
             self._connect_child(new_value)
             # The base EventedModel handles emitting the field-specific signal,
@@ -46,20 +96,21 @@ class DeepEventedModel(EventedModel):
     def _connect_child(self, child: Any) -> None:
         """If `child` is an evented object, connect its events to our signal."""
         if isinstance(child, DeepEventedModel):
-            child.changed.connect(self.changed)
+            child.connect_deep_events()
+            child.changed.connect(self.changed, **_RELAY_CONNECT_KWARGS)
         elif isinstance(child, EventedList):
-            child.events.connect(self.changed)
+            child.events.connect(self.changed, **_RELAY_CONNECT_KWARGS)
             child.events.inserted.connect(self._on_item_inserted)
             child.events.removed.connect(self._on_item_removed)
             for item in child:
                 self._connect_child(item)
         elif isinstance(child, EventedDict):
-            child.events.connect(self.changed)
+            child.events.connect(self.changed, **_RELAY_CONNECT_KWARGS)
             child.events.added.connect(self._on_item_added)
             for item in child.values():
                 self._connect_child(item)
         elif self._is_evented(child):
-            child.events.connect(self.changed)
+            child.events.connect(self.changed, **_RELAY_CONNECT_KWARGS)
 
     def _disconnect_child(self, child: Any) -> None:
         """If `child` is an evented object, disconnect its events."""
@@ -118,6 +169,8 @@ class DeepEventedModel(EventedModel):
         data = {}
         for field_name, field_info in self.__class__.model_fields.items():
             value = getattr(self, field_name)
+            if value is None and info.exclude_none:
+                continue
             if isinstance(value, EventedList):
                 data[field_name] = list(value)
             elif isinstance(value, EventedDict):
@@ -0,0 +1,116 @@
+"""JSON encoding and decoding for request and response bodies.
+
+Proxied payloads are decoded straight from bytes into their pydantic models with
+`decode_model` (pydantic-core's parser, with no intermediate `dict`), and encoded straight
+to bytes with `encode_model`. Everything else that is plain JSON (error bodies, admin APIs,
+debug logging) goes through `loads` / `dumps`, which use `orjson` when it is installed and
+fall back to the standard library otherwise. The backend can be forced with `use_backend`
+(at startup, from the `JSON_CODEC` setting).
+"""
+
+import importlib
+import json
+import logging
+from typing import Any, Callable, Optional, Type, TypeVar, Union
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Raised by `loads` for malformed input, whichever backend is in use (orjson's error subclasses it)
+JSONDecodeError = json.JSONDecodeError
+
+BACKENDS = ("orjson", "stdlib")
+
+_loads: Callable[[Union[bytes, str]], Any] = json.loads
+_dumps: Callable[..., bytes]
+backend: str = "stdlib"
+
+
+def _stdlib_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    return json.dumps(obj, default=default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+_dumps = _stdlib_dumps
+
+
+def use_backend(name: str) -> str:
+    """Selects the JSON backend used by `loads` and `dumps`.
+
+    Args:
+        name: `orjson`, `stdlib`, or `auto` for orjson when it is installed and stdlib otherwise.
+
+    Returns:
+        The name of the backend now in use.
+
+    Raises:
+        ValueError: If `name` is not a known backend.
+        ImportError: If `orjson` is requested but not installed.
+    """
+    global _loads, _dumps, backend
+    if name not in (*BACKENDS, "auto"):
+        raise ValueError(f"Unknown JSON codec {name!r}; expected one of: auto, {', '.join(BACKENDS)}")
+    if name in ("orjson", "auto"):
+        try:
+            orjson = importlib.import_module("orjson")
+        except ImportError:
+            if name == "orjson":
+                raise
+        else:
+            _loads = orjson.loads
+            _dumps = orjson.dumps
+            backend = "orjson"
+            return backend
+    _loads = json.loads
+    _dumps = _stdlib_dumps
+    backend = "stdlib"
+    return backend
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parses a JSON document.
+
+    Raises:
+        JSONDecodeError: If `data` is not valid JSON (or not valid UTF-8).
+    """
+    try:
+        return _loads(data)
+    except UnicodeDecodeError as e:
+        raise JSONDecodeError(f"Invalid UTF-8: {e}", "", 0) from e
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serializes `obj` to compact, UTF-8 encoded JSON.
+
+    Args:
+        obj: The value to serialize.
+        default: Called for values that are not natively serializable; returns a serializable value.
+    """
+    return _dumps(obj, default=default)
+
+
+def decode_model(model: Type[ModelT], data: Union[bytes, str]) -> ModelT:
+    """Validates a JSON document straight into `model`, without building an intermediate `dict`.
+
+    Raises:
+        pydantic.ValidationError: If `data` is not valid JSON or does not match `model`.
+    """
+    return model.model_validate_json(data)
+
+
+def encode_model(instance: BaseModel, **kwargs: Any) -> bytes:
+    """Serializes a pydantic model to JSON bytes, accepting the options of `model_dump_json`."""
+    return instance.__pydantic_serializer__.to_json(instance, **kwargs)
+
+
+class CodecJSONResponse(JSONResponse):
+    """A `JSONResponse` rendered with `dumps`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+use_backend("auto")
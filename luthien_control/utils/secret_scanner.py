@@ -0,0 +1,324 @@
+"""Multi-pattern secret scanning with a literal-prefix prefilter.
+
+Most secret formats start with a fixed marker (`sk-`, `xoxb-`, `github_pat_`, ...). Rather than
+running every regex over the whole text, `SecretScanner` extracts each pattern's literal prefix
+and picks the rarest character of that prefix as its anchor. A single character-class search
+finds every anchor occurrence, a dictionary lookup checks whether a known prefix surrounds it,
+and only the patterns owning that prefix are run, anchored, at that offset. The cost of a scan
+therefore depends on how often anchor characters occur rather than on the number of patterns.
+
+Patterns without a usable literal prefix (case-insensitive patterns, top-level alternations,
+leading character classes, ...) are still supported and fall back to a plain `search`, as are
+all patterns of small sets, where the regex engine's own literal search is faster.
+
+Prefixes are read from the parse tree of CPython's regex parser (`re._parser`), an internal
+module whose layout may change between Python versions. If it cannot be used, no pattern has
+a known prefix or maximum length, and every pattern is searched directly.
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+try:
+    import re._parser as _sre_parse
+
+    _LITERAL = getattr(_sre_parse, "LITERAL")
+    _MAXREPEAT = getattr(_sre_parse, "MAXREPEAT")
+    # Zero-width opcodes that may precede the literal prefix without moving the match start.
+    _ZERO_WIDTH_OPS = tuple(getattr(_sre_parse, name) for name in ("AT", "ASSERT", "ASSERT_NOT"))
+    _parse = _sre_parse.parse
+except (ImportError, AttributeError):
+    _parse = None
+
+# Shorter prefixes match too often in ordinary text to be worth prefiltering on.
+MIN_PREFIX_LENGTH = 2
+
+# Below this many prefixed patterns, searching each pattern directly is faster than the prefilter.
+PREFILTER_MIN_PATTERNS = 32
+
+# Characters roughly ordered from most to least common in prose and source code. Characters that
+# are not listed are considered rarer than all of these.
+_CHARACTER_FREQUENCY_ORDER = " etaoinsrhldcumfpgwybvkxjqz\n.,_-=():'\"ETAOINSRHLDCUMFPGWYBVKXJQZ0123456789"
+
+
+@dataclass(frozen=True)
+class SecretMatch:
+    """A secret found by `SecretScanner`.
+
+    Attributes:
+        pattern: The source of the pattern that matched.
+        start: Offset of the first character of the match.
+        end: Offset just past the last character of the match.
+    """
+
+    pattern: str
+    start: int
+    end: int
+
+
+def literal_prefix(pattern: Union[str, re.Pattern]) -> str:
+    """Returns the literal text every match of `pattern` must start with ('' if there is none).
+
+    Args:
+        pattern: A regular expression, as a string or compiled.
+
+    Returns:
+        The leading run of literal characters, skipping zero-width assertions such as `\\b`.
+        Case-insensitive patterns have no usable prefix, nor has any pattern if the regex
+        parser is unavailable.
+    """
+    if _parse is None:
+        return ""
+    flags = 0
+    if isinstance(pattern, re.Pattern):
+        pattern, flags = pattern.pattern, pattern.flags
+    try:
+        parsed = _parse(pattern, flags)
+    except re.error:
+        return ""
+    if parsed.state.flags & re.IGNORECASE:
+        return ""
+    chars: List[str] = []
+    for op, arg in parsed.data:
+        if op == _LITERAL:
+            chars.append(chr(arg))
+        elif op in _ZERO_WIDTH_OPS and not chars:
+            continue
+        else:
+            break
+    return "".join(chars)
+
+
+def _max_width(compiled: re.Pattern) -> Optional[int]:
+    """The length of the longest possible match of `compiled`, or None if it is unbounded or unknown."""
+    if _parse is None:
+        return None
+    width = _parse(compiled.pattern, compiled.flags).getwidth()[1]
+    return None if width >= _MAXREPEAT else width
+
+
+def _rarity(char: str) -> int:
+    rank = _CHARACTER_FREQUENCY_ORDER.find(char)
+    return len(_CHARACTER_FREQUENCY_ORDER) if rank < 0 else rank
+
+
+class SecretScanner:
+    """Scans text for any of a set of secret patterns in a single pass.
+
+    Args:
+        patterns: Regular expressions describing secrets, as strings or compiled.
+    """
+
+    def __init__(self, patterns: Iterable[Union[str, re.Pattern]]) -> None:
+        compiled_patterns = [re.compile(pattern) for pattern in patterns]
+        self.patterns: List[str] = [compiled.pattern for compiled in compiled_patterns]
+        prefixes = [literal_prefix(compiled) for compiled in compiled_patterns]
+        widths = [width for width in map(_max_width, compiled_patterns) if width is not None]
+        # Length of the longest possible secret, or None if some pattern is unbounded (e.g. `{50,}`)
+        self.max_match_length: Optional[int] = max(widths, default=0) if len(widths) == len(self.patterns) else None
+        # Every match starts with one of these, if every pattern has a literal prefix
+        self._required_prefixes: Optional[Set[str]] = set(prefixes) if all(prefixes) else None
+
+        self._direct: List[re.Pattern] = []
+        prefixed: List[Tuple[re.Pattern, str]] = []
+        for compiled, prefix in zip(compiled_patterns, prefixes):
+            if len(prefix) >= MIN_PREFIX_LENGTH:
+                prefixed.append((compiled, prefix))
+            else:
+                self._direct.append(compiled)
+        if len(prefixed) < PREFILTER_MIN_PATTERNS:
+            self._direct = compiled_patterns
+            prefixed = []
+
+        # anchor character -> (offset of the anchor in the prefix, prefix length) -> prefix -> patterns
+        anchors: Dict[str, Dict[Tuple[int, int], Dict[str, List[re.Pattern]]]] = defaultdict(
+            lambda: defaultdict(lambda: defaultdict(list))
+        )
+        for compiled, prefix in prefixed:
+            offset = max(range(len(prefix)), key=lambda index: _rarity(prefix[index]))
+            anchors[prefix[offset]][(offset, len(prefix))][prefix].append(compiled)
+        self._anchors: Dict[str, List[Tuple[int, int, Dict[str, List[re.Pattern]]]]] = {
+            char: [(offset, length, dict(by_prefix)) for (offset, length), by_prefix in groups.items()]
+            for char, groups in anchors.items()
+        }
+        self._max_anchor_offset = max(
+            (offset for groups in self._anchors.values() for offset, _, _ in groups), default=0
+        )
+        self._prefilter: Optional[re.Pattern] = (
+            re.compile("[" + "".join(re.escape(char) for char in sorted(self._anchors)) + "]")
+            if self._anchors
+            else None
+        )
+
+    @property
+    def prefiltered_pattern_count(self) -> int:
+        """Number of patterns verified only where their prefix occurs (the rest use a full search)."""
+        return len(self.patterns) - len(self._direct)
+
+    def incomplete_secret_start(self, text: str, max_length: int, ignore: Collection[int] = ()) -> int:
+        """Returns the earliest offset from which a secret could start and continue past the end of `text`.
+
+        Text before this offset can be released without waiting for more input. Without literal
+        prefixes to go on, any of the last `max_length - 1` characters could begin a secret.
+
+        Args:
+            text: Text received so far.
+            max_length: Length of the longest secret to wait for.
+            ignore: Offsets known not to begin an incomplete secret, such as the starts of
+                secrets that have already ended.
+        """
+        window_start = max(0, len(text) - max_length + 1)
+        if self._required_prefixes is None:
+            return window_start
+        earliest = len(text)
+        for prefix in self._required_prefixes:
+            found = text.find(prefix, window_start)
+            while found in ignore:
+                found = text.find(prefix, found + 1)
+            if 0 <= found < earliest:
+                earliest = found
+            # The text may end with the beginning of a prefix
+            for length in range(len(prefix) - 1, 0, -1):
+                if text.endswith(prefix[:length]):
+                    earliest = min(earliest, len(text) - length)
+                    break
+        return earliest
+
+    def search(self, text: str) -> Optional[SecretMatch]:
+        """Returns the earliest secret in `text`, or None if there is none."""
+        best: Optional[SecretMatch] = None
+        for compiled in self._direct:
+            found = compiled.search(text)
+            if found and (best is None or found.start() < best.start):
+                best = SecretMatch(compiled.pattern, found.start(), found.end())
+        for anchor_pos, start, compiled in self._candidates(text):
+            if best is not None and anchor_pos - self._max_anchor_offset > best.start:
+                break
+            if best is not None and start >= best.start:
+                continue
+            found = compiled.match(text, start)
+            if found:
+                best = SecretMatch(compiled.pattern, start, found.end())
+        return best
+
+    def scan(self, text: str) -> List[SecretMatch]:
+        """Returns every secret in `text`, ordered by start offset.
+
+        Each pattern reports non-overlapping matches; matches of different patterns may overlap.
+        """
+        matches: List[SecretMatch] = []
+        for compiled in self._direct:
+            matches.extend(
+                SecretMatch(compiled.pattern, found.start(), found.end()) for found in compiled.finditer(text)
+            )
+        # The offset each pattern may next match from, so that its matches do not overlap
+        resume: Dict[re.Pattern, int] = {}
+        for _, start, compiled in self._candidates(text):
+            if resume.get(compiled, 0) > start:
+                continue
+            found = compiled.match(text, start)
+            if found:
+                matches.append(SecretMatch(compiled.pattern, start, found.end()))
+                resume[compiled] = max(found.end(), start + 1)
+        matches.sort(key=lambda match: (match.start, -match.end))
+        return matches
+
+    def _candidates(self, text: str) -> Iterator[Tuple[int, int, re.Pattern]]:
+        """Yields (anchor offset, prefix offset, pattern) wherever a known prefix occurs in `text`."""
+        if self._prefilter is None:
+            return
+        for hit in self._prefilter.finditer(text):
+            anchor_pos = hit.start()
+            for offset, length, by_prefix in self._anchors[text[anchor_pos]]:
+                start = anchor_pos - offset
+                if start < 0:
+                    continue
+                for compiled in by_prefix.get(text[start : start + length], ()):
+                    yield anchor_pos, start, compiled
+
+
+class IncrementalSecretScanner:
+    """Finds secrets in text that arrives in pieces, such as the deltas of a streamed completion.
+
+    Secrets split across pieces are found by rescanning a bounded window of recent text together
+    with each new piece, so memory stays proportional to the longest secret rather than to the
+    whole text.
+
+    With `hold_back` (the default), text that could still be the beginning of a secret is kept
+    back until enough of what follows has arrived to decide, so that callers can redact or
+    withhold a secret before any of it is released. Without it, every piece is released
+    immediately and secrets are only reported once complete.
+
+    Args:
+        scanner: The scanner holding the secret patterns.
+        max_secret_length: Length of the longest secret to look for across pieces. Defaults to
+            the scanner's longest possible match; required if any pattern is unbounded.
+        hold_back: Whether to withhold text that may be part of a secret.
+    """
+
+    def __init__(self, scanner: SecretScanner, max_secret_length: Optional[int] = None, hold_back: bool = True):
+        max_secret_length = max_secret_length or scanner.max_match_length
+        if not max_secret_length:
+            raise ValueError("max_secret_length is required when a secret pattern has no maximum length")
+        self.scanner = scanner
+        self.max_secret_length = max_secret_length
+        self.hold_back = hold_back
+        self._pending = ""
+        # Absolute offset (in all text fed so far) of the start of `_pending`
+        self._pending_offset = 0
+        # Absolute end of the last secret reported per pattern, so that a secret is not reported twice
+        self._reported_ends: Dict[str, int] = {}
+
+    def feed(self, text: str) -> Tuple[str, List[SecretMatch]]:
+        """Adds the next piece of text.
+
+        Args:
+            text: The next piece of text.
+
+        Returns:
+            The text released by this call and the secrets found in it, with offsets relative to
+            the released text. With `hold_back`, secrets lie entirely within the released text.
+            Without it, the released text is `text` itself and a secret may start before it
+            (at a negative offset).
+        """
+        return self._process(text, final=False)
+
+    def flush(self) -> Tuple[str, List[SecretMatch]]:
+        """Releases any text still held back, once no more text will arrive."""
+        return self._process("", final=True)
+
+    def _process(self, text: str, final: bool) -> Tuple[str, List[SecretMatch]]:
+        buffer = self._pending + text
+        matches = self.scanner.scan(buffer) if buffer else []
+        if self.hold_back:
+            if final:
+                release = limit = len(buffer)
+            else:
+                # A secret that reaches the end of the buffer could still be extended by more input
+                limit = min((match.start for match in matches if match.end == len(buffer)), default=len(buffer))
+                ended = {match.start for match in matches if match.end < len(buffer)}
+                release = min(limit, self.scanner.incomplete_secret_start(buffer, self.max_secret_length, ended))
+            # Never split a secret: hold back any that straddles the release point
+            for match in reversed(matches):
+                if match.start < release < match.end:
+                    release = match.start
+            released, self._pending = buffer[:release], buffer[release:]
+            released_matches = [match for match in matches if match.end <= release]
+            self._pending_offset += release
+            return released, released_matches
+
+        new_text_start = len(self._pending)
+        reported: List[SecretMatch] = []
+        for match in matches:
+            if match.end <= new_text_start or self._pending_offset + match.start < self._reported_ends.get(
+                match.pattern, 0
+            ):
+                continue
+            reported.append(SecretMatch(match.pattern, match.start - new_text_start, match.end - new_text_start))
+            self._reported_ends[match.pattern] = self._pending_offset + match.end
+        keep = 0 if final else min(len(buffer), self.max_secret_length - 1)
+        self._pending_offset += len(buffer) - keep
+        self._pending = buffer[len(buffer) - keep :]
+        return text, reported
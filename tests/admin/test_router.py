@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
+from luthien_control.core.client_quota import ClientQuotaTracker
 from luthien_control.db.sqlmodel_models import AdminUser, ControlPolicy
 
 
@@ -54,6 +55,9 @@ def mock_dependency_container():
     # Mock http client
     container.http_client = AsyncMock()
     container.http_client.aclose = AsyncMock()
+    container.openai_clients = AsyncMock()
+    container.log_sink = None
+    container.client_quotas = ClientQuotaTracker()
 
     return container
 
@@ -202,7 +206,9 @@ class TestPolicyEdit:
 
             assert response.status_code == 404
 
-    def test_update_policy_success(self, authenticated_admin_client, sample_policy, mock_csrf):
+    def test_update_policy_success(
+        self, authenticated_admin_client, sample_policy, mock_csrf, mock_dependency_container
+    ):
         """Test successful policy update."""
         with patch("luthien_control.admin.router.get_policy_by_name", AsyncMock(return_value=sample_policy)):
             # Get CSRF from edit page
@@ -224,6 +230,7 @@ class TestPolicyEdit:
 
             assert response.status_code == 303
             assert response.headers["location"] == "/admin/policies"
+            mock_dependency_container.invalidate_policy_cache.assert_called_once_with("test_policy")
 
     def test_update_policy_invalid_csrf(self, authenticated_admin_client):
         """Test update rejects invalid CSRF."""
@@ -1,10 +1,15 @@
+import json
+from typing import cast
 from unittest.mock import Mock
 
 import pytest
 from luthien_control.api.openai_chat_completions.datatypes import Choice, Message, Usage
 from luthien_control.api.openai_chat_completions.response import (
     OpenAIChatCompletionsResponse,
+    openai_chat_completions_response_to_fastapi_response,
+    openai_chat_completions_stream_to_fastapi_response,
 )
+from openai.types.chat import ChatCompletionChunk
 from psygnal.containers import EventedList
 
 
@@ -82,3 +87,44 @@ def test_response_set_optional_fields(minimal_response):
     minimal_response.system_fingerprint = "fp_abc123"
     assert minimal_response.system_fingerprint == "fp_abc123"
     mock_callback.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_to_fastapi_response_reports_errors_in_band():
+    """Errors raised mid-stream are sent to the client as an SSE error event, without [DONE]."""
+    chunk = ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 1,
+            "model": "gpt-4",
+            "choices": [{"index": 0, "delta": {"content": "partial"}, "finish_reason": None}],
+        }
+    )
+
+    async def failing_stream():
+        yield chunk
+        raise RuntimeError("backend went away")
+
+    response = openai_chat_completions_stream_to_fastapi_response(failing_stream())
+    events = [cast(bytes, event) async for event in response.body_iterator]
+
+    assert response.media_type == "text/event-stream"
+    assert len(events) == 2
+    assert events[0].startswith(b"data: ") and b'"content":"partial"' in events[0]
+    assert events[1].startswith(b"data: ") and events[1].endswith(b"\n\n")
+    assert json.loads(events[1][len(b"data: ") :]) == {
+        "error": {"message": "backend went away", "type": "RuntimeError"}
+    }
+    assert b"[DONE]" not in b"".join(events)
+
+
+def test_response_to_fastapi_response_prefers_raw_body(minimal_response):
+    """The backend's original bytes are returned untouched when provided."""
+    raw_body = b'{"id": "chatcmpl-123", "untouched": true}'
+
+    passthrough = openai_chat_completions_response_to_fastapi_response(minimal_response, raw_body)
+    reserialized = openai_chat_completions_response_to_fastapi_response(minimal_response)
+
+    assert passthrough.body == raw_body
+    assert reserialized.body == minimal_response.model_dump_json().encode()
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+from benchmarks.mock_backend import MockBackendConfig, create_mock_backend_app
+from benchmarks.policies import SCENARIOS
+from benchmarks.run import parse_policy_apply_totals, percentile, policy_mean_ms
+from fastapi.testclient import TestClient
+from luthien_control.control_policy.loader import load_policy_from_file
+from luthien_control.control_policy.send_backend_request import SendBackendRequestPolicy
+from luthien_control.control_policy.serial_policy import SerialPolicy
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+
+@pytest.fixture
+def backend() -> TestClient:
+    return TestClient(create_mock_backend_app(MockBackendConfig(latency_ms=0, response_chars=50, stream_chunks=5)))
+
+
+def test_mock_backend_returns_chat_completion(backend):
+    response = backend.post("/v1/chat/completions", json={"model": "m", "messages": []})
+
+    completion = ChatCompletion.model_validate(response.json())
+    assert completion.model == "m"
+    assert len(completion.choices[0].message.content or "") == 50
+
+
+def test_mock_backend_streams_chunks(backend):
+    response = backend.post("/v1/chat/completions", json={"model": "m", "messages": [], "stream": True})
+
+    events = [line.removeprefix("data: ") for line in response.text.split("\n\n") if line]
+    assert events[-1] == "[DONE]"
+    chunks = [ChatCompletionChunk.model_validate(json.loads(event)) for event in events[:-1]]
+    assert "".join(chunk.choices[0].delta.content or "" for chunk in chunks) == backend.app.state.content
+    assert chunks[-1].choices[0].finish_reason == "stop"
+
+
+# Policies in each scenario's tree: the root SerialPolicy, its stages, and the three forwarding policies
+EXPECTED_POLICY_COUNTS = {
+    "noop": 1 + 1 + 3,
+    "serial": 1 + 2 + 3,
+    "branching": 1 + 10 * (1 + 10 + 1) + 3,
+}
+
+
+def test_every_scenario_has_an_expected_policy_count():
+    assert sorted(EXPECTED_POLICY_COUNTS) == sorted(SCENARIOS)
+
+
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_scenario_policies_load(scenario, tmp_path):
+    policy_file = tmp_path / "policy.json"
+    policy_file.write_text(json.dumps(SCENARIOS[scenario]("http://127.0.0.1:9100/v1")))
+
+    policy = load_policy_from_file(str(policy_file))
+    policies = list(policy.iter_policies())
+
+    assert len(policies) == EXPECTED_POLICY_COUNTS[scenario]
+    assert isinstance(policies[0], SerialPolicy)
+    assert isinstance(policies[-1], SendBackendRequestPolicy)
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_policy_mean_ms_from_metrics_deltas():
+    before = parse_policy_apply_totals(
+        'luthien_policy_apply_duration_seconds_sum{policy_name="Auth",policy_type="ClientApiKeyAuth"} 1.0\n'
+        'luthien_policy_apply_duration_seconds_count{policy_name="Auth",policy_type="ClientApiKeyAuth"} 10\n'
+    )
+    after = parse_policy_apply_totals(
+        'luthien_policy_apply_duration_seconds_bucket{policy_name="Auth",policy_type="ClientApiKeyAuth",le="+Inf"} 20\n'
+        'luthien_policy_apply_duration_seconds_sum{policy_name="Auth",policy_type="ClientApiKeyAuth"} 1.5\n'
+        'luthien_policy_apply_duration_seconds_count{policy_name="Auth",policy_type="ClientApiKeyAuth"} 20\n'
+    )
+
+    assert policy_mean_ms(before, after) == {"Auth": 50.0}
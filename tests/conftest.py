@@ -7,7 +7,15 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import httpx
 import pytest
 from dotenv import load_dotenv
+from luthien_control.core.api_key_cache import ApiKeyCache
+from luthien_control.core.backend_health import BackendHealthRegistry
+from luthien_control.core.circuit_breaker import CircuitBreakerRegistry
+from luthien_control.core.client_quota import ClientQuotaTracker
 from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.micro_batch import MicroBatcher
+from luthien_control.core.openai_client_registry import OpenAIClientRegistry
+from luthien_control.core.policy_cache import PolicyCache
+from luthien_control.core.response_cache import InMemoryResponseCache
 from luthien_control.core.transaction_context import TransactionContext
 
 # Import centralized type alias
@@ -108,6 +116,11 @@ def mock_settings() -> MagicMock:
     settings = MagicMock(spec=Settings)
     # Add common default return values if needed by most tests
     settings.get_top_level_policy_name.return_value = "test_policy"
+    settings.get_transaction_log_enabled.return_value = False
+    settings.get_client_quota_flush_interval.return_value = 10.0
+    settings.get_response_cache_cleanup_interval.return_value = 300.0
+    settings.get_json_codec.return_value = "auto"
+    settings.get_raw_passthrough_paths.return_value = []
     return settings
 
 
@@ -164,6 +177,15 @@ def mock_container(
     container.settings = mock_settings
     container.http_client = mock_http_client
     container.db_session_factory = mock_db_session_factory
+    container.policy_cache = PolicyCache()
+    container.openai_clients = OpenAIClientRegistry(mock_http_client)
+    container.api_key_cache = ApiKeyCache()
+    container.log_sink = None
+    container.client_quotas = ClientQuotaTracker()
+    container.embeddings_batcher = MicroBatcher()
+    container.backend_health = BackendHealthRegistry()
+    container.circuit_breakers = CircuitBreakerRegistry()
+    container.response_caches = {"memory": InMemoryResponseCache()}
     return container
 
 
@@ -231,6 +253,9 @@ def admin_client_with_full_mocking():
     mock_http_client = AsyncMock()
     mock_http_client.aclose = AsyncMock()
     mock_container.http_client = mock_http_client
+    mock_container.openai_clients = AsyncMock()
+    mock_container.log_sink = None
+    mock_container.client_quotas = ClientQuotaTracker()
 
     async def mock_initialize_dependencies(settings):
         return mock_container
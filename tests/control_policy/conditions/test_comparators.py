@@ -141,6 +141,18 @@ def test_regex_match_comparator():
         regex_match.evaluate("abc", r"[")
 
 
+def test_bind_right():
+    """Tests binding a comparator to a fixed right value."""
+    is_gpt = regex_match.bind_right(r"^gpt-")
+    assert is_gpt("gpt-4o") is True
+    assert is_gpt("claude-3") is False
+    assert equals.bind_right(5)(5) is True
+    assert less_than.bind_right(5)(6) is False
+
+    with pytest.raises(re.error):  # The pattern is compiled when bound
+        regex_match.bind_right(r"[")
+
+
 def test_name_to_comparator_mapping():
     """Tests the NAME_TO_COMPARATOR mapping."""
     assert NAME_TO_COMPARATOR["equals"] is equals
@@ -1,5 +1,6 @@
 # pyright: reportCallIssue=false
 
+import re
 from typing import Any, cast
 
 import pytest
@@ -18,6 +19,7 @@ from luthien_control.control_policy.conditions.comparison_conditions import (
     NotEqualsCondition,
     RegexMatchCondition,
 )
+from luthien_control.control_policy.conditions.condition import ConstantResult
 from luthien_control.control_policy.conditions.value_resolvers import (
     StaticValue,
     TransactionPath,
@@ -372,3 +374,38 @@ class TestValidatorCodePaths:
         }
         condition = EqualsCondition.model_validate(data)
         assert condition.evaluate(sample_transaction_clean) is True
+
+
+class TestCompile:
+    @pytest.mark.parametrize(
+        "condition",
+        [
+            EqualsCondition(path("request.payload.model"), "gpt-4o"),
+            EqualsCondition(path("request.payload.model"), path("data.preferred_model")),
+            EqualsCondition("gpt-4o", path("request.payload.model")),
+            NotEqualsCondition(path("request.payload.model"), path("data.alternative_model")),
+            ContainsCondition(path("data.settings.allowed_models"), "claude-3"),
+            LessThanCondition(path("request.payload.max_tokens"), path("data.settings.max_tokens_limit")),
+            GreaterThanCondition(path("response.payload.usage.total_tokens"), 100),
+            RegexMatchCondition(path("request.payload.model"), r"^gpt-4"),
+            RegexMatchCondition(path("request.payload.model"), path("data.patterns.model_pattern")),
+            EqualsCondition(path("request.nonexistent.path"), "gpt-4o"),
+            EqualsCondition(path("invalid"), path("data.nonexistent")),
+        ],
+    )
+    def test_compiled_matches_evaluate(self, condition, sample_transaction_clean: Transaction):
+        """Test that the compiled form gives the same result as evaluate."""
+        compiled = condition.compile()
+        assert compiled(sample_transaction_clean) is condition.evaluate(sample_transaction_clean)
+
+    def test_static_comparison_is_folded(self, sample_transaction_clean: Transaction):
+        """Test that comparing two static values is evaluated at compile time."""
+        compiled = EqualsCondition("gpt-4o", "gpt-4o").compile()
+        assert isinstance(compiled, ConstantResult)
+        assert compiled(sample_transaction_clean) is True
+
+    def test_invalid_static_pattern_fails_at_evaluation(self, sample_transaction_clean: Transaction):
+        """Test that an invalid static regex still only fails when the condition is evaluated."""
+        compiled = RegexMatchCondition(path("request.payload.model"), r"[").compile()
+        with pytest.raises(re.error):
+            compiled(sample_transaction_clean)
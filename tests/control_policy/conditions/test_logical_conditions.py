@@ -8,7 +8,7 @@ from luthien_control.api.openai_chat_completions.response import OpenAIChatCompl
 from luthien_control.control_policy.conditions import EqualsCondition, path
 from luthien_control.control_policy.conditions.all_cond import AllCondition
 from luthien_control.control_policy.conditions.any_cond import AnyCondition
-from luthien_control.control_policy.conditions.condition import Condition
+from luthien_control.control_policy.conditions.condition import Condition, ConstantResult
 from luthien_control.control_policy.conditions.not_cond import NotCondition
 from luthien_control.control_policy.conditions.util import get_condition_from_serialized
 from luthien_control.core.request import Request
@@ -263,6 +263,45 @@ def test_not_condition_serialization_deserialization(
     assert from_serializedd_condition.serialize() == serialized_data
 
 
+@pytest.mark.parametrize(
+    "condition_class, conditions_setup",
+    [
+        (AllCondition, []),
+        (AllCondition, ["true", "false"]),
+        (AllCondition, ["true", "true"]),
+        (AnyCondition, []),
+        (AnyCondition, ["false", "true"]),
+        (AnyCondition, ["false", "false"]),
+    ],
+)
+def test_compiled_logical_condition_matches_evaluate(
+    condition_class,
+    conditions_setup: List[str],
+    sample_transaction: Transaction,
+    true_condition: Condition,
+    false_condition: Condition,
+) -> None:
+    """Tests that compiled All/Any/Not conditions give the same results as evaluate."""
+    condition_map = {"true": true_condition, "false": false_condition}
+    condition = condition_class(conditions=[condition_map[name] for name in conditions_setup])
+    for cond in [condition, NotCondition(cond=condition)]:
+        assert cond.compile()(sample_transaction) is cond.evaluate(sample_transaction)
+
+
+def test_compiled_logical_condition_folds_constants(true_condition: Condition) -> None:
+    """Tests that constant sub-conditions are folded away when compiling."""
+    always = EqualsCondition(1, 1)
+    never = EqualsCondition(1, 2)
+
+    folded = AllCondition(conditions=[true_condition, never]).compile()
+    assert isinstance(folded, ConstantResult) and folded.value is False
+    folded = AnyCondition(conditions=[never, always]).compile()
+    assert isinstance(folded, ConstantResult) and folded.value is True
+    folded = NotCondition(cond=AnyCondition(conditions=[])).compile()
+    assert isinstance(folded, ConstantResult) and folded.value is True
+    assert not isinstance(AllCondition(conditions=[always, true_condition]).compile(), ConstantResult)
+
+
 def test_not_condition_repr(true_condition: Condition):
     """Test the __repr__ method of NotCondition."""
     not_cond = NotCondition(cond=true_condition)
@@ -12,6 +12,7 @@ from luthien_control.control_policy.conditions.registry import (
     NAME_TO_CONDITION_CLASS,
 )
 from luthien_control.control_policy.conditions.util import (
+    compile_transaction_path,
     get_condition_class,
     get_condition_class_from_serialized,
     get_condition_from_serialized,
@@ -238,3 +239,39 @@ def test_get_transaction_value_index_access_failure() -> None:
     # This should fail when trying to access index 5 on a 2-item list
     with pytest.raises(AttributeError, match="Cannot access '5' on"):
         get_transaction_value(transaction, "data.items.5")
+
+
+def test_compile_transaction_path_matches_get_transaction_value() -> None:
+    """Tests that a compiled path resolves the same values as get_transaction_value."""
+    from psygnal.containers import EventedDict
+
+    transaction = _create_minimal_transaction()
+    transaction.data = EventedDict({"items": ["item1", "item2"], "nested": {"key": "value"}})
+
+    value_paths = ["request.payload.model", "request.payload.messages.0.content", "data.items.1", "data.nested.key"]
+    for value_path in value_paths:
+        assert compile_transaction_path(value_path)(transaction) == get_transaction_value(transaction, value_path)
+
+    with pytest.raises(AttributeError, match="Cannot access '5' on"):
+        compile_transaction_path("data.items.5")(transaction)
+
+
+def test_compile_transaction_path_is_cached() -> None:
+    """Tests that each path is only compiled once."""
+    assert compile_transaction_path("request.payload.model") is compile_transaction_path("request.payload.model")
+
+    with pytest.raises(ValueError, match="Path must contain at least two components"):
+        compile_transaction_path("single")
+
+
+def test_compile_transaction_path_memoizes_until_change() -> None:
+    """Tests that resolved values are reused until the transaction changes."""
+    transaction = _create_minimal_transaction()
+    resolve = compile_transaction_path("request.payload.model")
+
+    assert resolve(transaction) == "gpt-4"
+    assert transaction.resolved_paths == {"request.payload.model": "gpt-4"}
+
+    transaction.request.payload.model = "gpt-4o"
+    assert resolve(transaction) == "gpt-4o"
+    assert get_transaction_value(transaction, "request.payload.model") == "gpt-4o"
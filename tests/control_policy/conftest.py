@@ -0,0 +1,88 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
+
+import pytest
+from luthien_control.api.openai_chat_completions.datatypes import Choice, Message, Usage
+from luthien_control.api.openai_chat_completions.request import OpenAIChatCompletionsRequest
+from luthien_control.api.openai_chat_completions.response import OpenAIChatCompletionsResponse
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.request import Request
+from luthien_control.core.response import Response
+from luthien_control.core.transaction import Transaction
+from psygnal.containers import EventedDict, EventedList
+from pydantic import ConfigDict
+from sqlalchemy.ext.asyncio import AsyncSession
+
+BACKEND_URL = "https://api.openai.com/v1"
+
+Action = Callable[[Transaction], Awaitable[None]]
+
+
+class MockBackendPolicy(ControlPolicy):
+    """Stands in for SendBackendRequestPolicy, running an arbitrary action as the backend call.
+
+    Records a copy of each request it is sent. Unless the action raised or set a stream, it answers
+    with a completion of `content`, kept as the backend's raw response, and sets `headers` as the
+    backend's response headers.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, extra="allow")
+
+    def __init__(
+        self, action: Optional[Action] = None, content: str = "Hi there", headers: Optional[Dict[str, str]] = None
+    ):
+        super().__init__(name="backend")
+        self.action = action
+        self.content = content
+        self.headers = headers or {}
+        self.calls: List[Request] = []
+
+    @classmethod
+    def get_policy_type_name(cls) -> str:
+        """Override to avoid registry lookup for test class."""
+        return "MockBackendPolicy"
+
+    async def apply(
+        self, transaction: Transaction, container: DependencyContainer, session: AsyncSession
+    ) -> Transaction:
+        self.calls.append(transaction.request.model_copy())
+        if self.action is not None:
+            await self.action(transaction)
+        if transaction.response.stream is None:
+            response = OpenAIChatCompletionsResponse(
+                id="chatcmpl-123",
+                object="chat.completion",
+                created=1677652288,
+                model="gpt-4o",
+                choices=EventedList(
+                    [Choice(index=0, message=Message(role="assistant", content=self.content), finish_reason="stop")]
+                ),
+                usage=Usage(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+            )
+            transaction.response.set_backend_payload(response, response.model_dump_json().encode())
+            transaction.response.api_endpoint = transaction.request.api_endpoint
+        transaction.response.backend_headers = dict(self.headers)
+        return transaction
+
+
+@pytest.fixture
+def mock_backend_policy() -> Type[MockBackendPolicy]:
+    """Provides the MockBackendPolicy class, standing in for the policy sending the backend request."""
+    return MockBackendPolicy
+
+
+@pytest.fixture
+def make_transaction() -> Callable[..., Transaction]:
+    """Provides a factory of chat completions transactions, taking extra request fields as keyword arguments."""
+
+    def factory(api_endpoint: str = BACKEND_URL, api_key: str = "test-key", **fields: Any) -> Transaction:
+        payload = OpenAIChatCompletionsRequest(
+            model="gpt-4o", messages=EventedList([Message(role="user", content="Hello")]), **fields
+        )
+        return Transaction(
+            request=Request(payload=payload, api_endpoint=api_endpoint, api_key=api_key),
+            response=Response(),
+            data=EventedDict(),
+        )
+
+    return factory
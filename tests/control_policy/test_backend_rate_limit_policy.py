@@ -0,0 +1,248 @@
+"""Tests for BackendRateLimitPolicy."""
+
+import asyncio
+from typing import Any, Callable, List
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import openai
+import pytest
+from luthien_control.control_policy.backend_call_policy import BackendCallPolicy
+from luthien_control.control_policy.backend_rate_limit_policy import BackendRateLimitPolicy, estimate_request_tokens
+from luthien_control.control_policy.exceptions import BackendRateLimitError
+from luthien_control.control_policy.noop_policy import NoopPolicy
+from luthien_control.core.backend_limiter import BackendLimiterRegistry
+from luthien_control.core.response import close_stream
+from luthien_control.core.transaction import Transaction
+from luthien_control.utils.backend_call_spec import BackendCallSpec
+from openai.types.chat import ChatCompletionChunk
+
+BACKEND_URL = "https://api.openai.com/v1"
+
+
+def make_chunk() -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 1,
+            "model": "gpt-4o",
+            "choices": [{"index": 0, "delta": {"content": "Hi"}, "finish_reason": None}],
+        }
+    )
+
+
+@pytest.fixture
+def limiters() -> BackendLimiterRegistry:
+    return BackendLimiterRegistry()
+
+
+@pytest.fixture
+def container(limiters: BackendLimiterRegistry) -> MagicMock:
+    container = MagicMock()
+    container.backend_limiters = limiters
+    return container
+
+
+def test_estimate_request_tokens(make_transaction: Callable[..., Transaction]):
+    payload = make_transaction(max_tokens=100).request.payload
+    assert estimate_request_tokens(payload) > 100
+    payload.max_tokens = None
+    assert 0 < estimate_request_tokens(payload) < 100
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrent_requests(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    running = 0
+    max_running = 0
+
+    async def slow(tx: Transaction) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    policy = BackendRateLimitPolicy(policy=mock_backend_policy(slow), max_in_flight=2)
+    await asyncio.gather(*(policy.apply(make_transaction(), container, AsyncMock()) for _ in range(6)))
+
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_the_queue_is_full(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    release = asyncio.Event()
+
+    async def blocked(tx: Transaction) -> None:
+        await release.wait()
+
+    policy = BackendRateLimitPolicy(policy=mock_backend_policy(blocked), max_in_flight=1, max_queue=0)
+    first = asyncio.create_task(policy.apply(make_transaction(), container, AsyncMock()))
+    await asyncio.sleep(0)
+
+    with pytest.raises(BackendRateLimitError) as exc_info:
+        await policy.apply(make_transaction(), container, AsyncMock())
+    assert exc_info.value.status_code == 429
+
+    release.set()
+    await first
+    assert policy.get_limiter(container, BACKEND_URL).in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_rejects_after_max_wait(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    async def slow(tx: Transaction) -> None:
+        await asyncio.sleep(0.1)
+
+    policy = BackendRateLimitPolicy(policy=mock_backend_policy(slow), max_in_flight=1, max_wait_seconds=0.01)
+    results = await asyncio.gather(
+        *(policy.apply(make_transaction(), container, AsyncMock()) for _ in range(2)), return_exceptions=True
+    )
+
+    assert isinstance(results[0], Transaction)
+    assert isinstance(results[1], BackendRateLimitError)
+
+
+@pytest.mark.asyncio
+async def test_limiters_are_per_backend(
+    container: MagicMock,
+    limiters: BackendLimiterRegistry,
+    make_transaction: Callable[..., Transaction],
+    mock_backend_policy: Any,
+):
+    policy = BackendRateLimitPolicy(policy=mock_backend_policy(), requests_per_minute=60)
+
+    await policy.apply(make_transaction(BACKEND_URL), container, AsyncMock())
+    await policy.apply(make_transaction("https://other.example.com/v1"), container, AsyncMock())
+
+    assert policy.get_limiter(container, BACKEND_URL).stats()["admitted"] == 1
+    assert policy.get_limiter(container, "https://other.example.com/v1").stats()["admitted"] == 1
+    assert len(limiters) == 2
+
+
+@pytest.mark.asyncio
+async def test_policies_with_different_limits_keep_separate_limiters(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    strict = BackendRateLimitPolicy(policy=mock_backend_policy(), requests_per_minute=60, max_in_flight=1)
+    loose = BackendRateLimitPolicy(policy=mock_backend_policy(), requests_per_minute=600)
+
+    await strict.apply(make_transaction(), container, AsyncMock())
+    await loose.apply(make_transaction(), container, AsyncMock())
+
+    strict_limiter = strict.get_limiter(container, BACKEND_URL)
+    loose_limiter = loose.get_limiter(container, BACKEND_URL)
+    assert strict_limiter is not loose_limiter
+    assert (strict_limiter.stats()["requests_per_minute"], strict_limiter.max_in_flight) == (60, 1)
+    assert (loose_limiter.stats()["requests_per_minute"], loose_limiter.max_in_flight) == (600, None)
+    assert (
+        BackendRateLimitPolicy(policy=NoopPolicy(), requests_per_minute=60, max_in_flight=1).get_limiter(
+            container, BACKEND_URL
+        )
+        is strict_limiter
+    )
+
+
+def test_backend_call_policy_url_is_used(make_transaction: Callable[..., Transaction]):
+    """The limiter of a wrapped BackendCallPolicy is that of the endpoint in its spec."""
+    inner = BackendCallPolicy(backend_call_spec=BackendCallSpec(api_endpoint="https://spec.example.com/v1"))
+    policy = BackendRateLimitPolicy(policy=inner)
+
+    assert policy._backend_url(make_transaction()) == "https://spec.example.com/v1"
+
+
+@pytest.mark.asyncio
+async def test_adapts_to_response_headers(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    headers = {"x-ratelimit-limit-requests": "500", "x-ratelimit-limit-tokens": "40000"}
+    policy = BackendRateLimitPolicy(policy=mock_backend_policy(headers=headers))
+
+    await policy.apply(make_transaction(), container, AsyncMock())
+
+    stats = policy.get_limiter(container, BACKEND_URL).stats()
+    assert (stats["requests_per_minute"], stats["tokens_per_minute"]) == (500, 40000)
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backend_rate_limit_error_pauses_the_backend(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    async def rate_limited(tx: Transaction) -> None:
+        response = httpx.Response(429, headers={"retry-after": "60"}, request=httpx.Request("POST", BACKEND_URL))
+        raise openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+    policy = BackendRateLimitPolicy(policy=mock_backend_policy(rate_limited), max_wait_seconds=0.01)
+    with pytest.raises(openai.RateLimitError):
+        await policy.apply(make_transaction(), container, AsyncMock())
+    assert policy.get_limiter(container, BACKEND_URL).in_flight == 0
+
+    with pytest.raises(BackendRateLimitError):
+        await policy.apply(make_transaction(), container, AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_holds_its_slot_until_the_stream_ends(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    chunks: List[ChatCompletionChunk] = [make_chunk()]
+
+    async def open_stream(tx: Transaction) -> None:
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+
+        tx.response.stream = stream()
+
+    policy = BackendRateLimitPolicy(policy=mock_backend_policy(open_stream))
+    transaction = await policy.apply(make_transaction(), container, AsyncMock())
+    limiter = policy.get_limiter(container, BACKEND_URL)
+    assert limiter.in_flight == 1
+
+    received = [chunk async for chunk in transaction.response.iter_chunks()]
+
+    assert received == chunks
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_closed_before_it_is_read_releases_its_slot(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    async def open_stream(tx: Transaction) -> None:
+        async def stream():
+            yield make_chunk()
+
+        tx.response.stream = stream()
+
+    policy = BackendRateLimitPolicy(policy=mock_backend_policy(open_stream), max_in_flight=1)
+    transaction = await policy.apply(make_transaction(), container, AsyncMock())
+    stream = transaction.response.stream
+    assert stream is not None and policy.get_limiter(container, BACKEND_URL).in_flight == 1
+
+    await close_stream(stream)
+
+    assert policy.get_limiter(container, BACKEND_URL).in_flight == 0
+
+
+def test_serialization_round_trip():
+    policy = BackendRateLimitPolicy(
+        name="limits", policy=NoopPolicy(name="inner"), requests_per_minute=500, max_in_flight=8, adaptive=False
+    )
+
+    restored = BackendRateLimitPolicy.from_serialized(policy.serialize())
+
+    assert isinstance(restored.policy, NoopPolicy)
+    assert (restored.name, restored.requests_per_minute, restored.max_in_flight, restored.adaptive) == (
+        "limits",
+        500,
+        8,
+        False,
+    )
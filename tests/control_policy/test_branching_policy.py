@@ -11,7 +11,7 @@ from luthien_control.api.openai_chat_completions.datatypes import Choice, Messag
 from luthien_control.api.openai_chat_completions.request import OpenAIChatCompletionsRequest
 from luthien_control.api.openai_chat_completions.response import OpenAIChatCompletionsResponse
 from luthien_control.control_policy.branching_policy import BranchingPolicy
-from luthien_control.control_policy.conditions import EqualsCondition, path
+from luthien_control.control_policy.conditions import AnyCondition, EqualsCondition, NotCondition, path
 from luthien_control.control_policy.conditions.condition import Condition
 from luthien_control.control_policy.conditions.registry import NAME_TO_CONDITION_CLASS
 from luthien_control.control_policy.control_policy import ControlPolicy
@@ -22,6 +22,7 @@ from luthien_control.core.dependency_container import DependencyContainer
 from luthien_control.core.request import Request
 from luthien_control.core.response import Response
 from luthien_control.core.transaction import Transaction
+from luthien_control.utils.deep_evented_model import deep_events
 from psygnal.containers import EventedDict, EventedList
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -145,6 +146,134 @@ async def test_branching_policy_condition_matching(
     assert result.data["applied_policy"] == expected_policy
 
 
+@pytest.mark.asyncio
+async def test_branching_policy_uses_compiled_conditions(
+    sample_transaction: Transaction, mock_container: MagicMock, mock_db_session: AsyncMock
+):
+    """Test that apply evaluates the conditions compiled when the map was assigned."""
+    never = EqualsCondition(1, 2)
+    matching = EqualsCondition(path("data.method"), "GET")
+    branching_policy = BranchingPolicy(
+        cond_to_policy_map=OrderedDict(
+            [(never, MockSimplePolicy(marker="never")), (matching, MockSimplePolicy(marker="policy1"))]
+        )
+    )
+
+    with patch.object(EqualsCondition, "evaluate", side_effect=AssertionError("evaluate should not be called")):
+        result = await branching_policy.apply(sample_transaction, mock_container, mock_db_session)
+    assert result.data["applied_policy"] == "policy1"
+
+    # Reassigning the map recompiles the branches
+    branching_policy.cond_to_policy_map = OrderedDict([(EqualsCondition(1, 1), MockSimplePolicy(marker="always"))])
+    result = await branching_policy.apply(sample_transaction, mock_container, mock_db_session)
+    assert result.data["applied_policy"] == "always"
+
+
+@pytest.mark.asyncio
+async def test_branching_policy_resolves_each_path_once_per_apply(
+    sample_transaction: Transaction, mock_container: MagicMock, mock_db_session: AsyncMock
+):
+    """Test that conditions reading the same path share its value, even without change events."""
+    reads = []
+
+    class User:
+        @property
+        def kind(self) -> str:
+            reads.append("kind")
+            return "admin"
+
+    with deep_events(False):
+        transaction = Transaction(
+            request=sample_transaction.request, response=sample_transaction.response, data=EventedDict({"user": User()})
+        )
+    branching_policy = BranchingPolicy(
+        cond_to_policy_map=_routing_map(
+            (NotCondition(cond=EqualsCondition(path("data.user.kind"), "admin")), "guest"),
+            (EqualsCondition(path("data.user.kind"), "admin"), "admin"),
+        )
+    )
+
+    result = await branching_policy.apply(transaction, mock_container, mock_db_session)
+
+    assert result.data["applied_policy"] == "admin"
+    assert reads == ["kind"]
+    assert transaction.resolved_paths is None
+
+    await branching_policy.apply(transaction, mock_container, mock_db_session)
+    assert reads == ["kind", "kind"]
+
+
+def _routing_map(*branches: tuple[Condition, str]) -> OrderedDict[Condition, ControlPolicy]:
+    return OrderedDict((cond, MockSimplePolicy(marker=marker)) for cond, marker in branches)
+
+
+@pytest.mark.parametrize(
+    "model, user_type, expected_policy",
+    [
+        ("gpt-4", "admin", "gpt-4"),  # The first branch listing a value wins
+        ("model-7", "admin", "model-7"),
+        ("gpt-3.5", "admin", "any-gpt"),
+        ("unknown", "admin", "admin"),  # Falls through to the non-indexable branch
+        ("model-42", "admin", "admin"),  # Indexed after the non-indexable branch, which matches first
+        ("model-42", "guest", "model-42"),
+        ("unknown", "guest", "default"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_branching_policy_indexed_routing(
+    sample_transaction: Transaction,
+    mock_container: MagicMock,
+    mock_db_session: AsyncMock,
+    model: str,
+    user_type: str,
+    expected_policy: str,
+):
+    """Test that equality branches looked up by index keep first-match semantics."""
+    model_path = "request.payload.model"
+    branches = [(EqualsCondition(path(model_path), "gpt-4"), "gpt-4")]
+    branches += [(EqualsCondition(path(model_path), f"model-{i}"), f"model-{i}") for i in range(20)]
+    branches += [
+        (
+            AnyCondition(
+                conditions=[
+                    EqualsCondition(path(model_path), "gpt-3.5"),
+                    EqualsCondition("gpt-4", path(model_path)),
+                ]
+            ),
+            "any-gpt",
+        ),
+        (NotCondition(cond=EqualsCondition(path("data.user_type"), "guest")), "admin"),
+    ]
+    branches += [(EqualsCondition(path(model_path), f"model-{i}"), f"model-{i}") for i in range(20, 50)]
+    branching_policy = BranchingPolicy(
+        cond_to_policy_map=_routing_map(*branches), default_policy=MockSimplePolicy(marker="default")
+    )
+    # Two index lookups around the one branch that cannot be indexed
+    assert len(branching_policy._branches) == 3
+
+    sample_transaction.request.payload.model = model
+    sample_transaction.data["user_type"] = user_type
+    result = await branching_policy.apply(sample_transaction, mock_container, mock_db_session)
+    assert result.data["applied_policy"] == expected_policy
+
+
+@pytest.mark.asyncio
+async def test_branching_policy_indexed_routing_unhashable_value(
+    sample_transaction: Transaction, mock_container: MagicMock, mock_db_session: AsyncMock
+):
+    """Test that indexed branches still compare values that cannot be hashed."""
+    branching_policy = BranchingPolicy(
+        cond_to_policy_map=_routing_map(
+            (EqualsCondition(path("data.method"), "GET"), "get"),
+            (EqualsCondition(path("data.method"), "POST"), "post"),
+        ),
+        default_policy=MockSimplePolicy(marker="default"),
+    )
+    sample_transaction.data["method"] = ["GET"]
+    result = await branching_policy.apply(sample_transaction, mock_container, mock_db_session)
+    assert result.data["applied_policy"] == "default"
+
+
 @pytest.mark.asyncio
 async def test_branching_policy_no_conditions_match_with_default(
     sample_transaction: Transaction,
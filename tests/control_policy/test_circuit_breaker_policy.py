@@ -0,0 +1,165 @@
+"""Tests for CircuitBreakerPolicy."""
+
+from typing import Any, AsyncIterator, Callable
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import openai
+import pytest
+from luthien_control.control_policy.circuit_breaker_policy import CircuitBreakerPolicy
+from luthien_control.control_policy.exceptions import CircuitOpenError
+from luthien_control.control_policy.noop_policy import NoopPolicy
+from luthien_control.core.transaction import Transaction
+from openai.types.chat import ChatCompletionChunk
+
+BACKEND_URL = "https://api.openai.com/v1"
+
+
+def status_error(status_code: int) -> openai.APIStatusError:
+    request = httpx.Request("POST", BACKEND_URL)
+    return openai.APIStatusError("error", response=httpx.Response(status_code, request=request), body=None)
+
+
+async def fail(transaction: Transaction) -> None:
+    raise openai.APITimeoutError(request=httpx.Request("POST", BACKEND_URL))
+
+
+async def apply_ignoring_errors(
+    policy: CircuitBreakerPolicy, container: MagicMock, make_transaction: Callable[..., Transaction], count: int
+) -> None:
+    for _ in range(count):
+        try:
+            await policy.apply(make_transaction(), container, AsyncMock())
+        except (openai.APIError, CircuitOpenError):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    backend = mock_backend_policy(fail)
+    policy = CircuitBreakerPolicy(policy=backend, minimum_calls=3)
+
+    await apply_ignoring_errors(policy, mock_container, make_transaction, 3)
+    assert policy.get_breaker(mock_container, BACKEND_URL).state == "open"
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        await policy.apply(make_transaction(), mock_container, AsyncMock())
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.detail is not None and BACKEND_URL in exc_info.value.detail
+    assert len(backend.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_applies_the_fallback_policy(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    fallback = mock_backend_policy()
+    policy = CircuitBreakerPolicy(policy=mock_backend_policy(fail), fallback_policy=fallback, minimum_calls=2)
+
+    await apply_ignoring_errors(policy, mock_container, make_transaction, 2)
+    await policy.apply(make_transaction(), mock_container, AsyncMock())
+
+    assert len(fallback.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_open_the_breaker(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    async def bad_request(transaction: Transaction) -> None:
+        raise status_error(400)
+
+    backend = mock_backend_policy(bad_request)
+    policy = CircuitBreakerPolicy(policy=backend, minimum_calls=2)
+
+    await apply_ignoring_errors(policy, mock_container, make_transaction, 4)
+
+    assert policy.get_breaker(mock_container, BACKEND_URL).state == "closed"
+    assert len(backend.calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_outcome_is_recorded_when_it_ends(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    async def failing_chunks() -> AsyncIterator[ChatCompletionChunk]:
+        yield ChatCompletionChunk.model_validate(
+            {"id": "chunk", "object": "chat.completion.chunk", "created": 1, "model": "gpt-4o", "choices": []}
+        )
+        raise openai.APIConnectionError(request=httpx.Request("POST", BACKEND_URL))
+
+    async def stream(transaction: Transaction) -> None:
+        transaction.response.stream = failing_chunks()
+
+    policy = CircuitBreakerPolicy(policy=mock_backend_policy(stream), minimum_calls=1)
+    transaction = await policy.apply(make_transaction(), mock_container, AsyncMock())
+    breaker = policy.get_breaker(mock_container, BACKEND_URL)
+    assert breaker.state == "closed"
+
+    assert transaction.response.stream is not None
+    with pytest.raises(openai.APIConnectionError):
+        async for _ in transaction.response.stream:
+            pass
+    assert breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_probe_stream_closed_before_it_is_read_ends_the_probe(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    async def chunks() -> AsyncIterator[ChatCompletionChunk]:
+        yield ChatCompletionChunk.model_validate(
+            {"id": "chunk", "object": "chat.completion.chunk", "created": 1, "model": "gpt-4o", "choices": []}
+        )
+
+    async def stream(transaction: Transaction) -> None:
+        transaction.response.stream = chunks()
+
+    policy = CircuitBreakerPolicy(policy=mock_backend_policy(stream), minimum_calls=1, open_seconds=30)
+    breaker = policy.get_breaker(mock_container, BACKEND_URL)
+    with patch("luthien_control.core.circuit_breaker.time.monotonic", return_value=100.0):
+        breaker.record_failure("closed")
+    with patch("luthien_control.core.circuit_breaker.time.monotonic", return_value=130.0):
+        transaction = await policy.apply(make_transaction(), mock_container, AsyncMock())
+        assert breaker.state == "half_open"
+
+        assert transaction.response.stream is not None
+        await transaction.response.stream.aclose()  # type: ignore[attr-defined]
+
+        assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_policies_with_different_thresholds_keep_separate_breakers(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    strict = CircuitBreakerPolicy(policy=mock_backend_policy(fail), minimum_calls=2)
+    lenient = CircuitBreakerPolicy(policy=mock_backend_policy(fail), minimum_calls=10)
+
+    await apply_ignoring_errors(strict, mock_container, make_transaction, 2)
+    await apply_ignoring_errors(lenient, mock_container, make_transaction, 2)
+
+    assert strict.get_breaker(mock_container, BACKEND_URL).state == "open"
+    assert lenient.get_breaker(mock_container, BACKEND_URL).state == "closed"
+    assert lenient.get_breaker(mock_container, BACKEND_URL).minimum_calls == 10
+    same = CircuitBreakerPolicy(policy=NoopPolicy(), minimum_calls=2)
+    assert same.get_breaker(mock_container, BACKEND_URL) is strict.get_breaker(mock_container, BACKEND_URL)
+
+
+def test_serialization_round_trip():
+    policy = CircuitBreakerPolicy(
+        name="breaker",
+        policy=NoopPolicy(name="inner"),
+        fallback_policy=NoopPolicy(name="fallback"),
+        slow_call_seconds=10,
+        open_seconds=5,
+    )
+
+    restored = CircuitBreakerPolicy.from_serialized(policy.serialize())
+
+    assert isinstance(restored.policy, NoopPolicy)
+    assert isinstance(restored.fallback_policy, NoopPolicy)
+    assert restored.fallback_policy.name == "fallback"
+    assert (restored.name, restored.slow_call_seconds, restored.open_seconds) == ("breaker", 10, 5)
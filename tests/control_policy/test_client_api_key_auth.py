@@ -15,11 +15,12 @@ from luthien_control.control_policy.exceptions import (
     NoRequestError,
 )
 from luthien_control.control_policy.serialization import SerializableDict
+from luthien_control.core.api_key_cache import ApiKeyCache
 from luthien_control.core.dependency_container import DependencyContainer
 from luthien_control.core.request import Request
 from luthien_control.core.response import Response
 from luthien_control.core.transaction import Transaction
-from luthien_control.db.exceptions import LuthienDBQueryError
+from luthien_control.db.exceptions import LuthienDBNotFoundError, LuthienDBQueryError
 from luthien_control.db.sqlmodel_models import ClientApiKey
 from psygnal.containers import EventedDict, EventedList
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -136,7 +137,9 @@ def mock_inactive_api_key() -> MagicMock:
 @pytest.fixture
 def mock_container() -> MagicMock:
     """Provides a mock dependency container."""
-    return MagicMock(spec=DependencyContainer)
+    container = MagicMock(spec=DependencyContainer)
+    container.api_key_cache = ApiKeyCache()
+    return container
 
 
 @pytest.fixture
@@ -596,3 +599,69 @@ async def test_client_api_key_auth_policy_short_api_key_logging(
 
     # Check that the truncation works with short keys too
     assert "Invalid API key provided (key starts with: abc...)" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_client_api_key_auth_policy_caches_valid_key(
+    sample_transaction: Transaction,
+    mock_active_api_key: MagicMock,
+    mock_container: MagicMock,
+    mock_db_session: AsyncMock,
+):
+    """A validated key is served from the cache on subsequent requests."""
+    from unittest.mock import patch
+
+    policy = ClientApiKeyAuthPolicy()
+
+    with patch("luthien_control.control_policy.client_api_key_auth.get_api_key_by_value") as mock_get_api_key:
+        mock_get_api_key.return_value = mock_active_api_key
+
+        await policy.apply(sample_transaction, mock_container, mock_db_session)
+        await policy.apply(sample_transaction, mock_container, mock_db_session)
+
+        mock_get_api_key.assert_awaited_once()
+
+    assert mock_container.api_key_cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+@pytest.mark.asyncio
+async def test_client_api_key_auth_policy_caches_unknown_key(
+    sample_transaction: Transaction,
+    mock_container: MagicMock,
+    mock_db_session: AsyncMock,
+):
+    """Unknown keys are negatively cached, so repeated attempts don't hit the DB."""
+    from unittest.mock import patch
+
+    policy = ClientApiKeyAuthPolicy()
+
+    with patch("luthien_control.control_policy.client_api_key_auth.get_api_key_by_value") as mock_get_api_key:
+        mock_get_api_key.side_effect = LuthienDBNotFoundError("API key not found")
+
+        for _ in range(2):
+            with pytest.raises(ClientAuthenticationError, match="Invalid API Key"):
+                await policy.apply(sample_transaction, mock_container, mock_db_session)
+
+        mock_get_api_key.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_client_api_key_auth_policy_does_not_cache_db_errors(
+    sample_transaction: Transaction,
+    mock_active_api_key: MagicMock,
+    mock_container: MagicMock,
+    mock_db_session: AsyncMock,
+):
+    """A failed lookup is not cached, so the key works again once the DB recovers."""
+    from unittest.mock import patch
+
+    policy = ClientApiKeyAuthPolicy()
+
+    with patch("luthien_control.control_policy.client_api_key_auth.get_api_key_by_value") as mock_get_api_key:
+        mock_get_api_key.side_effect = [LuthienDBQueryError("Database connection failed"), mock_active_api_key]
+
+        with pytest.raises(ClientAuthenticationError, match="Invalid API Key"):
+            await policy.apply(sample_transaction, mock_container, mock_db_session)
+        result = await policy.apply(sample_transaction, mock_container, mock_db_session)
+
+    assert result is sample_transaction
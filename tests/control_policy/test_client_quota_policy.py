@@ -0,0 +1,223 @@
+"""Tests for ClientQuotaPolicy."""
+
+from typing import Any, Awaitable, Callable, List, Optional
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from luthien_control.api.openai_chat_completions.datatypes import StreamOptions
+from luthien_control.control_policy.client_quota_policy import ClientQuotaPolicy
+from luthien_control.control_policy.exceptions import ClientAuthenticationError, ClientQuotaExceededError
+from luthien_control.control_policy.noop_policy import NoopPolicy
+from luthien_control.core.api_key_cache import ApiKeyCache
+from luthien_control.core.client_quota import ClientQuotaTracker, QuotaLimits
+from luthien_control.core.transaction import Transaction
+from luthien_control.db.sqlmodel_models import ClientApiKey
+from openai.types.chat import ChatCompletionChunk
+from pydantic import ValidationError
+
+API_KEY = "test-key"
+
+
+def streaming(chunks: List[ChatCompletionChunk]) -> Callable[[Transaction], Awaitable[None]]:
+    """Returns a backend action answering with a stream of `chunks`."""
+
+    async def action(transaction: Transaction) -> None:
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+
+        transaction.response.stream = stream()
+
+    return action
+
+
+def make_container(metadata: Optional[dict] = None, is_active: bool = True) -> MagicMock:
+    container = MagicMock()
+    container.api_key_cache = ApiKeyCache()
+    container.api_key_cache.put(
+        API_KEY, ClientApiKey(id=1, key_value=API_KEY, name="tenant", is_active=is_active, metadata_=metadata)
+    )
+    container.client_quotas = ClientQuotaTracker()
+    return container
+
+
+@pytest.mark.asyncio
+async def test_rejects_requests_over_quota_before_the_wrapped_policy(
+    make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    container = make_container({"quota": {"requests_per_minute": 2}})
+    backend = mock_backend_policy()
+    policy = ClientQuotaPolicy(policy=backend)
+
+    for _ in range(2):
+        await policy.apply(make_transaction(), container, AsyncMock())
+    with pytest.raises(ClientQuotaExceededError) as exc_info:
+        await policy.apply(make_transaction(), container, AsyncMock())
+
+    assert exc_info.value.status_code == 429
+    assert "requests_per_minute" in str(exc_info.value)
+    assert len(backend.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_counts_tokens_from_the_response_usage(
+    make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    container = make_container({"quota": {"tokens_per_hour": 30}})
+    policy = ClientQuotaPolicy(policy=mock_backend_policy())
+
+    await policy.apply(make_transaction(), container, AsyncMock())
+    await policy.apply(make_transaction(), container, AsyncMock())  # 15 tokens used so far, still within quota
+
+    with pytest.raises(ClientQuotaExceededError):
+        await policy.apply(make_transaction(), container, AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_counts_tokens_from_the_stream_usage(
+    make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    chunk = ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 1,
+            "model": "gpt-4o",
+            "choices": [],
+            "usage": {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10},
+        }
+    )
+    container = make_container({"quota": {"prompt_tokens_per_day": 100}})
+    policy = ClientQuotaPolicy(policy=mock_backend_policy(streaming([chunk])))
+
+    transaction = await policy.apply(make_transaction(), container, AsyncMock())
+    assert [c async for c in transaction.response.iter_chunks()] == [chunk]
+
+    assert container.client_quotas._pending[1] == {"requests": 1, "prompt_tokens": 7, "completion_tokens": 3}
+
+
+def make_chunk(content: Optional[str] = None, usage: Optional[dict] = None) -> ChatCompletionChunk:
+    choices = [] if content is None else [{"index": 0, "delta": {"content": content}}]
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 1,
+            "model": "gpt-4o",
+            "choices": choices,
+            "usage": usage,
+        }
+    )
+
+
+USAGE = {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10}
+
+
+@pytest.mark.asyncio
+async def test_streams_request_usage_and_hide_it_from_clients_that_did_not_ask(
+    make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    chunks = [make_chunk("Hello"), make_chunk(usage=USAGE)]
+    container = make_container({"quota": {"tokens_per_day": 100}})
+    policy = ClientQuotaPolicy(policy=mock_backend_policy(streaming(chunks)))
+
+    transaction = await policy.apply(make_transaction(stream=True), container, AsyncMock())
+
+    assert transaction.request.payload.stream_options == StreamOptions(include_usage=True)
+    assert [c async for c in transaction.response.iter_chunks()] == [chunks[0]]
+    assert container.client_quotas._pending[1] == {"requests": 1, "prompt_tokens": 7, "completion_tokens": 3}
+
+
+@pytest.mark.asyncio
+async def test_streams_keep_usage_for_clients_that_asked_for_it(
+    make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    chunks = [make_chunk("Hello"), make_chunk(usage=USAGE)]
+    container = make_container({"quota": {"tokens_per_day": 100}})
+    policy = ClientQuotaPolicy(policy=mock_backend_policy(streaming(chunks)))
+    transaction = make_transaction(stream=True, stream_options=StreamOptions(include_usage=True))
+
+    transaction = await policy.apply(transaction, container, AsyncMock())
+
+    assert [c async for c in transaction.response.iter_chunks()] == chunks
+
+
+@pytest.mark.asyncio
+async def test_streams_without_usage_are_charged_an_estimate(
+    make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    container = make_container({"quota": {"tokens_per_day": 100}})
+    policy = ClientQuotaPolicy(policy=mock_backend_policy(streaming([make_chunk("a" * 40), make_chunk("b" * 40)])))
+
+    transaction = await policy.apply(make_transaction(stream=True), container, AsyncMock())
+    assert len([c async for c in transaction.response.iter_chunks()]) == 2
+
+    pending = container.client_quotas._pending[1]
+    assert pending["prompt_tokens"] > 0
+    assert pending["completion_tokens"] == 20
+
+
+@pytest.mark.asyncio
+async def test_unread_streams_are_charged_an_estimate_when_closed(
+    make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    container = make_container({"quota": {"tokens_per_day": 100}})
+    policy = ClientQuotaPolicy(policy=mock_backend_policy(streaming([make_chunk("Hello")])))
+
+    transaction = await policy.apply(make_transaction(stream=True), container, AsyncMock())
+    stream = transaction.response.stream
+    assert stream is not None
+    await stream.aclose()  # type: ignore[attr-defined]
+
+    assert container.client_quotas._pending[1]["prompt_tokens"] > 0
+
+
+@pytest.mark.asyncio
+async def test_default_quota_applies_to_keys_without_one(
+    make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    container = make_container({"team": "research"})
+    policy = ClientQuotaPolicy(policy=mock_backend_policy(), default_quota={"requests_per_day": 1})
+
+    await policy.apply(make_transaction(), container, AsyncMock())
+    with pytest.raises(ClientQuotaExceededError):
+        await policy.apply(make_transaction(), container, AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_keys_without_quota_are_unlimited(make_transaction: Callable[..., Transaction], mock_backend_policy: Any):
+    container = make_container()
+    policy = ClientQuotaPolicy(policy=mock_backend_policy())
+
+    for _ in range(5):
+        await policy.apply(make_transaction(), container, AsyncMock())
+
+    assert await container.client_quotas.check(1, QuotaLimits({"requests_per_minute": 5})) == "requests_per_minute"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("api_key, is_active", [("unknown-key", True), (API_KEY, False)])
+async def test_rejects_unknown_and_inactive_keys(
+    api_key: str, is_active: bool, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    container = make_container(is_active=is_active)
+    container.api_key_cache.put_missing("unknown-key")
+    backend = mock_backend_policy()
+
+    with pytest.raises(ClientAuthenticationError):
+        await ClientQuotaPolicy(policy=backend).apply(make_transaction(api_key=api_key), container, AsyncMock())
+    assert len(backend.calls) == 0
+
+
+def test_invalid_default_quota_is_rejected():
+    with pytest.raises(ValidationError):
+        ClientQuotaPolicy(policy=NoopPolicy(), default_quota={"requests_per_fortnight": 1})
+
+
+def test_serialization_round_trip():
+    policy = ClientQuotaPolicy(name="quotas", policy=NoopPolicy(name="inner"), default_quota={"tokens_per_day": 1e6})
+
+    restored = ClientQuotaPolicy.from_serialized(policy.serialize())
+
+    assert isinstance(restored.policy, NoopPolicy)
+    assert (restored.name, restored.default_quota) == ("quotas", {"tokens_per_day": 1e6})
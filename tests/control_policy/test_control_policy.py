@@ -144,3 +144,28 @@ def test_from_serialized_type_inference_success():
             assert isinstance(policy, MinimalConcretePolicy)
             assert policy.name == "inferred_test"
             assert policy.type == "MinimalConcretePolicy"
+
+
+def test_iter_policies_walks_nested_policies():
+    """iter_policies should yield the policy itself and every nested member policy."""
+    from collections import OrderedDict
+
+    from luthien_control.control_policy.branching_policy import BranchingPolicy
+    from luthien_control.control_policy.conditions.comparison_conditions import EqualsCondition
+    from luthien_control.control_policy.conditions.value_resolvers import StaticValue, path
+    from luthien_control.control_policy.noop_policy import NoopPolicy
+    from luthien_control.control_policy.serial_policy import SerialPolicy
+
+    leaf_a = NoopPolicy(name="a")
+    leaf_b = NoopPolicy(name="b")
+    leaf_c = NoopPolicy(name="c")
+    branching = BranchingPolicy(
+        cond_to_policy_map=OrderedDict(
+            [(EqualsCondition(left=path("data.x"), right=StaticValue(value=1), comparator="equals"), leaf_b)]
+        ),
+        default_policy=leaf_c,
+    )
+    root = SerialPolicy(policies=[leaf_a, branching])
+
+    assert [p.name for p in root.iter_policies()] == [root.name, "a", branching.name, "b", "c"]
+    assert not any(p.requires_change_events for p in root.iter_policies())
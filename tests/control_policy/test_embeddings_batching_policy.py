@@ -0,0 +1,180 @@
+import asyncio
+import json
+from typing import Any, List
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from luthien_control.control_policy.embeddings_batching_policy import (
+    EmbeddingsBatchingPolicy,
+    estimate_input_tokens,
+    split_embeddings_response,
+)
+from luthien_control.core.tracked_context import BACKEND_URL_KEY, TrackedContext
+
+
+def _embeddings_context(body: Any, url: str = "embeddings", method: str = "POST") -> TrackedContext:
+    context = TrackedContext()
+    content = json.dumps(body).encode() if not isinstance(body, bytes) else body
+    context.update_request(method=method, url=url, headers={"authorization": "Bearer sk-backend"}, content=content)
+    context.set_data(BACKEND_URL_KEY, "https://backend.example/v1")
+    return context
+
+
+@pytest.fixture
+def backend_calls() -> List[httpx.Request]:
+    return []
+
+
+@pytest.fixture
+def batching_container(mock_container: MagicMock, backend_calls: List[httpx.Request]) -> MagicMock:
+    """A container whose HTTP client answers embeddings requests with one vector per input."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        backend_calls.append(request)
+        inputs = json.loads(request.content)["input"]
+        data = [{"object": "embedding", "index": i, "embedding": [float(i)]} for i in reversed(range(len(inputs)))]
+        usage = {"prompt_tokens": 10 * len(inputs), "total_tokens": 10 * len(inputs)}
+        return httpx.Response(200, json={"object": "list", "data": data, "model": "m", "usage": usage})
+
+    mock_container.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return mock_container
+
+
+def test_split_embeddings_response_reindexes_and_splits_usage():
+    body = json.dumps(
+        {
+            "object": "list",
+            "data": [{"index": i, "embedding": [float(i)]} for i in (2, 0, 1)],
+            "usage": {"prompt_tokens": 10, "total_tokens": 10},
+        }
+    ).encode()
+
+    first, second = (json.loads(part) for part in split_embeddings_response(body, [1, 2]))
+
+    assert first["data"] == [{"index": 0, "embedding": [0.0]}]
+    assert second["data"] == [{"index": 0, "embedding": [1.0]}, {"index": 1, "embedding": [2.0]}]
+    assert first["usage"]["prompt_tokens"] + second["usage"]["prompt_tokens"] == 10
+    assert first["usage"]["prompt_tokens"] == 3
+
+
+def test_split_embeddings_response_rejects_missing_embeddings():
+    body = json.dumps({"data": [{"index": 0, "embedding": [0.0]}]}).encode()
+    with pytest.raises(ValueError, match="1 embeddings for 2 inputs"):
+        split_embeddings_response(body, [2])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_backend_call(
+    batching_container: MagicMock, backend_calls: List[httpx.Request]
+):
+    policy = EmbeddingsBatchingPolicy(max_wait_ms=20)
+    contexts = [
+        _embeddings_context({"model": "text-embedding-3-small", "input": "one"}),
+        _embeddings_context({"model": "text-embedding-3-small", "input": ["two", "three"]}),
+    ]
+
+    await asyncio.gather(*(policy.apply_headers(context, batching_container, AsyncMock()) for context in contexts))
+
+    (call,) = backend_calls
+    assert str(call.url) == "https://backend.example/v1/embeddings"
+    assert call.headers["authorization"] == "Bearer sk-backend"
+    assert json.loads(call.content) == {"model": "text-embedding-3-small", "input": ["one", "two", "three"]}
+
+    first, second = (context.response for context in contexts)
+    assert first is not None and second is not None
+    assert first.status_code == 200
+    assert [item["embedding"] for item in json.loads(first.content)["data"]] == [[0.0]]
+    assert [item["embedding"] for item in json.loads(second.content)["data"]] == [[1.0], [2.0]]
+
+
+@pytest.mark.asyncio
+async def test_different_models_are_not_batched_together(
+    batching_container: MagicMock, backend_calls: List[httpx.Request]
+):
+    policy = EmbeddingsBatchingPolicy(max_wait_ms=10)
+    contexts = [
+        _embeddings_context({"model": "small", "input": "one"}),
+        _embeddings_context({"model": "large", "input": "two"}),
+    ]
+
+    await asyncio.gather(*(policy.apply_headers(context, batching_container, AsyncMock()) for context in contexts))
+
+    assert len(backend_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_reach_every_caller(mock_container: MagicMock):
+    mock_container.http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(429, json={"error": {"message": "slow down"}}))
+    )
+    policy = EmbeddingsBatchingPolicy(max_wait_ms=10)
+    contexts = [_embeddings_context({"model": "m", "input": text}) for text in ("a", "b")]
+
+    await asyncio.gather(*(policy.apply_headers(context, mock_container, AsyncMock()) for context in contexts))
+
+    for context in contexts:
+        assert context.response is not None
+        assert context.response.status_code == 429
+        assert json.loads(context.response.content)["error"]["message"] == "slow down"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_only_reach_the_callers_at_fault(mock_container: MagicMock):
+    calls: List[List[str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)["input"]
+        calls.append(inputs)
+        if "too long" in inputs:
+            return httpx.Response(400, json={"error": {"message": "input too long"}})
+        data = [{"object": "embedding", "index": i, "embedding": [0.0]} for i in range(len(inputs))]
+        return httpx.Response(200, json={"object": "list", "data": data, "model": "m"})
+
+    mock_container.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    policy = EmbeddingsBatchingPolicy(max_wait_ms=10)
+    contexts = [_embeddings_context({"model": "m", "input": text}) for text in ("a", "too long", "b")]
+
+    await asyncio.gather(*(policy.apply_headers(context, mock_container, AsyncMock()) for context in contexts))
+
+    assert calls[0] == ["a", "too long", "b"]
+    assert sorted(map(tuple, calls[1:])) == [("a",), ("b",), ("too long",)]
+    assert [context.response.status_code for context in contexts if context.response is not None] == [200, 400, 200]
+
+
+def test_estimate_input_tokens():
+    assert estimate_input_tokens("text", ["abcdefgh", ""]) == 4
+    assert estimate_input_tokens("tokens", [[1, 2, 3], [4]]) == 4
+
+
+@pytest.mark.asyncio
+async def test_batches_are_limited_by_estimated_tokens(
+    batching_container: MagicMock, backend_calls: List[httpx.Request]
+):
+    policy = EmbeddingsBatchingPolicy(max_wait_ms=10, max_batch_tokens=32)
+    contexts = [_embeddings_context({"model": "m", "input": "x" * 60}) for _ in range(3)]
+
+    await asyncio.gather(*(policy.apply_headers(context, batching_container, AsyncMock()) for context in contexts))
+
+    assert [len(json.loads(call.content)["input"]) for call in backend_calls] == [2, 1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body,url,method",
+    [
+        ({"model": "m", "input": "text"}, "models", "POST"),
+        ({"model": "m", "input": "text"}, "embeddings", "GET"),
+        ({"model": "m", "input": ["text", [1, 2]]}, "embeddings", "POST"),
+        (b"not json", "embeddings", "POST"),
+    ],
+)
+async def test_requests_that_cannot_be_batched_are_left_alone(
+    batching_container: MagicMock, backend_calls: List[httpx.Request], body: Any, url: str, method: str
+):
+    context = _embeddings_context(body, url=url, method=method)
+
+    result = await EmbeddingsBatchingPolicy().apply_headers(context, batching_container, AsyncMock())
+
+    assert result.response is None
+    assert backend_calls == []
@@ -0,0 +1,249 @@
+"""Tests for LeakedApiKeyResponseDetectionPolicy."""
+
+from typing import List, Optional
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from luthien_control.api.openai_chat_completions.datatypes import Choice, Message, Usage
+from luthien_control.api.openai_chat_completions.request import OpenAIChatCompletionsRequest
+from luthien_control.api.openai_chat_completions.response import OpenAIChatCompletionsResponse
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.exceptions import LeakedApiKeyError
+from luthien_control.control_policy.leaked_api_key_detection import LeakedApiKeyDetectionPolicy
+from luthien_control.control_policy.leaked_api_key_response_detection import LeakedApiKeyResponseDetectionPolicy
+from luthien_control.core.request import Request
+from luthien_control.core.response import Response
+from luthien_control.core.transaction import Transaction
+from openai.types.chat import ChatCompletionChunk
+from psygnal.containers import EventedDict, EventedList
+
+OPENAI_KEY = "sk-" + "a1B2" * 12
+
+
+def make_chunk(content: Optional[str], finish_reason: Optional[str] = None, index: int = 0) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 1,
+            "model": "gpt-4",
+            "choices": [{"index": index, "delta": {"content": content}, "finish_reason": finish_reason}],
+        }
+    )
+
+
+async def chunk_stream(chunks: List[ChatCompletionChunk]):
+    for chunk in chunks:
+        yield chunk
+
+
+def make_transaction(response: Response, n: Optional[int] = None) -> Transaction:
+    request = Request(
+        payload=OpenAIChatCompletionsRequest(
+            model="gpt-4", messages=EventedList([Message(role="user", content="Hi")]), n=n
+        ),
+        api_endpoint="https://api.openai.com/v1/chat/completions",
+        api_key="test_key",
+    )
+    return Transaction(request=request, response=response, data=EventedDict())
+
+
+def completion(content: str) -> OpenAIChatCompletionsResponse:
+    return OpenAIChatCompletionsResponse(
+        id="chatcmpl-123",
+        object="chat.completion",
+        created=1677652288,
+        model="gpt-4",
+        choices=EventedList(
+            [Choice(index=0, message=Message(role="assistant", content=content), finish_reason="stop")]
+        ),
+        usage=Usage(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+    )
+
+
+def split_stream(text: str, size: int) -> List[ChatCompletionChunk]:
+    """Streams `text` in `size`-character content chunks followed by a finishing chunk."""
+    return [make_chunk(text[i : i + size]) for i in range(0, len(text), size)] + [make_chunk(None, "stop")]
+
+
+async def stream_through(policy: ControlPolicy, chunks: List[ChatCompletionChunk], n: Optional[int] = None):
+    transaction = make_transaction(Response(stream=chunk_stream(chunks)), n=n)
+    await policy.apply(transaction, MagicMock(), AsyncMock())
+    received = [chunk async for chunk in transaction.response.iter_chunks()]
+    return transaction, received
+
+
+def streamed_text(chunks: List[ChatCompletionChunk], index: int = 0) -> str:
+    return "".join(choice.delta.content or "" for chunk in chunks for choice in chunk.choices if choice.index == index)
+
+
+def test_defaults_match_request_side_policy():
+    policy = LeakedApiKeyResponseDetectionPolicy(patterns=[])
+
+    assert policy.patterns == LeakedApiKeyDetectionPolicy.DEFAULT_PATTERNS
+    assert policy.action == "block"
+    assert policy.serialize()["type"] == "LeakedApiKeyResponseDetection"
+
+
+def test_round_trip_serialization():
+    policy = LeakedApiKeyResponseDetectionPolicy(name="Outputs", patterns=["tok_[0-9]{8}"], action="redact")
+
+    restored = LeakedApiKeyResponseDetectionPolicy.from_serialized(policy.serialize())
+
+    assert restored.serialize() == policy.serialize()
+
+
+@pytest.mark.asyncio
+async def test_non_streamed_key_is_blocked():
+    transaction = make_transaction(Response(payload=completion(f"Your key is {OPENAI_KEY}")))
+
+    with pytest.raises(LeakedApiKeyError, match="Potential API key detected in response content"):
+        await LeakedApiKeyResponseDetectionPolicy().apply(transaction, MagicMock(), AsyncMock())
+
+    assert transaction.data[LeakedApiKeyResponseDetectionPolicy.FLAGGED_PATTERNS_KEY] == [r"sk-[a-zA-Z0-9]{48}"]
+
+
+@pytest.mark.asyncio
+async def test_non_streamed_key_is_redacted_and_raw_body_discarded():
+    payload = completion(f"Your key is {OPENAI_KEY}.")
+    response = Response()
+    response.set_backend_payload(payload, raw_body=payload.model_dump_json().encode())
+    transaction = make_transaction(response)
+
+    await LeakedApiKeyResponseDetectionPolicy(action="redact").apply(transaction, MagicMock(), AsyncMock())
+
+    assert transaction.response.payload is not None
+    assert transaction.response.payload.choices[0].message.content == "Your key is [REDACTED]."
+    assert transaction.response.raw_body is None
+
+
+@pytest.mark.asyncio
+async def test_non_streamed_clean_response_is_untouched():
+    transaction = make_transaction(Response(payload=completion("Nothing secret here.")))
+
+    await LeakedApiKeyResponseDetectionPolicy().apply(transaction, MagicMock(), AsyncMock())
+
+    assert transaction.response.payload is not None
+    assert transaction.response.payload.choices[0].message.content == "Nothing secret here."
+    assert LeakedApiKeyResponseDetectionPolicy.FLAGGED_PATTERNS_KEY not in transaction.data
+
+
+@pytest.mark.asyncio
+async def test_streamed_clean_text_passes_through_unchanged():
+    pieces = ["The square root ", "of 64 is 8. ", "Ask me more!"]
+
+    _, received = await stream_through(
+        LeakedApiKeyResponseDetectionPolicy(), [make_chunk(piece) for piece in pieces] + [make_chunk(None, "stop")]
+    )
+
+    # Nothing resembling a key prefix, so every chunk is released as it arrives
+    assert [chunk.choices[0].delta.content for chunk in received] == [*pieces, None]
+
+
+@pytest.mark.asyncio
+async def test_streamed_key_split_across_chunks_is_redacted():
+    text = f"Here: {OPENAI_KEY} and {OPENAI_KEY}. Done"
+
+    transaction, received = await stream_through(
+        LeakedApiKeyResponseDetectionPolicy(action="redact"), split_stream(text, 7)
+    )
+
+    assert streamed_text(received) == "Here: [REDACTED] and [REDACTED]. Done"
+    assert all("sk-" not in (chunk.choices[0].delta.content or "") for chunk in received)
+    assert transaction.data[LeakedApiKeyResponseDetectionPolicy.FLAGGED_PATTERNS_KEY] == [r"sk-[a-zA-Z0-9]{48}"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_key_blocks_rest_of_stream():
+    text = f"Here: {OPENAI_KEY} and more text after it"
+
+    _, received = await stream_through(LeakedApiKeyResponseDetectionPolicy(), split_stream(text, 4))
+
+    assert streamed_text(received) == "Here: "
+    assert received[-1].choices[0].finish_reason == "content_filter"
+
+
+@pytest.mark.asyncio
+async def test_streamed_key_is_only_flagged():
+    text = f"Here: {OPENAI_KEY}"
+    chunks = split_stream(text, 9)
+
+    transaction, received = await stream_through(LeakedApiKeyResponseDetectionPolicy(action="flag"), chunks)
+
+    assert streamed_text(received) == text
+    assert transaction.data[LeakedApiKeyResponseDetectionPolicy.FLAGGED_PATTERNS_KEY] == [r"sk-[a-zA-Z0-9]{48}"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_text_held_at_end_is_flushed_with_finish_reason():
+    # A trailing "sk" could begin a key, so it is held back until the stream finishes
+    _, received = await stream_through(
+        LeakedApiKeyResponseDetectionPolicy(), [make_chunk("ask"), make_chunk(None, "stop")]
+    )
+
+    assert [chunk.choices[0].delta.content for chunk in received] == ["a", "sk"]
+
+
+@pytest.mark.asyncio
+async def test_blocked_stream_stops_reading_the_backend():
+    chunks = split_stream(f"Here: {OPENAI_KEY} and more text after it", 4)
+    read: List[ChatCompletionChunk] = []
+    closed = False
+
+    async def backend():
+        nonlocal closed
+        try:
+            for chunk in chunks:
+                read.append(chunk)
+                yield chunk
+        finally:
+            closed = True
+
+    transaction = make_transaction(Response(stream=backend()))
+    await LeakedApiKeyResponseDetectionPolicy().apply(transaction, MagicMock(), AsyncMock())
+    received = [chunk async for chunk in transaction.response.iter_chunks()]
+
+    assert received[-1].choices[0].finish_reason == "content_filter"
+    assert closed
+    assert len(read) < len(chunks)
+
+
+@pytest.mark.asyncio
+async def test_blocking_one_choice_keeps_the_others_streaming():
+    leaking = split_stream(f"Here: {OPENAI_KEY} and more", 4)
+    clean = [make_chunk(piece) for piece in ["Nothing ", "to ", "see ", "here ", "at ", "all"]] + [
+        make_chunk(None, "stop")
+    ]
+    chunks = []
+    for position in range(max(len(leaking), len(clean))):
+        if position < len(leaking):
+            chunks.append(leaking[position])
+        if position < len(clean):
+            choice = clean[position].choices[0]
+            choice.index = 1
+            chunks.append(clean[position])
+
+    _, received = await stream_through(LeakedApiKeyResponseDetectionPolicy(), chunks, n=2)
+
+    assert streamed_text(received, index=0) == "Here: "
+    assert streamed_text(received, index=1) == "Nothing to see here at all"
+    finish_reasons = {choice.index: choice.finish_reason for chunk in received for choice in chunk.choices}
+    assert finish_reasons == {0: "content_filter", 1: "stop"}
+
+
+@pytest.mark.asyncio
+async def test_streamed_text_held_at_end_is_flushed_without_finish_reason():
+    _, received = await stream_through(LeakedApiKeyResponseDetectionPolicy(), [make_chunk("ask")])
+
+    assert [chunk.choices[0].delta.content for chunk in received] == ["a", "sk"]
+    assert received[-1].choices[0].finish_reason is None
+
+
+@pytest.mark.asyncio
+async def test_key_completed_at_end_of_unfinished_stream_is_blocked():
+    _, received = await stream_through(
+        LeakedApiKeyResponseDetectionPolicy(), [make_chunk("Here: "), make_chunk(OPENAI_KEY)]
+    )
+
+    assert streamed_text(received) == "Here: "
+    assert received[-1].choices[0].finish_reason == "content_filter"
@@ -0,0 +1,215 @@
+"""Tests for LoadBalancedBackendPolicy."""
+
+from typing import Any, AsyncIterator, Callable, List, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import openai
+import pytest
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.exceptions import ApiKeyNotFoundError
+from luthien_control.control_policy.load_balanced_backend_policy import BackendEndpoint, LoadBalancedBackendPolicy
+from luthien_control.control_policy.send_backend_request import SendBackendRequestPolicy
+from luthien_control.core.response import close_stream
+from luthien_control.core.transaction import Transaction
+from openai.types.chat import ChatCompletionChunk
+
+URL_A = "https://a.example/v1"
+URL_B = "https://b.example/v1"
+
+
+def server_error(status_code: int = 500) -> openai.APIStatusError:
+    request = httpx.Request("POST", URL_A)
+    return openai.APIStatusError("error", response=httpx.Response(status_code, request=request), body=None)
+
+
+async def send(
+    policy: LoadBalancedBackendPolicy, container: MagicMock, make_transaction: Callable[..., Transaction], count: int
+) -> List[str]:
+    for _ in range(count):
+        await policy.apply(make_transaction(), container, AsyncMock())
+    return [call.api_endpoint for call in cast(Any, policy.policy).calls]
+
+
+@pytest.mark.asyncio
+async def test_weighted_round_robin_interleaves_by_weight(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    policy = LoadBalancedBackendPolicy(
+        endpoints=[BackendEndpoint(api_endpoint=URL_A, weight=2), BackendEndpoint(api_endpoint=URL_B)],
+        policy=mock_backend_policy(),
+    )
+
+    endpoints = await send(policy, mock_container, make_transaction, 6)
+
+    assert endpoints == [URL_A, URL_B, URL_A] * 2
+
+
+@pytest.mark.asyncio
+async def test_least_in_flight_avoids_busy_endpoints(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    mock_container.backend_health.get(URL_A).start()
+    policy = LoadBalancedBackendPolicy(
+        endpoints=[BackendEndpoint(api_endpoint=URL_A), BackendEndpoint(api_endpoint=URL_B)],
+        strategy="least_in_flight",
+        policy=mock_backend_policy(),
+    )
+
+    assert await send(policy, mock_container, make_transaction, 2) == [URL_B, URL_B]
+    assert mock_container.backend_health.get(URL_B).in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_ewma_latency_prefers_the_fastest_endpoint(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    mock_container.backend_health.get(URL_A).record_success(2.0)
+    mock_container.backend_health.get(URL_B).record_success(0.5)
+    policy = LoadBalancedBackendPolicy(
+        endpoints=[BackendEndpoint(api_endpoint=URL_A), BackendEndpoint(api_endpoint=URL_B)],
+        strategy="ewma_latency",
+        policy=mock_backend_policy(),
+    )
+
+    assert await send(policy, mock_container, make_transaction, 1) == [URL_B]
+
+
+@pytest.mark.asyncio
+async def test_endpoint_api_key_is_read_from_its_env_var(
+    mock_container: MagicMock, monkeypatch, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    monkeypatch.setenv("BACKEND_A_KEY", "key-a")
+    monkeypatch.delenv("BACKEND_B_KEY", raising=False)
+    backend = mock_backend_policy()
+    policy = LoadBalancedBackendPolicy(
+        endpoints=[
+            BackendEndpoint(api_endpoint=URL_A, api_key_env_var="BACKEND_A_KEY"),
+            BackendEndpoint(api_endpoint=URL_B, api_key_env_var="BACKEND_B_KEY"),
+        ],
+        policy=backend,
+    )
+
+    await policy.apply(make_transaction(), mock_container, AsyncMock())
+    assert backend.calls[0].api_key == "key-a"
+    with pytest.raises(ApiKeyNotFoundError, match="BACKEND_B_KEY"):
+        await policy.apply(make_transaction(), mock_container, AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_failing_endpoint_is_ejected(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    async def fail_on_a(transaction: Transaction) -> None:
+        if transaction.request.api_endpoint == URL_A:
+            raise server_error(503)
+
+    policy = LoadBalancedBackendPolicy(
+        endpoints=[BackendEndpoint(api_endpoint=URL_A), BackendEndpoint(api_endpoint=URL_B)],
+        policy=mock_backend_policy(fail_on_a),
+        max_failures=2,
+    )
+
+    for _ in range(4):
+        try:
+            await policy.apply(make_transaction(), mock_container, AsyncMock())
+        except openai.APIStatusError:
+            pass
+
+    health = mock_container.backend_health.get(URL_A)
+    assert not health.is_healthy()
+    assert health.in_flight == 0
+    assert await send(policy, mock_container, make_transaction, 2) == [URL_A, URL_B, URL_A, URL_B, URL_B, URL_B]
+
+
+@pytest.mark.asyncio
+async def test_ejected_endpoints_are_used_until_one_recovers(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    async def fail_on_a(transaction: Transaction) -> None:
+        if transaction.request.api_endpoint == URL_A:
+            raise server_error(503)
+
+    for url in (URL_A, URL_B):
+        mock_container.backend_health.get(url).record_failure(max_failures=1, ejection_seconds=60)
+    policy = LoadBalancedBackendPolicy(
+        endpoints=[BackendEndpoint(api_endpoint=URL_A), BackendEndpoint(api_endpoint=URL_B)],
+        policy=mock_backend_policy(fail_on_a),
+        max_failures=1,
+    )
+
+    with pytest.raises(openai.APIStatusError):
+        await policy.apply(make_transaction(), mock_container, AsyncMock())
+    # B is tried next and succeeds: it takes the requests while A stays ejected
+    assert await send(policy, mock_container, make_transaction, 3) == [URL_A, URL_B, URL_B, URL_B]
+    assert not mock_container.backend_health.get(URL_A).is_healthy()
+
+
+@pytest.mark.asyncio
+async def test_streamed_request_stays_in_flight_until_the_stream_ends(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    chunk = ChatCompletionChunk.model_validate(
+        {"id": "chunk", "object": "chat.completion.chunk", "created": 1, "model": "gpt-4o", "choices": []}
+    )
+
+    async def chunks() -> AsyncIterator[ChatCompletionChunk]:
+        yield chunk
+
+    async def stream(transaction: Transaction) -> None:
+        transaction.response.stream = chunks()
+
+    policy = LoadBalancedBackendPolicy(
+        endpoints=[BackendEndpoint(api_endpoint=URL_A)], policy=mock_backend_policy(stream)
+    )
+
+    transaction = await policy.apply(make_transaction(), mock_container, AsyncMock())
+    health = mock_container.backend_health.get(URL_A)
+    assert health.in_flight == 1
+
+    assert transaction.response.stream is not None
+    assert [received async for received in transaction.response.stream] == [chunk]
+    assert health.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_closed_before_it_is_read_is_no_longer_in_flight(
+    mock_container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    async def chunks() -> AsyncIterator[ChatCompletionChunk]:
+        yield ChatCompletionChunk.model_validate(
+            {"id": "chunk", "object": "chat.completion.chunk", "created": 1, "model": "gpt-4o", "choices": []}
+        )
+
+    async def stream(transaction: Transaction) -> None:
+        transaction.response.stream = chunks()
+
+    policy = LoadBalancedBackendPolicy(
+        endpoints=[BackendEndpoint(api_endpoint=URL_A)], policy=mock_backend_policy(stream)
+    )
+
+    transaction = await policy.apply(make_transaction(), mock_container, AsyncMock())
+    assert transaction.response.stream is not None
+    await close_stream(transaction.response.stream)
+
+    assert mock_container.backend_health.get(URL_A).in_flight == 0
+
+
+def test_serialization_round_trip():
+    policy = LoadBalancedBackendPolicy(
+        name="pool",
+        endpoints=[
+            BackendEndpoint(api_endpoint=URL_A, api_key_env_var="BACKEND_A_KEY", weight=3),
+            BackendEndpoint(api_endpoint=URL_B),
+        ],
+        strategy="least_in_flight",
+    )
+
+    serialized = policy.serialize()
+    restored = ControlPolicy.from_serialized(serialized)
+
+    assert isinstance(restored, LoadBalancedBackendPolicy)
+    assert cast(dict, serialized["policy"])["type"] == "SendBackendRequest"
+    assert isinstance(restored.policy, SendBackendRequestPolicy)
+    assert restored.endpoints == policy.endpoints
+    assert restored.strategy == "least_in_flight"
@@ -0,0 +1,290 @@
+import asyncio
+from typing import Any, Awaitable, Callable, ClassVar, List, Optional
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from luthien_control.api.openai_chat_completions.datatypes import Message
+from luthien_control.api.openai_chat_completions.request import OpenAIChatCompletionsRequest
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.exceptions import ClientAuthenticationError, PolicyLoadError, PolicyTimeoutError
+from luthien_control.control_policy.noop_policy import NoopPolicy
+from luthien_control.control_policy.parallel_policy import ParallelPolicy
+from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.request import Request
+from luthien_control.core.response import Response
+from luthien_control.core.transaction import Transaction
+from psygnal.containers import EventedDict, EventedList
+from pydantic import ConfigDict, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+Action = Callable[[Transaction], Awaitable[None]]
+
+
+class MockActionPolicy(ControlPolicy):
+    """A policy that runs an arbitrary async action on the transaction."""
+
+    modifies_payloads: ClassVar[bool] = True
+    uses_db_session: ClassVar[bool] = True
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, extra="allow")
+
+    def __init__(self, name: str, action: Optional[Action] = None):
+        super().__init__(name=name)
+        self.action = action
+        self.sessions: List[Any] = []
+
+    @classmethod
+    def get_policy_type_name(cls) -> str:
+        """Override to avoid registry lookup for test class."""
+        return "MockActionPolicy"
+
+    async def apply(
+        self, transaction: Transaction, container: DependencyContainer, session: AsyncSession
+    ) -> Transaction:
+        self.sessions.append(session)
+        if self.action is not None:
+            await self.action(transaction)
+        return transaction
+
+
+class ReadOnlyActionPolicy(MockActionPolicy):
+    """An action policy that neither changes payloads in place nor queries its session."""
+
+    modifies_payloads: ClassVar[bool] = False
+    uses_db_session: ClassVar[bool] = False
+
+    def __init__(self, name: str, action: Optional[Action] = None):
+        super().__init__(name, action)
+
+
+@pytest.fixture
+def transaction() -> Transaction:
+    return Transaction(
+        request=Request(
+            payload=OpenAIChatCompletionsRequest(
+                model="gpt-4o", messages=EventedList([Message(role="user", content="Hello")])
+            ),
+            api_endpoint="https://api.openai.com/v1",
+            api_key="test-key",
+        ),
+        response=Response(),
+        data=EventedDict({"existing": "value", "to_remove": 1}),
+    )
+
+
+@pytest.fixture
+def container() -> MagicMock:
+    return MagicMock()
+
+
+@pytest.mark.asyncio
+async def test_members_run_concurrently(transaction: Transaction, container: MagicMock):
+    """Members overlap, so the total time is that of the slowest member."""
+    running = 0
+    max_running = 0
+
+    async def slow(tx: Transaction) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    policy = ParallelPolicy(policies=[MockActionPolicy(f"member{i}", slow) for i in range(3)])
+    await policy.apply(transaction, container, AsyncMock())
+    assert max_running == 3
+
+
+@pytest.mark.asyncio
+async def test_members_see_isolated_views(transaction: Transaction, container: MagicMock):
+    """Members do not observe the transaction or each other's changes while running."""
+    seen = {}
+
+    async def change_model(tx: Transaction) -> None:
+        tx.request.payload.model = "changed"
+        tx.data["flag"] = "first"
+        await asyncio.sleep(0.01)
+
+    async def observe(tx: Transaction) -> None:
+        await asyncio.sleep(0.005)
+        seen["model"] = tx.request.payload.model
+        seen["flag"] = tx.data.get("flag")
+
+    policy = ParallelPolicy(
+        policies=[MockActionPolicy("changer", change_model), ReadOnlyActionPolicy("observer", observe)]
+    )
+    result = await policy.apply(transaction, container, AsyncMock())
+
+    assert seen == {"model": "gpt-4o", "flag": None}
+    assert result is transaction
+    assert transaction.request.payload.model == "changed"
+    assert transaction.data["flag"] == "first"
+
+
+@pytest.mark.asyncio
+async def test_merge_is_deterministic(transaction: Transaction, container: MagicMock):
+    """Conflicting changes resolve in member order, whatever order the members finish in."""
+
+    def setter(model: str, value: str, delay: float) -> Action:
+        async def action(tx: Transaction) -> None:
+            await asyncio.sleep(delay)
+            tx.request.payload.model = model
+            tx.data["winner"] = value
+            tx.data[f"set_by_{value}"] = True
+
+        return action
+
+    async def remove(tx: Transaction) -> None:
+        del tx.data["to_remove"]
+
+    policy = ParallelPolicy(
+        policies=[
+            MockActionPolicy("first", setter("model-a", "first", 0.0)),
+            MockActionPolicy("second", setter("model-b", "second", 0.03)),
+            MockActionPolicy("third", setter("model-c", "third", 0.01)),
+            MockActionPolicy("remover", remove),
+        ]
+    )
+    await policy.apply(transaction, container, AsyncMock())
+
+    assert transaction.request.payload.model == "model-c"
+    assert dict(transaction.data) == {
+        "existing": "value",
+        "winner": "third",
+        "set_by_first": True,
+        "set_by_second": True,
+        "set_by_third": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_unchanged_parts_are_kept(transaction: Transaction, container: MagicMock):
+    """A member that only reads leaves the transaction's objects in place."""
+    request = transaction.request
+    response = transaction.response
+    policy = ParallelPolicy(policies=[NoopPolicy(), NoopPolicy()])
+
+    await policy.apply(transaction, container, AsyncMock())
+
+    assert transaction.request is request
+    assert transaction.response is response
+
+
+@pytest.mark.asyncio
+async def test_read_only_members_share_the_payloads(transaction: Transaction, container: MagicMock):
+    """Members that do not change payloads in place see the transaction's own payloads."""
+    payload = transaction.request.payload
+    seen = []
+
+    async def observe(tx: Transaction) -> None:
+        seen.append(tx.request.payload)
+
+    async def replace_key(tx: Transaction) -> None:
+        tx.request.api_key = "replaced-key"
+
+    policy = ParallelPolicy(
+        policies=[
+            ReadOnlyActionPolicy("first", observe),
+            ReadOnlyActionPolicy("second", observe),
+            ReadOnlyActionPolicy("key", replace_key),
+            MockActionPolicy("changer", observe),
+        ]
+    )
+    await policy.apply(transaction, container, AsyncMock())
+
+    assert seen[0] is payload and seen[1] is payload
+    assert seen[2] is not payload and seen[2] == payload
+    assert transaction.request.api_key == "replaced-key"
+    assert transaction.request.payload is payload
+
+
+@pytest.mark.asyncio
+async def test_first_failure_cancels_the_rest(transaction: Transaction, container: MagicMock):
+    """A failing member cancels the others and its error propagates unchanged."""
+    finished = []
+
+    async def fail(tx: Transaction) -> None:
+        await asyncio.sleep(0.01)
+        raise ClientAuthenticationError(detail="Invalid API key")
+
+    async def slow(tx: Transaction) -> None:
+        tx.data["slow"] = True
+        await asyncio.sleep(1)
+        finished.append("slow")
+
+    policy = ParallelPolicy(policies=[MockActionPolicy("auth", fail), MockActionPolicy("slow", slow)])
+    with pytest.raises(ClientAuthenticationError, match="Invalid API key"):
+        await policy.apply(transaction, container, AsyncMock())
+
+    assert finished == []
+    assert "slow" not in transaction.data
+
+
+@pytest.mark.asyncio
+async def test_member_timeout(transaction: Transaction, container: MagicMock):
+    """A member exceeding the timeout fails with a PolicyTimeoutError naming it."""
+
+    async def hang(tx: Transaction) -> None:
+        await asyncio.sleep(1)
+
+    policy = ParallelPolicy(
+        policies=[MockActionPolicy("fast"), MockActionPolicy("moderation", hang)], timeout_seconds=0.02
+    )
+    with pytest.raises(PolicyTimeoutError) as exc_info:
+        await policy.apply(transaction, container, AsyncMock())
+
+    assert exc_info.value.policy_name == "moderation"
+    assert exc_info.value.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_members_get_separate_sessions(transaction: Transaction, container: MagicMock):
+    """The first member querying the database uses the request's session; the others get their own."""
+    session = AsyncMock()
+    members = [ReadOnlyActionPolicy("reader"), *(MockActionPolicy(f"member{i}") for i in range(3))]
+
+    await ParallelPolicy(policies=members).apply(transaction, container, session)
+
+    assert members[0].sessions == [session]
+    assert members[1].sessions == [session]
+    other_sessions = [members[2].sessions[0], members[3].sessions[0]]
+    assert session not in other_sessions
+    assert container.db_session_factory.call_count == 2
+
+
+def test_serialization_round_trip():
+    """A ParallelPolicy is rebuilt from its serialized form."""
+    policy = ParallelPolicy(name="checks", policies=[NoopPolicy(name="a"), NoopPolicy(name="b")], timeout_seconds=2.5)
+
+    restored = ParallelPolicy.from_serialized(policy.serialize())
+
+    assert restored.name == "checks"
+    assert restored.timeout_seconds == 2.5
+    assert [member.name for member in restored.policies] == ["a", "b"]
+
+
+def test_from_serialized_nested_member_config():
+    """Members can be given in the {"type", "config"} form used by SerialPolicy configs."""
+    policy = ParallelPolicy.from_serialized(
+        {"policies": [{"type": "NoopPolicy", "config": {"name": "nested"}}, {"type": "NoopPolicy", "name": "flat"}]}
+    )
+    assert [member.name for member in policy.policies] == ["nested", "flat"]
+
+
+@pytest.mark.parametrize(
+    "config, message",
+    [
+        ({"name": "p"}, "missing 'policies'"),
+        ({"policies": "NoopPolicy"}, "must be a list"),
+        ({"policies": ["NoopPolicy"]}, "not a dictionary"),
+        ({"policies": [{"type": "Unknown"}]}, "Failed to load member policy at index 0"),
+    ],
+)
+def test_from_serialized_invalid(config, message):
+    with pytest.raises(PolicyLoadError, match=message):
+        ParallelPolicy.from_serialized(config)
+
+
+def test_from_serialized_validates_its_own_fields():
+    with pytest.raises(ValidationError, match="timeout_seconds"):
+        ParallelPolicy.from_serialized({"policies": [], "timeout_seconds": "soon"})
@@ -4,13 +4,21 @@ from typing import Dict, Type
 # Import the classes directly for comparison
 from luthien_control.control_policy.add_api_key_header import AddApiKeyHeaderPolicy
 from luthien_control.control_policy.add_api_key_header_from_env import AddApiKeyHeaderFromEnvPolicy
+from luthien_control.control_policy.backend_rate_limit_policy import BackendRateLimitPolicy
 from luthien_control.control_policy.branching_policy import BranchingPolicy
+from luthien_control.control_policy.circuit_breaker_policy import CircuitBreakerPolicy
 from luthien_control.control_policy.client_api_key_auth import ClientApiKeyAuthPolicy
+from luthien_control.control_policy.client_quota_policy import ClientQuotaPolicy
 from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.embeddings_batching_policy import EmbeddingsBatchingPolicy
 from luthien_control.control_policy.leaked_api_key_detection import LeakedApiKeyDetectionPolicy
+from luthien_control.control_policy.leaked_api_key_response_detection import LeakedApiKeyResponseDetectionPolicy
+from luthien_control.control_policy.load_balanced_backend_policy import LoadBalancedBackendPolicy
 from luthien_control.control_policy.model_name_replacement import ModelNameReplacementPolicy
 from luthien_control.control_policy.noop_policy import NoopPolicy
+from luthien_control.control_policy.parallel_policy import ParallelPolicy
 from luthien_control.control_policy.registry import POLICY_NAME_TO_CLASS
+from luthien_control.control_policy.response_cache_policy import ResponseCachePolicy
 from luthien_control.control_policy.send_backend_request import SendBackendRequestPolicy
 from luthien_control.control_policy.serial_policy import SerialPolicy
 
@@ -18,13 +26,21 @@ from luthien_control.control_policy.serial_policy import SerialPolicy
 EXPECTED_POLICY_MAPPINGS: Dict[str, Type[ControlPolicy]] = {
     "AddApiKeyHeader": AddApiKeyHeaderPolicy,
     "AddApiKeyHeaderFromEnv": AddApiKeyHeaderFromEnvPolicy,
+    "BackendRateLimit": BackendRateLimitPolicy,
     "BranchingPolicy": BranchingPolicy,
+    "CircuitBreaker": CircuitBreakerPolicy,
     "ClientApiKeyAuth": ClientApiKeyAuthPolicy,
+    "ClientQuota": ClientQuotaPolicy,
     "CompoundPolicy": SerialPolicy,  # legacy compatibility
+    "EmbeddingsBatching": EmbeddingsBatchingPolicy,
     "LeakedApiKeyDetection": LeakedApiKeyDetectionPolicy,
+    "LeakedApiKeyResponseDetection": LeakedApiKeyResponseDetectionPolicy,
+    "LoadBalancedBackend": LoadBalancedBackendPolicy,
     "SerialPolicy": SerialPolicy,
+    "ParallelPolicy": ParallelPolicy,
     "SendBackendRequest": SendBackendRequestPolicy,
     "ModelNameReplacement": ModelNameReplacementPolicy,
+    "ResponseCache": ResponseCachePolicy,
     "NoopPolicy": NoopPolicy,
 }
 
@@ -0,0 +1,226 @@
+"""Tests for ResponseCachePolicy."""
+
+from typing import Any, Callable, Optional
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from luthien_control.control_policy.noop_policy import NoopPolicy
+from luthien_control.control_policy.response_cache_policy import ResponseCachePolicy
+from luthien_control.core.response_cache import InMemoryResponseCache
+from luthien_control.core.transaction import Transaction
+from psygnal.containers import EventedDict
+
+ENDPOINT = "https://api.openai.com/v1"
+
+
+@pytest.fixture
+def make_transaction(make_transaction: Callable[..., Transaction]) -> Callable[..., Transaction]:
+    """Overrides the shared factory: requests are deterministic (temperature 0) unless given another temperature."""
+
+    def factory(temperature: Optional[float] = 0, metadata: Optional[dict] = None, **kwargs: Any) -> Transaction:
+        if metadata is not None:
+            kwargs["metadata"] = EventedDict(metadata)
+        return make_transaction(temperature=temperature, **kwargs)
+
+    return factory
+
+
+@pytest.fixture
+def cache() -> InMemoryResponseCache:
+    return InMemoryResponseCache()
+
+
+@pytest.fixture
+def container(cache: InMemoryResponseCache) -> MagicMock:
+    container = MagicMock()
+    container.response_caches = {"memory": cache}
+    return container
+
+
+async def apply(policy: ResponseCachePolicy, transaction: Transaction, container: MagicMock) -> Transaction:
+    return await policy.apply(transaction, container, AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_repeated_request_is_served_from_cache(
+    container: MagicMock,
+    cache: InMemoryResponseCache,
+    make_transaction: Callable[..., Transaction],
+    mock_backend_policy: Any,
+):
+    backend = mock_backend_policy()
+    policy = ResponseCachePolicy(policy=backend)
+
+    first = await apply(policy, make_transaction(), container)
+    second = await apply(policy, make_transaction(user="someone-else"), container)
+
+    assert len(backend.calls) == 1
+    assert first.data[ResponseCachePolicy.RESULT_KEY] == "miss"
+    assert second.data[ResponseCachePolicy.RESULT_KEY] == "hit"
+    assert second.response.payload is not None
+    assert second.response.payload.choices[0].message.content == "Hi there"
+    assert second.response.raw_body == first.response.raw_body
+    assert second.response.api_endpoint == ENDPOINT
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_different_requests_are_cached_separately(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    backend = mock_backend_policy()
+    policy = ResponseCachePolicy(policy=backend)
+
+    await apply(policy, make_transaction(), container)
+    await apply(policy, make_transaction(seed=42), container)
+
+    assert len(backend.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_responses_are_not_shared_across_api_keys(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    backend = mock_backend_policy()
+    policy = ResponseCachePolicy(policy=backend)
+
+    await apply(policy, make_transaction(api_key="tenant-a"), container)
+    other = await apply(policy, make_transaction(api_key="tenant-b"), container)
+
+    assert len(backend.calls) == 2
+    assert other.data[ResponseCachePolicy.RESULT_KEY] == "miss"
+
+
+@pytest.mark.asyncio
+async def test_non_deterministic_requests_bypass_the_cache(
+    container: MagicMock,
+    cache: InMemoryResponseCache,
+    make_transaction: Callable[..., Transaction],
+    mock_backend_policy: Any,
+):
+    backend = mock_backend_policy()
+    policy = ResponseCachePolicy(policy=backend)
+
+    for _ in range(2):
+        transaction = await apply(policy, make_transaction(temperature=0.7), container)
+        assert transaction.data[ResponseCachePolicy.RESULT_KEY] == "bypass"
+
+    assert len(backend.calls) == 2
+    assert len(cache) == 0
+
+    await apply(
+        ResponseCachePolicy(policy=backend, deterministic_only=False), make_transaction(temperature=0.7), container
+    )
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_seeded_requests_are_cached(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    backend = mock_backend_policy()
+    policy = ResponseCachePolicy(policy=backend)
+
+    await apply(policy, make_transaction(temperature=0.7, seed=1), container)
+    await apply(policy, make_transaction(temperature=0.7, seed=1), container)
+
+    assert len(backend.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_streamed_requests_bypass_the_cache(
+    container: MagicMock, cache: InMemoryResponseCache, make_transaction: Callable[..., Transaction]
+):
+    policy = ResponseCachePolicy(policy=NoopPolicy())
+
+    transaction = await apply(policy, make_transaction(stream=True), container)
+
+    assert transaction.data[ResponseCachePolicy.RESULT_KEY] == "bypass"
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "bytes": 0}
+
+
+@pytest.mark.asyncio
+async def test_no_store_opts_out(
+    container: MagicMock,
+    cache: InMemoryResponseCache,
+    make_transaction: Callable[..., Transaction],
+    mock_backend_policy: Any,
+):
+    backend = mock_backend_policy()
+    policy = ResponseCachePolicy(policy=backend)
+    await apply(policy, make_transaction(), container)
+
+    transaction = await apply(policy, make_transaction(metadata={"cache_control": "no-store"}), container)
+
+    assert transaction.data[ResponseCachePolicy.RESULT_KEY] == "bypass"
+    assert len(backend.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_no_cache_refreshes_the_entry(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    backend = mock_backend_policy(content="old")
+    policy = ResponseCachePolicy(policy=backend)
+    await apply(policy, make_transaction(), container)
+
+    backend.content = "new"
+    refreshed = await apply(policy, make_transaction(metadata={"cache_control": "no-cache"}), container)
+    cached = await apply(policy, make_transaction(), container)
+
+    assert refreshed.data[ResponseCachePolicy.RESULT_KEY] == "miss"
+    assert len(backend.calls) == 2
+    assert cached.response.payload is not None
+    assert cached.response.payload.choices[0].message.content == "new"
+
+
+@pytest.mark.asyncio
+async def test_modified_response_is_cached_as_returned(
+    container: MagicMock, make_transaction: Callable[..., Transaction], mock_backend_policy: Any
+):
+    """A wrapped policy that changes the backend response has its changed response cached."""
+
+    class RewritingBackend(mock_backend_policy):
+        async def apply(self, transaction, container, session):
+            transaction = await super().apply(transaction, container, session)
+            transaction.response.payload = transaction.response.payload.model_copy(update={"model": "rewritten"})
+            return transaction
+
+    policy = ResponseCachePolicy(policy=RewritingBackend())
+    await apply(policy, make_transaction(), container)
+    cached = await apply(policy, make_transaction(), container)
+
+    assert cached.response.payload is not None
+    assert cached.response.payload.model == "rewritten"
+
+
+@pytest.mark.asyncio
+async def test_unknown_store(container: MagicMock, make_transaction: Callable[..., Transaction]):
+    policy = ResponseCachePolicy(policy=NoopPolicy(), store="redis")
+
+    with pytest.raises(ValueError, match="Unknown response cache store 'redis'"):
+        await apply(policy, make_transaction(), container)
+
+
+def test_serialization_round_trip():
+    policy = ResponseCachePolicy(
+        name="cache", policy=NoopPolicy(name="inner"), store="database", ttl_seconds=60, deterministic_only=False
+    )
+
+    serialized = policy.serialize()
+    restored = ResponseCachePolicy.from_serialized(serialized)
+
+    assert serialized["policy"] == {"name": "inner", "type": "NoopPolicy"}
+    assert isinstance(restored.policy, NoopPolicy)
+    assert restored.policy.name == "inner"
+    assert (restored.name, restored.store, restored.ttl_seconds, restored.deterministic_only) == (
+        "cache",
+        "database",
+        60,
+        False,
+    )
+
+
+def test_invalid_wrapped_policy():
+    with pytest.raises(ValueError, match="Unknown policy type 'Unknown'"):
+        ResponseCachePolicy.from_serialized({"policy": {"type": "Unknown"}})
@@ -1,5 +1,7 @@
 """Tests for SendBackendRequestPolicy."""
 
+import asyncio
+import json
 import logging
 from typing import cast
 from unittest.mock import AsyncMock, MagicMock
@@ -15,6 +17,7 @@ from luthien_control.control_policy.serialization import SerializableDict
 from luthien_control.core.dependency_container import DependencyContainer
 from luthien_control.core.request import Request
 from luthien_control.core.response import Response
+from luthien_control.core.single_flight import SingleFlight
 from luthien_control.core.transaction import Transaction
 from psygnal.containers import EventedDict, EventedList
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -113,8 +116,8 @@ def mock_openai_client() -> AsyncMock:
     """Provides a mock OpenAI client with default successful response."""
     client = AsyncMock()
     mock_response = MagicMock()
-    mock_response.model_dump.return_value = create_mock_openai_response()
-    client.chat.completions.create.return_value = mock_response
+    mock_response.content = json.dumps(create_mock_openai_response()).encode()
+    client.chat.completions.with_raw_response.create.return_value = mock_response
     return client
 
 
@@ -199,8 +202,8 @@ async def test_send_backend_request_policy_successful_request(
     )
 
     # Verify chat completion was called
-    mock_openai_client.chat.completions.create.assert_called_once()
-    call_kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+    mock_openai_client.chat.completions.with_raw_response.create.assert_called_once()
+    call_kwargs = mock_openai_client.chat.completions.with_raw_response.create.call_args.kwargs
 
     # Check that the request payload was properly converted and filtered
     assert call_kwargs["model"] == "gpt-4"
@@ -217,6 +220,35 @@ async def test_send_backend_request_policy_successful_request(
     assert len(sample_transaction.response.payload.choices) == 1
     assert sample_transaction.response.payload.choices[0].message.content == "Hello! How can I help you today?"
     assert sample_transaction.response.payload.usage.total_tokens == 25
+    # The backend bytes are kept for passthrough until the payload is modified
+    assert (
+        sample_transaction.response.raw_body
+        == mock_openai_client.chat.completions.with_raw_response.create.return_value.content
+    )
+    sample_transaction.response.payload.choices[0].message.content = "Modified"
+    assert sample_transaction.response.raw_body is None
+
+
+@pytest.mark.asyncio
+async def test_send_backend_request_policy_streaming_request(
+    sample_transaction: Transaction,
+    test_container: MagicMock,
+    mock_openai_client: AsyncMock,
+):
+    """Streamed requests should store the backend chunk stream instead of a response payload."""
+    sample_transaction.request.payload.stream = True
+    sample_transaction.response.payload = None
+    backend_stream = MagicMock()
+    mock_openai_client.chat.completions.create.return_value = backend_stream
+
+    policy = SendBackendRequestPolicy()
+    result = await policy.apply(sample_transaction, test_container, AsyncMock(spec=AsyncSession))
+
+    call_kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+    assert call_kwargs["stream"] is True
+    assert result.response.stream is backend_stream
+    assert result.response.payload is None
+    assert result.response.api_endpoint == "https://api.openai.com/v1/chat/completions"
 
 
 @pytest.mark.asyncio
@@ -254,7 +286,7 @@ async def test_send_backend_request_policy_api_timeout_error(
     # Configure client to raise timeout error
     mock_request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
     timeout_error = openai.APITimeoutError(request=mock_request)
-    mock_openai_client.chat.completions.create.side_effect = timeout_error
+    mock_openai_client.chat.completions.with_raw_response.create.side_effect = timeout_error
 
     with caplog.at_level(logging.ERROR):
         with pytest.raises(openai.APITimeoutError):
@@ -277,7 +309,7 @@ async def test_send_backend_request_policy_api_connection_error(
     # Configure client to raise connection error
     mock_request = httpx.Request("POST", "https://api.test-backend.com/v1/chat/completions")
     connection_error = openai.APIConnectionError(message="Connection failed", request=mock_request)
-    mock_openai_client.chat.completions.create.side_effect = connection_error
+    mock_openai_client.chat.completions.with_raw_response.create.side_effect = connection_error
 
     with caplog.at_level(logging.ERROR):
         with pytest.raises(openai.APIConnectionError, match="Connection failed"):
@@ -300,7 +332,7 @@ async def test_send_backend_request_policy_api_error(
     # Configure client to raise API error
     mock_request = httpx.Request("POST", "https://api.test-backend.com/v1/chat/completions")
     api_error = openai.APIError("Invalid request", request=mock_request, body=None)
-    mock_openai_client.chat.completions.create.side_effect = api_error
+    mock_openai_client.chat.completions.with_raw_response.create.side_effect = api_error
 
     with caplog.at_level(logging.ERROR):
         with pytest.raises(openai.APIError, match="Invalid request"):
@@ -322,7 +354,7 @@ async def test_send_backend_request_policy_unexpected_error(
 
     # Configure client to raise unexpected error
     unexpected_error = RuntimeError("Something went wrong")
-    mock_openai_client.chat.completions.create.side_effect = unexpected_error
+    mock_openai_client.chat.completions.with_raw_response.create.side_effect = unexpected_error
 
     with caplog.at_level(logging.ERROR):
         with pytest.raises(RuntimeError, match="Something went wrong"):
@@ -347,7 +379,7 @@ async def test_send_backend_request_policy_filters_none_values(
 
     await policy.apply(sample_transaction, test_container, db_session)
 
-    call_kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+    call_kwargs = mock_openai_client.chat.completions.with_raw_response.create.call_args.kwargs
 
     # None values should be filtered out
     assert "stream" not in call_kwargs
@@ -377,7 +409,7 @@ async def test_send_backend_request_policy_different_model(
     policy = SendBackendRequestPolicy()
     await policy.apply(transaction, test_container, db_session)
 
-    call_kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+    call_kwargs = mock_openai_client.chat.completions.with_raw_response.create.call_args.kwargs
     assert call_kwargs["model"] == "gpt-3.5-turbo"
     assert len(call_kwargs["messages"]) == 1
 
@@ -474,8 +506,8 @@ async def test_send_backend_request_policy_container_client_creation(
     # Create a test client
     test_client = AsyncMock()
     test_response = MagicMock()
-    test_response.model_dump.return_value = create_mock_openai_response(id="test-response", content="Test")
-    test_client.chat.completions.create.return_value = test_response
+    test_response.content = json.dumps(create_mock_openai_response(id="test-response", content="Test")).encode()
+    test_client.chat.completions.with_raw_response.create.return_value = test_response
 
     container.create_openai_client.return_value = test_client
 
@@ -485,4 +517,104 @@ async def test_send_backend_request_policy_container_client_creation(
     container.create_openai_client.assert_called_once_with("https://api.openai.com/v1/chat/completions", "test_key")
 
     # Verify that the returned client was used
-    test_client.chat.completions.create.assert_called_once()
+    test_client.chat.completions.with_raw_response.create.assert_called_once()
+
+
+# --- Coalescing of identical requests ---
+
+
+def deterministic_transaction(api_key: str = "test_key", content: str = "Hello, world!") -> Transaction:
+    request = create_chat_request(temperature=0, api_key=api_key, messages=[Message(role="user", content=content)])
+    return Transaction(request=request, response=Response(), data=EventedDict())
+
+
+@pytest.fixture
+def slow_openai_client() -> AsyncMock:
+    """A client whose backend takes a moment to answer, so that requests overlap."""
+    client = AsyncMock()
+
+    async def create(**kwargs):
+        await asyncio.sleep(0.02)
+        response = MagicMock()
+        response.content = json.dumps(create_mock_openai_response()).encode()
+        return response
+
+    client.chat.completions.with_raw_response.create.side_effect = create
+    return client
+
+
+@pytest.fixture
+def coalescing_container(slow_openai_client: AsyncMock) -> MagicMock:
+    container = MagicMock(spec=DependencyContainer)
+    container.create_openai_client.return_value = slow_openai_client
+    container.backend_requests_in_flight = SingleFlight()
+    return container
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_requests_share_one_backend_call(
+    coalescing_container: MagicMock, slow_openai_client: AsyncMock
+):
+    policy = SendBackendRequestPolicy()
+    transactions = [deterministic_transaction() for _ in range(5)]
+
+    await asyncio.gather(*(policy.apply(tx, coalescing_container, AsyncMock()) for tx in transactions))
+
+    assert slow_openai_client.chat.completions.with_raw_response.create.call_count == 1
+    payloads = [tx.response.payload for tx in transactions]
+    assert all(payload is not None and payload.id == "chatcmpl-backend-123" for payload in payloads)
+    # Each transaction gets its own copy of the response
+    assert len({id(payload) for payload in payloads}) == 5
+    payloads[0].choices[0].message.content = "Modified"  # type: ignore[union-attr]
+    assert payloads[1].choices[0].message.content == "Hello! How can I help you today?"  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "other",
+    [
+        lambda: deterministic_transaction(content="Something else"),
+        lambda: deterministic_transaction(api_key="other_key"),
+        lambda: Transaction(request=create_chat_request(temperature=0.7), response=Response(), data=EventedDict()),
+    ],
+    ids=["different-request", "different-api-key", "non-deterministic"],
+)
+async def test_requests_that_are_not_coalesced(coalescing_container: MagicMock, slow_openai_client: AsyncMock, other):
+    policy = SendBackendRequestPolicy()
+
+    await asyncio.gather(
+        policy.apply(deterministic_transaction(), coalescing_container, AsyncMock()),
+        policy.apply(other(), coalescing_container, AsyncMock()),
+    )
+
+    assert slow_openai_client.chat.completions.with_raw_response.create.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_coalescing_can_be_disabled(coalescing_container: MagicMock, slow_openai_client: AsyncMock):
+    policy = SendBackendRequestPolicy(coalesce=False)
+
+    await asyncio.gather(
+        *(policy.apply(deterministic_transaction(), coalescing_container, AsyncMock()) for _ in range(3))
+    )
+
+    assert slow_openai_client.chat.completions.with_raw_response.create.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers(
+    coalescing_container: MagicMock, slow_openai_client: AsyncMock
+):
+    policy = SendBackendRequestPolicy()
+    leader = asyncio.create_task(policy.apply(deterministic_transaction(), coalescing_container, AsyncMock()))
+    await asyncio.sleep(0)
+    follower_transaction = deterministic_transaction()
+    follower = asyncio.create_task(policy.apply(follower_transaction, coalescing_container, AsyncMock()))
+    await asyncio.sleep(0.005)
+
+    leader.cancel()
+    await follower
+
+    assert leader.cancelled()
+    assert follower_transaction.response.payload is not None
+    assert slow_openai_client.chat.completions.with_raw_response.create.call_count == 1
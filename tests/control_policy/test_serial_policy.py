@@ -15,6 +15,7 @@ from luthien_control.core.dependency_container import DependencyContainer
 from luthien_control.core.request import Request
 from luthien_control.core.response import Response
 from luthien_control.core.transaction import Transaction
+from luthien_control.metrics.definitions import POLICY_APPLY_DURATION
 from psygnal.containers import EventedDict, EventedList
 from pydantic import ConfigDict
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -158,6 +159,22 @@ async def test_serial_policy_applies_policies_sequentially(
     assert result_transaction is sample_transaction  # Verify same transaction object is returned
 
 
+@pytest.mark.asyncio
+async def test_serial_policy_times_member_policies(
+    sample_transaction,
+    mock_db_session: AsyncSession,
+    mock_container: DependencyContainer,
+):
+    """Each member's apply is recorded in the per-policy latency histogram."""
+    labels = {"policy_name": "TimedMember", "policy_type": "MockSimplePolicy"}
+    before = POLICY_APPLY_DURATION.get_count(**labels)
+    serial = SerialPolicy(policies=[MockSimplePolicy(name="TimedMember")], name="TimingTest")
+
+    await serial.apply(sample_transaction, container=mock_container, session=mock_db_session)
+
+    assert POLICY_APPLY_DURATION.get_count(**labels) == before + 1
+
+
 @pytest.mark.asyncio
 async def test_serial_policy_empty_list(
     sample_transaction,
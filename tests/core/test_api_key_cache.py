@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+from luthien_control.core.api_key_cache import ApiKeyCache, CachedApiKey
+from luthien_control.db.sqlmodel_models import ClientApiKey
+
+MONOTONIC = "luthien_control.core.api_key_cache.time.monotonic"
+
+
+def make_key(key_id: int = 1) -> ClientApiKey:
+    return ClientApiKey(id=key_id, key_value=f"key-{key_id}", name=f"Key {key_id}", is_active=True)
+
+
+class TestApiKeyCache:
+    """Unit tests for the client API key cache."""
+
+    def test_put_and_get(self):
+        cache = ApiKeyCache()
+        cached = cache.put("key-1", make_key())
+
+        entry = cache.get("key-1")
+
+        assert entry is not None
+        assert entry.api_key == cached == CachedApiKey(id=1, name="Key 1", is_active=True)
+        assert cache.get("other") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_entries_expire(self):
+        """Found keys use `ttl`, unknown keys the shorter `negative_ttl`."""
+        cache = ApiKeyCache(ttl=60, negative_ttl=5)
+        with patch(MONOTONIC, return_value=100.0):
+            cache.put("known", make_key())
+            cache.put_missing("unknown")
+
+        with patch(MONOTONIC, return_value=106.0):
+            known = cache.get("known")
+            assert known is not None and known.api_key is not None
+            assert cache.get("unknown") is None
+
+        with patch(MONOTONIC, return_value=161.0):
+            assert cache.get("known") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = ApiKeyCache(max_size=2)
+        cache.put("key-1", make_key(1))
+        cache.put("key-2", make_key(2))
+        cache.get("key-1")  # key-2 is now least recently used
+        cache.put("key-3", make_key(3))
+
+        assert cache.get("key-2") is None
+        assert cache.get("key-1") is not None
+        assert cache.get("key-3") is not None
+
+    def test_zero_ttl_disables_caching(self):
+        cache = ApiKeyCache(ttl=0, negative_ttl=0)
+        cache.put("key-1", make_key())
+        cache.put_missing("unknown")
+
+        assert len(cache) == 0
+
+    def test_invalidate(self):
+        cache = ApiKeyCache()
+        cache.put("key-1", make_key(1))
+        cache.put("key-2", make_key(2))
+
+        cache.invalidate("key-1")
+        assert cache.get("key-1") is None
+        assert cache.get("key-2") is not None
+
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_key_values_are_not_stored_in_plaintext(self):
+        cache = ApiKeyCache()
+        cache.put("super-secret", make_key())
+
+        assert "super-secret" not in cache._entries
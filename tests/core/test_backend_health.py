@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+import httpx
+import openai
+import pytest
+from luthien_control.core.backend_health import EWMA_ALPHA, BackendHealthRegistry, EndpointHealth, is_backend_failure
+
+MONOTONIC = "luthien_control.core.backend_health.time.monotonic"
+
+
+def test_in_flight_counts_started_requests():
+    health = EndpointHealth()
+    health.start()
+    health.start()
+    health.finish()
+    assert health.in_flight == 1
+    health.finish()
+    health.finish()
+    assert health.in_flight == 0
+
+
+def test_latency_is_a_moving_average():
+    health = EndpointHealth()
+    health.record_success(1.0)
+    assert health.ewma_latency == 1.0
+    health.record_success(2.0)
+    assert health.ewma_latency == pytest.approx(1.0 + EWMA_ALPHA)
+
+
+def test_endpoint_is_ejected_after_consecutive_failures():
+    health = EndpointHealth()
+    with patch(MONOTONIC, return_value=100.0):
+        assert health.record_failure(max_failures=2, ejection_seconds=30) is False
+        assert health.is_healthy()
+        assert health.record_failure(max_failures=2, ejection_seconds=30) is True
+        assert not health.is_healthy()
+    assert health.is_healthy(now=130.0)
+
+    # Once back in the pool, the next failure ejects it again, until a request succeeds
+    with patch(MONOTONIC, return_value=200.0):
+        assert health.record_failure(max_failures=2, ejection_seconds=30) is True
+    health.record_success(0.1)
+    assert health.consecutive_failures == 0
+    assert health.is_healthy(now=200.0)
+
+
+def test_success_resets_the_failure_count():
+    health = EndpointHealth()
+    health.record_failure(max_failures=2, ejection_seconds=30)
+    health.record_success(0.1)
+    assert health.record_failure(max_failures=2, ejection_seconds=30) is False
+
+
+def test_registry_shares_health_per_backend_url():
+    registry = BackendHealthRegistry()
+    assert registry.get("https://a.example/v1") is registry.get("https://a.example/v1")
+    assert registry.get("https://a.example/v1") is not registry.get("https://b.example/v1")
+    assert len(registry) == 2
+
+
+def _status_error(status_code: int) -> openai.APIStatusError:
+    request = httpx.Request("POST", "https://a.example/v1")
+    return openai.APIStatusError("error", response=httpx.Response(status_code, request=request), body=None)
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (_status_error(500), True),
+        (_status_error(429), True),
+        (_status_error(400), False),
+        (openai.APIConnectionError(request=httpx.Request("POST", "https://a.example/v1")), True),
+        (openai.APITimeoutError(request=httpx.Request("POST", "https://a.example/v1")), True),
+        (ValueError("bad payload"), False),
+    ],
+)
+def test_is_backend_failure(error: Exception, expected: bool):
+    assert is_backend_failure(error) is expected
@@ -0,0 +1,169 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from luthien_control.core.backend_limiter import (
+    BackendLimiter,
+    BackendLimiterRegistry,
+    BackendLimitExceeded,
+    TokenBucket,
+    parse_duration,
+)
+
+MONOTONIC = "luthien_control.core.backend_limiter.time.monotonic"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("1h2m3.5s", 3723.5), ("2.5", 2.5), ("soon", None), ("", None)],
+)
+def test_parse_duration(value, expected):
+    assert parse_duration(value) == expected
+
+
+class TestTokenBucket:
+    def test_refills_continuously_up_to_capacity(self):
+        with patch(MONOTONIC, return_value=100.0):
+            bucket = TokenBucket(per_minute=60)
+            bucket.consume(60)
+            assert bucket.delay(1) == pytest.approx(1.0)
+        with patch(MONOTONIC, return_value=130.0):
+            assert bucket.tokens == pytest.approx(30)
+        with patch(MONOTONIC, return_value=1000.0):
+            assert bucket.tokens == 60
+
+    def test_requests_larger_than_capacity_wait_for_a_full_bucket(self):
+        with patch(MONOTONIC, return_value=100.0):
+            bucket = TokenBucket(per_minute=60)
+            assert bucket.delay(1000) == 0
+            bucket.consume(30)
+            assert bucket.delay(1000) == pytest.approx(30)
+
+    def test_limit_to_and_set_rate(self):
+        with patch(MONOTONIC, return_value=100.0):
+            bucket = TokenBucket(per_minute=100)
+            bucket.limit_to(10)
+            assert bucket.tokens == 10
+            bucket.limit_to(50)
+            assert bucket.tokens == 10
+            bucket.set_rate(5)
+            assert (bucket.capacity, bucket.tokens) == (5, 5)
+
+
+class TestBackendLimiter:
+    @pytest.mark.asyncio
+    async def test_unlimited_by_default(self):
+        limiter = BackendLimiter()
+        for _ in range(100):
+            await limiter.acquire(tokens=1000)
+        assert limiter.stats()["in_flight"] == 100
+
+    @pytest.mark.asyncio
+    async def test_max_in_flight_admits_in_arrival_order(self):
+        limiter = BackendLimiter(max_in_flight=1)
+        order = []
+
+        async def request(i: int) -> None:
+            await limiter.acquire()
+            order.append(i)
+            await asyncio.sleep(0.005)
+            limiter.release()
+
+        await asyncio.gather(*(request(i) for i in range(5)))
+
+        assert order == [0, 1, 2, 3, 4]
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_is_bounded(self):
+        limiter = BackendLimiter(max_in_flight=1, max_queue=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(BackendLimitExceeded) as exc_info:
+            await limiter.acquire()
+        assert exc_info.value.reason == "queue_full"
+
+        limiter.release()
+        await waiter
+        assert limiter.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline(self):
+        limiter = BackendLimiter(max_in_flight=1)
+        await limiter.acquire()
+
+        with pytest.raises(BackendLimitExceeded) as exc_info:
+            await limiter.acquire(timeout=0.01)
+
+        assert exc_info.value.reason == "deadline"
+        assert limiter.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_request_rate_limit_delays_admission(self):
+        limiter = BackendLimiter(requests_per_minute=600)  # one request every 0.1s once the burst is used
+        limiter.requests.consume(600)  # type: ignore[union-attr]
+
+        with pytest.raises(BackendLimitExceeded):
+            await limiter.acquire(timeout=0.05)
+        await limiter.acquire(timeout=0.2)
+
+    @pytest.mark.asyncio
+    async def test_token_usage_corrects_the_estimate(self):
+        limiter = BackendLimiter(tokens_per_minute=1000)
+        await limiter.acquire(tokens=500)
+        limiter.release(estimated_tokens=500, used_tokens=100)
+
+        assert limiter.tokens.tokens == pytest.approx(900, abs=1)  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio
+    async def test_learns_limits_from_headers(self):
+        limiter = BackendLimiter(requests_per_minute=10000)
+        limiter.update_from_headers(
+            {
+                "X-RateLimit-Limit-Requests": "500",
+                "X-RateLimit-Remaining-Requests": "499",
+                "X-RateLimit-Limit-Tokens": "30000",
+                "X-RateLimit-Remaining-Tokens": "100",
+            }
+        )
+
+        stats = limiter.stats()
+        assert (stats["requests_per_minute"], stats["tokens_per_minute"]) == (500, 30000)
+        assert limiter.tokens.tokens == pytest.approx(100, abs=1)  # type: ignore[union-attr]
+
+    def test_configured_limit_lower_than_the_reported_one_is_kept(self):
+        limiter = BackendLimiter(requests_per_minute=100)
+        limiter.update_from_headers({"x-ratelimit-limit-requests": "500"})
+
+        assert limiter.stats()["requests_per_minute"] == 100
+
+    @pytest.mark.asyncio
+    async def test_exhausted_quota_pauses_admission(self):
+        limiter = BackendLimiter()
+        limiter.update_from_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "50ms"})
+
+        with pytest.raises(BackendLimitExceeded):
+            await limiter.acquire(timeout=0.02)
+        await limiter.acquire(timeout=0.1)
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_admission(self):
+        limiter = BackendLimiter()
+        limiter.update_from_headers({"retry-after": "0.05"})
+
+        with pytest.raises(BackendLimitExceeded):
+            await limiter.acquire(timeout=0.02)
+
+
+def test_registry_shares_limiters_by_url_and_limits():
+    registry = BackendLimiterRegistry()
+
+    assert registry.get("https://a.example.com/v1") is registry.get("https://a.example.com/v1")
+    assert registry.get("https://a.example.com/v1") is not registry.get("https://b.example.com/v1")
+    limited = registry.get("https://a.example.com/v1", max_in_flight=2)
+    assert limited is registry.get("https://a.example.com/v1", max_in_flight=2)
+    assert limited is not registry.get("https://a.example.com/v1")
+    assert limited.max_in_flight == 2
+    assert len(registry) == 3
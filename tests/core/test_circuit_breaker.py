@@ -0,0 +1,123 @@
+from unittest.mock import patch
+
+from luthien_control.core.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+
+MONOTONIC = "luthien_control.core.circuit_breaker.time.monotonic"
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    return CircuitBreaker("https://backend.example/v1", **{"minimum_calls": 4, "open_seconds": 30, **kwargs})
+
+
+def test_opens_when_the_failure_rate_reaches_the_threshold():
+    breaker = make_breaker()
+    with patch(MONOTONIC, return_value=100.0):
+        breaker.record_success(0.1, "closed")
+        breaker.record_failure("closed")
+        breaker.record_success(0.1, "closed")
+        assert breaker.state == "closed"
+        breaker.record_failure("closed")
+        assert breaker.state == "open"
+        assert breaker.admit() is None
+        assert breaker.retry_after() == 30
+
+
+def test_does_not_open_before_minimum_calls():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure("closed")
+    assert breaker.state == "closed"
+
+
+def test_old_outcomes_leave_the_window():
+    breaker = make_breaker(window_seconds=10)
+    with patch(MONOTONIC, return_value=100.0):
+        for _ in range(3):
+            breaker.record_failure("closed")
+    with patch(MONOTONIC, return_value=120.0):
+        breaker.record_failure("closed")
+    assert breaker.state == "closed"
+
+
+def test_opens_when_too_many_responses_are_slow():
+    breaker = make_breaker(slow_call_seconds=1.0, slow_call_rate_threshold=0.75)
+    for latency in (5.0, 0.1, 5.0, 5.0):
+        breaker.record_success(latency, "closed")
+    assert breaker.state == "open"
+
+
+def test_half_open_probe_success_closes_the_breaker():
+    breaker = make_breaker(half_open_max_calls=1)
+    with patch(MONOTONIC, return_value=100.0):
+        for _ in range(4):
+            breaker.record_failure("closed")
+    with patch(MONOTONIC, return_value=130.0):
+        assert breaker.admit() == "half_open"
+        assert breaker.admit() is None
+        breaker.record_success(0.1, "half_open")
+        assert breaker.state == "closed"
+        assert breaker.admit() == "closed"
+
+
+def test_half_open_probe_failure_reopens_the_breaker():
+    breaker = make_breaker()
+    with patch(MONOTONIC, return_value=100.0):
+        for _ in range(4):
+            breaker.record_failure("closed")
+    with patch(MONOTONIC, return_value=130.0):
+        assert breaker.admit() == "half_open"
+        breaker.record_failure("half_open")
+        assert breaker.state == "open"
+        assert breaker.retry_after() == 30
+
+
+def test_released_probe_lets_another_one_through():
+    breaker = make_breaker()
+    with patch(MONOTONIC, return_value=100.0):
+        for _ in range(4):
+            breaker.record_failure("closed")
+    with patch(MONOTONIC, return_value=130.0):
+        assert breaker.admit() == "half_open"
+        breaker.release("half_open")
+        assert breaker.admit() == "half_open"
+
+
+def test_probe_without_outcome_reopens_the_breaker_after_open_seconds():
+    breaker = make_breaker()
+    with patch(MONOTONIC, return_value=100.0):
+        for _ in range(4):
+            breaker.record_failure("closed")
+    with patch(MONOTONIC, return_value=130.0):
+        assert breaker.admit() == "half_open"
+    with patch(MONOTONIC, return_value=159.0):
+        assert breaker.admit() is None
+        assert breaker.state == "half_open"
+    with patch(MONOTONIC, return_value=160.0):
+        assert breaker.state == "open"
+        assert breaker.retry_after() == 30
+        # The late outcome of the abandoned probe changes nothing
+        breaker.record_success(0.1, "half_open")
+        assert breaker.state == "open"
+    with patch(MONOTONIC, return_value=190.0):
+        assert breaker.admit() == "half_open"
+
+
+def test_transitions_are_counted():
+    breaker = make_breaker()
+    with patch(MONOTONIC, return_value=100.0):
+        for _ in range(4):
+            breaker.record_failure("closed")
+    with patch(MONOTONIC, return_value=130.0):
+        breaker.admit()
+        breaker.record_success(0.1, "half_open")
+    assert breaker.transitions == 3
+
+
+def test_registry_shares_breakers_per_backend_url_and_thresholds():
+    registry = CircuitBreakerRegistry()
+    breaker = registry.get("https://a.example/v1", minimum_calls=5)
+    assert registry.get("https://a.example/v1", minimum_calls=5) is breaker
+    assert (breaker.backend_url, breaker.minimum_calls) == ("https://a.example/v1", 5)
+    assert registry.get("https://a.example/v1", minimum_calls=20) is not breaker
+    assert registry.get("https://b.example/v1", minimum_calls=5) is not breaker
+    assert len(registry) == 3
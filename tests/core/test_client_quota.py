@@ -0,0 +1,52 @@
+from unittest.mock import patch
+
+import pytest
+from luthien_control.core.client_quota import ClientQuotaTracker, QuotaLimits, SlidingWindowCounter
+
+MONOTONIC = "luthien_control.core.client_quota.time.monotonic"
+
+
+def test_quota_limits_from_metadata():
+    limits = QuotaLimits.from_metadata(
+        {"quota": {"requests_per_minute": 60, "tokens_per_day": 1000, "tokens_per_hour": None}}
+    )
+
+    assert limits.limits == {"requests_per_minute": 60.0, "tokens_per_day": 1000.0}
+    assert not QuotaLimits.from_metadata(None)
+    assert not QuotaLimits.from_metadata({"team": "research"})
+
+
+@pytest.mark.parametrize(
+    "quota",
+    [{"requests_per_week": 1}, {"bytes_per_minute": 1}, {"requests_per_minute": "many"}, ["requests_per_minute"]],
+)
+def test_quota_limits_rejects_invalid_quotas(quota):
+    with pytest.raises(ValueError):
+        QuotaLimits.from_metadata({"quota": quota})
+
+
+def test_sliding_window_counter_weights_the_previous_window():
+    with patch(MONOTONIC, return_value=0.0):
+        counter = SlidingWindowCounter(window=60)
+        counter.add(10)
+    with patch(MONOTONIC, return_value=75.0):  # 15s into the next window: 3/4 of the previous one still counts
+        assert counter.count() == pytest.approx(7.5)
+        counter.add(1)
+        assert counter.count() == pytest.approx(8.5)
+    with patch(MONOTONIC, return_value=500.0):
+        assert counter.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_check_reports_the_reached_limit():
+    tracker = ClientQuotaTracker()
+    limits = QuotaLimits({"requests_per_minute": 2, "tokens_per_hour": 100})
+
+    assert await tracker.check(1, limits) is None
+    tracker.record(1, requests=2)
+    assert await tracker.check(1, limits) == "requests_per_minute"
+    assert await tracker.check(2, limits) is None
+
+    tracker.record(2, prompt_tokens=60, completion_tokens=40)
+    assert await tracker.check(2, limits) == "tokens_per_hour"
+    assert tracker.stats()["rejected"] == 2
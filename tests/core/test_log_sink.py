@@ -0,0 +1,155 @@
+import asyncio
+import contextlib
+import uuid
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from luthien_control.core.log_sink import TransactionLogSink
+from pydantic import BaseModel
+
+
+class _Payload(BaseModel):
+    model: str
+
+
+@pytest.fixture
+def session_factory() -> MagicMock:
+    @contextlib.asynccontextmanager
+    async def _session():
+        yield MagicMock()
+
+    return MagicMock(side_effect=_session)
+
+
+@pytest.fixture
+def written() -> List[List[Dict[str, Any]]]:
+    return []
+
+
+@pytest.fixture
+def mock_create_logs(written):
+    async def _create_logs(session, rows):
+        written.append(rows)
+        return len(rows)
+
+    with patch("luthien_control.core.log_sink.create_logs", side_effect=_create_logs) as mock:
+        yield mock
+
+
+def _record(i: int) -> Dict[str, Any]:
+    return {"transaction_id": f"tx-{i}", "datatype": "transaction", "data": {"i": i}}
+
+
+class TestTransactionLogSink:
+    """Unit tests for the batched transaction log writer."""
+
+    def test_rejects_unknown_overflow_mode(self, session_factory):
+        with pytest.raises(ValueError, match="overflow"):
+            TransactionLogSink(session_factory, overflow="block")  # type: ignore
+
+    def test_drop_oldest_keeps_newest_records(self, session_factory):
+        """When full, drop_oldest evicts the oldest queued record to make room."""
+        sink = TransactionLogSink(session_factory, max_queue_size=2, overflow="drop_oldest")
+
+        assert all(sink.submit(_record(i)) for i in range(3))
+
+        queued = [sink._queue.get_nowait()["transaction_id"] for _ in range(sink._queue.qsize())]
+        assert queued == ["tx-1", "tx-2"]
+        assert sink.stats()["dropped"] == 1
+
+    def test_drop_newest_rejects_new_records(self, session_factory):
+        """When full, drop_newest refuses the incoming record."""
+        sink = TransactionLogSink(session_factory, max_queue_size=2, overflow="drop_newest")
+
+        results = [sink.submit(_record(i)) for i in range(3)]
+
+        assert results == [True, True, False]
+        queued = [sink._queue.get_nowait()["transaction_id"] for _ in range(sink._queue.qsize())]
+        assert queued == ["tx-0", "tx-1"]
+        assert sink.stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_full_batches_without_waiting_for_interval(self, session_factory, mock_create_logs, written):
+        """A full batch is written immediately, not after the flush interval."""
+        sink = TransactionLogSink(session_factory, batch_size=3, flush_interval=60.0)
+        sink.start()
+
+        for i in range(3):
+            sink.submit(_record(i))
+        for _ in range(10):
+            await asyncio.sleep(0)
+            if written:
+                break
+
+        assert [[row["transaction_id"] for row in batch] for batch in written] == [["tx-0", "tx-1", "tx-2"]]
+        await sink.aclose()
+
+    @pytest.mark.asyncio
+    async def test_writes_partial_batch_after_flush_interval(self, session_factory, mock_create_logs, written):
+        sink = TransactionLogSink(session_factory, batch_size=100, flush_interval=0.01)
+        sink.start()
+
+        sink.submit(_record(0))
+        await asyncio.sleep(0.05)
+
+        assert len(written) == 1
+        assert sink.stats()["written"] == 1
+        await sink.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_flushes_queued_records(self, session_factory, mock_create_logs, written):
+        """Records still queued at shutdown are written in batches."""
+        sink = TransactionLogSink(session_factory, batch_size=2, flush_interval=60.0)
+        for i in range(5):
+            sink.submit(_record(i))
+
+        await sink.aclose()
+
+        assert [len(batch) for batch in written] == [2, 2, 1]
+        assert sink.stats() == {"submitted": 5, "dropped": 0, "written": 5, "failed": 0, "queued": 0}
+
+    @pytest.mark.asyncio
+    async def test_aclose_writes_the_batch_being_gathered(self, session_factory, mock_create_logs, written):
+        """Records already taken off the queue, waiting for their batch to fill up, are written at shutdown."""
+        sink = TransactionLogSink(session_factory, batch_size=10, flush_interval=5.0)
+        sink.start()
+        for i in range(3):
+            sink.submit(_record(i))
+        await asyncio.sleep(0)
+        assert sink._queue.empty()
+
+        await sink.aclose()
+
+        assert [[row["transaction_id"] for row in batch] for batch in written] == [["tx-0", "tx-1", "tx-2"]]
+        assert sink.stats()["written"] == 3
+
+    @pytest.mark.asyncio
+    async def test_serializes_rich_values_when_writing(self, session_factory, mock_create_logs, written):
+        """Models and other non-JSON values are converted when the batch is written."""
+        sink = TransactionLogSink(session_factory)
+        transaction_id = uuid.uuid4()
+        sink.submit(
+            {
+                "transaction_id": str(transaction_id),
+                "datatype": "transaction",
+                "data": {"request": _Payload(model="gpt-4o"), "id": transaction_id},
+            }
+        )
+
+        await sink.flush()
+
+        row = written[0][0]
+        assert row["data"] == {"request": {"model": "gpt-4o"}, "id": str(transaction_id)}
+        assert row["notes"] is None
+
+    @pytest.mark.asyncio
+    async def test_write_failures_are_counted_not_raised(self, session_factory):
+        sink = TransactionLogSink(session_factory)
+        sink.submit(_record(0))
+
+        with patch("luthien_control.core.log_sink.create_logs", new=AsyncMock(side_effect=RuntimeError("db down"))):
+            assert await sink.flush() == 0
+
+        assert sink.stats()["failed"] == 1
+        assert sink.stats()["queued"] == 0
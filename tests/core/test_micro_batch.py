@@ -0,0 +1,118 @@
+import asyncio
+from typing import List
+
+import pytest
+from luthien_control.core.micro_batch import MicroBatcher
+
+
+class Backend:
+    """Records the batches it is sent and answers each item with its double."""
+
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.batches: List[List[int]] = []
+
+    async def __call__(self, items: List[int]) -> List[int]:
+        self.batches.append(list(items))
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return [item * 2 for item in items]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_items_are_sent_in_one_batch():
+    batcher: MicroBatcher[int, int] = MicroBatcher()
+    backend = Backend()
+
+    results = await asyncio.gather(
+        *(batcher.submit("key", item, backend, max_batch_size=100, max_wait=0.01) for item in range(5))
+    )
+
+    assert results == [0, 2, 4, 6, 8]
+    assert backend.batches == [[0, 1, 2, 3, 4]]
+    assert len(batcher) == 0
+
+
+@pytest.mark.asyncio
+async def test_keys_are_batched_separately():
+    batcher: MicroBatcher[int, int] = MicroBatcher()
+    backend = Backend()
+
+    await asyncio.gather(
+        batcher.submit("a", 1, backend, max_batch_size=100, max_wait=0.01),
+        batcher.submit("b", 2, backend, max_batch_size=100, max_wait=0.01),
+        batcher.submit("a", 3, backend, max_batch_size=100, max_wait=0.01),
+    )
+
+    assert sorted(backend.batches) == [[1, 3], [2]]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting():
+    batcher: MicroBatcher[int, int] = MicroBatcher()
+    backend = Backend()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit("key", item, backend, max_batch_size=2, max_wait=60) for item in range(4))),
+        timeout=1,
+    )
+
+    assert results == [0, 2, 4, 6]
+    assert backend.batches == [[0, 1], [2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_item_sizes_count_towards_the_batch_size():
+    batcher: MicroBatcher[int, int] = MicroBatcher()
+    backend = Backend()
+
+    await asyncio.gather(
+        batcher.submit("key", 1, backend, size=3, max_batch_size=4, max_wait=0.01),
+        batcher.submit("key", 2, backend, size=3, max_batch_size=4, max_wait=0.01),
+        batcher.submit("key", 3, backend, size=10, max_batch_size=4, max_wait=0.01),
+    )
+
+    assert backend.batches == [[1], [2], [3]]
+
+
+@pytest.mark.asyncio
+async def test_item_weights_count_towards_the_batch_weight():
+    batcher: MicroBatcher[int, int] = MicroBatcher()
+    backend = Backend()
+
+    await asyncio.gather(
+        batcher.submit("key", 1, backend, max_batch_size=10, max_wait=0.01, weight=5, max_batch_weight=8),
+        batcher.submit("key", 2, backend, max_batch_size=10, max_wait=0.01, weight=2, max_batch_weight=8),
+        batcher.submit("key", 3, backend, max_batch_size=10, max_wait=0.01, weight=2, max_batch_weight=8),
+    )
+
+    assert backend.batches == [[1, 2], [3]]
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_in_the_batch():
+    batcher: MicroBatcher[int, int] = MicroBatcher()
+    backend = Backend(error=RuntimeError("backend down"))
+
+    results = await asyncio.gather(
+        *(batcher.submit("key", item, backend, max_batch_size=100, max_wait=0.01) for item in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(backend.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_batch():
+    batcher: MicroBatcher[int, int] = MicroBatcher()
+    backend = Backend()
+
+    cancelled = asyncio.create_task(batcher.submit("key", 1, backend, max_batch_size=100, max_wait=0.02))
+    kept = asyncio.create_task(batcher.submit("key", 2, backend, max_batch_size=100, max_wait=0.02))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await kept == 4
+    assert backend.batches == [[1, 2]]
@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock, patch
+
+import httpx
+import openai
+import pytest
+from luthien_control.core.openai_client_registry import OpenAIClientRegistry
+
+
+@pytest.fixture
+def http_client() -> MagicMock:
+    return MagicMock(spec=httpx.AsyncClient)
+
+
+class TestOpenAIClientRegistry:
+    """Unit tests for the pooled OpenAI client registry."""
+
+    def test_reuses_client_for_same_url_and_key(self, http_client):
+        """The same (base URL, API key) pair should always get the same client."""
+        registry = OpenAIClientRegistry(http_client)
+
+        first = registry.get("https://api.openai.com/v1", "key-1")
+        second = registry.get("https://api.openai.com/v1/", "key-1")
+
+        assert isinstance(first, openai.AsyncOpenAI)
+        assert first is second
+        assert first._client is http_client
+        assert len(registry) == 1
+
+    def test_separates_clients_by_url_and_key(self, http_client):
+        """Different URLs or API keys should get distinct clients."""
+        registry = OpenAIClientRegistry(http_client)
+
+        a = registry.get("https://api.openai.com/v1", "key-1")
+        b = registry.get("https://api.openai.com/v1", "key-2")
+        c = registry.get("http://localhost:8000/v1", "key-1")
+
+        assert len({id(a), id(b), id(c)}) == 3
+        assert len(registry) == 3
+
+    def test_api_key_is_not_stored_in_plaintext(self, http_client):
+        """Registry keys should hold a hash of the API key, not the key itself."""
+        registry = OpenAIClientRegistry(http_client)
+        registry.get("https://api.openai.com/v1", "super-secret")
+
+        assert all("super-secret" not in key for key in registry._clients)
+
+    def test_evicts_idle_clients(self, http_client):
+        """Clients unused for longer than the idle timeout should be dropped."""
+        registry = OpenAIClientRegistry(http_client, idle_timeout=10.0)
+
+        with patch("luthien_control.core.openai_client_registry.time.monotonic", return_value=100.0):
+            stale = registry.get("https://a.example/v1", "key")
+        with patch("luthien_control.core.openai_client_registry.time.monotonic", return_value=105.0):
+            registry.get("https://b.example/v1", "key")
+
+        assert registry.evict_idle(now=112.0) == 1
+        assert len(registry) == 1
+
+        with patch("luthien_control.core.openai_client_registry.time.monotonic", return_value=113.0):
+            fresh = registry.get("https://a.example/v1", "key")
+        assert fresh is not stale
+
+    @pytest.mark.asyncio
+    async def test_aclose_leaves_shared_http_client_open(self, http_client):
+        """Closing the registry forgets clients without closing the shared transport."""
+        registry = OpenAIClientRegistry(http_client)
+        registry.get("https://api.openai.com/v1", "key")
+
+        await registry.aclose()
+
+        assert len(registry) == 0
+        http_client.aclose.assert_not_called()
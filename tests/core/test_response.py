@@ -0,0 +1,172 @@
+from typing import AsyncGenerator, cast
+
+import pytest
+from luthien_control.api.openai_chat_completions import OpenAIChatCompletionsResponse
+from luthien_control.core.response import ObservedStream, Response
+from luthien_control.utils import deep_events
+from openai.types.chat import ChatCompletionChunk
+
+
+def make_chunk(content: str) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 1,
+            "model": "gpt-4",
+            "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+        }
+    )
+
+
+class ClosableStream:
+    """Minimal stand-in for openai's AsyncStream, which is closed with `close()`."""
+
+    def __init__(self, contents):
+        self._chunks = iter([make_chunk(c) for c in contents])
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self):
+        self.closed = True
+
+
+class TestResponseStreaming:
+    """Tests for streamed responses and chunk hooks."""
+
+    @pytest.mark.asyncio
+    async def test_iter_chunks_applies_hooks_in_order(self):
+        """Hooks run in registration order; a hook returning None drops the chunk."""
+        response = Response(stream=ClosableStream(["a", "skip", "b"]))
+        seen = []
+
+        async def drop_skip(chunk):
+            return None if chunk.choices[0].delta.content == "skip" else chunk
+
+        async def record(chunk):
+            seen.append(chunk.choices[0].delta.content)
+            chunk.choices[0].delta.content += "!"
+            return chunk
+
+        response.add_chunk_hook(drop_skip)
+        response.add_chunk_hook(record)
+
+        contents = [chunk.choices[0].delta.content async for chunk in response.iter_chunks()]
+
+        assert contents == ["a!", "b!"]
+        assert seen == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_iter_chunks_closes_backend_stream_early(self):
+        """Stopping iteration early (e.g. client disconnect) should close the backend stream."""
+        stream = ClosableStream(["a", "b", "c"])
+        response = Response(stream=stream)
+
+        chunks = cast(AsyncGenerator[ChatCompletionChunk, None], response.iter_chunks())
+        await chunks.__anext__()
+        await chunks.aclose()
+
+        assert stream.closed
+
+    @pytest.mark.asyncio
+    async def test_iter_chunks_without_stream(self):
+        """Iterating a non-streamed response is an error."""
+        with pytest.raises(ValueError, match="no stream"):
+            async for _ in Response().iter_chunks():
+                pass
+
+    def test_stream_fields_are_not_serialized(self):
+        """The stream and hooks are runtime-only and must not show up in dumps."""
+        response = Response(stream=ClosableStream([]))
+
+        async def passthrough(chunk: ChatCompletionChunk) -> ChatCompletionChunk:
+            return chunk
+
+        response.add_chunk_hook(passthrough)
+
+        assert response.model_dump() == {"payload": None, "api_endpoint": None}
+
+
+class TestObservedStream:
+    """Tests for passing a stream through with a close callback that cannot be skipped."""
+
+    @pytest.mark.asyncio
+    async def test_on_close_runs_once_at_the_end(self):
+        stream = ClosableStream(["a", "b"])
+        seen, closes = [], []
+        observed = ObservedStream(stream, on_close=closes.append, on_chunk=seen.append)
+
+        contents = [chunk.choices[0].delta.content async for chunk in observed]
+        await observed.aclose()
+
+        assert contents == ["a", "b"]
+        assert len(seen) == 2
+        assert closes == [None]
+        assert stream.closed
+
+    @pytest.mark.asyncio
+    async def test_closing_before_iteration_still_calls_on_close(self):
+        stream = ClosableStream(["a"])
+        closes = []
+
+        await ObservedStream(stream, on_close=closes.append).aclose()
+
+        assert closes == [None]
+        assert stream.closed
+
+    @pytest.mark.asyncio
+    async def test_on_close_receives_the_error_that_ended_the_stream(self):
+        error = RuntimeError("backend went away")
+
+        async def failing():
+            yield make_chunk("a")
+            raise error
+
+        closes = []
+        observed = ObservedStream(failing(), on_close=closes.append)
+
+        with pytest.raises(RuntimeError):
+            async for _ in observed:
+                pass
+
+        assert closes == [error]
+
+
+RAW_BODY = (
+    b'{"id":"chatcmpl-1","object":"chat.completion","created":1,"model":"gpt-4",'
+    b'"choices":[{"index":0,"message":{"role":"assistant","content":"hi"},"finish_reason":"stop"}]}'
+)
+
+
+class TestResponseRawBody:
+    """Tests for keeping the backend's raw bytes alongside the parsed payload."""
+
+    @pytest.fixture
+    def response(self) -> Response:
+        # Built without deep events, as in the proxy's fast path
+        with deep_events(False):
+            response = Response()
+            payload = OpenAIChatCompletionsResponse.model_validate_json(RAW_BODY)
+        response.set_backend_payload(payload, RAW_BODY)
+        return response
+
+    def test_raw_body_kept_while_unmodified(self, response):
+        assert response.raw_body is RAW_BODY
+
+    def test_nested_change_discards_raw_body(self, response):
+        response.payload.choices[0].message.content = "changed"
+        assert response.raw_body is None
+
+    def test_replacing_payload_discards_raw_body(self, response):
+        replacement = OpenAIChatCompletionsResponse.model_validate_json(RAW_BODY)
+        replacement.id = "chatcmpl-2"
+        response.payload = replacement
+        assert response.raw_body is None
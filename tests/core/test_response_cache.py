@@ -0,0 +1,149 @@
+import asyncio
+import contextlib
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+import pytest
+from luthien_control.api.openai_chat_completions.datatypes import Message
+from luthien_control.api.openai_chat_completions.request import OpenAIChatCompletionsRequest
+from luthien_control.core.response_cache import DatabaseResponseCache, InMemoryResponseCache, response_cache_key
+from luthien_control.db.exceptions import LuthienDBQueryError
+from psygnal.containers import EventedDict, EventedList
+
+MONOTONIC = "luthien_control.core.response_cache.time.monotonic"
+ENDPOINT = "https://api.openai.com/v1"
+
+
+def make_request(**kwargs) -> OpenAIChatCompletionsRequest:
+    return OpenAIChatCompletionsRequest(
+        model="gpt-4o", messages=EventedList([Message(role="user", content="Hello")]), **kwargs
+    )
+
+
+class TestResponseCacheKey:
+    def test_ignores_fields_that_do_not_affect_the_completion(self):
+        key = response_cache_key(make_request(temperature=0), ENDPOINT)
+
+        assert response_cache_key(make_request(temperature=0, user="alice"), ENDPOINT) == key
+        assert response_cache_key(make_request(temperature=0, metadata=EventedDict({"a": "b"})), ENDPOINT) == key
+        assert response_cache_key(make_request(temperature=0, stream=False), ENDPOINT) == key
+
+    def test_distinguishes_requests_and_backends(self):
+        key = response_cache_key(make_request(temperature=0), ENDPOINT)
+
+        assert response_cache_key(make_request(temperature=0.5), ENDPOINT) != key
+        assert response_cache_key(make_request(temperature=0, seed=1), ENDPOINT) != key
+        assert response_cache_key(make_request(temperature=0), "https://other.example.com/v1") != key
+
+
+class TestInMemoryResponseCache:
+    @pytest.mark.asyncio
+    async def test_put_and_get(self):
+        cache = InMemoryResponseCache()
+        await cache.put("key", b"body", ttl=60)
+
+        assert await cache.get("key") == b"body"
+        assert await cache.get("other") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "bytes": 4}
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self):
+        cache = InMemoryResponseCache()
+        with patch(MONOTONIC, return_value=100.0):
+            await cache.put("key", b"body", ttl=60)
+        with patch(MONOTONIC, return_value=159.0):
+            assert await cache.get("key") == b"body"
+        with patch(MONOTONIC, return_value=161.0):
+            assert await cache.get("key") is None
+        assert cache.total_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_within_byte_budget(self):
+        cache = InMemoryResponseCache(max_bytes=10)
+        await cache.put("a", b"aaaa", ttl=60)
+        await cache.put("b", b"bbbb", ttl=60)
+        await cache.get("a")  # b is now least recently used
+        await cache.put("c", b"cccc", ttl=60)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == b"aaaa"
+        assert await cache.get("c") == b"cccc"
+        assert cache.total_bytes == 8
+
+    @pytest.mark.asyncio
+    async def test_replacing_an_entry_updates_its_size(self):
+        cache = InMemoryResponseCache()
+        await cache.put("key", b"long body", ttl=60)
+        await cache.put("key", b"body", ttl=60)
+
+        assert len(cache) == 1
+        assert cache.total_bytes == 4
+
+    @pytest.mark.asyncio
+    async def test_oversized_bodies_are_not_cached(self):
+        cache = InMemoryResponseCache(max_bytes=3)
+        await cache.put("key", b"body", ttl=60)
+
+        assert len(cache) == 0
+
+
+class TestDatabaseResponseCache:
+    @staticmethod
+    def make_cache(session: MagicMock) -> DatabaseResponseCache:
+        @contextlib.asynccontextmanager
+        async def session_factory():
+            yield session
+
+        return DatabaseResponseCache(session_factory, cleanup_interval=0.01)
+
+    @pytest.mark.asyncio
+    async def test_operations_use_their_own_session(self):
+        session = MagicMock()
+        cache = self.make_cache(session)
+        with (
+            patch("luthien_control.core.response_cache.get_cached_response", AsyncMock(return_value=b"body")) as get,
+            patch("luthien_control.core.response_cache.put_cached_response", AsyncMock()) as put,
+        ):
+            await cache.put("key", b"body", ttl=60)
+            assert await cache.get("key") == b"body"
+
+        put.assert_awaited_once_with(session, "key", b"body", ANY)
+        get.assert_awaited_once_with(session, "key")
+
+    @pytest.mark.asyncio
+    async def test_background_task_deletes_expired_entries(self):
+        session = MagicMock()
+        cache = self.make_cache(session)
+        deleted = asyncio.Event()
+
+        async def delete_expired(session):
+            deleted.set()
+            return 2
+
+        with patch("luthien_control.core.response_cache.delete_expired_cached_responses", delete_expired):
+            cache.start()
+            await asyncio.wait_for(deleted.wait(), timeout=1)
+            await cache.aclose()
+
+        assert cache._task is None
+
+    @pytest.mark.asyncio
+    async def test_failed_deletion_is_counted(self):
+        cache = self.make_cache(MagicMock())
+        with patch(
+            "luthien_control.core.response_cache.delete_expired_cached_responses",
+            AsyncMock(side_effect=LuthienDBQueryError("boom")),
+        ):
+            assert await cache.delete_expired() == 0
+
+        assert cache.stats()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_database_errors_are_misses(self):
+        cache = self.make_cache(MagicMock())
+        with patch(
+            "luthien_control.core.response_cache.get_cached_response",
+            AsyncMock(side_effect=LuthienDBQueryError("down")),
+        ):
+            assert await cache.get("key") is None
+
+        assert cache.stats() == {"hits": 0, "misses": 1, "errors": 1}
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+from luthien_control.core.single_flight import SingleFlight
+
+
+class Backend:
+    """Counts calls and answers after a short delay."""
+
+    def __init__(self, result: bytes = b"result", error: Exception | None = None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def __call__(self) -> bytes:
+        self.calls += 1
+        try:
+            await asyncio.sleep(0.02)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_flight():
+    flight: SingleFlight[bytes] = SingleFlight()
+    backend = Backend()
+
+    results = await asyncio.gather(*(flight.run("key", backend) for _ in range(10)))
+
+    assert results == [b"result"] * 10
+    assert backend.calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_and_later_calls_are_separate():
+    flight: SingleFlight[bytes] = SingleFlight()
+    backend = Backend()
+
+    await asyncio.gather(flight.run("a", backend), flight.run("b", backend))
+    await flight.run("a", backend)
+
+    assert backend.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    flight: SingleFlight[bytes] = SingleFlight()
+    backend = Backend(error=RuntimeError("backend down"))
+
+    results = await asyncio.gather(*(flight.run("key", backend) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert backend.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_caller_keeps_the_flight_for_the_others():
+    flight: SingleFlight[bytes] = SingleFlight()
+    backend = Backend()
+    leader = asyncio.create_task(flight.run("key", backend))
+    follower = asyncio.create_task(flight.run("key", backend))
+    await asyncio.sleep(0.005)
+    assert flight.in_flight("key") == 2
+
+    leader.cancel()
+
+    assert await follower == b"result"
+    assert leader.cancelled()
+    assert not backend.cancelled
+
+
+@pytest.mark.asyncio
+async def test_flight_is_cancelled_once_every_caller_is():
+    flight: SingleFlight[bytes] = SingleFlight()
+    backend = Backend()
+    callers = [asyncio.create_task(flight.run("key", backend)) for _ in range(2)]
+    await asyncio.sleep(0.005)
+
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert backend.cancelled
+    assert len(flight) == 0
+    # A new caller starts a fresh call
+    assert await flight.run("key", backend) == b"result"
+    assert backend.calls == 2
@@ -8,6 +8,7 @@ from luthien_control.api.openai_chat_completions.response import OpenAIChatCompl
 from luthien_control.core.request import Request
 from luthien_control.core.response import Response
 from luthien_control.core.transaction import Transaction
+from luthien_control.utils.deep_evented_model import deep_events
 from psygnal.containers import EventedDict, EventedList
 
 
@@ -97,3 +98,46 @@ def test_transaction_event_emission_on_nested_attribute_change(sample_request, s
     mock_callback.assert_called_once()
     assert transaction.response.payload is not None
     assert transaction.response.payload.choices[0].message.content == "New content"
+
+
+def test_transaction_resolved_paths_cleared_on_change(sample_request, sample_response):
+    """Test that the resolved path cache is cleared by any change within the transaction."""
+    transaction = Transaction(request=sample_request, response=sample_response)
+    cache = transaction.resolved_paths
+    assert cache is not None
+
+    cache["request.payload.model"] = "gpt-4"
+    transaction.request.payload.model = "gpt-4-turbo"
+    assert cache == {}
+
+    cache["data.key"] = None
+    transaction.data["key"] = "value"
+    assert cache == {}
+
+
+def test_transaction_resolved_paths_requires_change_events(sample_request, sample_response):
+    """Test that there is no resolved path cache when changes cannot be observed."""
+    with deep_events(False):
+        transaction = Transaction(request=sample_request, response=sample_response)
+    assert transaction.resolved_paths is None
+
+    transaction.connect_deep_events()
+    assert transaction.resolved_paths == {}
+
+
+def test_transaction_memoizing_paths_without_change_events(sample_request, sample_response):
+    """Test that paths are memoized within `memoizing_paths` only, when changes cannot be observed."""
+    with deep_events(False):
+        transaction = Transaction(request=sample_request, response=sample_response)
+
+    with transaction.memoizing_paths():
+        cache = transaction.resolved_paths
+        assert cache is not None
+        assert cache == {}
+        cache["request.payload.model"] = "gpt-4"
+        with transaction.memoizing_paths():
+            assert transaction.resolved_paths is cache
+    assert transaction.resolved_paths is None
+
+    with transaction.memoizing_paths():
+        assert transaction.resolved_paths == {}
@@ -4,6 +4,7 @@ import uuid
 from unittest.mock import Mock
 
 import httpx
+import pytest
 from luthien_control.core.tracked_context import TrackedContext, _update_headers
 
 
@@ -49,6 +50,41 @@ class TestTrackedContext:
         assert context.request.method == "POST"
         assert str(context.request.url) == "https://api.test.com"
 
+    def test_set_request_with_streamed_content(self):
+        """Test that a new request can stream its body, which is left unread."""
+        context = TrackedContext()
+        listener = Mock()
+        context.events.mutation.register("test_streamed_content", listener)
+
+        async def body():
+            yield b"chunk"
+
+        try:
+            context.update_request(method="POST", url="embeddings", content=body())
+        finally:
+            context.events.mutation.unregister("test_streamed_content")
+
+        assert context.request is not None
+        assert isinstance(context.request.stream, httpx.AsyncByteStream)
+        assert listener.call_args[0][1].details["content"]["new"] == "<stream>"
+
+        with pytest.raises(ValueError, match="streamed content"):
+            context.update_request(content=body())
+
+    @pytest.mark.asyncio
+    async def test_request_to_send_keeps_the_streamed_body(self):
+        """Test that the request to send is the tracked one, whose streamed body can still be read."""
+        context = TrackedContext()
+        with pytest.raises(ValueError, match="missing request"):
+            context.request_to_send()
+
+        async def body():
+            yield b"chunk"
+
+        context.update_request(method="POST", url="embeddings", content=body())
+
+        assert await context.request_to_send().aread() == b"chunk"
+
     def test_set_response(self):
         """Test setting response."""
         context = TrackedContext()
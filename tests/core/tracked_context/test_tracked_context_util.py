@@ -1,3 +1,6 @@
+import json
+from unittest.mock import patch
+
 import pytest
 from luthien_control.core.tracked_context import TrackedContext
 from luthien_control.core.tracked_context.util import get_tx_value
@@ -74,3 +77,29 @@ class TestGetTxValueTrackedContext:
         ctx = TrackedContext()
         with pytest.raises(ValueError):
             get_tx_value(ctx, "notreal.whatsit")
+
+    # --- Memoization ----------------------------------------------------------
+
+    def test_json_content_parsed_once(self):
+        """JSON content is decoded once for any number of lookups into it."""
+        ctx = TrackedContext()
+        ctx.update_request(method="POST", url="https://example.com", content=b'{"model": "gpt-4o", "n": 2}')
+
+        with patch("luthien_control.core.tracked_context.tracked_context.json.loads", wraps=json.loads) as loads:
+            assert get_tx_value(ctx, "request.content.model") == "gpt-4o"
+            assert get_tx_value(ctx, "request.content.model") == "gpt-4o"
+            assert get_tx_value(ctx, "request.content.n") == 2
+        assert loads.call_count == 1
+
+    def test_mutation_invalidates_memoized_values(self):
+        """Values resolved before a mutation are not returned after it."""
+        ctx = TrackedContext()
+        ctx.update_request(method="POST", url="https://example.com", content=b'{"model": "gpt-4o"}')
+        ctx.set_data("user", "alice")
+        assert get_tx_value(ctx, "request.content.model") == "gpt-4o"
+        assert get_tx_value(ctx, "data.user") == "alice"
+
+        ctx.update_request(content=b'{"model": "gpt-4o-mini"}')
+        ctx.set_data("user", "bob")
+        assert get_tx_value(ctx, "request.content.model") == "gpt-4o-mini"
+        assert get_tx_value(ctx, "data.user") == "bob"
@@ -3,6 +3,7 @@ from typing import cast
 from unittest.mock import Mock
 
 import pytest
+from luthien_control.core.api_key_cache import ApiKeyCache
 from luthien_control.db.client_api_key_crud import (
     create_api_key,
     get_api_key_by_value,
@@ -11,6 +12,7 @@ from luthien_control.db.client_api_key_crud import (
 )
 from luthien_control.db.exceptions import (
     LuthienDBIntegrityError,
+    LuthienDBNotFoundError,
     LuthienDBOperationError,
     LuthienDBQueryError,
     LuthienDBTransactionError,
@@ -108,6 +110,23 @@ async def test_update_api_key(async_session: AsyncSession):
     assert retrieved_key.metadata_ == {"updated": True}
 
 
+async def test_create_and_update_api_key_invalidate_cache(async_session: AsyncSession):
+    """Creating or deactivating a key drops its cached lookup."""
+    cache = ApiKeyCache()
+    cache.put_missing("cached-key")
+
+    created_key = await create_api_key(
+        async_session, ClientApiKey(key_value="cached-key", name="Cached", is_active=True), api_key_cache=cache
+    )
+    assert cache.get("cached-key") is None
+
+    cache.put("cached-key", created_key)
+    assert created_key.id is not None
+    deactivate = ClientApiKey(key_value="cached-key", name="Cached", is_active=False)
+    await update_api_key(async_session, created_key.id, deactivate, api_key_cache=cache)
+    assert cache.get("cached-key") is None
+
+
 async def test_update_api_key_not_found(async_session: AsyncSession):
     """Test updating a non-existent API key."""
     # Pass a ClientApiKey model instance
@@ -120,7 +139,7 @@ async def test_update_api_key_not_found(async_session: AsyncSession):
 
 async def test_get_api_key_by_value_not_found(async_session: AsyncSession):
     """Test getting a non-existent API key by value."""
-    with pytest.raises(LuthienDBQueryError, match="Active API key with value 'non-existent-key' not found"):
+    with pytest.raises(LuthienDBNotFoundError, match="Active API key with value 'non-existent-key' not found"):
         await get_api_key_by_value(async_session, "non-existent-key")
 
 
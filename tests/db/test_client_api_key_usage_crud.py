@@ -0,0 +1,137 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from luthien_control.core.client_quota import ClientQuotaTracker, QuotaLimits
+from luthien_control.db.client_api_key_usage_crud import create_usage_records, delete_usage_before, sum_usage_since
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def record(api_key_id: int, age: timedelta, requests: int, prompt_tokens: int, completion_tokens: int) -> dict:
+    return {
+        "api_key_id": api_key_id,
+        "recorded_at": utcnow() - age,
+        "requests": requests,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+    }
+
+
+@pytest.mark.asyncio
+async def test_sum_usage_since_sums_each_period(async_session: AsyncSession):
+    count = await create_usage_records(
+        async_session,
+        [
+            record(1, timedelta(seconds=10), 2, 100, 50),
+            record(1, timedelta(minutes=30), 3, 300, 30),
+            record(1, timedelta(days=2), 100, 1000, 1000),
+            record(2, timedelta(seconds=10), 7, 7, 7),
+        ],
+    )
+    assert count == 4
+
+    now = utcnow()
+    sums = await sum_usage_since(async_session, 1, [now - timedelta(minutes=1), now - timedelta(hours=1)])
+
+    assert sums == [(2, 100, 50), (5, 400, 80)]
+
+
+@pytest.mark.asyncio
+async def test_sum_usage_since_without_usage(async_session: AsyncSession):
+    assert await sum_usage_since(async_session, 1, [utcnow() - timedelta(days=1)]) == [(0, 0, 0)]
+    assert await create_usage_records(async_session, []) == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_usage_before_keeps_recent_usage(async_session: AsyncSession):
+    await create_usage_records(
+        async_session, [record(1, timedelta(hours=1), 1, 0, 0), record(1, timedelta(days=2), 5, 0, 0)]
+    )
+
+    assert await delete_usage_before(async_session, utcnow() - timedelta(days=1)) == 1
+    assert await sum_usage_since(async_session, 1, [datetime(2000, 1, 1)]) == [(1, 0, 0)]
+
+
+@pytest.mark.asyncio
+async def test_tracker_deletes_usage_older_than_the_longest_window(async_session: AsyncSession):
+    @asynccontextmanager
+    async def session_factory():
+        yield async_session
+
+    await create_usage_records(
+        async_session, [record(1, timedelta(hours=23), 1, 0, 0), record(2, timedelta(days=1, hours=1), 1, 0, 0)]
+    )
+
+    assert await ClientQuotaTracker(session_factory).delete_expired() == 1
+    assert await ClientQuotaTracker().delete_expired() == 0
+    assert await sum_usage_since(async_session, 2, [datetime(2000, 1, 1)]) == [(0, 0, 0)]
+
+
+@pytest.mark.asyncio
+async def test_flush_persists_usage_and_seeds_new_trackers(async_session: AsyncSession):
+    @asynccontextmanager
+    async def session_factory():
+        yield async_session
+
+    tracker = ClientQuotaTracker(session_factory)
+    tracker.record(1, requests=1, prompt_tokens=10, completion_tokens=5)
+    tracker.record(1, requests=1, prompt_tokens=20, completion_tokens=5)
+    tracker.record(2, requests=1)
+
+    assert await tracker.flush() == 2
+    assert await tracker.flush() == 0
+
+    with patch("luthien_control.core.client_quota.time.monotonic", return_value=100.0):
+        restarted = ClientQuotaTracker(session_factory)
+        limits = QuotaLimits({"requests_per_minute": 2})
+        assert await restarted.check(1, limits, async_session) == "requests_per_minute"
+        assert await restarted.check(2, limits, async_session) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_usage_for_the_next_one(async_session: AsyncSession):
+    failing = True
+
+    @asynccontextmanager
+    async def session_factory():
+        if failing:
+            raise RuntimeError("database is down")
+        yield async_session
+
+    tracker = ClientQuotaTracker(session_factory)
+    tracker.record(1, requests=1)
+    assert await tracker.flush() == 0
+    tracker.record(1, requests=1)
+
+    failing = False
+    await tracker.aclose()
+
+    assert tracker.stats()["failed"] == 1
+    assert await sum_usage_since(async_session, 1, [datetime(2000, 1, 1)]) == [(2, 0, 0)]
+
+
+@pytest.mark.asyncio
+async def test_keys_used_before_their_first_check_are_still_seeded(async_session: AsyncSession):
+    @asynccontextmanager
+    async def session_factory():
+        yield async_session
+
+    with patch("luthien_control.core.client_quota.time.monotonic", return_value=100.0):
+        tracker = ClientQuotaTracker(session_factory)
+        limits = QuotaLimits({"requests_per_minute": 3})
+        # Used while the key had no quota, then persisted
+        tracker.record(1, requests=1)
+        assert await tracker.flush() == 1
+        # Checked without a session, which cannot seed the key yet
+        assert await tracker.check(1, limits) is None
+        # Usage persisted by another replica
+        await create_usage_records(async_session, [record(1, timedelta(seconds=5), 1, 0, 0)])
+
+        assert await tracker.check(1, limits, async_session) is None
+        tracker.record(1, requests=1)
+        assert await tracker.check(1, limits, async_session) == "requests_per_minute"
@@ -10,6 +10,7 @@ from luthien_control.control_policy.serialization import SerializedPolicy
 from luthien_control.db.control_policy_crud import (
     get_policy_by_name,
     get_policy_config_by_name,
+    get_policy_version,
     list_policies,
     load_policy_from_db,
     save_policy_to_db,
@@ -114,6 +115,25 @@ async def test_update_policy(async_session: AsyncSession):
         await get_policy_by_name(async_session, "update-policy")
 
 
+async def test_get_policy_version_tracks_updates(async_session: AsyncSession):
+    """The policy version changes when the policy is updated, and inactive policies have none."""
+    policy = await save_policy_to_db(
+        async_session, ControlPolicy(name="versioned", type="mock_type", config={}, is_active=True)
+    )
+    assert policy.id is not None
+    original_version = await get_policy_version(async_session, "versioned")
+    assert original_version == policy.updated_at
+
+    update = ControlPolicy(name="versioned", type="mock_type", config={"new": True}, is_active=True)
+    await update_policy(async_session, policy.id, update)
+    assert await get_policy_version(async_session, "versioned") > original_version
+
+    update.is_active = False
+    await update_policy(async_session, policy.id, update)
+    with pytest.raises(LuthienDBQueryError):
+        await get_policy_version(async_session, "versioned")
+
+
 async def test_update_policy_not_found(async_session: AsyncSession):
     """Test updating a non-existent policy."""
     # Pass a Policy model instance
@@ -6,6 +6,7 @@ from luthien_control.db.database_async import (
     _mask_password,
     close_db_engine,
     create_db_engine,
+    get_db_pool_status,
     get_db_session,
 )
 from luthien_control.db.database_async import settings as db_async_settings
@@ -207,3 +208,20 @@ async def test_get_db_session_exception():
 
         # Verify rollback was called
         assert mock_session.rollback_called, "Session rollback was not called during exception handling"
+
+
+def test_get_db_pool_status_without_engine():
+    """No engine means no pool to report on."""
+    with patch("luthien_control.db.database_async._db_engine", None):
+        assert get_db_pool_status() == {}
+
+
+def test_get_db_pool_status_reports_queue_pool_counts():
+    """Counts are read from the engine's pool, skipping states the pool doesn't track."""
+    with patch("luthien_control.db.database_async._db_engine") as mock_engine:
+        mock_engine.pool = MagicMock(spec=["size", "checkedin", "checkedout"])
+        mock_engine.pool.size.return_value = 5
+        mock_engine.pool.checkedin.return_value = 3
+        mock_engine.pool.checkedout.return_value = 2
+
+        assert get_db_pool_status() == {"size": 5, "checked_in": 3, "checked_out": 2}
@@ -1,13 +1,15 @@
 from datetime import datetime, timezone
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from luthien_control.db.exceptions import (
     LuthienDBOperationError,
     LuthienDBQueryError,
+    LuthienDBTransactionError,
 )
 from luthien_control.db.luthien_log_crud import (
     count_logs,
+    create_logs,
     get_log_by_id,
     get_unique_datatypes,
     get_unique_transaction_ids,
@@ -346,3 +348,45 @@ async def test_count_logs_unexpected_error():
 
     with pytest.raises(LuthienDBOperationError, match="Unexpected error during log counting"):
         await count_logs(mock_session)
+
+
+async def test_create_logs_inserts_batch(async_session: AsyncSession):
+    """A batch of row dicts is inserted in one go, with defaults for omitted columns."""
+    count = await create_logs(
+        async_session,
+        [
+            {"transaction_id": "tx-1", "datatype": "transaction", "data": {"status_code": 200}},
+            {
+                "transaction_id": "tx-2",
+                "datatype": "transaction",
+                "datetime": datetime(2024, 1, 1, 12, 0, 0),
+                "notes": {"source": "test"},
+            },
+        ],
+    )
+
+    assert count == 2
+    logs = {log.transaction_id: log for log in await list_logs(async_session)}
+    assert logs["tx-1"].data == {"status_code": 200}
+    assert logs["tx-1"].datetime is not None
+    assert logs["tx-2"].data is None
+    assert logs["tx-2"].notes == {"source": "test"}
+    assert logs["tx-2"].datetime == datetime(2024, 1, 1, 12, 0, 0)
+
+
+async def test_create_logs_empty_batch():
+    """An empty batch doesn't touch the session."""
+    mock_session = AsyncMock()
+
+    assert await create_logs(mock_session, []) == 0
+    mock_session.execute.assert_not_awaited()
+
+
+async def test_create_logs_sqlalchemy_error():
+    """SQLAlchemy errors roll back and surface as LuthienDBTransactionError."""
+    mock_session = AsyncMock()
+    mock_session.execute.side_effect = SQLAlchemyError("Database error")
+
+    with pytest.raises(LuthienDBTransactionError, match="Database transaction failed while inserting logs"):
+        await create_logs(mock_session, [{"transaction_id": "tx-1", "datatype": "transaction"}])
+    mock_session.rollback.assert_awaited_once()
@@ -0,0 +1,55 @@
+import contextlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from luthien_control.core.response_cache import DatabaseResponseCache
+from luthien_control.db.response_cache_crud import (
+    delete_expired_cached_responses,
+    get_cached_response,
+    put_cached_response,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.mark.asyncio
+async def test_put_and_get_cached_response(async_session: AsyncSession):
+    await put_cached_response(async_session, "key", b"body", utcnow() + timedelta(minutes=1))
+
+    assert await get_cached_response(async_session, "key") == b"body"
+    assert await get_cached_response(async_session, "other") is None
+
+
+@pytest.mark.asyncio
+async def test_put_replaces_existing_entry(async_session: AsyncSession):
+    await put_cached_response(async_session, "key", b"old", utcnow() + timedelta(minutes=1))
+    await put_cached_response(async_session, "key", b"new", utcnow() + timedelta(minutes=1))
+
+    assert await get_cached_response(async_session, "key") == b"new"
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_served_and_can_be_deleted(async_session: AsyncSession):
+    await put_cached_response(async_session, "expired", b"body", utcnow() - timedelta(seconds=1))
+    await put_cached_response(async_session, "fresh", b"body", utcnow() + timedelta(minutes=1))
+
+    assert await get_cached_response(async_session, "expired") is None
+    assert await delete_expired_cached_responses(async_session) == 1
+    assert await get_cached_response(async_session, "fresh") == b"body"
+
+
+@pytest.mark.asyncio
+async def test_database_response_cache(async_session: AsyncSession):
+    @contextlib.asynccontextmanager
+    async def session_factory():
+        yield async_session
+
+    cache = DatabaseResponseCache(session_factory)
+    await cache.put("key", b"body", ttl=60)
+
+    assert await cache.get("key") == b"body"
+    assert await cache.get("other") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "errors": 0}
@@ -0,0 +1,68 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from luthien_control.metrics.definitions import HTTP_REQUEST_DURATION, HTTP_REQUESTS
+from luthien_control.metrics.middleware import UNMATCHED_PATH, MetricsMiddleware
+from luthien_control.metrics.router import router as metrics_router
+
+
+def _create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"item_id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            yield b"a"
+            yield b"b"
+
+        return StreamingResponse(body(), media_type="text/plain")
+
+    return app
+
+
+def test_requests_are_counted_by_route_template():
+    client = TestClient(_create_app())
+    before = HTTP_REQUESTS.get(path="/items/{item_id}", method="GET", status="200")
+
+    client.get("/items/1")
+    client.get("/items/2")
+
+    assert HTTP_REQUESTS.get(path="/items/{item_id}", method="GET", status="200") == before + 2
+
+
+def test_unmatched_paths_share_one_label():
+    client = TestClient(_create_app())
+    before = HTTP_REQUESTS.get(path=UNMATCHED_PATH, method="GET", status="404")
+
+    client.get("/does-not-exist-1")
+    client.get("/does-not-exist-2")
+
+    assert HTTP_REQUESTS.get(path=UNMATCHED_PATH, method="GET", status="404") == before + 2
+
+
+def test_streamed_responses_are_timed():
+    client = TestClient(_create_app())
+    before = HTTP_REQUEST_DURATION.get_count(path="/stream", method="GET")
+
+    assert client.get("/stream").text == "ab"
+
+    assert HTTP_REQUEST_DURATION.get_count(path="/stream", method="GET") == before + 1
+
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    client = TestClient(_create_app())
+    client.get("/items/1")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE luthien_http_requests_total counter" in response.text
+    assert "# TYPE luthien_policy_apply_duration_seconds histogram" in response.text
+    assert 'luthien_http_requests_total{path="/items/{item_id}",method="GET",status="200"}' in response.text
@@ -0,0 +1,77 @@
+import pytest
+from luthien_control.metrics.registry import MetricsRegistry
+
+
+@pytest.fixture
+def registry() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+def test_counter_renders_labelled_samples(registry: MetricsRegistry):
+    requests = registry.counter("requests_total", "Requests served.", ("path", "status"))
+    requests.inc(path="/api", status=200)
+    requests.inc(2, path="/api", status=200)
+    requests.inc(path="/api", status=500)
+
+    assert requests.get(path="/api", status=200) == 3
+    assert registry.render() == (
+        "# HELP requests_total Requests served.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="/api",status="200"} 3.0\n'
+        'requests_total{path="/api",status="500"} 1.0\n'
+    )
+
+
+def test_counter_rejects_wrong_labels_and_negative_increments(registry: MetricsRegistry):
+    requests = registry.counter("requests_total", "Requests served.", ("path",))
+
+    with pytest.raises(ValueError, match="expects labels"):
+        requests.inc(route="/api")
+    with pytest.raises(ValueError, match="non-negative"):
+        requests.inc(-1, path="/api")
+
+
+def test_histogram_buckets_are_cumulative(registry: MetricsRegistry):
+    latency = registry.histogram("latency_seconds", "Latency.", ("policy",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, policy="p")
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{policy="p",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{policy="p",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{policy="p",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{policy="p"} 3.65' in lines
+    assert 'latency_seconds_count{policy="p"} 4' in lines
+
+
+def test_histogram_time_records_even_when_block_raises(registry: MetricsRegistry):
+    latency = registry.histogram("latency_seconds", "Latency.", ("policy",))
+
+    with pytest.raises(RuntimeError):
+        with latency.time(policy="p"):
+            raise RuntimeError("boom")
+
+    assert latency.get_count(policy="p") == 1
+
+
+def test_gauge_callback_is_evaluated_on_render(registry: MetricsRegistry):
+    values = {("checked_out",): 1.0}
+    registry.gauge("pool_connections", "Pool connections.", ("state",), callback=lambda: values)
+
+    assert 'pool_connections{state="checked_out"} 1.0' in registry.render()
+    values[("checked_out",)] = 4.0
+    assert 'pool_connections{state="checked_out"} 4.0' in registry.render()
+
+
+def test_label_values_are_escaped(registry: MetricsRegistry):
+    requests = registry.counter("requests_total", "Requests served.", ("path",))
+    requests.inc(path='a"b\\c\nd')
+
+    assert 'requests_total{path="a\\"b\\\\c\\nd"} 1.0' in registry.render()
+
+
+def test_duplicate_names_are_rejected(registry: MetricsRegistry):
+    registry.counter("requests_total", "Requests served.")
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.histogram("requests_total", "Again.")
@@ -1,9 +1,87 @@
 """Unit tests for proxy debugging utilities."""
 
+import logging
 from datetime import UTC, datetime
 from unittest.mock import patch
 
-from luthien_control.proxy.debugging import create_debug_response
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from luthien_control.proxy.debugging import DebugLoggingMiddleware, create_debug_response
+
+
+@pytest.fixture
+def debug_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(DebugLoggingMiddleware)
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"received": len(await request.body())}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            yield b"first,"
+            yield b"second"
+
+        return StreamingResponse(body(), media_type="text/plain")
+
+    return app
+
+
+class TestDebugLoggingMiddleware:
+    """Test cases for the pure ASGI DebugLoggingMiddleware."""
+
+    def test_adds_request_id_and_processing_time_headers(self, debug_app):
+        client = TestClient(debug_app)
+
+        response = client.post("/echo", content=b'{"a": 1}', headers={"x-request-id": "req-1"})
+
+        assert response.json() == {"received": 8}
+        assert response.headers["X-Request-ID"] == "req-1"
+        assert response.headers["X-Processing-Time"].endswith("s")
+
+    def test_streaming_responses_pass_through(self, debug_app):
+        client = TestClient(debug_app)
+
+        response = client.get("/stream")
+
+        assert response.text == "first,second"
+        assert response.headers["X-Request-ID"] == "no-id"
+
+    def test_skips_request_details_unless_debug_enabled(self, debug_app, caplog):
+        """At INFO level, only the completion line is logged and the body is never inspected."""
+        client = TestClient(debug_app)
+
+        with caplog.at_level(logging.INFO, logger="luthien_control.proxy.debugging"):
+            with patch("luthien_control.proxy.debugging._log_request_body") as mock_log_body:
+                client.post("/echo", content=b'{"a": 1}')
+
+        mock_log_body.assert_not_called()
+        assert [r.getMessage() for r in caplog.records] == ["[no-id] Request completed"]
+
+    def test_logs_parsed_body_at_debug_level(self, debug_app, caplog):
+        client = TestClient(debug_app)
+
+        with caplog.at_level(logging.DEBUG, logger="luthien_control.proxy.debugging"):
+            response = client.post("/echo", content=b'{"a": 1}', headers={"x-request-id": "req-2"})
+
+        assert response.json() == {"received": 8}
+        incoming = [r for r in caplog.records if r.getMessage() == "[req-2] Incoming POST request"]
+        assert len(incoming) == 1
+        assert incoming[0].body == {"a": 1}
+
+    def test_logs_non_json_body_length_at_debug_level(self, debug_app, caplog):
+        client = TestClient(debug_app)
+
+        with caplog.at_level(logging.DEBUG, logger="luthien_control.proxy.debugging"):
+            client.post("/echo", content=b"not json", headers={"x-request-id": "req-3"})
+
+        incoming = [r for r in caplog.records if "non-JSON body" in r.getMessage()]
+        assert len(incoming) == 1
+        assert incoming[0].body_length == 8
 
 
 class TestCreateDebugResponse:
@@ -1,16 +1,19 @@
 import uuid
-from typing import cast
+from typing import ClassVar, cast
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import fastapi
 import httpx
 import pytest
 from fastapi import Response
+from fastapi.responses import StreamingResponse
 from luthien_control.control_policy.control_policy import ControlPolicy
 from luthien_control.control_policy.exceptions import ControlPolicyError
 from luthien_control.control_policy.serialization import SerializableDict
+from luthien_control.db.naive_datetime import NaiveDatetime
 from luthien_control.proxy.orchestration import _initialize_transaction, run_policy_flow
 from luthien_control.settings import Settings
+from openai.types.chat import ChatCompletionChunk
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Mark all tests in this module as async
@@ -104,6 +107,76 @@ class MockTestPolicyNonePayload(ControlPolicy):
         return cls()
 
 
+def create_test_chunk(content: str) -> ChatCompletionChunk:
+    """Helper to create a streamed chat completion chunk."""
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "test-stream",
+            "object": "chat.completion.chunk",
+            "created": 1234567890,
+            "model": "gpt-4",
+            "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+        }
+    )
+
+
+class MockTestStreamingPolicy(ControlPolicy):
+    """Test policy that sets a streamed response and upper-cases each chunk through a chunk hook."""
+
+    def __init__(self, **data):
+        super().__init__(type="test_policy_streaming", **data)
+
+    async def apply(self, transaction, container, session):
+        async def backend_stream():
+            for content in ["Hel", "lo", "!"]:
+                yield create_test_chunk(content)
+
+        async def upper_case(chunk):
+            if chunk.choices[0].delta.content == "!":
+                return None
+            chunk.choices[0].delta.content = chunk.choices[0].delta.content.upper()
+            return chunk
+
+        transaction.response.stream = backend_stream()
+        transaction.response.add_chunk_hook(upper_case)
+        return transaction
+
+    def serialize(self) -> SerializableDict:
+        return {}
+
+    @classmethod
+    def from_serialized(cls, config: SerializableDict, **kwargs) -> "MockTestStreamingPolicy":
+        return cls()
+
+
+class MockTestStreamingThenFailingPolicy(ControlPolicy):
+    """Test policy that opens a backend stream, then fails before it is returned."""
+
+    def __init__(self, **data):
+        super().__init__(type="test_policy_streaming_then_failing", name="MockPolicy", **data)
+        self._stream = ClosableStream()
+
+    async def apply(self, transaction, container, session):
+        transaction.response.stream = self._stream
+        raise ControlPolicyError("Policy Failed!", policy_name="MockPolicy", status_code=418, detail="Test Detail")
+
+
+class ClosableStream:
+    """Stands in for openai's AsyncStream, which is closed with `close()`."""
+
+    def __init__(self):
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+    async def close(self):
+        self.closed = True
+
+
 class MockTestPolicyRaisingException(ControlPolicy):
     """Test policy that raises ControlPolicyError."""
 
@@ -177,9 +250,9 @@ def mock_container() -> MagicMock:
 @patch("luthien_control.proxy.orchestration.uuid.uuid4")
 @patch("luthien_control.proxy.orchestration.openai_chat_completions_response_to_fastapi_response")
 @patch("luthien_control.proxy.orchestration.logger")  # Patch logger
-@patch("luthien_control.proxy.orchestration.JSONResponse")  # Patch JSONResponse used directly now
+@patch("luthien_control.proxy.orchestration.CodecJSONResponse")  # Patch CodecJSONResponse used directly now
 async def test_run_policy_flow_successful(
-    MockJSONResponse: MagicMock,
+    MockCodecJSONResponse: MagicMock,
     mock_logger: MagicMock,
     mock_response_converter: MagicMock,
     mock_uuid4: MagicMock,
@@ -190,7 +263,7 @@ async def test_run_policy_flow_successful(
 ):
     """
     Test Goal: Verify the happy path: context init, policy runs, builder invoked.
-    (Added logger/JSONResponse patches for consistency, though not strictly needed here)
+    (Added logger/CodecJSONResponse patches for consistency, though not strictly needed here)
     """
     fixed_test_uuid = uuid.UUID("12345678-1234-5678-1234-567812345678")
     mock_uuid4.return_value = fixed_test_uuid
@@ -217,8 +290,8 @@ async def test_run_policy_flow_successful(
     # The policy should have set response payload (mocked in this test)
     # In a real scenario, the policy would set transaction.response.payload
 
-    # Direct JSONResponse should *not* be called in happy path
-    MockJSONResponse.assert_not_called()
+    # Direct CodecJSONResponse should *not* be called in happy path
+    MockCodecJSONResponse.assert_not_called()
     # Warning/exception logger should not be called
     mock_logger.warning.assert_not_called()
     mock_logger.exception.assert_not_called()
@@ -229,9 +302,9 @@ async def test_run_policy_flow_successful(
 
 @patch("luthien_control.proxy.orchestration.uuid.uuid4")
 @patch("luthien_control.proxy.orchestration.logger")  # Patch logger
-@patch("luthien_control.proxy.orchestration.JSONResponse")  # Patch JSONResponse used directly now
+@patch("luthien_control.proxy.orchestration.CodecJSONResponse")  # Patch CodecJSONResponse used directly now
 async def test_run_policy_flow_policy_exception(
-    MockJSONResponse: MagicMock,
+    MockCodecJSONResponse: MagicMock,
     mock_logger: MagicMock,
     mock_uuid4: MagicMock,
     mock_request: MagicMock,
@@ -240,15 +313,15 @@ async def test_run_policy_flow_policy_exception(
     mock_session: AsyncMock,
 ):
     """
-    Test Goal: Verify ControlPolicyError is caught, logged, *direct* JSONResponse used.
+    Test Goal: Verify ControlPolicyError is caught, logged, *direct* CodecJSONResponse used.
     Builder should NOT be called.
     """
     fixed_test_uuid = uuid.UUID("abcdefab-cdef-abcd-efab-cdefabcdefab")
     mock_uuid4.return_value = fixed_test_uuid
 
-    # Configure the mocked JSONResponse (used directly in this path)
+    # Configure the mocked CodecJSONResponse (used directly in this path)
     expected_error_response = Response(content=b"direct json error response")
-    MockJSONResponse.return_value = expected_error_response
+    MockCodecJSONResponse.return_value = expected_error_response
 
     # No ResponseBuilder to configure in this path
 
@@ -270,11 +343,11 @@ async def test_run_policy_flow_policy_exception(
     assert str(fixed_test_uuid) in log_message
     mock_logger.exception.assert_not_called()  # No unexpected exceptions logged
 
-    # Response Building (direct JSONResponse IS called)
-    MockJSONResponse.assert_called_once()
+    # Response Building (direct CodecJSONResponse IS called)
+    MockCodecJSONResponse.assert_called_once()
 
-    # Check args passed to JSONResponse
-    json_call_kwargs = MockJSONResponse.call_args.kwargs
+    # Check args passed to CodecJSONResponse
+    json_call_kwargs = MockCodecJSONResponse.call_args.kwargs
     assert json_call_kwargs.get("status_code") == 418  # Status from mock exception
     content = json_call_kwargs.get("content")
     assert content is not None
@@ -288,9 +361,9 @@ async def test_run_policy_flow_policy_exception(
 
 @patch("luthien_control.proxy.orchestration.uuid.uuid4")
 @patch("luthien_control.proxy.orchestration.logger")  # Patch logger
-@patch("luthien_control.proxy.orchestration.JSONResponse")  # Patch JSONResponse fallback
+@patch("luthien_control.proxy.orchestration.CodecJSONResponse")  # Patch CodecJSONResponse fallback
 async def test_run_policy_flow_unexpected_exception(
-    MockJSONResponse: MagicMock,
+    MockCodecJSONResponse: MagicMock,
     mock_logger: MagicMock,
     mock_uuid4: MagicMock,
     mock_request: MagicMock,
@@ -300,14 +373,14 @@ async def test_run_policy_flow_unexpected_exception(
 ):
     """
     Test Goal: Verify unexpected Exception is caught, logged, builder *is* called,
-               and builder's response returned. Fallback JSONResponse not used.
+               and builder's response returned. Fallback CodecJSONResponse not used.
     """
     fixed_test_uuid = uuid.UUID("ffffffff-ffff-ffff-ffff-ffffffffffff")
     mock_uuid4.return_value = fixed_test_uuid
 
-    # Configure fallback JSONResponse (this should be called for unexpected errors)
+    # Configure fallback CodecJSONResponse (this should be called for unexpected errors)
     expected_error_response = Response(content=b"error response")
-    MockJSONResponse.return_value = expected_error_response
+    MockCodecJSONResponse.return_value = expected_error_response
 
     # Call the orchestrator
     response = await run_policy_flow(
@@ -327,9 +400,9 @@ async def test_run_policy_flow_unexpected_exception(
     assert str(fixed_test_uuid) in log_message
     mock_logger.warning.assert_not_called()  # No policy warnings logged
 
-    # Response Building (JSONResponse IS called for unexpected exceptions)
-    MockJSONResponse.assert_called_once()
-    json_call_kwargs = MockJSONResponse.call_args.kwargs
+    # Response Building (CodecJSONResponse IS called for unexpected exceptions)
+    MockCodecJSONResponse.assert_called_once()
+    json_call_kwargs = MockCodecJSONResponse.call_args.kwargs
     assert json_call_kwargs.get("status_code") == 500
     content = json_call_kwargs.get("content")
     assert content is not None
@@ -344,9 +417,9 @@ async def test_run_policy_flow_unexpected_exception(
 @patch("luthien_control.proxy.orchestration.uuid.uuid4")
 @patch("luthien_control.proxy.orchestration.openai_chat_completions_response_to_fastapi_response")
 @patch("luthien_control.proxy.orchestration.logger")  # Patch logger
-@patch("luthien_control.proxy.orchestration.JSONResponse")  # Patch JSONResponse fallback
+@patch("luthien_control.proxy.orchestration.CodecJSONResponse")  # Patch CodecJSONResponse fallback
 async def test_run_policy_flow_unexpected_exception_during_build(
-    MockJSONResponse: MagicMock,
+    MockCodecJSONResponse: MagicMock,
     mock_logger: MagicMock,
     mock_response_converter: MagicMock,
     mock_uuid4: MagicMock,
@@ -357,7 +430,7 @@ async def test_run_policy_flow_unexpected_exception_during_build(
 ):
     """
     Test Goal: Verify if response converter fails after successful policy execution,
-               the error is caught and JSONResponse is used as fallback.
+               the error is caught and CodecJSONResponse is used as fallback.
     """
     fixed_test_uuid = uuid.UUID("eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee")
     mock_uuid4.return_value = fixed_test_uuid
@@ -367,9 +440,9 @@ async def test_run_policy_flow_unexpected_exception_during_build(
     converter_error = RuntimeError("Response converter failed!")
     mock_response_converter.side_effect = converter_error
 
-    # Configure the mocked JSONResponse (fallback)
+    # Configure the mocked CodecJSONResponse (fallback)
     expected_fallback_response = Response(content=b"fallback json response")
-    MockJSONResponse.return_value = expected_fallback_response
+    MockCodecJSONResponse.return_value = expected_fallback_response
 
     # Call the orchestrator
     response = await run_policy_flow(
@@ -391,11 +464,11 @@ async def test_run_policy_flow_unexpected_exception_during_build(
     log_message = mock_logger.exception.call_args[0][0]
     assert str(fixed_test_uuid) in log_message
 
-    # Response Building (JSONResponse fallback IS called)
-    MockJSONResponse.assert_called_once()  # Fallback JSONResponse was called
+    # Response Building (CodecJSONResponse fallback IS called)
+    MockCodecJSONResponse.assert_called_once()  # Fallback CodecJSONResponse was called
 
-    # Check args passed to fallback JSONResponse
-    json_call_kwargs = MockJSONResponse.call_args.kwargs
+    # Check args passed to fallback CodecJSONResponse
+    json_call_kwargs = MockCodecJSONResponse.call_args.kwargs
     assert json_call_kwargs.get("status_code") == 500
     content = json_call_kwargs.get("content")
     assert content is not None
@@ -410,9 +483,9 @@ async def test_run_policy_flow_unexpected_exception_during_build(
 
 @patch("luthien_control.proxy.orchestration._initialize_transaction")
 @patch("luthien_control.proxy.orchestration.logger")
-@patch("luthien_control.proxy.orchestration.JSONResponse")
+@patch("luthien_control.proxy.orchestration.CodecJSONResponse")
 async def test_run_policy_flow_context_init_exception(
-    MockJSONResponse: MagicMock,
+    MockCodecJSONResponse: MagicMock,
     mock_logger: MagicMock,
     mock_init_transaction: MagicMock,
     mock_request: MagicMock,
@@ -447,7 +520,7 @@ async def test_run_policy_flow_context_init_exception(
 
     mock_logger.exception.assert_not_called()  # Logger within run_policy_flow not called
     mock_logger.warning.assert_not_called()
-    MockJSONResponse.assert_not_called()  # Fallback JSONResponse not created
+    MockCodecJSONResponse.assert_not_called()  # Fallback CodecJSONResponse not created
 
 
 async def test_run_policy_flow_none_payload(
@@ -466,11 +539,118 @@ async def test_run_policy_flow_none_payload(
         session=mock_session,
     )
 
-    # Should return JSONResponse with 500 status and error message
+    # Should return CodecJSONResponse with 500 status and error message
     assert response.status_code == 500
     assert "Internal Server Error: No response payload" in cast(bytes, response.body).decode()
 
 
+async def test_run_policy_flow_streaming(
+    mock_request: MagicMock,
+    mock_container: MagicMock,
+    mock_session: AsyncMock,
+):
+    """Streamed responses should be forwarded as SSE events, passing each chunk through the chunk hooks."""
+    response = await run_policy_flow(
+        request=mock_request,
+        main_policy=MockTestStreamingPolicy(),
+        dependencies=mock_container,
+        session=mock_session,
+    )
+
+    assert isinstance(response, StreamingResponse)
+    assert response.media_type == "text/event-stream"
+
+    events = [event async for event in response.body_iterator]
+    assert len(events) == 3
+    assert b'"content":"HEL"' in cast(bytes, events[0])
+    assert b'"content":"LO"' in cast(bytes, events[1])
+    assert events[2] == b"data: [DONE]\n\n"
+
+
+async def test_run_policy_flow_closes_the_stream_of_a_failed_policy(
+    mock_request: MagicMock,
+    mock_container: MagicMock,
+    mock_session: AsyncMock,
+):
+    """A backend stream opened before a policy failed is closed, since no one will read it."""
+    policy = MockTestStreamingThenFailingPolicy()
+
+    response = await run_policy_flow(mock_request, policy, mock_container, mock_session)
+
+    assert response.status_code == 418
+    assert policy._stream.closed
+
+
+async def test_run_policy_flow_tracks_changes_only_when_required(
+    mock_request: MagicMock,
+    mock_container: MagicMock,
+    mock_session: AsyncMock,
+):
+    """Payload models are only deep-evented when a policy in the tree subscribes to change events."""
+    seen = {}
+
+    class RecordingPolicy(MockTestPolicy):
+        async def apply(self, transaction, container, session):
+            seen["connected"] = transaction.request.payload.deep_events_connected
+            return await super().apply(transaction, container, session)
+
+    class TrackingPolicy(RecordingPolicy):
+        requires_change_events: ClassVar[bool] = True
+
+    await run_policy_flow(mock_request, RecordingPolicy(), mock_container, mock_session)
+    assert seen["connected"] is False
+
+    await run_policy_flow(mock_request, TrackingPolicy(), mock_container, mock_session)
+    assert seen["connected"] is True
+
+
+async def test_run_policy_flow_submits_transaction_log(
+    mock_request: MagicMock,
+    mock_policy: MockTestPolicy,
+    mock_container: MagicMock,
+    mock_session: AsyncMock,
+):
+    """A record of the finished transaction is handed to the log sink without serializing it."""
+    before = NaiveDatetime.now()
+    response = await run_policy_flow(mock_request, mock_policy, mock_container, mock_session)
+
+    mock_container.log_sink.submit.assert_called_once()
+    record = mock_container.log_sink.submit.call_args.args[0]
+    assert record["datatype"] == "transaction"
+    assert before <= record["datetime"] <= NaiveDatetime.now()
+    assert record["data"]["status_code"] == response.status_code
+    assert record["data"]["api_endpoint"] == "/test/path"
+    assert record["data"]["response"].id == "test-response"
+    assert record["data"]["transaction_data"] == {"main_policy_called": True}
+    assert record["data"]["error"] is None
+
+
+async def test_run_policy_flow_logs_policy_errors(
+    mock_request: MagicMock,
+    mock_policy_raising_exception: MockTestPolicyRaisingException,
+    mock_container: MagicMock,
+    mock_session: AsyncMock,
+):
+    await run_policy_flow(mock_request, mock_policy_raising_exception, mock_container, mock_session)
+
+    record = mock_container.log_sink.submit.call_args.args[0]
+    assert record["data"]["error"] is not None
+    assert record["data"]["response"] is None
+
+
+async def test_run_policy_flow_without_log_sink(
+    mock_request: MagicMock,
+    mock_policy: MockTestPolicy,
+    mock_container: MagicMock,
+    mock_session: AsyncMock,
+):
+    mock_container.log_sink = None
+
+    response = await run_policy_flow(mock_request, mock_policy, mock_container, mock_session)
+
+    assert response.status_code == 200
+
+
 async def test_initialize_context_query_params():
     """_initialize_transaction should store the URL and API key."""
     body = b'{"model": "gpt-4", "messages": [{"role": "user", "content": "test"}]}'
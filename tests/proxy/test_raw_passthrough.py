@@ -0,0 +1,261 @@
+"""Tests for the raw byte-level passthrough engine."""
+
+import json
+from typing import Any, AsyncIterator, List, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fastapi
+import httpx
+import pytest
+from fastapi.responses import StreamingResponse
+from luthien_control.control_policy.add_api_key_header_from_env import AddApiKeyHeaderFromEnvPolicy
+from luthien_control.control_policy.client_api_key_auth import ClientApiKeyAuthPolicy
+from luthien_control.control_policy.control_policy import ControlPolicy
+from luthien_control.control_policy.noop_policy import NoopPolicy
+from luthien_control.control_policy.serial_policy import SerialPolicy
+from luthien_control.control_policy.set_backend_policy import SetBackendPolicy
+from luthien_control.db.exceptions import LuthienDBNotFoundError
+from luthien_control.proxy.raw_passthrough import is_raw_passthrough_path, run_raw_passthrough
+
+
+class _WrappingPolicy(ControlPolicy):
+    """A policy nesting another one without taking part in raw passthrough."""
+
+    inner: ControlPolicy
+
+    async def apply(self, transaction, container, session):
+        return await self.inner.apply(transaction, container, session)
+
+
+def _make_request(
+    method: str, full_path: str, body: bytes = b"", query: bytes = b"", headers: Optional[dict] = None
+) -> fastapi.Request:
+    raw_headers = [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()]
+    if body:
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+    raw_headers.append((b"host", b"proxy.local"))
+    chunks = [body[:3], body[3:]] if body else [b""]
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": f"/api/{full_path}",
+        "query_string": query,
+        "headers": raw_headers,
+        "path_params": {"full_path": full_path},
+    }
+    return fastapi.Request(scope, receive)
+
+
+async def _read_body(response: fastapi.Response) -> bytes:
+    assert isinstance(response, StreamingResponse)
+    return b"".join([chunk async for chunk in response.body_iterator])  # type: ignore[misc]
+
+
+class _BackendBody(httpx.AsyncByteStream):
+    """A response body streamed in several chunks, as a real backend connection would deliver it."""
+
+    def __init__(self, chunks: List[bytes]):
+        self.chunks = chunks
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def backend_requests() -> List[httpx.Request]:
+    return []
+
+
+@pytest.fixture
+def backend_bodies() -> List[_BackendBody]:
+    return []
+
+
+@pytest.fixture
+def passthrough_container(
+    mock_container: MagicMock, backend_requests: List[httpx.Request], backend_bodies: List[_BackendBody]
+) -> MagicMock:
+    """A container whose HTTP client records requests and answers like a backend would."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        backend_requests.append(request)
+        body = _BackendBody([b'{"object": ', b'"list"}'])
+        backend_bodies.append(body)
+        return httpx.Response(
+            201,
+            headers=[("x-backend", "yes"), ("set-cookie", "a=1"), ("set-cookie", "b=2"), ("connection", "close")],
+            stream=body,
+        )
+
+    mock_container.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    mock_container.settings.get_backend_url.return_value = "https://default.example/v1"
+    return mock_container
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("models", True),
+        ("/models/gpt-4o/", True),
+        ("embeddings", True),
+        ("chat/completions", False),
+        ("embeddings/extra", False),
+    ],
+)
+def test_is_raw_passthrough_path(path: str, expected: bool):
+    assert is_raw_passthrough_path(path, ["models*", "embeddings"]) is expected
+
+
+def test_is_raw_passthrough_path_without_patterns():
+    assert not is_raw_passthrough_path("models", [])
+
+
+@pytest.mark.asyncio
+async def test_raw_passthrough_forwards_request_and_streams_response(
+    passthrough_container: MagicMock,
+    backend_requests: List[httpx.Request],
+    backend_bodies: List[_BackendBody],
+    monkeypatch,
+):
+    monkeypatch.setenv("TEST_BACKEND_KEY", "sk-backend")
+    policy = SerialPolicy(
+        policies=[
+            SetBackendPolicy(backend_url="https://backend.example/v1/"),
+            NoopPolicy(),
+            AddApiKeyHeaderFromEnvPolicy(api_key_env_var_name="TEST_BACKEND_KEY"),
+        ]
+    )
+    body = json.dumps({"model": "text-embedding-3-small", "input": "hello"}).encode()
+    request = _make_request(
+        "POST",
+        "embeddings",
+        body=body,
+        query=b"api-version=1",
+        headers={"Authorization": "Bearer client-key", "Content-Type": "application/json", "Connection": "keep-alive"},
+    )
+
+    response = await run_raw_passthrough(request, policy, passthrough_container, AsyncMock())
+
+    assert response.status_code == 201
+    assert isinstance(response, StreamingResponse)
+    assert [chunk async for chunk in response.body_iterator] == [b'{"object": ', b'"list"}']
+    assert backend_bodies[0].closed
+    assert (b"x-backend", b"yes") in response.raw_headers
+    assert [value for key, value in response.raw_headers if key == b"set-cookie"] == [b"a=1", b"b=2"]
+    assert all(key.lower() != b"connection" for key, _ in response.raw_headers)
+
+    (sent,) = backend_requests
+    assert sent.method == "POST"
+    assert str(sent.url) == "https://backend.example/v1/embeddings?api-version=1"
+    assert sent.headers["host"] == "backend.example"
+    assert sent.headers["authorization"] == "Bearer sk-backend"
+    assert sent.headers["content-type"] == "application/json"
+    assert "connection" not in sent.headers
+    assert sent.content == body
+
+
+@pytest.mark.asyncio
+async def test_raw_passthrough_get_uses_default_backend(
+    passthrough_container: MagicMock, backend_requests: List[httpx.Request]
+):
+    request = _make_request("GET", "models", headers={"Authorization": "Bearer client-key"})
+
+    response = await run_raw_passthrough(request, NoopPolicy(), passthrough_container, AsyncMock())
+
+    assert response.status_code == 201
+    await _read_body(response)
+    (sent,) = backend_requests
+    assert str(sent.url) == "https://default.example/v1/models"
+    assert sent.content == b""
+    assert "transfer-encoding" not in sent.headers
+    # Without a policy setting one, the client's key is forwarded, as on the chat completions path
+    assert sent.headers["authorization"] == "Bearer client-key"
+
+
+@pytest.mark.asyncio
+async def test_raw_passthrough_rejects_unknown_client_key(
+    passthrough_container: MagicMock, backend_requests: List[httpx.Request]
+):
+    request = _make_request("GET", "models", headers={"Authorization": "Bearer unknown"})
+
+    with patch(
+        "luthien_control.control_policy.client_api_key_auth.get_api_key_by_value",
+        new_callable=AsyncMock,
+        side_effect=LuthienDBNotFoundError("not found"),
+    ):
+        response = await run_raw_passthrough(request, ClientApiKeyAuthPolicy(), passthrough_container, AsyncMock())
+
+    assert response.status_code == 401
+    assert "Invalid API Key" in json.loads(bytes(response.body))["detail"]
+    assert backend_requests == []
+
+
+@pytest.mark.asyncio
+async def test_raw_passthrough_authenticates_client_key(
+    passthrough_container: MagicMock, backend_requests: List[httpx.Request]
+):
+    request = _make_request("GET", "models", headers={"Authorization": "Bearer known"})
+    api_key: Any = MagicMock(is_active=True, id=1)
+    api_key.name = "indexer"
+
+    with patch(
+        "luthien_control.control_policy.client_api_key_auth.get_api_key_by_value",
+        new_callable=AsyncMock,
+        return_value=api_key,
+    ):
+        response = await run_raw_passthrough(request, ClientApiKeyAuthPolicy(), passthrough_container, AsyncMock())
+
+    assert response.status_code == 201
+    await _read_body(response)
+    assert len(backend_requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_raw_passthrough_fails_closed_on_unreachable_auth(
+    passthrough_container: MagicMock, backend_requests: List[httpx.Request]
+):
+    policy = _WrappingPolicy(type="Wrapping", inner=ClientApiKeyAuthPolicy())
+    request = _make_request("GET", "models", headers={"Authorization": "Bearer client-key"})
+
+    response = await run_raw_passthrough(request, policy, passthrough_container, AsyncMock())
+
+    assert response.status_code == 403
+    assert backend_requests == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [httpx.ConnectError("connection refused"), httpx.StreamClosed()],
+)
+async def test_raw_passthrough_backend_unreachable(passthrough_container: MagicMock, error: Exception):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise error
+
+    passthrough_container.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    request = _make_request("GET", "models")
+
+    response = await run_raw_passthrough(request, NoopPolicy(), passthrough_container, AsyncMock())
+
+    assert response.status_code == 502
+
+
+@pytest.mark.asyncio
+async def test_raw_passthrough_without_backend_url(passthrough_container: MagicMock):
+    passthrough_container.settings.get_backend_url.return_value = None
+    request = _make_request("GET", "models")
+
+    response = await run_raw_passthrough(request, NoopPolicy(), passthrough_container, AsyncMock())
+
+    assert response.status_code == 500
@@ -1,4 +1,6 @@
 import contextlib
+from datetime import datetime
+from typing import cast
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -12,6 +14,9 @@ from luthien_control.core.dependencies import (
     initialize_app_dependencies,
 )
 from luthien_control.core.dependency_container import DependencyContainer
+from luthien_control.core.log_sink import TransactionLogSink
+from luthien_control.core.policy_cache import PolicyCache
+from luthien_control.core.response_cache import DatabaseResponseCache
 from starlette.datastructures import State
 
 # --- Fixtures (reusing mocks from conftest via dependency injection) ---
@@ -116,10 +121,20 @@ async def test_get_db_session_exception_handling(mock_container):
 # --- Tests for get_main_control_policy (using Container) ---
 
 
+@pytest.fixture(autouse=True)
+def mock_get_policy_version():
+    """Stub out the policy version lookup so no DB query is attempted."""
+    with patch("luthien_control.core.dependencies.get_policy_version", new_callable=AsyncMock) as mock_version:
+        mock_version.return_value = datetime(2025, 1, 1)
+        yield mock_version
+
+
 @pytest.mark.asyncio
+@patch("luthien_control.core.dependencies.os.path.getmtime", return_value=1000.0)
 @patch("luthien_control.core.dependencies.load_policy_from_file")
 async def test_get_main_control_policy_from_file(
     mock_load_from_file: MagicMock,
+    mock_getmtime: MagicMock,
     mock_container: MagicMock,
 ):
     """Test loading control policy from file when filepath is provided."""
@@ -134,6 +149,76 @@ async def test_get_main_control_policy_from_file(
     assert result_policy is mock_policy
 
 
+@pytest.mark.asyncio
+@patch("luthien_control.core.dependencies.os.path.getmtime")
+@patch("luthien_control.core.dependencies.load_policy_from_file")
+async def test_get_main_control_policy_from_file_cached_until_modified(
+    mock_load_from_file: MagicMock,
+    mock_getmtime: MagicMock,
+    mock_container: MagicMock,
+):
+    """The file policy is only rebuilt when the file's modification time changes."""
+    mock_container.settings.get_policy_filepath.return_value = "/path/to/policy.json"
+    first_policy, second_policy = MagicMock(spec=ControlPolicy), MagicMock(spec=ControlPolicy)
+    mock_load_from_file.side_effect = [first_policy, second_policy]
+
+    mock_getmtime.return_value = 1000.0
+    assert await get_main_control_policy(dependencies=mock_container) is first_policy
+    assert await get_main_control_policy(dependencies=mock_container) is first_policy
+    assert mock_load_from_file.call_count == 1
+
+    mock_getmtime.return_value = 2000.0
+    assert await get_main_control_policy(dependencies=mock_container) is second_policy
+    assert mock_load_from_file.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("luthien_control.core.dependencies.load_policy_from_db", new_callable=AsyncMock)
+async def test_get_main_control_policy_cached_by_version(
+    mock_load_from_db: AsyncMock,
+    mock_container: MagicMock,
+    mock_get_policy_version: AsyncMock,
+):
+    """The DB policy is reused while its version is unchanged, and reloaded once it changes."""
+    mock_container.settings.get_policy_filepath.return_value = None
+    mock_container.policy_cache = PolicyCache(revalidate_interval=0)
+    first_policy, second_policy = AsyncMock(spec=ControlPolicy), AsyncMock(spec=ControlPolicy)
+    mock_load_from_db.side_effect = [first_policy, second_policy]
+
+    assert await get_main_control_policy(dependencies=mock_container) is first_policy
+    assert await get_main_control_policy(dependencies=mock_container) is first_policy
+    assert mock_load_from_db.await_count == 1
+    assert mock_get_policy_version.await_count == 2
+
+    mock_get_policy_version.return_value = datetime(2025, 2, 1)
+    assert await get_main_control_policy(dependencies=mock_container) is second_policy
+    assert mock_load_from_db.await_count == 2
+
+
+@pytest.mark.asyncio
+@patch("luthien_control.core.dependencies.load_policy_from_db", new_callable=AsyncMock)
+async def test_get_main_control_policy_fresh_entry_skips_db(
+    mock_load_from_db: AsyncMock,
+    mock_container: MagicMock,
+    mock_get_policy_version: AsyncMock,
+):
+    """Within the revalidation interval the cached policy is returned without touching the DB."""
+    mock_container.settings.get_policy_filepath.return_value = None
+    mock_container.policy_cache = PolicyCache(revalidate_interval=60)
+    mock_policy = AsyncMock(spec=ControlPolicy)
+    mock_load_from_db.return_value = mock_policy
+
+    assert await get_main_control_policy(dependencies=mock_container) is mock_policy
+    assert await get_main_control_policy(dependencies=mock_container) is mock_policy
+
+    assert mock_get_policy_version.await_count == 1
+    assert mock_load_from_db.await_count == 1
+
+    mock_container.policy_cache.invalidate("test_policy")
+    assert await get_main_control_policy(dependencies=mock_container) is mock_policy
+    assert mock_load_from_db.await_count == 2
+
+
 @pytest.mark.asyncio
 @patch("luthien_control.core.dependencies.load_policy_from_db", new_callable=AsyncMock)
 async def test_get_main_control_policy_success(
@@ -261,8 +346,44 @@ async def test_initialize_app_dependencies_success(
     assert result.settings is mock_settings
     assert result.http_client is mock_http_client
     assert result.db_session_factory is mock_db_get_session
+    assert result.openai_clients.http_client is mock_http_client
+    assert result.client_quotas.db_session_factory is mock_db_get_session
+    assert cast(DatabaseResponseCache, result.response_caches["database"]).db_session_factory is mock_db_get_session
+    assert result.client_quotas._task is not None
+    database_cache = cast(DatabaseResponseCache, result.response_caches["database"])
+    assert database_cache._task is not None
 
     mock_create_db_engine.assert_awaited_once()
+    await result.client_quotas.aclose()
+    await database_cache.aclose()
+
+
+@pytest.mark.asyncio
+@patch("luthien_control.core.dependencies.create_db_engine", new_callable=AsyncMock)
+@patch("luthien_control.core.dependencies.httpx.AsyncClient")
+@patch("luthien_control.core.dependencies.db_get_session")
+async def test_initialize_app_dependencies_starts_log_sink(
+    mock_db_get_session: MagicMock,
+    mock_http_client_class: MagicMock,
+    mock_create_db_engine: AsyncMock,
+    mock_settings: MagicMock,
+):
+    """With transaction logging enabled, a configured log sink is created and started."""
+    mock_http_client_class.return_value = AsyncMock()
+    mock_settings.get_transaction_log_enabled.return_value = True
+    mock_settings.get_transaction_log_queue_size.return_value = 50
+    mock_settings.get_transaction_log_batch_size.return_value = 10
+    mock_settings.get_transaction_log_flush_interval.return_value = 0.5
+    mock_settings.get_transaction_log_overflow.return_value = "drop_newest"
+
+    result = await initialize_app_dependencies(mock_settings)
+
+    assert isinstance(result.log_sink, TransactionLogSink)
+    assert result.log_sink.db_session_factory is mock_db_get_session
+    assert result.log_sink.batch_size == 10
+    assert result.log_sink.overflow == "drop_newest"
+    assert result.log_sink._task is not None
+    await result.log_sink.aclose()
 
 
 @pytest.mark.asyncio
@@ -38,6 +38,10 @@ def test_dependency_container_initialization():
     mock_openai_client = container.create_openai_client("https://api.openai.com/v1", "test-key")
     assert isinstance(mock_openai_client, openai.AsyncOpenAI)
 
+    # Clients are pooled and share the container's HTTP client
+    assert container.create_openai_client("https://api.openai.com/v1", "test-key") is mock_openai_client
+    assert container.openai_clients.http_client is mock_http_client
+
 
 def test_create_openai_client_with_invalid_url():
     """Test that create_openai_client raises ValueError for invalid URLs."""
@@ -25,6 +25,8 @@ def test_lifespan_success_path(mocker, mock_container: MagicMock):
     # 1. Mock dependencies directly used by lifespan, or global ones for shutdown.
     mock_settings_instance = MagicMock()
     mocker.patch("luthien_control.main.Settings", return_value=mock_settings_instance)
+    mock_container.log_sink = AsyncMock()
+    mock_container.client_quotas = AsyncMock()
 
     mock_initialize_dependencies = mocker.patch(
         "luthien_control.main.initialize_app_dependencies",
@@ -60,6 +62,9 @@ def test_lifespan_success_path(mocker, mock_container: MagicMock):
     # 4. Assertions for shutdown
     # Check that the http_client on our mock_container had its aclose called
     mock_container.http_client.aclose.assert_awaited_once()  # mock_container.http_client is an AsyncMock
+    assert len(mock_container.openai_clients) == 0
+    mock_container.log_sink.aclose.assert_awaited_once()
+    mock_container.client_quotas.aclose.assert_awaited_once()
 
     mock_close_db_engine.assert_awaited_once()
 
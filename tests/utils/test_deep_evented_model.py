@@ -1,7 +1,7 @@
 from typing import Optional
 from unittest.mock import Mock
 
-from luthien_control.utils.deep_evented_model import DeepEventedModel
+from luthien_control.utils.deep_evented_model import DeepEventedModel, deep_events
 from psygnal import EventedModel as PsygnalEventedModel
 from psygnal.containers import EventedDict, EventedList
 from pydantic import Field
@@ -536,3 +536,42 @@ class TestDeepEventedModel:
         assert serialized["messages"] == ["hello", "world"]
         assert isinstance(serialized["metadata"], dict)
         assert serialized["metadata"] == {"key": "value"}
+
+    def test_models_built_without_deep_events_are_not_wired(self):
+        """Models built inside `deep_events(False)` skip signal wiring until upgraded."""
+
+        class Child(DeepEventedModel):
+            value: int = 0
+
+        class Parent(DeepEventedModel):
+            child: Child = Field(default_factory=Child)
+            children: EventedList[Child] = Field(default_factory=lambda: EventedList[Child]())
+
+        with deep_events(False):
+            model = Parent(children=EventedList([Child(), Child()]))
+
+        assert not model.deep_events_connected
+        mock_handler = Mock()
+        model.changed.connect(mock_handler)
+
+        model.child.value = 1
+        model.children[1].value = 1
+        mock_handler.assert_not_called()
+
+        # Upgrading wires the whole tree, including already-built children
+        model.connect_deep_events()
+        assert model.deep_events_connected
+        assert model.children[0].deep_events_connected
+
+        model.children[1].value = 2
+        mock_handler.assert_called_once()
+
+    def test_deep_events_context_is_restored(self):
+        """The default (wired) behavior is restored when the context exits."""
+
+        class MyModel(DeepEventedModel):
+            x: int = 0
+
+        with deep_events(False):
+            assert not MyModel().deep_events_connected
+        assert MyModel().deep_events_connected
@@ -0,0 +1,69 @@
+"""Tests for the pluggable JSON codec."""
+
+import json
+from datetime import UTC, datetime
+
+import pytest
+from luthien_control.api.openai_chat_completions.request import OpenAIChatCompletionsRequest
+from luthien_control.utils import json_codec
+from pydantic import ValidationError
+
+REQUEST_BODY = b'{"model": "gpt-4o", "messages": [{"role": "user", "content": "h\xc3\xa9llo"}]}'
+
+
+@pytest.fixture(params=json_codec.BACKENDS)
+def codec_backend(request):
+    """Runs a test once per backend, restoring the automatic choice afterwards."""
+    if request.param != "stdlib":
+        pytest.importorskip(request.param)
+    yield json_codec.use_backend(request.param)
+    json_codec.use_backend("auto")
+
+
+def test_use_backend_rejects_unknown_name():
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        json_codec.use_backend("simdjson")
+
+
+def test_loads_and_dumps_round_trip(codec_backend):
+    data = {"text": "héllo", "items": [1, 2.5, None, True]}
+    encoded = json_codec.dumps(data)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == data
+    assert json_codec.loads(encoded) == data
+
+
+def test_dumps_uses_default_for_unknown_types(codec_backend):
+    moment = datetime(2024, 1, 2, tzinfo=UTC)
+    encoded = json_codec.dumps({"at": moment}, default=lambda value: value.isoformat() if value is moment else None)
+    assert json.loads(encoded) == {"at": moment.isoformat()}
+
+
+@pytest.mark.parametrize("data", [b"{not json", b'{"a": "\xff"}'])
+def test_loads_raises_json_decode_error(codec_backend, data):
+    with pytest.raises(json_codec.JSONDecodeError):
+        json_codec.loads(data)
+
+
+def test_decode_model_parses_bytes_directly():
+    request = json_codec.decode_model(OpenAIChatCompletionsRequest, REQUEST_BODY)
+    assert request.model == "gpt-4o"
+    assert request.messages[0].content == "héllo"
+
+
+def test_decode_model_rejects_invalid_json():
+    with pytest.raises(ValidationError):
+        json_codec.decode_model(OpenAIChatCompletionsRequest, b"{not json")
+
+
+def test_encode_model_matches_model_dump_json():
+    request = json_codec.decode_model(OpenAIChatCompletionsRequest, REQUEST_BODY)
+    assert json_codec.encode_model(request) == request.model_dump_json().encode()
+    assert json_codec.encode_model(request, exclude_unset=True) == request.model_dump_json(exclude_unset=True).encode()
+
+
+def test_codec_json_response_renders_with_dumps(codec_backend):
+    response = json_codec.CodecJSONResponse(content={"detail": "héllo"}, status_code=418)
+    assert response.status_code == 418
+    assert json.loads(bytes(response.body)) == {"detail": "héllo"}
+    assert response.headers["content-type"] == "application/json"